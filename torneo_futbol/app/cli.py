@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Línea de comandos para operaciones masivas sobre el torneo (sin interfaz).
+
+Uso: ``python -m app.cli [--db RUTA] <subcomando> ...``
+
+Subcomandos:
+    crear-cuadro          Crea los octavos (o la fase de grupos) desde una lista de equipos
+    importar-resultados   Guarda resultados desde un CSV, por lotes en una transacción
+    propagar              Avanza todos los ganadores a la siguiente ronda
+    reconstruir           Recalcula acumulados, ratings, sanciones, grupos y clasificaciones
+    informes              Genera los informes PDF (en paralelo con --jobs)
+    exportar              Exporta las tablas a CSV o JSON (en paralelo con --jobs)
+    servir                API HTTP/JSON de solo lectura para pantallas de la red local
+    copia                 Crea una copia de seguridad de la base de datos en caliente
+    copias                Lista las copias de seguridad
+    diferencias           Compara una copia con la base de datos actual
+    restaurar             Sustituye la base de datos por una copia
+    dispositivo           Muestra (o cambia) la identidad de esta copia para sincronizar
+    exportar-cambios      Escribe los cambios pendientes para otro dispositivo
+    importar-cambios      Fusiona los cambios de otro dispositivo e informa de los conflictos
+    torneos               Lista el torneo activo y los archivados
+    archivar              Archiva el torneo activo en un archivo de solo lectura y empieza otro
+
+Trabaja sobre los servicios de la aplicación arrancados con
+``app.core.headless`` y nunca importa Qt. Las importaciones de la aplicación
+se hacen dentro de cada subcomando para que ``--db`` (variable TORNEO_DB)
+se aplique antes de leer la configuración y llegue también a los procesos
+de --jobs.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+
+# Resultados que se guardan en cada transacción al importar
+LOTE_POR_DEFECTO = 200
+
+# Filas que se leen de cada tabla en cada paso al exportar
+FILAS_POR_LECTURA = 500
+
+# Informes disponibles: nombre -> método de ReportService
+INFORMES = {
+    "equipos": "generate_equipos_jugadores",
+    "partidos": "generate_partidos_resultados",
+    "clasificacion": "generate_clasificacion_eliminatorias",
+}
+
+
+# ----------------------------------------------------------------------
+# Base de datos de solo lectura
+# ----------------------------------------------------------------------
+
+def _es_archivo() -> bool:
+    """Avisa (y devuelve True) si la base de datos es un torneo archivado, que solo se puede consultar."""
+    from app.models.db import es_solo_lectura, get_db_path
+
+    if es_solo_lectura():
+        print(f"{get_db_path()} es un torneo archivado: solo se puede consultar "
+              f"(torneos, informes, exportar, servir, copia)", file=sys.stderr)
+        return True
+    return False
+
+
+# ----------------------------------------------------------------------
+# crear-cuadro
+# ----------------------------------------------------------------------
+
+def _leer_equipos(archivo: Optional[str]) -> list[int]:
+    """IDs de los equipos del archivo (un nombre o ID por línea) o de todos."""
+    from app.models.team_model import TeamModel
+
+    equipos = TeamModel.listar_equipos()
+    if not archivo:
+        return [equipo["id"] for equipo in equipos]
+
+    por_nombre = {equipo["nombre"].strip().lower(): equipo["id"] for equipo in equipos}
+    ids_validos = {equipo["id"] for equipo in equipos}
+    ids = []
+    with open(archivo, encoding="utf-8") as f:
+        for numero, linea in enumerate(f, start=1):
+            texto = linea.strip()
+            if not texto or texto.startswith("#"):
+                continue
+            if texto.isdigit() and int(texto) in ids_validos:
+                ids.append(int(texto))
+            elif texto.lower() in por_nombre:
+                ids.append(por_nombre[texto.lower()])
+            else:
+                raise ValueError(f"Línea {numero}: no existe el equipo '{texto}'")
+    if len(set(ids)) != len(ids):
+        raise ValueError("La lista de equipos tiene equipos repetidos")
+    return ids
+
+
+def _crear_cuadro(args) -> int:
+    from app.core.headless import iniciar
+    from app.services.tournament_service import TournamentService
+    from app.services.group_service import get_group_service
+
+    iniciar()
+    if _es_archivo():
+        return 1
+    try:
+        equipos = _leer_equipos(args.equipos)
+        if args.grupos:
+            grupos = get_group_service().generar_grupos(equipos, args.grupos, sembrado=args.sembrado,
+                                                        ronda=args.clasificados_a)
+            partidos = sum(len(grupo["partidos"]) for grupo in grupos)
+            print(f"{len(grupos)} grupos con {len(equipos)} equipos y {partidos} partidos")
+        else:
+            existentes = TournamentService.partidos_tras_octavos()
+            if (existentes or TournamentService.octavos_already_exist()) and not args.reemplazar:
+                rondas = "octavos y rondas siguientes" if existentes else "octavos"
+                print(f"El cuadro ya tiene {rondas}: use --reemplazar para borrarlos "
+                      f"(con sus resultados) y crear los octavos de nuevo", file=sys.stderr)
+                return 1
+            TournamentService.randomize_and_create_octavos(equipos, sembrado=args.sembrado)
+            print(f"Octavos creados con {len(equipos)} equipos")
+    except (OSError, ValueError) as e:
+        print(f"No se puede crear el cuadro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+# ----------------------------------------------------------------------
+# importar-resultados
+# ----------------------------------------------------------------------
+
+def _entero(valor: Optional[str]) -> Optional[int]:
+    """Convierte una celda del CSV en entero (vacía = None)."""
+    valor = (valor or "").strip()
+    return int(valor) if valor else None
+
+
+def _abrir_csv(archivo: str):
+    """Abre el CSV detectando el separador (coma, punto y coma o tabulador)."""
+    f = open(archivo, encoding="utf-8-sig", newline="")
+    muestra = f.read(4096)
+    f.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    return f, csv.DictReader(f, dialect=dialecto)
+
+
+def _indice_partidos() -> tuple[dict[tuple[str, int], int], set[int], dict[int, int]]:
+    """
+    Índice de los partidos para resolver las filas del CSV.
+
+    Returns:
+        Tupla ({(eliminatoria, slot): partido_id}, IDs de los partidos que
+        ya tienen los dos equipos, {partido_id: ID del partido al que pasa
+        su ganador, si ya existe})
+    """
+    from app.models.match_model import MatchModel
+    from app.services.tournament_service import TournamentService
+
+    rondas = TournamentService.RONDAS
+    partidos = MatchModel.listar_partidos()
+    por_clave = {(p["eliminatoria"], p["slot"]): p["id"] for p in partidos}
+    completos = {p["id"] for p in partidos if p["local_id"] and p["visitante_id"]}
+    destinos = {}
+    for p in partidos:
+        if p["eliminatoria"] in rondas[:-1]:
+            siguiente_slot, _ = TournamentService._calcular_siguiente_partido(p["eliminatoria"], p["slot"])
+            siguiente = por_clave.get((rondas[rondas.index(p["eliminatoria"]) + 1], siguiente_slot))
+            if siguiente:
+                destinos[p["id"]] = siguiente
+    return por_clave, completos, destinos
+
+
+def _importar_resultados(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.services.tournament_service import TournamentService
+
+    iniciar()
+    if _es_archivo():
+        return 1
+    inicio = time.perf_counter()
+    por_clave, completos, destinos = _indice_partidos()
+    lote: list[dict] = []
+    # Partidos a los que pasan los ganadores del lote pendiente
+    pendientes: set[int] = set()
+    guardados = errores = 0
+
+    def guardar_lote() -> None:
+        """Guarda el lote pendiente; los partidos que cree la propagación pasan al índice."""
+        nonlocal guardados, errores, por_clave, completos, destinos
+        if not lote:
+            return
+        try:
+            guardados += len(TournamentService.guardar_resultados(lote))
+        except (ValueError, DbError) as e:
+            errores += len(lote)
+            print(f"  Lote de {len(lote)} resultados descartado: {e}", file=sys.stderr)
+        lote.clear()
+        pendientes.clear()
+        por_clave, completos, destinos = _indice_partidos()
+
+    def resolver(fila: dict) -> Optional[int]:
+        partido_id = _entero(fila.get("partido_id"))
+        if partido_id is not None:
+            return partido_id
+        clave = ((fila.get("eliminatoria") or "").strip().lower(), _entero(fila.get("slot")))
+        return por_clave.get(clave)
+
+    try:
+        f, lector = _abrir_csv(args.archivo)
+    except OSError as e:
+        print(f"No se puede leer {args.archivo}: {e}", file=sys.stderr)
+        return 1
+
+    with f:
+        # La fila 1 es la cabecera
+        for numero, fila in enumerate(lector, start=2):
+            try:
+                partido_id = resolver(fila)
+                # Los equipos de un partido de la ronda siguiente salen de los
+                # ganadores del lote pendiente: hasta guardarlo y propagarlos,
+                # el partido no existe, le falta un equipo o tiene los de antes
+                if partido_id not in completos or partido_id in pendientes:
+                    guardar_lote()
+                    partido_id = resolver(fila)
+                if partido_id is None:
+                    raise ValueError("no existe el partido")
+                if partido_id not in completos:
+                    raise ValueError(f"el partido {partido_id} aún no tiene los dos equipos")
+                resultado = {
+                    "partido_id": partido_id,
+                    "goles_local": _entero(fila.get("goles_local")),
+                    "goles_visitante": _entero(fila.get("goles_visitante")),
+                    "penaltis_local": _entero(fila.get("penaltis_local")),
+                    "penaltis_visitante": _entero(fila.get("penaltis_visitante")),
+                }
+                if resultado["goles_local"] is None or resultado["goles_visitante"] is None:
+                    raise ValueError("faltan los goles")
+                if min(v for v in resultado.values() if v is not None) < 0:
+                    raise ValueError("valores negativos")
+                TournamentService.validar_resultado(resultado)
+            except ValueError as e:
+                errores += 1
+                print(f"  Línea {numero}: {e}", file=sys.stderr)
+                continue
+
+            lote.append(resultado)
+            if partido_id in destinos:
+                pendientes.add(destinos[partido_id])
+            if len(lote) >= args.lote:
+                guardar_lote()
+        guardar_lote()
+
+    print(f"{guardados} resultados guardados, {errores} con errores "
+          f"({time.perf_counter() - inicio:.2f} s)")
+    return 1 if errores else 0
+
+
+# ----------------------------------------------------------------------
+# propagar y reconstruir
+# ----------------------------------------------------------------------
+
+def _propagar(args) -> int:
+    from app.core.headless import iniciar
+    from app.services.tournament_service import TournamentService
+    from app.services.group_service import get_group_service
+
+    iniciar()
+    if _es_archivo():
+        return 1
+    grupos = get_group_service()
+    if grupos.fase_completa() and not TournamentService.obtener_partidos_cuadro():
+        grupos.promocionar()
+        print(f"Fase de grupos completa: {grupos.ronda_clasificados()} creados con los clasificados")
+    propagados = TournamentService.propagar_ganadores()
+    print(f"{propagados} ganadores propagados")
+    return 0
+
+
+def _reconstruir(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.participant_model import ParticipantModel
+    from app.services.rating_service import get_rating_service
+    from app.services.referee_service import get_referee_service
+    from app.services.eligibility_service import get_eligibility_service
+    from app.services.group_service import get_group_service
+    from app.services.leaderboard_service import get_leaderboard_service
+
+    # Cada servicio se reconstruye explícitamente; no hace falta que escuchen el bus
+    iniciar(conectar_servicios=False)
+    if _es_archivo():
+        return 1
+    pasos = [
+        ("Acumulados de participantes", ParticipantModel.recalcular_acumulados),
+        ("Ratings", get_rating_service().reconstruir),
+        ("Disponibilidad de árbitros", get_referee_service().reconstruir),
+        ("Sanciones", get_eligibility_service().reconstruir),
+        ("Clasificación de grupos", get_group_service().recalcular),
+        ("Goleadores y tarjetas", get_leaderboard_service().reconstruir),
+        ("Instantánea de clasificaciones", get_leaderboard_service().guardar_snapshot),
+    ]
+    inicio = time.perf_counter()
+    for nombre, paso in pasos:
+        inicio_paso = time.perf_counter()
+        paso()
+        print(f"  {nombre} ({time.perf_counter() - inicio_paso:.2f} s)")
+    print(f"Reconstrucción completa en {time.perf_counter() - inicio:.2f} s")
+    return 0
+
+
+# ----------------------------------------------------------------------
+# informes y exportar (en paralelo)
+# ----------------------------------------------------------------------
+
+def _generar_informe(nombre: str, directorio: Optional[str]) -> str:
+    """Genera un informe (se ejecuta en un proceso de --jobs)."""
+    from app.services.report_service import ReportService
+
+    salida = None
+    if directorio:
+        salida = str(Path(directorio) / f"{nombre}_{time.strftime('%Y%m%d_%H%M%S')}.pdf")
+    return getattr(ReportService, INFORMES[nombre])(output_path=salida)
+
+
+def _exportar_tabla(tabla: str, directorio: str, formato: str) -> tuple[str, int]:
+    """Exporta una tabla leyéndola por bloques (se ejecuta en un proceso de --jobs)."""
+    from app.models.db import get_connection
+
+    destino = Path(directorio) / f"{tabla}.{formato}"
+    filas = 0
+    conn = get_connection()
+    try:
+        # El nombre viene de sqlite_master; se cita por si tiene caracteres especiales
+        cursor = conn.execute(f'SELECT * FROM "{tabla}"')
+        columnas = [d[0] for d in cursor.description]
+        with open(destino, "w", encoding="utf-8", newline="") as f:
+            if formato == "csv":
+                escritor = csv.writer(f)
+                escritor.writerow(columnas)
+            else:
+                f.write("[")
+            while bloque := cursor.fetchmany(FILAS_POR_LECTURA):
+                if formato == "csv":
+                    escritor.writerows(tuple(fila) for fila in bloque)
+                else:
+                    f.write("".join(
+                        ("\n" if filas + i == 0 else ",\n") + json.dumps(dict(zip(columnas, fila)), ensure_ascii=False)
+                        for i, fila in enumerate(bloque)
+                    ))
+                filas += len(bloque)
+            if formato == "json":
+                f.write("\n]\n")
+    finally:
+        conn.close()
+    return str(destino), filas
+
+
+def _ejecutar(tareas: list[tuple], jobs: int) -> tuple[list, list]:
+    """
+    Ejecuta tareas (función, *argumentos) en serie o en varios procesos.
+
+    Returns:
+        Tupla (resultados, errores) con los resultados de las tareas
+        correctas y los mensajes de las que fallaron
+    """
+    resultados, errores = [], []
+    if jobs <= 1:
+        for funcion, *argumentos in tareas:
+            try:
+                resultados.append(funcion(*argumentos))
+            except Exception as e:
+                errores.append(f"{argumentos[0]}: {e}")
+        return resultados, errores
+
+    with ProcessPoolExecutor(max_workers=jobs) as ejecutor:
+        futuros = {ejecutor.submit(funcion, *argumentos): argumentos[0] for funcion, *argumentos in tareas}
+        for futuro in as_completed(futuros):
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                errores.append(f"{futuros[futuro]}: {e}")
+    return resultados, errores
+
+
+def _informes(args) -> int:
+    from app.core.headless import iniciar
+
+    iniciar(conectar_servicios=False)
+    if args.salida:
+        Path(args.salida).mkdir(parents=True, exist_ok=True)
+    nombres = args.tipo or list(INFORMES)
+    inicio = time.perf_counter()
+    rutas, errores = _ejecutar([(_generar_informe, nombre, args.salida) for nombre in nombres], args.jobs)
+    for ruta in rutas:
+        print(f"  {ruta}")
+    for error in errores:
+        print(f"  Error en el informe {error}", file=sys.stderr)
+    print(f"{len(rutas)} informes en {time.perf_counter() - inicio:.2f} s")
+    return 1 if errores else 0
+
+
+def _exportar(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import get_connection
+
+    iniciar(conectar_servicios=False)
+    conn = get_connection()
+    try:
+        tablas = [fila[0] for fila in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )]
+    finally:
+        conn.close()
+    if args.tablas:
+        desconocidas = set(args.tablas) - set(tablas)
+        if desconocidas:
+            print(f"Tablas desconocidas: {', '.join(sorted(desconocidas))}", file=sys.stderr)
+            return 1
+        tablas = args.tablas
+
+    Path(args.directorio).mkdir(parents=True, exist_ok=True)
+    inicio = time.perf_counter()
+    exportadas, errores = _ejecutar(
+        [(_exportar_tabla, tabla, args.directorio, args.formato) for tabla in tablas], args.jobs
+    )
+    for destino, filas in sorted(exportadas):
+        print(f"  {destino}: {filas} filas")
+    for error in errores:
+        print(f"  Error al exportar {error}", file=sys.stderr)
+    print(f"{len(exportadas)} tablas exportadas en {time.perf_counter() - inicio:.2f} s")
+    return 1 if errores else 0
+
+
+# ----------------------------------------------------------------------
+# servir
+# ----------------------------------------------------------------------
+
+def _servir(args) -> int:
+    import asyncio
+    from app.config import API_HOST, API_PUERTO
+    from app.core.headless import iniciar
+    from app.core.api_server import ServidorApi
+
+    iniciar(conectar_servicios=False)
+    servidor = ServidorApi(args.host or API_HOST, API_PUERTO if args.puerto is None else args.puerto)
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"No se puede abrir el puerto: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+# ----------------------------------------------------------------------
+# copias de seguridad
+# ----------------------------------------------------------------------
+
+def _ruta_copia(nombre: str) -> Path:
+    """Ruta de una copia: tal cual si existe o, si no, dentro del directorio de copias."""
+    from app.config import COPIAS_DIR
+
+    ruta = Path(nombre)
+    return ruta if ruta.exists() else COPIAS_DIR / nombre
+
+
+def _copia(args) -> int:
+    from app.models.db import DbError
+    from app.services.backup_service import get_backup_service
+
+    try:
+        ruta = get_backup_service().crear_copia(args.motivo)
+    except DbError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(ruta)
+    return 0
+
+
+def _copias(args) -> int:
+    from app.services.backup_service import get_backup_service
+
+    for copia in get_backup_service().listar_copias():
+        print(f"{copia['ruta'].name}  {copia['fecha']:%Y-%m-%d %H:%M:%S}  {copia['motivo']:<20} "
+              f"{copia['tamano'] // 1024:>6} KB  diario hasta {copia['secuencia']}")
+    return 0
+
+
+def _diferencias(args) -> int:
+    from app.models.db import DbError
+    from app.services.backup_service import get_backup_service
+
+    try:
+        diferencias = get_backup_service().diferencias(_ruta_copia(args.copia))
+    except DbError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if not diferencias:
+        print("Sin diferencias")
+    for tabla, cuentas in diferencias.items():
+        print(f"{tabla:<16} +{cuentas['añadidas']} -{cuentas['borradas']} ~{cuentas['modificadas']}")
+    return 0
+
+
+def _restaurar(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.services.backup_service import get_backup_service
+
+    iniciar(conectar_servicios=False)
+    if _es_archivo():
+        return 1
+    try:
+        anterior = get_backup_service().restaurar(_ruta_copia(args.copia))
+    except DbError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Copia restaurada; el estado anterior está en {anterior}")
+    return 0
+
+
+# ----------------------------------------------------------------------
+# dispositivo, exportar-cambios, importar-cambios
+# ----------------------------------------------------------------------
+
+def _dispositivo(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.models.sync_model import SyncModel
+    from app.services.sync_service import get_sync_service
+
+    iniciar(conectar_servicios=False)
+    if _es_archivo():
+        return 1
+    try:
+        dispositivo = get_sync_service().dispositivo(nombre=args.nombre, nuevo=args.nuevo)
+        pares = SyncModel.listar_pares()
+    except DbError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{dispositivo['nombre']}  {dispositivo['id']}")
+    for par in pares:
+        print(f"  {par['nombre']:<20} {par['dispositivo_id']}  última sincronización {par['fecha']}  "
+              f"enviado hasta {par['enviado_hasta']}, recibido hasta {par['recibido_hasta']}")
+    return 0
+
+
+def _exportar_cambios(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.services.sync_service import get_sync_service
+
+    iniciar(conectar_servicios=False)
+    servicio = get_sync_service()
+    try:
+        conjunto = servicio.exportar(servicio.resolver_par(args.para) if args.para else None)
+        tamano = servicio.guardar(conjunto, Path(args.archivo))
+    except (ValueError, DbError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{len(conjunto['partidos'])} partidos en {args.archivo} ({tamano} bytes)")
+    return 0
+
+
+def _importar_cambios(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.services.sync_service import get_sync_service
+
+    iniciar()
+    if _es_archivo():
+        return 1
+    servicio = get_sync_service()
+    try:
+        informe = servicio.importar(servicio.leer(Path(args.archivo)), args.preferir)
+    except (ValueError, DbError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Aplicados: {len(informe['aplicados'])}  iguales: {informe['iguales']}  "
+          f"conservados: {informe['conservados']}")
+    for omitido in informe['omitidos']:
+        print(f"  Omitido {omitido['partido']}: {omitido['motivo']}")
+    for conflicto in informe['conflictos']:
+        print(f"  Conflicto {conflicto['partido']}:\n    local:  {conflicto['local']}\n"
+              f"    remoto: {conflicto['remoto']}")
+    if informe['conflictos']:
+        print(f"{len(informe['conflictos'])} conflictos sin aplicar; vuelva a importar con "
+              f"--preferir local o --preferir remoto para resolverlos", file=sys.stderr)
+        return 1
+    return 0
+
+
+# ----------------------------------------------------------------------
+# torneos, archivar
+# ----------------------------------------------------------------------
+
+def _torneos(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.services.archive_service import get_archive_service
+
+    iniciar(conectar_servicios=False)
+    try:
+        torneos = get_archive_service().listar()
+    except DbError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for torneo in torneos:
+        if torneo['estado'] == "activo":
+            print(f"{torneo['id']:>3}  {torneo['nombre']:<24} activo desde {torneo['inicio']}")
+            continue
+        archivo = torneo['archivo'] if torneo['disponible'] else f"{torneo['archivo']} (no encontrado)"
+        print(f"{torneo['id']:>3}  {torneo['nombre']:<24} archivado el {torneo['fin']}  "
+              f"{torneo['partidos']} partidos, campeón: {torneo['campeon'] or '-'}\n       {archivo}")
+    return 0
+
+
+def _archivar(args) -> int:
+    from app.core.headless import iniciar
+    from app.models.db import DbError
+    from app.services.archive_service import get_archive_service
+
+    iniciar()
+    if _es_archivo():
+        return 1
+    try:
+        torneos = get_archive_service().archivar(args.nombre)
+    except (ValueError, DbError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{torneos['archivado']['nombre']} archivado en {torneos['archivado']['archivo']}")
+    print(f"Torneo activo: {torneos['activo']['nombre']}")
+    return 0
+
+
+# ----------------------------------------------------------------------
+# Entrada
+# ----------------------------------------------------------------------
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construye el analizador de argumentos con todos los subcomandos."""
+    # Solo constantes: no lee la configuración, así que puede ir antes de --db
+    from app.constants import EQUIPOS_RONDA, FASE_OCTAVOS
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Operaciones masivas sobre el torneo sin abrir la interfaz"
+    )
+    parser.add_argument("--db", help="Base de datos a usar (por defecto, data/torneo.db)")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    p = subcomandos.add_parser("crear-cuadro", help="Crear los octavos o la fase de grupos")
+    p.add_argument("--equipos", help="Archivo con un nombre o ID de equipo por línea (por defecto, todos)")
+    p.add_argument("--sembrado", action="store_true", help="Cabezas de serie según el rating")
+    p.add_argument("--grupos", type=int, help="Crear una fase de grupos con este número de grupos")
+    p.add_argument("--clasificados-a", choices=list(EQUIPOS_RONDA), default=FASE_OCTAVOS,
+                   help="Ronda del cuadro en la que entran los clasificados de los grupos "
+                        "(por defecto, octavos)")
+    p.add_argument("--reemplazar", action="store_true",
+                   help="Borrar los octavos y las rondas siguientes que ya existan (con sus resultados)")
+    p.set_defaults(func=_crear_cuadro)
+
+    p = subcomandos.add_parser(
+        "importar-resultados", help="Guardar resultados desde un CSV",
+        description="Columnas: partido_id o eliminatoria y slot; goles_local, goles_visitante "
+                    "y, opcionalmente, penaltis_local y penaltis_visitante. Como al guardar desde "
+                    "el partido, cada uno necesita árbitro y convocados de los dos equipos, y un "
+                    "empate en eliminatoria, un ganador en los penaltis."
+    )
+    p.add_argument("archivo", help="CSV con cabecera (separado por comas, punto y coma o tabuladores)")
+    p.add_argument("--lote", type=int, default=LOTE_POR_DEFECTO,
+                   help=f"Resultados por transacción (por defecto {LOTE_POR_DEFECTO})")
+    p.set_defaults(func=_importar_resultados)
+
+    p = subcomandos.add_parser("propagar", help="Avanzar todos los ganadores a la siguiente ronda")
+    p.set_defaults(func=_propagar)
+
+    p = subcomandos.add_parser("reconstruir", help="Recalcular todos los datos derivados")
+    p.set_defaults(func=_reconstruir)
+
+    p = subcomandos.add_parser("informes", help="Generar los informes PDF")
+    p.add_argument("--tipo", action="append", choices=list(INFORMES),
+                   help="Informe a generar (se puede repetir; por defecto, todos)")
+    p.add_argument("--salida", help="Directorio de salida (por defecto, reports/generated)")
+    p.add_argument("--jobs", type=int, default=1, help="Procesos en paralelo")
+    p.set_defaults(func=_informes)
+
+    p = subcomandos.add_parser("exportar", help="Exportar las tablas de la base de datos")
+    p.add_argument("directorio", help="Directorio de salida")
+    p.add_argument("--formato", choices=["csv", "json"], default="csv")
+    p.add_argument("--tablas", nargs="+", help="Tablas a exportar (por defecto, todas)")
+    p.add_argument("--jobs", type=int, default=1, help="Procesos en paralelo")
+    p.set_defaults(func=_exportar)
+
+    p = subcomandos.add_parser("servir", help="Servir la API HTTP/JSON de solo lectura")
+    p.add_argument("--host", help="Dirección en la que escuchar (por defecto, toda la red local)")
+    p.add_argument("--puerto", type=int, help="Puerto TCP (por defecto 8765)")
+    p.set_defaults(func=_servir)
+
+    p = subcomandos.add_parser("copia", help="Crear una copia de seguridad en caliente")
+    p.add_argument("--motivo", default="manual", help="Palabra que se añade al nombre de la copia")
+    p.set_defaults(func=_copia)
+
+    p = subcomandos.add_parser("copias", help="Listar las copias de seguridad (la más reciente primero)")
+    p.set_defaults(func=_copias)
+
+    p = subcomandos.add_parser("diferencias", help="Comparar una copia con la base de datos actual")
+    p.add_argument("copia", help="Archivo de la copia (ruta o nombre dentro de data/copias)")
+    p.set_defaults(func=_diferencias)
+
+    p = subcomandos.add_parser("restaurar", help="Sustituir la base de datos por una copia")
+    p.add_argument("copia", help="Archivo de la copia (ruta o nombre dentro de data/copias)")
+    p.set_defaults(func=_restaurar)
+
+    p = subcomandos.add_parser("dispositivo", help="Mostrar la identidad de esta copia y sus sincronizaciones")
+    p.add_argument("--nombre", help="Cambiar el nombre con el que lo ven los demás dispositivos")
+    p.add_argument("--nuevo", action="store_true",
+                   help="Generar un identificador nuevo (para una copia duplicada de otro dispositivo)")
+    p.set_defaults(func=_dispositivo)
+
+    p = subcomandos.add_parser("exportar-cambios", help="Escribir los cambios pendientes para otro dispositivo")
+    p.add_argument("archivo", help="Archivo de salida (JSON; comprimido si termina en .gz)")
+    p.add_argument("--para", help="Nombre o ID del dispositivo destino (sin él, todos los partidos con datos)")
+    p.set_defaults(func=_exportar_cambios)
+
+    p = subcomandos.add_parser("importar-cambios", help="Fusionar los cambios de otro dispositivo")
+    p.add_argument("archivo", help="Archivo creado con exportar-cambios en el otro dispositivo")
+    p.add_argument("--preferir", choices=["local", "remoto"],
+                   help="Qué datos se quedan cuando los dos dispositivos han cambiado el mismo partido")
+    p.set_defaults(func=_importar_cambios)
+
+    p = subcomandos.add_parser("torneos", help="Listar el torneo activo y los archivados")
+    p.set_defaults(func=_torneos)
+
+    p = subcomandos.add_parser("archivar", help="Archivar el torneo activo y empezar otro")
+    p.add_argument("--nombre", help="Nombre del torneo que empieza (por defecto, \"Torneo <año>\")")
+    p.set_defaults(func=_archivar)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Ejecuta el subcomando indicado y devuelve el código de salida."""
+    args = crear_parser().parse_args(argv)
+    if args.db:
+        os.environ["TORNEO_DB"] = str(Path(args.db).resolve())
+    if getattr(args, "lote", 1) < 1 or getattr(args, "jobs", 1) < 1:
+        print("--lote y --jobs deben ser al menos 1", file=sys.stderr)
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
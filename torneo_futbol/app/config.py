@@ -1,7 +1,6 @@
 """Configuración de la aplicación."""
 import os
 import sys
-import shutil
 from pathlib import Path
 
 # Rutas base
@@ -10,24 +9,16 @@ if getattr(sys, 'frozen', False):
     # sys._MEIPASS es el directorio temporal donde PyInstaller desempaqueta los archivos
     BASE_DIR = Path(sys._MEIPASS)
     # DATA_DIR debe estar donde está el .exe para persistencia
+    # (los datos empaquetados se copian al arrancar con sincronizar_datos_empaquetados)
     DATA_DIR = Path(sys.executable).parent / "data"
-    # Copiar datos empaquetados como semilla junto al .exe
-    _bundled_data = BASE_DIR / "data"
-    if _bundled_data.exists():
-        DATA_DIR.mkdir(exist_ok=True)
-        for _f in _bundled_data.iterdir():
-            _dest = DATA_DIR / _f.name
-            if _f.is_file():
-                # Copiar si no existe, o si el empaquetado es mayor (destino vacío/corrupto)
-                if not _dest.exists() or _f.stat().st_size > _dest.stat().st_size:
-                    shutil.copy2(_f, _dest)
-            elif _f.is_dir() and not _dest.exists():
-                shutil.copytree(_f, _dest)
 else:
     # Estamos en desarrollo
     BASE_DIR = Path(__file__).resolve().parent.parent
     DATA_DIR = BASE_DIR / "data"
 
+# Datos empaquetados como semilla (solo existen en el ejecutable)
+BUNDLED_DATA_DIR = BASE_DIR / "data"
+
 RESOURCES_DIR = BASE_DIR / "app" / "resources"
 STYLES_DIR = RESOURCES_DIR / "styles"
 
@@ -38,7 +29,29 @@ TRANSLATIONS_DIR = BASE_DIR / "translations"
 
 # Base de datos
 DB_NAME = "torneo.db"
-DB_PATH = DATA_DIR / DB_NAME
+# TORNEO_DB permite usar otra base de datos (línea de comandos, pruebas)
+DB_PATH = Path(os.environ["TORNEO_DB"]) if os.environ.get("TORNEO_DB") else DATA_DIR / DB_NAME
+
+# Instantánea de las clasificaciones (goleadores, tarjetas) para pantallas externas,
+# junto a la base de datos de la que sale
+CLASIFICACIONES_NAME = "clasificaciones.json"
+CLASIFICACIONES_PATH = DB_PATH.parent / CLASIFICACIONES_NAME
+
+# Copias de seguridad de la base de datos (app.services.backup_service)
+COPIAS_DIR = DB_PATH.parent / "copias"
+
+# Minutos entre dos copias automáticas desde la interfaz (solo si hay cambios; 0 = desactivadas)
+INTERVALO_COPIAS_MIN = int(os.environ.get("TORNEO_INTERVALO_COPIAS", "15"))
+
+# Torneos archivados, cada uno en su archivo de solo lectura (app.services.archive_service)
+TORNEOS_DIR = DB_PATH.parent / "torneos"
+
+# Milisegundos entre dos comprobaciones de cambios hechos por otras instancias (0 = no se comprueban)
+INTERVALO_CAMBIOS_EXTERNOS_MS = int(os.environ.get("TORNEO_INTERVALO_CAMBIOS_MS", "1000"))
+
+# API HTTP de solo lectura para pantallas de la red local (python -m app.cli servir)
+API_HOST = os.environ.get("TORNEO_API_HOST", "0.0.0.0")
+API_PUERTO = int(os.environ.get("TORNEO_API_PUERTO", "8765"))
 
 # Tema por defecto
 DEFAULT_THEME = "light"
@@ -50,6 +63,18 @@ AVAILABLE_LANGUAGES = {
     "en": "English"
 }
 
+# Diagnóstico: trazado de consultas SQL (activar con TORNEO_SQL_TRACE=1)
+SQL_TRACE_ENABLED = os.environ.get("TORNEO_SQL_TRACE", "") == "1"
+
+# Diagnóstico: perfilado de slots y bloqueos de la interfaz (TORNEO_DIAGNOSTICO=1)
+UI_PROFILE_ENABLED = os.environ.get("TORNEO_DIAGNOSTICO", "") == "1"
+
+# Diagnóstico: archivo donde se acumulan las mediciones de cada arranque (opcional)
+STARTUP_LOG_PATH = os.environ.get("TORNEO_ARRANQUE_LOG", "")
+
+# Diagnóstico: tiempo de importación de cada módulo (TORNEO_PERFIL_IMPORTS=1)
+IMPORT_PROFILE_ENABLED = os.environ.get("TORNEO_PERFIL_IMPORTS", "") == "1"
+
 # Versión de la aplicación
 VERSION = "1.1.0"
 
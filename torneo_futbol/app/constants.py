@@ -35,6 +35,7 @@ PAGE_NAMES = {
 }
 
 # Fases del torneo (para calendario y bracket)
+FASE_GRUPOS = "grupos"
 FASE_OCTAVOS = "octavos"
 FASE_CUARTOS = "cuartos"
 FASE_SEMIFINAL = "semifinal"
@@ -42,6 +43,7 @@ FASE_FINAL = "final"
 
 # Configuración de fases
 FASES_CONFIG = {
+    FASE_GRUPOS: {"label": "Grupos", "required": 0, "prev": None},
     FASE_OCTAVOS: {"label": "Octavos", "required": 8, "prev": None},
     FASE_CUARTOS: {"label": "Cuartos", "required": 4, "prev": FASE_OCTAVOS},
     FASE_SEMIFINAL: {"label": "Semifinal", "required": 2, "prev": FASE_CUARTOS},
@@ -49,7 +51,23 @@ FASES_CONFIG = {
 }
 
 # Orden de fases para combo
-FASES_ORDEN = [FASE_OCTAVOS, FASE_CUARTOS, FASE_SEMIFINAL, FASE_FINAL]
+FASES_ORDEN = [FASE_GRUPOS, FASE_OCTAVOS, FASE_CUARTOS, FASE_SEMIFINAL, FASE_FINAL]
+
+# Programación de partidos
+DURACION_PARTIDO_MIN = 90  # Duración de un partido (incluye descanso y cambio de campo)
+HORARIOS_PARTIDO = ["16:00", "18:00"]  # Horas de inicio disponibles cada día
+DESCANSO_MINIMO_HORAS = 20  # Descanso mínimo de un equipo entre dos rondas
+
+# Fase de grupos (liga a una vuelta antes del cuadro)
+PUNTOS_VICTORIA = 3
+PUNTOS_EMPATE = 1
+EQUIPOS_OCTAVOS = 16  # Equipos del cuadro completo
+# Clasificados de todos los grupos según la ronda del cuadro en la que entran
+EQUIPOS_RONDA = {FASE_OCTAVOS: 16, FASE_CUARTOS: 8, FASE_SEMIFINAL: 4}
+
+# Sanciones
+AMARILLAS_POR_SANCION = 2  # Amarillas acumuladas que suponen un partido de sanción
+PARTIDOS_SANCION_ROJA = 1  # Partidos de sanción por una tarjeta roja
 
 # Temas disponibles
 THEME_LIGHT = "light"
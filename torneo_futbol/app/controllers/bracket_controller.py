@@ -1,11 +1,13 @@
 """
 Controlador para el cuadro de eliminatorias.
 """
-from PySide6.QtWidgets import QMessageBox
+from PySide6.QtWidgets import QMessageBox, QInputDialog
 from app.models.team_model import TeamModel
 from app.models.match_model import MatchModel
 from app.services.tournament_service import TournamentService
+from app.services.group_service import get_group_service
 from app.services.event_bus import EventBus
+from app.constants import FASES_CONFIG
 
 
 class ControladorCuadroEliminatorias:
@@ -64,6 +66,12 @@ class ControladorCuadroEliminatorias:
         except Exception as e:
             print(f"[BRACKET CONTROLLER] ❌ Error conectando randomizar: {e}")
         
+        try:
+            if hasattr(self.vista, 'sembrar_octavos_signal'):
+                self.vista.sembrar_octavos_signal.connect(lambda: self._on_randomizar(sembrado=True))
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] Error conectando sembrar: {e}")
+        
         try:
             if hasattr(self.vista, 'guardar_emparejamientos_signal'):
                 self.vista.guardar_emparejamientos_signal.connect(self._on_guardar_emparejamientos)
@@ -85,6 +93,22 @@ class ControladorCuadroEliminatorias:
         except Exception as e:
             print(f"[BRACKET CONTROLLER] ❌ Error conectando exportar_csv: {e}")
         
+        # Conectar señal de probabilidades
+        try:
+            if hasattr(self.vista, 'simular_probabilidades_signal'):
+                self.vista.simular_probabilidades_signal.connect(self._on_simular_probabilidades)
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] ❌ Error conectando simular_probabilidades: {e}")
+        
+        # Conectar señales de la fase de grupos
+        try:
+            if hasattr(self.vista, 'generar_grupos_signal'):
+                self.vista.generar_grupos_signal.connect(self._on_generar_grupos)
+            if hasattr(self.vista, 'ver_grupos_signal'):
+                self.vista.ver_grupos_signal.connect(self._on_ver_grupos)
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] ❌ Error conectando fase de grupos: {e}")
+        
         # Conectar señal de reiniciar torneo
         try:
             if hasattr(self.vista, 'reiniciar_torneo_signal'):
@@ -315,8 +339,13 @@ class ControladorCuadroEliminatorias:
         equipo = next((e for e in equipos if e['id'] == equipo_id), None)
         return equipo['nombre'] if equipo else None
     
-    def _on_randomizar(self):
-        """Maneja la acción de randomizar emparejamientos con persistencia en BD."""
+    def _on_randomizar(self, sembrado: bool = False):
+        """
+        Maneja la acción de randomizar emparejamientos con persistencia en BD.
+        
+        Args:
+            sembrado: Si True, empareja por cabezas de serie según el rating
+        """
         print("\n" + "="*60)
         print("[BRACKET CONTROLLER] _on_randomizar INICIADO")
         print("="*60)
@@ -340,9 +369,10 @@ class ControladorCuadroEliminatorias:
                 self.vista,
                 "Octavos ya existentes",
                 "Los octavos ya están creados.\n\n"
-                "Si continúas, se eliminarán los partidos de octavos existentes "
-                "(incluidos convocatorias y resultados) y se generarán nuevos emparejamientos aleatorios.\n\n"
-                "⚠️ Esta acción NO se puede deshacer.\n\n"
+                "Si continúas, se eliminarán los partidos de octavos existentes y los de las "
+                "rondas siguientes (incluidos convocatorias y resultados) y se generarán "
+                "nuevos emparejamientos aleatorios.\n\n"
+                "Se puede deshacer desde Editar > Deshacer.\n\n"
                 "¿Deseas regenerar los octavos?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
@@ -358,7 +388,8 @@ class ControladorCuadroEliminatorias:
         respuesta = QMessageBox.question(
             self.vista,
             "Confirmar randomización",
-            "Se generarán los 8 partidos de octavos con emparejamientos aleatorios "
+            f"Se generarán los 8 partidos de octavos con emparejamientos "
+            f"{'por ranking (cabezas de serie)' if sembrado else 'aleatorios'} "
             "y fechas automáticas.\n\n"
             "Los partidos aparecerán en Calendario/Partidos.\n\n"
             "¿Deseas continuar?",
@@ -377,7 +408,7 @@ class ControladorCuadroEliminatorias:
             
             # 5. Randomizar Y crear partidos en BD con fechas automáticas
             print("[DEBUG] Llamando a TournamentService.randomize_and_create_octavos...")
-            TournamentService.randomize_and_create_octavos(equipos_ids)
+            TournamentService.randomize_and_create_octavos(equipos_ids, sembrado=sembrado)
             print("[DEBUG] ✅ randomize_and_create_octavos completado")
             
             # 6. VERIFICACIÓN POST-CREACIÓN
@@ -447,6 +478,113 @@ class ControladorCuadroEliminatorias:
                 f"Error inesperado al crear octavos:\n\n{str(e)}"
             )
     
+    def _on_generar_grupos(self):
+        """Reparte todos los equipos en grupos de liga y crea sus partidos."""
+        num_equipos = len(self.equipos_list)
+        
+        # Repartos posibles: los clasificados entran en octavos, cuartos o semifinales
+        opciones = {}
+        for ronda, num_grupos, clasificados in get_group_service().repartos_posibles(num_equipos):
+            texto = (f"{num_grupos} grupos (pasan {clasificados} de cada grupo "
+                     f"a {FASES_CONFIG[ronda]['label'].lower()})")
+            opciones[texto] = (num_grupos, ronda)
+        
+        if not opciones:
+            QMessageBox.warning(
+                self.vista,
+                "Equipos insuficientes",
+                f"Hay {num_equipos} equipos. Para jugar una fase de grupos antes del cuadro "
+                "se necesitan al menos 5 equipos (1 grupo de 5, pasan 4 a semifinales)."
+            )
+            return
+        
+        texto, ok = QInputDialog.getItem(
+            self.vista,
+            "Fase de grupos",
+            f"Se repartirán los {num_equipos} equipos por bombos según su rating\n"
+            "y se creará una liga a una vuelta en cada grupo.\n\n"
+            "Número de grupos:",
+            list(opciones), len(opciones) - 1, False
+        )
+        if not ok:
+            return
+        
+        try:
+            num_grupos, ronda = opciones[texto]
+            grupos = get_group_service().generar_grupos(
+                [eq["id"] for eq in self.equipos_list], num_grupos, ronda=ronda
+            )
+        except ValueError as e:
+            QMessageBox.warning(self.vista, "Fase de grupos", str(e))
+            return
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] Error generando grupos: {e}")
+            QMessageBox.critical(self.vista, "Error", f"No se pudieron crear los grupos:\n{str(e)}")
+            return
+        
+        QMessageBox.information(
+            self.vista,
+            "Fase de grupos",
+            f"Se han creado {len(grupos)} grupos con "
+            f"{sum(len(g['partidos']) for g in grupos)} partidos.\n\n"
+            "Puedes programarlos y jugarlos en Calendario/Partidos (ronda \"Grupos\")."
+        )
+    
+    def _on_ver_grupos(self):
+        """Muestra la clasificación de los grupos."""
+        servicio = get_group_service()
+        try:
+            grupos = servicio.clasificaciones()
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] Error cargando la clasificación de grupos: {e}")
+            QMessageBox.critical(self.vista, "Error", f"No se pudo cargar la clasificación:\n{str(e)}")
+            return
+        
+        if not grupos:
+            QMessageBox.information(
+                self.vista,
+                "Fase de grupos",
+                "No hay fase de grupos. Créala con el botón \"Fase de grupos\"."
+            )
+            return
+        
+        from app.views.dialogs import DialogGrupos
+        dialogo = DialogGrupos(grupos, servicio.fase_completa(), self.vista)
+        dialogo.pasar_a_octavos_signal.connect(self._on_pasar_a_octavos)
+        dialogo.exec()
+    
+    def _on_pasar_a_octavos(self):
+        """Crea la primera ronda del cuadro con los clasificados de la fase de grupos."""
+        if TournamentService.obtener_partidos_cuadro():
+            respuesta = QMessageBox.question(
+                self.vista,
+                "Cuadro ya existente",
+                "El cuadro de eliminatorias ya está creado.\n\n"
+                "Si continúas, se eliminarán sus partidos (incluidos convocatorias y "
+                "resultados) y se creará con los clasificados de los grupos.\n\n"
+                "¿Deseas continuar?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if respuesta != QMessageBox.StandardButton.Yes:
+                return
+        
+        try:
+            get_group_service().promocionar()
+        except ValueError as e:
+            QMessageBox.warning(self.vista, "Pasar al cuadro", str(e))
+            return
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] Error creando el cuadro desde grupos: {e}")
+            QMessageBox.critical(self.vista, "Error", f"No se pudo crear el cuadro:\n{str(e)}")
+            return
+        
+        self.cargar_cuadro()
+        QMessageBox.information(
+            self.vista,
+            "Cuadro generado",
+            "Los clasificados de la fase de grupos ya están en el cuadro de eliminatorias."
+        )
+    
     def _on_reiniciar_torneo_desde_bracket(self):
         """Maneja la señal de reiniciar torneo desde el cuadro de clasificación."""
         print("[BRACKET CONTROLLER] _on_reiniciar_torneo_desde_bracket ejecutado")
@@ -605,7 +743,7 @@ class ControladorCuadroEliminatorias:
             "Confirmar reinicio",
             "¿Está seguro de que desea reiniciar el cuadro?\n\n"
             "ADVERTENCIA: Se eliminarán todos los partidos y resultados del torneo.\n"
-            "Esta acción no se puede deshacer.",
+            "Se puede deshacer desde Editar > Deshacer.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
@@ -660,6 +798,8 @@ class ControladorCuadroEliminatorias:
         print(f"[BRACKET_CONTROLLER] Partido ID: {match_id}")
         print(f"[BRACKET_CONTROLLER] Recargando cuadro...")
         print(f"{'='*60}\n")
+        # Los ratings cambian con cada resultado: refrescar los tooltips de los combos
+        self.vista.cargar_equipos_en_combos()
         self.cargar_cuadro()
         print(f"[BRACKET_CONTROLLER] ✓ Cuadro recargado\n")
     
@@ -754,4 +894,42 @@ class ControladorCuadroEliminatorias:
                 "Error",
                 f"No se pudo exportar el archivo CSV:\n{str(e)}"
             )
-
+    
+    def _on_simular_probabilidades(self):
+        """Simula el resto del torneo y muestra la probabilidad de cada equipo por ronda."""
+        from PySide6.QtCore import Qt
+        from PySide6.QtWidgets import QApplication
+        
+        try:
+            from app.services.simulation_service import SimulationService
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                resultado = SimulationService.simular()
+            finally:
+                QApplication.restoreOverrideCursor()
+        except ValueError as e:
+            QMessageBox.warning(self.vista, "Probabilidades", str(e))
+            return
+        except ImportError:
+            QMessageBox.critical(
+                self.vista,
+                "Probabilidades",
+                "La simulación necesita NumPy. Instálelo con: pip install numpy"
+            )
+            return
+        except Exception as e:
+            print(f"[BRACKET CONTROLLER] Error simulando el torneo: {e}")
+            QMessageBox.critical(
+                self.vista,
+                "Error",
+                f"No se pudo simular el torneo:\n{str(e)}"
+            )
+            return
+        
+        print(
+            f"[BRACKET CONTROLLER] {resultado['simulaciones']} simulaciones "
+            f"({resultado['simulaciones_por_segundo']:.0f}/s)"
+        )
+        from app.views.dialogs import DialogProbabilidades
+        dialogo = DialogProbabilidades(resultado, resultado["rondas"][1:], self.vista)
+        dialogo.exec()
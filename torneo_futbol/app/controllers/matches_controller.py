@@ -2,7 +2,7 @@
 Controlador para la gestión de partidos y calendario.
 """
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QMessageBox
+from PySide6.QtWidgets import QMessageBox, QInputDialog
 from app.models.match_model import MatchModel
 from app.models.participant_model import ParticipantModel
 from app.models.callup_model import CallupModel
@@ -11,6 +11,12 @@ from app.models.goal_model import GoalModel
 from app.services.tournament_service import TournamentService
 from app.services.match_service import MatchService, MatchData
 from app.services.event_bus import get_event_bus
+from app.services.scheduler_service import SchedulerService, OpcionesProgramacion
+from app.services.referee_service import get_referee_service
+from app.services.eligibility_service import get_eligibility_service
+from app.services.undo_service import deshacible, get_undo_service
+from app.models.db import ConflictoVersionError
+from app.constants import HORARIOS_PARTIDO, FASE_GRUPOS
 
 
 class ControladorCalendarioPartidos:
@@ -109,10 +115,41 @@ class ControladorCalendarioPartidos:
             print(f"[DEBUG] Cambio en partido {match_id} (no es el actual), recargando tabla...")
             self.cargar_tabla()
             print("[DEBUG] ✅ Tabla recargada")
-        # Si es el actual, ya se habrá refrescado localmente
         else:
-            print(f"[DEBUG] Cambio en partido actual {match_id}, ya manejado localmente")
+            self._recargar_partido_actual()
+
+    def _recargar_partido_actual(self):
+        """
+        Vuelve a leer el partido abierto tras un cambio hecho fuera del detalle.
+
+        Siempre se toma la versión nueva, para que el siguiente guardado no se
+        rechace por un cambio propio (p. ej. programarlo desde el día). El
+        detalle solo se rellena de nuevo si han cambiado sus datos.
+        """
+        anterior = self.partido_actual
+        self.partido_actual = MatchModel.obtener_partido_por_id(self.partido_actual_id)
+        self.cargar_tabla()
+        if not self.partido_actual:
+            return
+        cambiadas = {
+            campo for campo, valor in self.partido_actual.items()
+            if campo != 'version' and (anterior or {}).get(campo) != valor
+        }
+        if not cambiadas:
+            print(f"[DEBUG] Partido actual {self.partido_actual_id}: solo cambia la versión")
+            return
+        print(f"[DEBUG] Partido actual {self.partido_actual_id} modificado fuera del detalle, recargando...")
+        self.cargar_arbitros(self.partido_actual)
+        self.vista.rellenar_detalle(self.partido_actual)
+        self.cargar_convocados()
+        self.cargar_stats()
     
+    def _tomar_version(self):
+        """Toma la versión actual del partido abierto tras modificarlo desde aquí mismo."""
+        partido = MatchModel.obtener_partido_por_id(self.partido_actual_id)
+        if partido and self.partido_actual:
+            self.partido_actual['version'] = partido.get('version')
+
     def _conectar_senales(self):
         """Conecta todas las señales de la vista con los métodos del controlador."""
         print("[CONTROLLER] _conectar_senales() - Iniciando conexión de señales...")
@@ -130,10 +167,14 @@ class ControladorCalendarioPartidos:
         except Exception as e:
             print(f"  ❌ ERROR conectando reiniciar_torneo_signal: {e}")
         
+        self.vista.programar_automatico_signal.connect(self._on_programar_automatico)
+        
         # Selección y filtros
         self.vista.partido_seleccionado_signal.connect(self._on_seleccionado)
         self.vista.filtros_changed_signal.connect(self._on_filtros_changed)
         self.vista.abrir_partido_desde_dialogo_signal.connect(self._on_abrir_partido_desde_dialogo)
+        # Fecha y árbitro cambiados desde el diálogo del día: avisar al resto de vistas
+        self.vista.partido_programado_signal.connect(self.event_bus.emit_match_updated)
         
         # Edición de partido
         self.vista.guardar_partido_signal.connect(self._on_guardar_partido)
@@ -154,22 +195,41 @@ class ControladorCalendarioPartidos:
         except Exception as e:
             print(f"  ❌ ERROR conectando fase_changed_signal: {e}")
     
-    def cargar_arbitros(self):
-        """Carga la lista de árbitros disponibles."""
-        arbitros = ParticipantModel.listar_arbitros()
+    def cargar_arbitros(self, partido: dict = None):
+        """
+        Carga la lista de árbitros disponibles.
         
-        # Crear lista de nombres para el combo
-        lista_arbitros = ["Sin asignar"] + [
-            f"{arb['nombre']} {arb['apellidos'] or ''}".strip() 
-            for arb in arbitros
-        ]
+        Args:
+            partido: Si se indica, solo se muestran los árbitros que pueden
+                pitarlo (ni de sus equipos ni ocupados a esa hora) y el que ya
+                tenga asignado
+        """
+        servicio_arbitros = get_referee_service()
+        arbitros = servicio_arbitros.listar_arbitros()
         
-        # Guardar diccionario para conversión
+        # Guardar diccionario para conversión (todos, para resolver el árbitro actual)
         self.arbitros_dict = {
             f"{arb['nombre']} {arb['apellidos'] or ''}".strip(): arb['id'] 
             for arb in arbitros
         }
         
+        if partido:
+            disponibles = {
+                arb['id'] for arb in servicio_arbitros.arbitros_disponibles(
+                    partido.get('fecha_hora'),
+                    {partido.get('local_id'), partido.get('visitante_id')} - {None},
+                    partido.get('id')
+                )
+            }
+            disponibles.add(partido.get('arbitro_id'))
+            arbitros = [arb for arb in arbitros if arb['id'] in disponibles]
+        
+        # Crear lista de nombres para el combo
+        lista_arbitros = ["Sin asignar"] + [
+            f"{arb['nombre']} {arb['apellidos'] or ''}".strip() 
+            for arb in arbitros
+        ]
+        
         # Cargar en la vista
         self.vista.cargar_arbitros_en_combo(lista_arbitros)
     
@@ -236,6 +296,9 @@ class ControladorCalendarioPartidos:
         self.partido_actual = MatchModel.obtener_partido_por_id(self.partido_actual_id)
         
         if self.partido_actual:
+            # Árbitros que pueden pitar este partido (antes de rellenar el combo)
+            self.cargar_arbitros(self.partido_actual)
+            
             # Rellenar detalle del partido
             self.vista.rellenar_detalle(self.partido_actual)
             
@@ -292,6 +355,12 @@ class ControladorCalendarioPartidos:
             if j.get("tipo_jugador") in ("Jugador", "Ambos") and j.get("equipo_id") == visitante_id
         ]
         
+        # Excluir sancionados (solo en partidos sin jugar)
+        if self.partido_actual.get("estado") != "Jugado":
+            sanciones = get_eligibility_service()
+            jugadores_local = sanciones.filtrar_elegibles(jugadores_local, local_id)
+            jugadores_visitante = sanciones.filtrar_elegibles(jugadores_visitante, visitante_id)
+        
         # Verificar si algún equipo no tiene jugadores válidos
         tiene_error = False
         mensaje_error = ""
@@ -377,6 +446,7 @@ class ControladorCalendarioPartidos:
             self.vista.sincronizar_goles_en_stats()
             print(f"[CONTROLLER cargar_stats] No hay goles, caché limpiado")
     
+    @deshacible("Cambiar convocatoria")
     def _on_convocatoria_cambiada(self, datos: dict):
         """
         Maneja los cambios en la convocatoria (añadir/quitar jugadores).
@@ -397,7 +467,7 @@ class ControladorCalendarioPartidos:
         try:
             if accion == "convocar":
                 # Añadir jugador a convocatoria
-                CallupModel.convocar_jugador(
+                MatchService.convocar_jugador(
                     self.partido_actual_id,
                     participante_id,
                     equipo_id
@@ -463,9 +533,10 @@ class ControladorCalendarioPartidos:
             MatchModel.asignar_arbitro(self.partido_actual_id, arbitro_id)
             self.cargar_tabla()
             
-            # Recargar datos del partido
+            # Recargar datos del partido (también su versión)
             partido = MatchModel.obtener_partido_por_id(self.partido_actual_id)
             if partido:
+                self.partido_actual = partido
                 self.vista.rellenar_detalle(partido)
             
             QMessageBox.information(
@@ -564,8 +635,8 @@ class ControladorCalendarioPartidos:
         print(f"  - Stats: {len(datos_formulario.get('stats', []))} jugadores")
         
         # Validar empate en goles y penaltis
-        if goles_local != goles_visitante:
-            # No es empate, ignorar penaltis
+        if goles_local != goles_visitante or match.eliminatoria == FASE_GRUPOS:
+            # No es empate (o es de liga, donde se admite), ignorar penaltis
             penaltis_local = None
             penaltis_visitante = None
         else:
@@ -616,7 +687,8 @@ class ControladorCalendarioPartidos:
                 penaltis_local=penaltis_local,
                 penaltis_visitante=penaltis_visitante,
                 goles_detalle=goles_detalle,
-                stats=stats
+                stats=stats,
+                version=self.partido_actual.get("version") if self.partido_actual else None
             )
             
             print(f"[CONTROLLER] ✓ Resultado guardado exitosamente")
@@ -662,6 +734,18 @@ class ControladorCalendarioPartidos:
             # Mantener en modo editar_resultado para permitir correcciones
             self.vista.set_modo("editar_resultado")
             
+        except ConflictoVersionError as ce:
+            # Otra instancia ha modificado el partido mientras se editaba
+            print(f"[ERROR] Conflicto al guardar resultado: {ce}")
+            QMessageBox.warning(
+                self.vista,
+                "Partido modificado",
+                f"{ce}.\n\nSe van a cargar los datos actuales; revise el resultado y vuelva a guardarlo."
+            )
+            self.partido_actual = MatchModel.obtener_partido_por_id(self.partido_actual_id)
+            if self.partido_actual:
+                self.vista.rellenar_detalle(self.partido_actual)
+            self.cargar_stats()
         except ValueError as ve:
             # Error de validación o datos incorrectos
             print(f"[ERROR] ValueError al guardar resultado: {ve}")
@@ -724,6 +808,7 @@ class ControladorCalendarioPartidos:
         
         try:
             MatchModel.actualizar_fecha_hora(self.partido_actual_id, nueva_fecha)
+            self._tomar_version()
             self.cargar_tabla()
         except Exception as e:
             QMessageBox.warning(
@@ -741,6 +826,7 @@ class ControladorCalendarioPartidos:
             arbitro_id = self.arbitros_dict.get(nombre_arbitro)
             if arbitro_id:
                 MatchModel.asignar_arbitro(self.partido_actual_id, arbitro_id)
+                self._tomar_version()
                 self.cargar_tabla()
         except Exception as e:
             QMessageBox.warning(
@@ -1058,6 +1144,9 @@ class ControladorCalendarioPartidos:
             if not hasattr(self, 'equipos_dict') or not self.equipos_dict:
                 self.cargar_equipos()
             
+            # Todos los árbitros (la disponibilidad se comprueba al guardar)
+            self.cargar_arbitros()
+            
             # Limpiar formulario
             self.vista.limpiar_formulario_partido()
             
@@ -1079,6 +1168,44 @@ class ControladorCalendarioPartidos:
                 f"Error al iniciar nuevo partido: {str(e)}"
             )
     
+    def _on_programar_automatico(self):
+        """Programa los partidos pendientes sin fecha y da árbitro a los que ya la tienen."""
+        campos, ok = QInputDialog.getInt(
+            self.vista,
+            "Programar automáticamente",
+            "Se asignará fecha, campo y árbitro a los partidos pendientes sin fecha,\n"
+            f"de lunes a viernes a las {', '.join(HORARIOS_PARTIDO)}, a partir de mañana,\n"
+            "y árbitro a los que ya tienen fecha pero no árbitro.\n\n"
+            "Campos disponibles:",
+            1, 1, 8
+        )
+        if not ok:
+            return
+        
+        try:
+            resultado = SchedulerService.programar(OpcionesProgramacion(campos=campos))
+        except Exception as e:
+            print(f"[CONTROLLER ERROR] _on_programar_automatico: {e}")
+            QMessageBox.critical(self.vista, "Error", f"No se pudo programar los partidos:\n{e}")
+            return
+        
+        if not resultado['guardados'] and not resultado['no_programados'] and not resultado['sin_arbitro']:
+            QMessageBox.information(
+                self.vista,
+                "Programar automáticamente",
+                "No hay partidos pendientes sin fecha ni sin árbitro."
+            )
+            return
+        
+        mensaje = f"Partidos programados: {resultado['guardados']}"
+        if resultado['sin_arbitro']:
+            mensaje += f"\nSin árbitro disponible: {len(resultado['sin_arbitro'])}"
+        if resultado['no_programados']:
+            mensaje += (f"\nSin hueco (faltan fechas de la ronda anterior o no caben): "
+                        f"{len(resultado['no_programados'])}")
+        QMessageBox.information(self.vista, "Programar automáticamente", mensaje)
+        # La tabla se recarga con el evento match_changed(0) que emite el servicio
+    
     def _on_reiniciar_torneo(self):
         """Maneja el reinicio completo del torneo."""
         try:
@@ -1094,7 +1221,7 @@ class ControladorCalendarioPartidos:
                 "• Todos los resultados guardados\n"
                 "• Todas las convocatorias\n"
                 "• Todas las estadísticas de partidos\n\n"
-                "Esta acción NO se puede deshacer.",
+                "Se puede deshacer desde Editar > Deshacer.",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No
             )
@@ -1206,6 +1333,18 @@ class ControladorCalendarioPartidos:
                 if arbitro_nombre != "Sin árbitro":
                     arbitro_id = self.arbitros_dict.get(arbitro_nombre)
             
+            # Árbitro de uno de los equipos o con otro partido a esa hora
+            if arbitro_id:
+                conflicto = get_referee_service().validar_asignacion(
+                    arbitro_id,
+                    datos['fecha_hora'],
+                    {datos['local_id'], datos['visitante_id']},
+                    self.partido_actual_id
+                )
+                if conflicto:
+                    QMessageBox.warning(self.vista, "Árbitro no disponible", conflicto)
+                    return
+            
             # Guardar en DB
             if self.partido_actual_id:
                 # Actualizar partido existente
@@ -1289,14 +1428,16 @@ class ControladorCalendarioPartidos:
             "Confirmar",
             "¿Está seguro de que desea eliminar este partido?\n\n"
             "Se eliminarán también las convocatorias y estadísticas asociadas.\n"
-            "Esta acción NO se puede deshacer.",
+            "Se puede deshacer desde Editar > Deshacer.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if respuesta == QMessageBox.StandardButton.Yes:
             try:
-                MatchModel.eliminar_partido(self.partido_actual_id)
-                
+                with get_undo_service().operacion("Eliminar partido"):
+                    MatchModel.eliminar_partido(self.partido_actual_id)
+                    self.event_bus.emit_match_deleted(self.partido_actual_id)
+
                 # Recargar tabla
                 self.cargar_tabla()
                 
@@ -1348,6 +1489,7 @@ class ControladorCalendarioPartidos:
         # Cambiar a modo ver
         self.vista.set_modo("ver")
     
+    @deshacible("Cambiar convocatoria")
     def _on_convocatoria_changed(self, equipo: str, accion: str):
         """Maneja los cambios en la convocatoria."""
         if not self.partido_actual_id:
@@ -1367,7 +1509,7 @@ class ControladorCalendarioPartidos:
                     if selected >= 0:
                         item = tabla_disponibles.item(selected, 0)
                         participante_id = item.data(Qt.ItemDataRole.UserRole)
-                        CallupModel.convocar_jugador(
+                        MatchService.convocar_jugador(
                             self.partido_actual_id,
                             participante_id,
                             equipo_id
@@ -1395,7 +1537,7 @@ class ControladorCalendarioPartidos:
                     if selected >= 0:
                         item = tabla_disponibles.item(selected, 0)
                         participante_id = item.data(Qt.ItemDataRole.UserRole)
-                        CallupModel.convocar_jugador(
+                        MatchService.convocar_jugador(
                             self.partido_actual_id,
                             participante_id,
                             equipo_id
@@ -256,7 +256,7 @@ class ControladorGestionParticipantes:
                 ParticipantModel.eliminar_participante(self.participante_actual_id)
                 
                 # Emitir evento
-                self.event_bus.participant_deleted.emit(self.participante_actual_id)
+                self.event_bus.emit_participant_deleted(self.participante_actual_id)
                 
                 self.participante_actual_id = None
                 self.modo_actual = "ver"
@@ -339,7 +339,7 @@ class ControladorGestionParticipantes:
                 mensaje = "Participante creado correctamente."
                 
                 # Emitir evento
-                self.event_bus.participant_created.emit(participante_id)
+                self.event_bus.emit_participant_created(participante_id)
             else:
                 # Actualizar participante existente
                 ParticipantModel.actualizar_participante(
@@ -349,7 +349,7 @@ class ControladorGestionParticipantes:
                 mensaje = "Participante actualizado correctamente."
                 
                 # Emitir evento
-                self.event_bus.participant_updated.emit(self.participante_actual_id)
+                self.event_bus.emit_participant_updated(self.participante_actual_id)
             
             # Recargar tabla y volver a modo "ver"
             self.cargar_tabla()
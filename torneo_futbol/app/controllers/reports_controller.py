@@ -8,7 +8,6 @@ from PySide6.QtWidgets import QFileDialog
 
 from app.models.team_model import TeamModel
 from app.models.match_model import MatchModel
-from app.services.report_service import ReportService
 from app.views.page_reports import PageReports
 
 
@@ -51,6 +50,9 @@ class ControladorReportes:
     # ── Generación ───────────────────────────
     def _on_generar(self):
         """Genera el PDF del tipo seleccionado."""
+        # fpdf solo se carga cuando se genera el primer informe
+        from app.services.report_service import ReportService
+
         tipo = self.vista.get_tipo_informe()
         self.vista.clear_status()
 
@@ -108,6 +110,8 @@ class ControladorReportes:
         if not path:
             return
 
+        from app.services.report_service import ReportService
+
         self.vista.clear_status()
 
         try:
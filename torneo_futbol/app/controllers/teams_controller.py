@@ -1,16 +1,14 @@
 """Controlador para la gestión de equipos."""
-import shutil
 from pathlib import Path
 from PySide6.QtWidgets import QMessageBox, QFileDialog
 from PySide6.QtCore import QObject
 
 from app.views.page_teams import PageGestionEquipos
-from app.views.dialogs.dialog_jugadores_equipo import DialogJugadoresEquipo
 from app.models.team_model import TeamModel
 from app.models.participant_model import ParticipantModel
 from app.models.db import DbError
 from app.services.event_bus import get_event_bus
-from app.config import DATA_DIR
+from app.services.crest_service import crest_service
 
 
 class ControladorGestionEquipos(QObject):
@@ -137,8 +135,13 @@ class ControladorGestionEquipos(QObject):
         if respuesta == QMessageBox.StandardButton.Yes:
             try:
                 team_id_to_delete = self.equipo_actual_id
+                equipo = TeamModel.obtener_equipo_por_id(team_id_to_delete)
                 TeamModel.eliminar_equipo(team_id_to_delete)
                 
+                # Borrar el escudo si ya no lo usa ningún equipo
+                if equipo:
+                    crest_service.liberar(equipo['escudo_path'])
+                
                 # Emitir evento de equipo eliminado
                 self.event_bus.emit_team_deleted(team_id_to_delete)
                 
@@ -187,6 +190,7 @@ class ControladorGestionEquipos(QObject):
         escudo_path = self.escudo_temporal if self.escudo_temporal else datos.get('escudo', '')
         if escudo_path == 'Sin escudo':
             escudo_path = None
+        escudo_anterior = None
         
         try:
             if self.equipo_actual_id is None:
@@ -215,6 +219,12 @@ class ControladorGestionEquipos(QObject):
                 equipo_actual = TeamModel.obtener_equipo_por_id(self.equipo_actual_id)
                 curso_actual = equipo_actual['curso'] if equipo_actual else "1º ESO"
                 
+                # El formulario no devuelve el escudo: conservar el actual si no se eligió otro
+                if equipo_actual:
+                    escudo_anterior = equipo_actual['escudo_path']
+                    if not self.escudo_temporal:
+                        escudo_path = escudo_anterior
+                
                 TeamModel.actualizar_equipo(
                     equipo_id=self.equipo_actual_id,
                     nombre=nombre,
@@ -232,6 +242,10 @@ class ControladorGestionEquipos(QObject):
                     f"El equipo '{nombre}' ha sido actualizado correctamente."
                 )
             
+            # Borrar el escudo sustituido si ya no lo usa ningún equipo
+            if escudo_anterior and escudo_anterior != escudo_path:
+                crest_service.liberar(escudo_anterior)
+            
             # Recargar tabla y volver a modo ver
             self.escudo_temporal = None
             self.cargar_tabla()
@@ -332,27 +346,8 @@ class ControladorGestionEquipos(QObject):
         
         if archivo:
             try:
-                # Crear directorio de escudos si no existe
-                dir_escudos = DATA_DIR / "escudos"
-                dir_escudos.mkdir(parents=True, exist_ok=True)
-                
-                # Generar nombre único para el escudo
-                archivo_original = Path(archivo)
-                extension = archivo_original.suffix
-                nombre_base = archivo_original.stem
-                
-                # Usar timestamp para evitar colisiones
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                nombre_nuevo = f"{nombre_base}_{timestamp}{extension}"
-                
-                ruta_destino = dir_escudos / nombre_nuevo
-                
-                # Copiar archivo
-                shutil.copy2(archivo, ruta_destino)
-                
-                # Guardar ruta relativa desde DATA_DIR
-                self.escudo_temporal = str(ruta_destino.relative_to(DATA_DIR.parent))
+                # Incorporar al almacén de escudos (sin duplicar si ya existe)
+                self.escudo_temporal = crest_service.importar(archivo)
                 
                 # Actualizar preview en la vista (cargar imagen)
                 self.vista.cargar_escudo(self.escudo_temporal)
@@ -360,7 +355,7 @@ class ControladorGestionEquipos(QObject):
                 QMessageBox.information(
                     self.vista,
                     "Escudo seleccionado",
-                    f"Escudo '{nombre_nuevo}' seleccionado correctamente.\n\n"
+                    f"Escudo '{Path(archivo).name}' seleccionado correctamente.\n\n"
                     "Recuerde guardar los cambios del equipo."
                 )
                 
@@ -369,7 +364,8 @@ class ControladorGestionEquipos(QObject):
                     self.vista,
                     "Error al copiar escudo",
                     f"No se pudo copiar el archivo del escudo:\n{str(e)}"
-                )    
+                )
+    
     def _on_ver_jugadores(self, id_equipo: int, nombre_equipo: str):
         """
         Muestra un diálogo con los jugadores del equipo.
@@ -383,6 +379,7 @@ class ControladorGestionEquipos(QObject):
             jugadores = ParticipantModel.listar_jugadores_por_equipo(id_equipo)
             
             # Mostrar diálogo
+            from app.views.dialogs.dialog_jugadores_equipo import DialogJugadoresEquipo
             dialogo = DialogJugadoresEquipo(nombre_equipo, jugadores, self.vista)
             dialogo.exec()
             
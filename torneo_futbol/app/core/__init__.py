@@ -0,0 +1,10 @@
+"""
+Núcleo de la aplicación sin dependencias de Qt.
+
+Contiene el bus de eventos en Python puro (``app.core.event_bus``) y el
+arranque para procesos sin interfaz (``app.core.headless``). Los modelos y
+los servicios de negocio (torneo, partidos, grupos, programación, ratings,
+árbitros, sanciones y clasificaciones) solo dependen de este paquete, así que
+se pueden usar desde scripts, tareas por lotes o un servidor sin importar
+PySide6 ni crear una QApplication.
+"""
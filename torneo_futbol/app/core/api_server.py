@@ -0,0 +1,466 @@
+"""
+API HTTP/JSON de solo lectura para marcadores y pantallas de la red local.
+
+Servidor asyncio embebible (sin Qt ni dependencias externas) que publica
+equipos, partidos, cuadro, calendario, grupos y clasificaciones en JSON.
+
+Las respuestas no se calculan en cada petición:
+
+- Una tarea vigila ``PRAGMA data_version`` con una conexión propia; el valor
+  cambia cuando cualquier otra conexión (la aplicación, la línea de comandos
+  u otro proceso) confirma cambios en la base de datos.
+- Cuando la versión cambia, las rutas principales se vuelven a calcular una
+  sola vez, en un hilo aparte, y se guardan ya serializadas (y comprimidas con
+  gzip) junto con su ETag, que es un hash del contenido.
+- Las peticiones solo leen esa caché. Con ``If-None-Match`` y el mismo ETag se
+  responde 304 sin cuerpo, así que cientos de clientes que sondean cuestan
+  casi nada. Un ETag no cambia si el contenido de esa ruta no ha cambiado,
+  aunque haya cambiado otra parte de la base de datos.
+
+Las rutas con parámetros (``/api/partidos?eliminatoria=...``) se calculan en
+la primera petición de cada versión y se guardan igual.
+
+``/api/eventos`` es un flujo de eventos en directo (Server-Sent Events); ver
+``app.core.canal_eventos``. Con cada versión nueva se leen los cambios del
+diario desde el último procesado, así que el flujo recoge lo que escriba
+cualquier proceso, no solo el del servidor.
+
+Uso: ``python -m app.cli servir`` o ``ServidorApi().iniciar_en_hilo()``.
+"""
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from app.core.canal_eventos import CanalEventos, eventos_del_diario
+
+
+# Segundos entre dos consultas de la versión de los datos
+INTERVALO_SONDEO = 0.5
+
+# Segundos que se mantiene abierta una conexión sin peticiones
+TIEMPO_INACTIVIDAD = 15
+
+# Tamaño máximo de la línea de petición más las cabeceras
+MAX_CABECERAS = 8192
+
+# Respuestas más pequeñas no se comprimen
+MIN_GZIP = 512
+
+# Entradas máximas de la caché de rutas con parámetros
+MAX_CACHE_PARAMETROS = 256
+
+MOTIVOS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+# ----------------------------------------------------------------------
+# Contenido de cada ruta (se ejecuta en el hilo de cálculo)
+# ----------------------------------------------------------------------
+
+def _equipos(parametros: dict) -> list[dict]:
+    from app.models.team_model import TeamModel
+    return TeamModel.listar_equipos()
+
+
+def _partidos(parametros: dict) -> list[dict]:
+    from app.models.match_model import MatchModel
+    return MatchModel.listar_partidos(
+        eliminatoria=parametros.get("eliminatoria"), estado=parametros.get("estado")
+    )
+
+
+def _cuadro(parametros: dict) -> dict:
+    from app.services.tournament_service import TournamentService
+    return TournamentService.get_bracket_state()
+
+
+def _calendario(parametros: dict) -> list[dict]:
+    from app.models.match_model import MatchModel
+    dias: dict[str, list] = {}
+    programados = [p for p in MatchModel.listar_partidos() if p["fecha_hora"]]
+    for partido in sorted(programados, key=lambda p: (p["fecha_hora"], p["eliminatoria"], p["slot"])):
+        dias.setdefault(partido["fecha_hora"][:10], []).append(partido)
+    return [{"fecha": fecha, "partidos": partidos} for fecha, partidos in dias.items()]
+
+
+def _cambios(parametros: dict) -> dict:
+    from app.models.journal_model import JournalModel, LIMITE_POR_DEFECTO
+    desde = int(parametros.get("desde", 0))
+    limite = min(int(parametros.get("limite", LIMITE_POR_DEFECTO)), LIMITE_POR_DEFECTO)
+    cambios = JournalModel.cambios_desde(desde, limite=limite)
+    return {
+        "cambios": cambios,
+        "ultimo": cambios[-1]["seq"] if cambios else desde,
+        "completo": len(cambios) < limite,
+    }
+
+
+def _grupos(parametros: dict) -> list[dict]:
+    from app.services.group_service import get_group_service
+    return get_group_service().clasificaciones()
+
+
+class _Clasificaciones:
+    """Clasificaciones individuales con una instancia propia del servicio (solo la usa el hilo de cálculo)."""
+
+    def __init__(self):
+        self._servicio = None
+
+    def reconstruir(self) -> None:
+        from app.services.leaderboard_service import LeaderboardService
+        if self._servicio is None:
+            self._servicio = LeaderboardService()
+        self._servicio.reconstruir()
+
+    def __call__(self, parametros: dict) -> dict:
+        from app.services.leaderboard_service import CLASIFICACIONES
+        n = int(parametros.get("n", 10))
+        if self._servicio is None:
+            self.reconstruir()
+        return {nombre: self._servicio.top(nombre, n) for nombre in CLASIFICACIONES}
+
+
+# ----------------------------------------------------------------------
+# Servidor
+# ----------------------------------------------------------------------
+
+class _Respuesta:
+    """Respuesta ya serializada de una ruta para una versión de los datos."""
+
+    __slots__ = ("version", "cuerpo", "cuerpo_gzip", "etag")
+
+    def __init__(self, version: int, datos):
+        self.version = version
+        self.cuerpo = json.dumps(datos, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        self.cuerpo_gzip = gzip.compress(self.cuerpo, 6) if len(self.cuerpo) >= MIN_GZIP else None
+        self.etag = '"' + hashlib.sha1(self.cuerpo).hexdigest()[:20] + '"'
+
+
+class ServidorApi:
+    """Servidor HTTP de la API de solo lectura."""
+
+    # Ruta del flujo de eventos en directo
+    RUTA_EVENTOS = "/api/eventos"
+
+    def __init__(self, host: str = "127.0.0.1", puerto: int = 8765):
+        """
+        Inicializa el servidor (no abre el puerto hasta servir o iniciar_en_hilo).
+
+        Args:
+            host: Dirección en la que escuchar ("0.0.0.0" para toda la red local)
+            puerto: Puerto TCP (0 = uno libre, consultable en self.puerto)
+        """
+        self.host = host
+        self.puerto = puerto
+        self.version = 0
+        self._clasificaciones = _Clasificaciones()
+        # Rutas principales: se precalculan con cada versión nueva
+        self.rutas: dict[str, Callable[[dict], object]] = {
+            "/api/equipos": _equipos,
+            "/api/partidos": _partidos,
+            "/api/cuadro": _cuadro,
+            "/api/calendario": _calendario,
+            "/api/grupos": _grupos,
+            "/api/clasificaciones": self._clasificaciones,
+            "/api/cambios": _cambios,
+        }
+        self._cache: dict[str, _Respuesta] = {}
+        self._en_curso: dict[str, asyncio.Future] = {}
+        # Un único hilo de cálculo: las consultas no compiten entre sí ni con la interfaz
+        self._calculo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-calculo")
+        self.canal = CanalEventos(self._calculo)
+        # Último seq del diario ya publicado en el canal (None hasta el arranque)
+        self._ultimo_seq: Optional[int] = None
+        self._conexion_version: Optional[sqlite3.Connection] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._listo = threading.Event()
+        self._error_arranque: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # Versión de los datos y caché
+    # ------------------------------------------------------------------
+
+    def _leer_version(self) -> int:
+        """Valor actual de PRAGMA data_version (conexión propia, solo en el hilo de cálculo)."""
+        if self._conexion_version is None:
+            from app.models.db import get_db_path
+            self._conexion_version = sqlite3.connect(str(get_db_path()))
+        return self._conexion_version.execute("PRAGMA data_version").fetchone()[0]
+
+    def _leer_eventos(self) -> list[tuple]:
+        """
+        Eventos del canal para los cambios del diario desde el último leído (en el hilo de cálculo).
+
+        Returns:
+            Lista de eventos (nombre, *args); un único reinicio si el diario se
+            ha purgado o restaurado, o hay demasiados cambios para detallarlos
+        """
+        from app.models.journal_model import JournalModel
+        from app.services.change_monitor_service import MAX_CAMBIOS_DETALLADOS
+
+        ultima = JournalModel.ultima_secuencia()
+        anterior, self._ultimo_seq = self._ultimo_seq, ultima
+        if anterior is None or ultima == anterior:
+            return []
+        if ultima < anterior or ultima - anterior > MAX_CAMBIOS_DETALLADOS:
+            return [("reinicio",)]
+
+        cambios = []
+        while True:
+            lote = JournalModel.cambios_desde(cambios[-1]['seq'] if cambios else anterior)
+            if not lote:
+                break
+            cambios.extend(lote)
+        if not cambios or cambios[0]['seq'] != anterior + 1:
+            return [("reinicio",)]
+        self._ultimo_seq = cambios[-1]['seq']
+        return eventos_del_diario(cambios)
+
+    def _precalcular(self, version: int) -> dict[str, _Respuesta]:
+        """Calcula todas las rutas principales (en el hilo de cálculo)."""
+        self._clasificaciones.reconstruir()
+        return {ruta: _Respuesta(version, funcion({})) for ruta, funcion in self.rutas.items()}
+
+    async def _actualizar(self) -> None:
+        """Precalcula las rutas si la base de datos ha cambiado desde la última vez."""
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(self._calculo, self._leer_version)
+        if version == self.version and self._cache:
+            return
+        eventos = await loop.run_in_executor(self._calculo, self._leer_eventos)
+        nuevas = await loop.run_in_executor(self._calculo, self._precalcular, version)
+        # Se descartan las respuestas con parámetros de versiones anteriores
+        hay_anteriores = bool(self._cache)
+        self._cache = nuevas
+        self.version = version
+        for evento in eventos:
+            self.canal.publicar(*evento)
+        if hay_anteriores:
+            self.canal.publicar("datos", version)
+
+    async def _vigilar(self) -> None:
+        while True:
+            await asyncio.sleep(INTERVALO_SONDEO)
+            try:
+                await self._actualizar()
+            except Exception as e:
+                print(f"[API] Error al actualizar los datos: {e}")
+
+    async def _obtener(self, ruta: str, consulta: str) -> Optional[_Respuesta]:
+        """Respuesta cacheada de una ruta (None si la ruta no existe)."""
+        funcion = self.rutas.get(ruta)
+        if funcion is None:
+            return None
+        if not consulta:
+            return self._cache[ruta]
+
+        clave = f"{ruta}?{consulta}"
+        respuesta = self._cache.get(clave)
+        if respuesta is not None and respuesta.version == self.version:
+            return respuesta
+
+        # Varias peticiones iguales a la vez esperan un único cálculo
+        futuro = self._en_curso.get(clave)
+        if futuro is None:
+            parametros = dict(parse_qsl(consulta))
+            version = self.version
+            futuro = asyncio.get_running_loop().run_in_executor(
+                self._calculo, lambda: _Respuesta(version, funcion(parametros))
+            )
+            self._en_curso[clave] = futuro
+            futuro.add_done_callback(lambda _: self._en_curso.pop(clave, None))
+        respuesta = await futuro
+        if len(self._cache) < len(self.rutas) + MAX_CACHE_PARAMETROS:
+            self._cache[clave] = respuesta
+        return respuesta
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Atiende las peticiones de una conexión (HTTP/1.1 con keep-alive)."""
+        try:
+            while True:
+                try:
+                    bruto = await asyncio.wait_for(lector.readuntil(b"\r\n\r\n"), TIEMPO_INACTIVIDAD)
+                except asyncio.LimitOverrunError:
+                    await self._enviar(escritor, 431, {"error": "Cabeceras demasiado grandes"}, cerrar=True)
+                    return
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+
+                lineas = bruto.decode("latin-1").split("\r\n")
+                partes = lineas[0].split(" ")
+                if len(partes) != 3:
+                    await self._enviar(escritor, 400, {"error": "Petición no válida"}, cerrar=True)
+                    return
+                metodo, objetivo, protocolo = partes
+                cabeceras = {}
+                for linea in lineas[1:]:
+                    nombre, _, valor = linea.partition(":")
+                    if nombre:
+                        cabeceras[nombre.strip().lower()] = valor.strip()
+
+                if metodo == "GET" and urlsplit(objetivo).path.rstrip("/") == self.RUTA_EVENTOS:
+                    await self._servir_eventos(escritor, objetivo, cabeceras)
+                    return
+
+                conexion = cabeceras.get("connection", "").lower()
+                cerrar = conexion == "close" or (protocolo == "HTTP/1.0" and conexion != "keep-alive")
+                await self._responder(escritor, metodo, objetivo, cabeceras, cerrar)
+                if cerrar:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _servir_eventos(self, escritor: asyncio.StreamWriter, objetivo: str, cabeceras: dict) -> None:
+        """Abre el flujo text/event-stream de un cliente y lo mantiene hasta que se desconecta."""
+        if not self.canal.admite_clientes():
+            await self._enviar(escritor, 503, {"error": "Demasiados clientes conectados"}, cerrar=True,
+                               extra={"Retry-After": "30"})
+            return
+        ultimo = cabeceras.get("last-event-id") or dict(parse_qsl(urlsplit(objetivo).query)).get("desde")
+        try:
+            ultimo = int(ultimo) if ultimo else None
+        except ValueError:
+            ultimo = None
+        await self._escribir(escritor, 200, {"Content-Type": "text/event-stream; charset=utf-8",
+                                             "X-Accel-Buffering": "no"}, b"", cerrar=True)
+        await self.canal.atender(escritor, ultimo)
+
+    async def _responder(self, escritor: asyncio.StreamWriter, metodo: str, objetivo: str,
+                         cabeceras: dict, cerrar: bool) -> None:
+        if metodo not in ("GET", "HEAD"):
+            await self._enviar(escritor, 405, {"error": "Solo GET y HEAD"}, cerrar, extra={"Allow": "GET, HEAD"})
+            return
+
+        url = urlsplit(objetivo)
+        ruta = url.path.rstrip("/") or "/"
+        if ruta in ("/", "/api"):
+            await self._enviar(escritor, 200, {"version": self.version,
+                                               "rutas": sorted([*self.rutas, self.RUTA_EVENTOS])},
+                               cerrar, cuerpo=metodo == "GET")
+            return
+
+        try:
+            respuesta = await self._obtener(ruta, url.query)
+        except (ValueError, TypeError) as e:
+            await self._enviar(escritor, 400, {"error": str(e)}, cerrar)
+            return
+        except Exception as e:
+            print(f"[API] Error en {objetivo}: {e}")
+            await self._enviar(escritor, 500, {"error": "Error interno"}, cerrar)
+            return
+        if respuesta is None:
+            await self._enviar(escritor, 404, {"error": f"Ruta desconocida: {ruta}"}, cerrar)
+            return
+
+        extra = {"ETag": respuesta.etag, "X-Version-Datos": str(respuesta.version)}
+        if respuesta.etag in cabeceras.get("if-none-match", ""):
+            await self._escribir(escritor, 304, extra, b"", cerrar)
+            return
+
+        cuerpo = respuesta.cuerpo
+        if respuesta.cuerpo_gzip and "gzip" in cabeceras.get("accept-encoding", ""):
+            cuerpo = respuesta.cuerpo_gzip
+            extra["Content-Encoding"] = "gzip"
+        extra["Content-Type"] = "application/json; charset=utf-8"
+        extra["Content-Length"] = str(len(cuerpo))
+        await self._escribir(escritor, 200, extra, cuerpo if metodo == "GET" else b"", cerrar)
+
+    async def _enviar(self, escritor: asyncio.StreamWriter, estado: int, datos: dict, cerrar: bool,
+                      extra: Optional[dict] = None, cuerpo: bool = True) -> None:
+        """Envía una respuesta JSON que no se cachea (índice y errores)."""
+        contenido = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        cabeceras = {"Content-Type": "application/json; charset=utf-8",
+                     "Content-Length": str(len(contenido)), **(extra or {})}
+        await self._escribir(escritor, estado, cabeceras, contenido if cuerpo else b"", cerrar)
+
+    @staticmethod
+    async def _escribir(escritor: asyncio.StreamWriter, estado: int, cabeceras: dict,
+                        cuerpo: bytes, cerrar: bool) -> None:
+        lineas = [
+            f"HTTP/1.1 {estado} {MOTIVOS[estado]}",
+            f"Date: {formatdate(usegmt=True)}",
+            "Cache-Control: no-cache",
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Expose-Headers: ETag, X-Version-Datos",
+            "Vary: Accept-Encoding",
+            f"Connection: {'close' if cerrar else 'keep-alive'}",
+        ]
+        if estado == 304:
+            cabeceras = {k: v for k, v in cabeceras.items() if k in ("ETag", "X-Version-Datos")}
+        lineas.extend(f"{nombre}: {valor}" for nombre, valor in cabeceras.items())
+        escritor.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1") + cuerpo)
+        await escritor.drain()
+
+    # ------------------------------------------------------------------
+    # Arranque y parada
+    # ------------------------------------------------------------------
+
+    async def servir(self) -> None:
+        """Precalcula las respuestas, abre el puerto y atiende hasta que se detenga."""
+        self._loop = asyncio.get_running_loop()
+        self.canal.iniciar(self._loop)
+        try:
+            await self._actualizar()
+            self._servidor = await asyncio.start_server(
+                self._atender, self.host, self.puerto, limit=MAX_CABECERAS
+            )
+        except BaseException as e:
+            self._error_arranque = e
+            self._listo.set()
+            self._calculo.shutdown(wait=False)
+            raise
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+        print(f"[API] Escuchando en http://{self.host}:{self.puerto}/api")
+        self._listo.set()
+        vigilancia = asyncio.create_task(self._vigilar())
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            vigilancia.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await vigilancia
+            self._calculo.shutdown(wait=False)
+
+    def iniciar_en_hilo(self) -> threading.Thread:
+        """
+        Arranca el servidor en un hilo en segundo plano.
+
+        Returns:
+            Hilo del servidor (daemon); vuelve cuando el puerto ya está abierto
+
+        Raises:
+            OSError: Si no se puede abrir el puerto
+            DbError: Si no se puede leer la base de datos
+        """
+        hilo = threading.Thread(target=asyncio.run, args=(self.servir(),), name="api-http", daemon=True)
+        hilo.start()
+        self._listo.wait()
+        if self._error_arranque is not None:
+            raise self._error_arranque
+        return hilo
+
+    def detener(self) -> None:
+        """Cierra el servidor (se puede llamar desde cualquier hilo)."""
+        if self._loop and self._servidor:
+            self._loop.call_soon_threadsafe(self._servidor.close)
@@ -0,0 +1,284 @@
+"""
+Canal de eventos en directo (Server-Sent Events) para la API HTTP.
+
+Los clientes abren ``GET /api/eventos`` y reciben un flujo
+``text/event-stream`` con los cambios del torneo en cuanto se producen, sin
+sondear. Cada evento lleva un número de secuencia (``id:``) y un JSON
+compacto en ``data:``.
+
+Origen de los eventos: el diario de cambios de la base de datos. Cuando
+cambia ``PRAGMA data_version`` el servidor lee las filas nuevas del diario
+(las haya escrito la aplicación, la línea de órdenes u otro proceso) y
+``eventos_del_diario`` las convierte en:
+
+- ``result_saved`` y ``match_updated``: un partido ha cambiado de resultado
+  o de otros datos. Incluyen el marcador, leído una sola vez por lote.
+- ``phase_advanced``: una eliminatoria tiene ganador.
+- ``bracket_updated``: se han creado o borrado partidos del cuadro o han
+  cambiado sus equipos.
+- ``datos``: la versión de la base de datos ha cambiado; los clientes pueden
+  volver a pedir las rutas JSON con su ETag.
+- ``reinicio``: el diario se ha purgado o se ha restaurado una copia y no se
+  sabe qué ha cambiado; hay que volver a cargarlo todo.
+
+Para no saturar el equipo con muchos clientes:
+
+- Lotes: los eventos que llegan en ``VENTANA_LOTE`` segundos se agrupan, se
+  quitan los repetidos y se envían con una sola escritura por cliente.
+- Contrapresión: cada cliente tiene una cola acotada de lotes y su propia
+  tarea de escritura. Si un cliente lento llena la cola se vacía y recibe un
+  evento ``reinicio`` (debe volver a cargar los datos por la API JSON); los
+  demás clientes no esperan por él.
+- Reanudación: al reconectar, el navegador envía ``Last-Event-ID`` (o se pasa
+  ``?desde=N``) y se reenvían los eventos posteriores que sigan en el
+  historial. Si ya no están, se envía ``reinicio``.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+# Segundos durante los que se acumulan eventos antes de enviarlos
+VENTANA_LOTE = 0.2
+
+# Eventos que se guardan para reanudar conexiones
+TAMANO_HISTORIAL = 1000
+
+# Lotes pendientes por cliente antes de considerarlo lento
+MAX_LOTES_PENDIENTES = 32
+
+# Clientes conectados a la vez como máximo
+MAX_CLIENTES = 1000
+
+# Segundos entre dos comentarios de mantenimiento (evitan que los proxies corten la conexión)
+INTERVALO_LATIDO = 15
+
+# Milisegundos que espera el navegador antes de reconectar
+REINTENTO_MS = 3000
+
+
+def eventos_del_diario(cambios: list[dict]) -> list[tuple]:
+    """
+    Convierte filas del diario de cambios en eventos del canal.
+
+    Args:
+        cambios: Cambios del diario (como los devuelve JournalModel), en orden
+
+    Returns:
+        Lista de tuplas (nombre, *args) lista para publicar
+    """
+    from app.constants import FASE_GRUPOS
+    from app.services.change_monitor_service import COLUMNAS_RESULTADO
+
+    resultados, actualizados, fases = set(), set(), []
+    cuadro = False
+    for cambio in cambios:
+        tabla = cambio['tabla']
+        fila = cambio['despues'] or cambio['antes']
+        if tabla in ("stats_partido", "goles"):
+            resultados.add(fila['partido_id'])
+            continue
+        if tabla != "partidos":
+            continue
+        eliminatoria = fila['eliminatoria'] != FASE_GRUPOS
+        if cambio['operacion'] != "update":
+            cuadro = cuadro or eliminatoria
+            if cambio['operacion'] == "insert":
+                actualizados.add(fila['id'])
+            continue
+        columnas = set(cambio['columnas'])
+        if COLUMNAS_RESULTADO & columnas:
+            resultados.add(fila['id'])
+        else:
+            actualizados.add(fila['id'])
+        if eliminatoria and {"equipo_local_id", "equipo_visitante_id"} & columnas:
+            cuadro = True
+        if eliminatoria and "ganador_equipo_id" in columnas and fila['ganador_equipo_id']:
+            fases.append(("phase_advanced", fila['eliminatoria'], fila['id']))
+
+    eventos = [("result_saved", partido_id) for partido_id in sorted(resultados)]
+    eventos += [("match_updated", partido_id) for partido_id in sorted(actualizados - resultados)]
+    eventos += fases
+    if cuadro:
+        eventos.append(("bracket_updated",))
+    return eventos
+
+
+def _formatear(secuencia: int, nombre: str, datos: dict) -> bytes:
+    """Un evento en formato text/event-stream."""
+    return f"id: {secuencia}\nevent: {nombre}\ndata: {json.dumps(datos, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+class CanalEventos:
+    """Reparte los eventos del torneo a los clientes SSE conectados."""
+
+    def __init__(self, calcular=None):
+        """
+        Inicializa el canal (los eventos se aceptan cuando se llama a iniciar).
+
+        Args:
+            calcular: Ejecutor donde leer los marcadores de la base de datos
+                (por defecto, el del bucle)
+        """
+        # La secuencia parte de la hora en milisegundos para que siga creciendo
+        # entre ejecuciones del servidor y no se confundan los Last-Event-ID
+        self.secuencia = int(time.time() * 1000)
+        self._historial: deque[tuple[int, bytes]] = deque(maxlen=TAMANO_HISTORIAL)
+        self._clientes: set[asyncio.Queue] = set()
+        self._pendientes: list[tuple[str, tuple]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._calcular = calcular
+        self._envio_programado = False
+
+    @property
+    def clientes(self) -> int:
+        """Número de clientes conectados."""
+        return len(self._clientes)
+
+    def iniciar(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Empieza a aceptar eventos en el bucle del servidor."""
+        self._loop = loop
+
+    # ------------------------------------------------------------------
+    # Entrada de eventos (desde cualquier hilo)
+    # ------------------------------------------------------------------
+
+    def publicar(self, nombre: str, *args) -> None:
+        """
+        Añade un evento al lote en curso.
+
+        Args:
+            nombre: Nombre del evento
+            *args: Argumentos del evento (como en el bus)
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._lock:
+            self._pendientes.append((nombre, args))
+            if self._envio_programado:
+                return
+            self._envio_programado = True
+        try:
+            loop.call_soon_threadsafe(loop.call_later, VENTANA_LOTE, self._lanzar_envio)
+        except RuntimeError:
+            # El bucle se está cerrando
+            pass
+
+    def _lanzar_envio(self) -> None:
+        asyncio.ensure_future(self._enviar_lote())
+
+    # ------------------------------------------------------------------
+    # Lotes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _leer_marcadores(partidos_ids: list[int]) -> dict[int, dict]:
+        from app.models.match_model import MatchModel
+
+        marcadores = {}
+        for partido_id in partidos_ids:
+            partido = MatchModel.obtener_partido_por_id(partido_id)
+            if partido:
+                marcadores[partido_id] = {
+                    clave: partido[clave] for clave in (
+                        "eliminatoria", "slot", "local_id", "visitante_id", "goles_local",
+                        "goles_visitante", "penaltis_local", "penaltis_visitante",
+                        "ganador_equipo_id", "estado"
+                    )
+                }
+        return marcadores
+
+    async def _enviar_lote(self) -> None:
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, []
+            self._envio_programado = False
+
+        # Sin repetidos, en el orden de la primera aparición
+        unicos = list(dict.fromkeys(pendientes))
+        partidos_ids = sorted({args[0] for nombre, args in unicos
+                               if nombre in ("result_saved", "match_updated") and args and args[0]})
+        marcadores = {}
+        if partidos_ids:
+            try:
+                marcadores = await asyncio.get_running_loop().run_in_executor(
+                    self._calcular, self._leer_marcadores, partidos_ids
+                )
+            except Exception as e:
+                print(f"[API] Error al leer los marcadores: {e}")
+
+        lote = []
+        for nombre, args in unicos:
+            if nombre == "phase_advanced":
+                datos = {"fase": args[0], "partido_id": args[1]}
+            elif nombre == "datos":
+                datos = {"version": args[0]}
+            elif args:
+                datos = {"partido_id": args[0], **marcadores.get(args[0], {})}
+            else:
+                datos = {}
+            self.secuencia += 1
+            evento = (self.secuencia, _formatear(self.secuencia, nombre, datos))
+            self._historial.append(evento)
+            lote.append(evento[1])
+
+        bloque = b"".join(lote)
+        for cola in list(self._clientes):
+            self._encolar(cola, bloque)
+
+    @staticmethod
+    def _encolar(cola: asyncio.Queue, bloque: bytes) -> None:
+        """Encola un lote para un cliente; si va demasiado atrasado se le pide que recargue."""
+        try:
+            cola.put_nowait(bloque)
+        except asyncio.QueueFull:
+            while not cola.empty():
+                cola.get_nowait()
+            cola.put_nowait(b"event: reinicio\ndata: {}\n\n")
+
+    # ------------------------------------------------------------------
+    # Clientes
+    # ------------------------------------------------------------------
+
+    def _pendientes_desde(self, ultimo: Optional[int]) -> bytes:
+        """Eventos del historial posteriores a ultimo (o reinicio si se han perdido)."""
+        if ultimo is None or ultimo == self.secuencia:
+            return b""
+        # Un número mayor que el actual viene de una ejecución anterior del servidor
+        if ultimo > self.secuencia or not self._historial or ultimo < self._historial[0][0] - 1:
+            return b"event: reinicio\ndata: {}\n\n"
+        return b"".join(evento for secuencia, evento in self._historial if secuencia > ultimo)
+
+    async def atender(self, escritor: asyncio.StreamWriter, ultimo: Optional[int]) -> None:
+        """
+        Mantiene abierto el flujo de eventos de un cliente hasta que se desconecta.
+
+        Args:
+            escritor: Conexión del cliente (ya se han enviado las cabeceras)
+            ultimo: Último número de secuencia recibido por el cliente (reanudación)
+        """
+        cola: asyncio.Queue = asyncio.Queue(maxsize=MAX_LOTES_PENDIENTES)
+        self._clientes.add(cola)
+        try:
+            escritor.write(f"retry: {REINTENTO_MS}\n\n".encode() + self._pendientes_desde(ultimo))
+            await escritor.drain()
+            while True:
+                try:
+                    bloque = await asyncio.wait_for(cola.get(), INTERVALO_LATIDO)
+                except asyncio.TimeoutError:
+                    bloque = b": latido\n\n"
+                escritor.write(bloque)
+                await escritor.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # El cliente se ha ido o el servidor se está deteniendo
+            pass
+        finally:
+            self._clientes.discard(cola)
+
+    def admite_clientes(self) -> bool:
+        """Indica si se pueden aceptar más clientes."""
+        return len(self._clientes) < MAX_CLIENTES
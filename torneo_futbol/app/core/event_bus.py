@@ -0,0 +1,238 @@
+"""
+Bus de eventos del núcleo, en Python puro (sin Qt).
+
+Expone los mismos eventos que el bus de la interfaz (equipos, participantes,
+partidos, resultados, cuadro, convocatorias y estadísticas) con la misma
+forma de uso: ``bus.result_saved.connect(callback)`` y los métodos
+``emit_*``. Así los servicios funcionan igual en la aplicación, en scripts y
+en procesos sin interfaz.
+
+Es seguro entre hilos: suscribir y emitir se pueden hacer desde cualquier
+hilo. Los suscriptores se ejecutan en el hilo que emite, en orden de
+suscripción; un suscriptor que falla no impide que se avise al resto.
+
+La interfaz no se suscribe evento a evento: ``app.services.event_bus``
+registra un único oyente global (``suscribir_todos``) que reenvía cada
+evento a sus señales Qt en el hilo de la interfaz.
+"""
+import threading
+import traceback
+import weakref
+from typing import Callable, Optional
+
+
+class Senal:
+    """Evento al que se pueden suscribir funciones (equivalente a una señal Qt)."""
+
+    def __init__(self, nombre: str, bus: 'EventBus'):
+        self.nombre = nombre
+        self._bus = bus
+        self._lock = threading.Lock()
+        self._suscriptores: list = []
+
+    @staticmethod
+    def _referencia(callback: Callable):
+        # Los métodos se guardan con referencia débil para no mantener vivo su objeto
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            return weakref.WeakMethod(callback)
+        return lambda: callback
+
+    def connect(self, callback: Callable) -> None:
+        """
+        Suscribe una función al evento.
+
+        Args:
+            callback: Función que recibe los argumentos del evento
+        """
+        with self._lock:
+            self._suscriptores.append(self._referencia(callback))
+
+    def disconnect(self, callback: Callable) -> None:
+        """
+        Cancela la suscripción de una función.
+
+        Args:
+            callback: Función suscrita con connect
+
+        Raises:
+            ValueError: Si la función no estaba suscrita
+        """
+        with self._lock:
+            for i, referencia in enumerate(self._suscriptores):
+                if referencia() == callback:
+                    del self._suscriptores[i]
+                    return
+        raise ValueError(f"La función no estaba suscrita a {self.nombre}")
+
+    def emit(self, *args) -> None:
+        """
+        Avisa a todos los suscriptores y después a los oyentes globales del bus.
+
+        Args:
+            *args: Argumentos del evento
+        """
+        with self._lock:
+            referencias = list(self._suscriptores)
+
+        hay_muertas = False
+        for referencia in referencias:
+            callback = referencia()
+            if callback is None:
+                hay_muertas = True
+                continue
+            _llamar(self.nombre, callback, args)
+
+        if hay_muertas:
+            with self._lock:
+                self._suscriptores = [r for r in self._suscriptores if r() is not None]
+
+        self._bus._notificar_todos(self.nombre, args)
+
+
+def _llamar(nombre: str, callback: Callable, args: tuple) -> None:
+    try:
+        callback(*args)
+    except Exception:
+        print(f"[EVENTOS] Error en un suscriptor de {nombre}:")
+        print(traceback.format_exc())
+
+
+class EventBus:
+    """
+    Bus de eventos centralizado del núcleo.
+
+    Permite que diferentes componentes se suscriban a eventos
+    sin acoplamiento directo entre emisor y receptor.
+    """
+
+    # Eventos disponibles y sus argumentos (los mismos que las señales Qt)
+    EVENTOS = {
+        'team_created': (int,), 'team_updated': (int,), 'team_deleted': (int,), 'team_changed': (int,),
+        'participant_created': (int,), 'participant_updated': (int,),
+        'participant_deleted': (int,), 'participant_changed': (int,),
+        'match_created': (int,), 'match_updated': (int,), 'match_deleted': (int,), 'match_changed': (int,),
+        'result_saved': (int,), 'result_changed': (int,),
+        'bracket_updated': (), 'phase_advanced': (str, int),
+        'callup_changed': (int,),
+        'stats_updated': (),
+    }
+
+    def __init__(self):
+        """Inicializa el bus con una señal por evento."""
+        self._lock = threading.Lock()
+        self._oyentes: list[Callable[..., None]] = []
+        for nombre in self.EVENTOS:
+            setattr(self, nombre, Senal(nombre, self))
+
+    def suscribir_todos(self, callback: Callable[..., None]) -> None:
+        """
+        Suscribe una función a todos los eventos.
+
+        Se llama después de los suscriptores del evento, con el nombre del
+        evento seguido de sus argumentos.
+
+        Args:
+            callback: Función callback(nombre, *args)
+        """
+        with self._lock:
+            self._oyentes.append(callback)
+
+    def _notificar_todos(self, nombre: str, args: tuple) -> None:
+        with self._lock:
+            oyentes = list(self._oyentes)
+        for callback in oyentes:
+            _llamar(nombre, callback, (nombre, *args))
+
+    # Métodos de conveniencia para emitir eventos
+
+    def emit_team_created(self, team_id: int):
+        """Emite evento de equipo creado."""
+        self.team_created.emit(team_id)
+        self.team_changed.emit(team_id)
+
+    def emit_team_updated(self, team_id: int):
+        """Emite evento de equipo actualizado."""
+        self.team_updated.emit(team_id)
+        self.team_changed.emit(team_id)
+
+    def emit_team_deleted(self, team_id: int):
+        """Emite evento de equipo eliminado."""
+        self.team_deleted.emit(team_id)
+        self.team_changed.emit(team_id)
+
+    def emit_participant_created(self, participant_id: int):
+        """Emite evento de participante creado."""
+        self.participant_created.emit(participant_id)
+        self.participant_changed.emit(participant_id)
+
+    def emit_participant_updated(self, participant_id: int):
+        """Emite evento de participante actualizado."""
+        self.participant_updated.emit(participant_id)
+        self.participant_changed.emit(participant_id)
+
+    def emit_participant_deleted(self, participant_id: int):
+        """Emite evento de participante eliminado."""
+        self.participant_deleted.emit(participant_id)
+        self.participant_changed.emit(participant_id)
+
+    def emit_match_created(self, match_id: int):
+        """Emite evento de partido creado."""
+        self.match_created.emit(match_id)
+        self.match_changed.emit(match_id)
+        self.bracket_updated.emit()
+
+    def emit_match_updated(self, match_id: int):
+        """Emite evento de partido actualizado."""
+        self.match_updated.emit(match_id)
+        self.match_changed.emit(match_id)
+        self.bracket_updated.emit()
+
+    def emit_match_deleted(self, match_id: int):
+        """Emite evento de partido eliminado."""
+        self.match_deleted.emit(match_id)
+        self.match_changed.emit(match_id)
+        self.bracket_updated.emit()
+
+    def emit_result_saved(self, match_id: int):
+        """Emite evento de resultado guardado."""
+        self.result_saved.emit(match_id)
+        self.result_changed.emit(match_id)
+        self.match_changed.emit(match_id)
+        self.bracket_updated.emit()
+        self.stats_updated.emit()
+
+    def emit_phase_advanced(self, phase: str, match_id: int):
+        """Emite evento de avance de fase."""
+        self.phase_advanced.emit(phase, match_id)
+        self.bracket_updated.emit()
+
+    def emit_bracket_updated(self):
+        """Emite evento de actualización del cuadro de eliminatorias."""
+        self.bracket_updated.emit()
+
+    def emit_callup_changed(self, match_id: int):
+        """Emite evento de convocatoria modificada."""
+        self.callup_changed.emit(match_id)
+
+    def emit_stats_updated(self):
+        """Emite evento de estadísticas actualizadas."""
+        self.stats_updated.emit()
+
+
+_event_bus: Optional[EventBus] = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """
+    Obtiene la instancia única del bus del núcleo.
+
+    Returns:
+        Instancia global de EventBus
+    """
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                _event_bus = EventBus()
+    return _event_bus
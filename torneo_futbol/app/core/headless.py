@@ -0,0 +1,54 @@
+"""
+Arranque del núcleo para procesos sin interfaz (scripts, tareas, servidor).
+
+``iniciar()`` prepara la base de datos y suscribe al bus del núcleo los
+servicios que mantienen estado en memoria, igual que hace la ventana
+principal con el bus de la interfaz. No importa Qt.
+"""
+from app.core.event_bus import EventBus, get_event_bus
+
+
+def servicios_con_estado() -> list:
+    """
+    Servicios que se mantienen al día escuchando el bus de eventos.
+
+    Returns:
+        Instancias únicas de los servicios, en el orden en que se conectan
+    """
+    from app.services.rating_service import get_rating_service
+    from app.services.referee_service import get_referee_service
+    from app.services.eligibility_service import get_eligibility_service
+    from app.services.group_service import get_group_service
+    from app.services.leaderboard_service import get_leaderboard_service
+
+    return [
+        get_rating_service(),
+        get_referee_service(),
+        get_eligibility_service(),
+        get_group_service(),
+        get_leaderboard_service(),
+    ]
+
+
+def iniciar(conectar_servicios: bool = True) -> EventBus:
+    """
+    Inicializa la base de datos y, opcionalmente, conecta los servicios al bus.
+
+    Args:
+        conectar_servicios: Si True, los servicios con estado escuchan el bus
+            del núcleo (ratings, árbitros, sanciones, grupos y clasificaciones)
+
+    Returns:
+        Bus de eventos del núcleo
+
+    Raises:
+        DbError: Si no se puede inicializar la base de datos
+    """
+    from app.models.db import init_db
+
+    init_db()
+    bus = get_event_bus()
+    if conectar_servicios:
+        for servicio in servicios_con_estado():
+            servicio.conectar(bus)
+    return bus
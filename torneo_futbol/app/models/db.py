@@ -1,11 +1,13 @@
 """Gestión de la conexión a la base de datos."""
+import atexit
 import sqlite3
 from pathlib import Path
 from typing import Optional
 
 # Importar rutas centralizadas desde config (esto también ejecuta la
 # lógica de copia de datos empaquetados en modo frozen)
-from app.config import DB_PATH
+from app.config import DB_PATH, SQL_TRACE_ENABLED
+from app.models.sql_trace import sql_tracer, TracedConnection
 
 
 class DbError(Exception):
@@ -13,6 +15,11 @@ class DbError(Exception):
     pass
 
 
+class ConflictoVersionError(DbError):
+    """La fila ha cambiado desde que se leyó (bloqueo optimista)."""
+    pass
+
+
 def get_db_path() -> Path:
     """
     Obtiene la ruta absoluta al archivo de base de datos.
@@ -25,6 +32,14 @@ def get_db_path() -> Path:
 
 _db_path_printed = False
 _schema_printed = False
+# True si la base de datos es un torneo archivado (se abre en solo lectura)
+_solo_lectura = False
+
+
+def es_solo_lectura() -> bool:
+    """Indica si la base de datos abierta es un torneo archivado (solo lectura)."""
+    return _solo_lectura
+
 
 def get_connection() -> sqlite3.Connection:
     """
@@ -43,7 +58,11 @@ def get_connection() -> sqlite3.Connection:
         if not _db_path_printed:
             print(f"[APP-DB] Ruta absoluta BD: {db_path.resolve()}")
             _db_path_printed = True
-        conn = sqlite3.connect(str(db_path))
+        factory = TracedConnection if sql_tracer.activo else sqlite3.Connection
+        if _solo_lectura:
+            conn = sqlite3.connect(f"{db_path.absolute().as_uri()}?mode=ro", factory=factory, uri=True)
+        else:
+            conn = sqlite3.connect(str(db_path), factory=factory)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
         
@@ -79,9 +98,13 @@ def init_db() -> None:
     """
     Inicializa la base de datos creando el esquema.
     
+    Un torneo archivado (sin torneo activo) no se modifica: a partir de
+    aquí todas las conexiones se abren en solo lectura.
+    
     Raises:
         DbError: Si hay error durante la inicialización
     """
+    global _solo_lectura
     conn = None
     try:
         db_path = get_db_path()
@@ -89,11 +112,19 @@ def init_db() -> None:
         
         conn = get_connection()
         
-        # Importar y ejecutar creación de esquema
-        from app.models.schema import create_schema
-        create_schema(conn)
-        
-        conn.commit()
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'torneos'")
+        if cursor.fetchone():
+            cursor.execute("SELECT 1 FROM torneos WHERE estado = 'activo'")
+            _solo_lectura = cursor.fetchone() is None
+        if _solo_lectura:
+            print("✓ Torneo archivado: la base de datos se abre en solo lectura")
+        else:
+            # Importar y ejecutar creación de esquema
+            from app.models.schema import create_schema
+            create_schema(conn)
+            
+            conn.commit()
         
         # Verificar datos existentes
         cursor = conn.cursor()
@@ -156,3 +187,50 @@ def execute_query(query: str, params: tuple = (), fetch: str = None) -> Optional
     finally:
         if conn:
             conn.close()
+
+
+def activar_trazado_sql() -> None:
+    """
+    Activa el registro de consultas SQL.
+    
+    Solo afecta a las conexiones que se abran a partir de este momento.
+    """
+    sql_tracer.activo = True
+    print("[APP-SQL] Trazado de consultas activado")
+
+
+def desactivar_trazado_sql() -> None:
+    """Desactiva el registro de consultas SQL (conserva lo ya medido)."""
+    sql_tracer.activo = False
+    print("[APP-SQL] Trazado de consultas desactivado")
+
+
+def trazado_sql_activo() -> bool:
+    """Indica si el trazado de consultas está activo."""
+    return sql_tracer.activo
+
+
+def obtener_estadisticas_sql() -> list[dict]:
+    """
+    Obtiene las estadísticas agregadas por sentencia.
+    
+    Returns:
+        Lista de diccionarios con sql, llamadores, ejecuciones, filas,
+        total_ms, media_ms, p50_ms, p95_ms, p99_ms y max_ms
+    """
+    return sql_tracer.obtener_estadisticas()
+
+
+def volcar_estadisticas_sql(limite: int = 20) -> None:
+    """
+    Imprime por consola las sentencias más costosas.
+    
+    Args:
+        limite: Número de sentencias a mostrar
+    """
+    sql_tracer.volcar(limite)
+
+
+if SQL_TRACE_ENABLED:
+    activar_trazado_sql()
+    atexit.register(volcar_estadisticas_sql)
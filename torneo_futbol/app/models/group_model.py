@@ -0,0 +1,352 @@
+"""Modelo de datos para la fase de grupos."""
+import sqlite3
+from typing import Optional
+from app.models.db import get_connection, DbError
+from app.models.schema import TORNEO_ACTIVO
+from app.constants import FASE_GRUPOS
+
+
+# Columnas acumuladas de la tabla clasificacion, en el orden de los cambios
+COLUMNAS_CLASIFICACION = (
+    "jugados", "ganados", "empatados", "perdidos",
+    "goles_favor", "goles_contra", "puntos"
+)
+
+
+class GroupModel:
+    """Modelo para las tablas grupos, grupo_equipos, grupo_partidos y clasificacion."""
+
+    @staticmethod
+    def crear_grupos(grupos: list[dict]) -> list[int]:
+        """
+        Crea los grupos con sus equipos, su calendario y su clasificación vacía.
+
+        Los partidos se insertan en la tabla partidos con eliminatoria
+        FASE_GRUPOS y slots consecutivos. Todo se hace en una única transacción.
+
+        Args:
+            grupos: Lista de diccionarios con nombre, clasificados, equipos
+                (lista de IDs) y partidos (lista de tuplas
+                (jornada, local_id, visitante_id) en orden de slot)
+
+        Returns:
+            Lista con los IDs de los partidos creados
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "SELECT COALESCE(MAX(slot), 0) FROM partidos WHERE eliminatoria = ?",
+                (FASE_GRUPOS,)
+            )
+            slot = cursor.fetchone()[0]
+
+            partidos_ids = []
+            for grupo in grupos:
+                cursor.execute(
+                    "INSERT INTO grupos (nombre, clasificados) VALUES (?, ?)",
+                    (grupo['nombre'], grupo['clasificados'])
+                )
+                grupo_id = cursor.lastrowid
+
+                cursor.executemany(
+                    "INSERT INTO grupo_equipos (grupo_id, equipo_id) VALUES (?, ?)",
+                    [(grupo_id, equipo_id) for equipo_id in grupo['equipos']]
+                )
+                cursor.executemany(
+                    "INSERT INTO clasificacion (grupo_id, equipo_id) VALUES (?, ?)",
+                    [(grupo_id, equipo_id) for equipo_id in grupo['equipos']]
+                )
+
+                for jornada, local_id, visitante_id in grupo['partidos']:
+                    slot += 1
+                    cursor.execute(f"""
+                        INSERT INTO partidos (torneo_id, eliminatoria, slot, equipo_local_id, equipo_visitante_id, estado)
+                        VALUES ({TORNEO_ACTIVO}, ?, ?, ?, ?, 'Pendiente')
+                    """, (FASE_GRUPOS, slot, local_id, visitante_id))
+                    partidos_ids.append(cursor.lastrowid)
+                    cursor.execute(
+                        "INSERT INTO grupo_partidos (partido_id, grupo_id, jornada) VALUES (?, ?, ?)",
+                        (cursor.lastrowid, grupo_id, jornada)
+                    )
+
+            conn.commit()
+            return partidos_ids
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al crear los grupos: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def listar_grupos() -> list[dict]:
+        """
+        Lista los grupos con su número de partidos jugados y totales.
+
+        Returns:
+            Lista de diccionarios con id, nombre, clasificados, partidos y jugados
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT g.id, g.nombre, g.clasificados,
+                       COUNT(p.id) AS partidos,
+                       COALESCE(SUM(p.estado = 'Jugado'), 0) AS jugados
+                FROM grupos g
+                LEFT JOIN grupo_partidos gp ON gp.grupo_id = g.id
+                LEFT JOIN partidos p ON p.id = gp.partido_id AND p.estado != 'Cancelado'
+                GROUP BY g.id
+                ORDER BY g.nombre
+            """)
+
+            return [dict(row) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al listar los grupos: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_clasificacion(grupo_id: int) -> list[dict]:
+        """
+        Obtiene la clasificación acumulada de un grupo, por puntos.
+
+        Args:
+            grupo_id: ID del grupo
+
+        Returns:
+            Lista de diccionarios con equipo_id, equipo_nombre y las columnas
+            acumuladas (jugados, ganados, empatados, perdidos, goles_favor,
+            goles_contra, puntos)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT c.*, e.nombre AS equipo_nombre
+                FROM clasificacion c
+                JOIN equipos e ON e.id = c.equipo_id
+                WHERE c.grupo_id = ?
+                ORDER BY c.puntos DESC
+            """, (grupo_id,))
+
+            return [dict(row) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al obtener la clasificación del grupo: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def listar_partidos_grupo(grupo_id: Optional[int] = None) -> list[dict]:
+        """
+        Lista los partidos de la fase de grupos con su resultado.
+
+        Args:
+            grupo_id: Solo los partidos de ese grupo (opcional)
+
+        Returns:
+            Lista de diccionarios con partido_id, grupo_id, jornada, local_id,
+            visitante_id, goles_local, goles_visitante, estado y el resultado
+            aplicado (goles_local_aplicado, goles_visitante_aplicado)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            query = """
+                SELECT gp.partido_id, gp.grupo_id, gp.jornada,
+                       gp.goles_local_aplicado, gp.goles_visitante_aplicado,
+                       p.equipo_local_id AS local_id, p.equipo_visitante_id AS visitante_id,
+                       p.goles_local, p.goles_visitante, p.estado
+                FROM grupo_partidos gp
+                JOIN partidos p ON p.id = gp.partido_id
+            """
+            params = []
+            if grupo_id is not None:
+                query += " WHERE gp.grupo_id = ?"
+                params.append(grupo_id)
+            query += " ORDER BY gp.jornada, p.slot"
+
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al listar los partidos de grupos: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_partido_grupo(partido_id: int) -> Optional[dict]:
+        """
+        Obtiene un partido de la fase de grupos con su resultado aplicado.
+
+        Args:
+            partido_id: ID del partido
+
+        Returns:
+            Diccionario como en listar_partidos_grupo o None si no es de grupos
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT gp.partido_id, gp.grupo_id, gp.jornada,
+                       gp.goles_local_aplicado, gp.goles_visitante_aplicado,
+                       p.equipo_local_id AS local_id, p.equipo_visitante_id AS visitante_id,
+                       p.goles_local, p.goles_visitante, p.estado
+                FROM grupo_partidos gp
+                JOIN partidos p ON p.id = gp.partido_id
+                WHERE gp.partido_id = ?
+            """, (partido_id,))
+
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al obtener el partido de grupos: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def aplicar_cambios(partido_id: int, grupo_id: int, cambios: dict[int, tuple],
+                        aplicado: tuple[Optional[int], Optional[int]]) -> None:
+        """
+        Suma los cambios de un resultado a la clasificación y lo marca como aplicado.
+
+        Todo se hace en una única transacción.
+
+        Args:
+            partido_id: ID del partido
+            grupo_id: ID del grupo
+            cambios: Diccionario {equipo_id: incrementos en el orden de
+                COLUMNAS_CLASIFICACION}
+            aplicado: Resultado (goles_local, goles_visitante) que queda sumado,
+                o (None, None) si ninguno
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            asignaciones = ", ".join(f"{columna} = {columna} + ?" for columna in COLUMNAS_CLASIFICACION)
+            cursor.executemany(
+                f"UPDATE clasificacion SET {asignaciones} WHERE grupo_id = ? AND equipo_id = ?",
+                [(*incrementos, grupo_id, equipo_id) for equipo_id, incrementos in cambios.items()]
+            )
+            cursor.execute("""
+                UPDATE grupo_partidos
+                SET goles_local_aplicado = ?, goles_visitante_aplicado = ?
+                WHERE partido_id = ?
+            """, (*aplicado, partido_id))
+
+            conn.commit()
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al actualizar la clasificación: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def reemplazar_clasificacion(totales: dict[tuple[int, int], tuple],
+                                 aplicados: dict[int, tuple[Optional[int], Optional[int]]]) -> None:
+        """
+        Sustituye la clasificación de todos los grupos en una única transacción.
+
+        Args:
+            totales: Diccionario {(grupo_id, equipo_id): totales en el orden de
+                COLUMNAS_CLASIFICACION}
+            aplicados: Diccionario {partido_id: (goles_local, goles_visitante)}
+                con el resultado que queda sumado de cada partido
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("DELETE FROM clasificacion")
+            cursor.executemany(f"""
+                INSERT INTO clasificacion (grupo_id, equipo_id, {", ".join(COLUMNAS_CLASIFICACION)})
+                VALUES (?, ?, {", ".join("?" for _ in COLUMNAS_CLASIFICACION)})
+            """, [(*clave, *valores) for clave, valores in totales.items()])
+            cursor.executemany("""
+                UPDATE grupo_partidos
+                SET goles_local_aplicado = ?, goles_visitante_aplicado = ?
+                WHERE partido_id = ?
+            """, [(*aplicado, partido_id) for partido_id, aplicado in aplicados.items()])
+
+            conn.commit()
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al recalcular la clasificación: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_equipos_grupos() -> dict[int, int]:
+        """
+        Obtiene el grupo de cada equipo.
+
+        Returns:
+            Diccionario {equipo_id: grupo_id}
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT equipo_id, grupo_id FROM grupo_equipos")
+            return {row['equipo_id']: row['grupo_id'] for row in cursor.fetchall()}
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al obtener los equipos de los grupos: {e}")
+        finally:
+            if conn:
+                conn.close()
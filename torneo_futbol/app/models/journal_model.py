@@ -0,0 +1,284 @@
+"""Modelo de datos del diario de cambios (tabla cambios)."""
+import json
+import sqlite3
+from typing import Optional
+from app.models.db import get_connection, DbError
+from app.models.schema import TABLAS_DIARIO, COLUMNAS_FUERA_DEL_DIARIO
+
+
+# Cambios que se devuelven como máximo en cada consulta de cambios_desde
+LIMITE_POR_DEFECTO = 1000
+
+
+def _decodificar(fila: sqlite3.Row) -> dict:
+    """Convierte una fila de cambios en diccionario con los campos JSON ya decodificados."""
+    cambio = dict(fila)
+    for campo in ("clave", "columnas", "antes", "despues"):
+        if cambio[campo] is not None:
+            cambio[campo] = json.loads(cambio[campo])
+    return cambio
+
+
+def _fila_actual(cursor: sqlite3.Cursor, cambio: dict) -> Optional[dict]:
+    """Fila que hay ahora en la tabla con la clave del cambio (None si no existe)."""
+    condicion = " AND ".join(f"{columna} = ?" for columna in cambio['clave'])
+    cursor.execute(f"SELECT * FROM {cambio['tabla']} WHERE {condicion}", list(cambio['clave'].values()))
+    fila = cursor.fetchone()
+    return dict(fila) if fila else None
+
+
+def _revertir_cambio(cursor: sqlite3.Cursor, cambio: dict) -> None:
+    """
+    Aplica la operación inversa de un cambio del diario.
+
+    Antes comprueba que la fila sigue como la dejó el cambio; si no, otra
+    operación posterior la ha tocado y revertir la pisaría.
+
+    Raises:
+        ValueError: Si la fila ha cambiado después
+    """
+    tabla, clave = cambio['tabla'], cambio['clave']
+    if tabla not in TABLAS_DIARIO:
+        raise ValueError(f"La tabla {tabla} no está en el diario")
+    actual = _fila_actual(cursor, cambio)
+    condicion = " AND ".join(f"{columna} = ?" for columna in clave)
+
+    if cambio['operacion'] == "insert":
+        conflicto = actual is None or any(
+            actual.get(columna) != valor for columna, valor in cambio['despues'].items()
+            if columna not in COLUMNAS_FUERA_DEL_DIARIO
+        )
+    elif cambio['operacion'] == "delete":
+        conflicto = actual is not None
+    else:
+        conflicto = actual is None or any(
+            actual.get(columna) != cambio['despues'].get(columna) for columna in cambio['columnas']
+        )
+    if conflicto:
+        raise ValueError(f"La fila {json.dumps(clave)} de {tabla} se ha modificado después")
+
+    if cambio['operacion'] == "insert":
+        cursor.execute(f"DELETE FROM {tabla} WHERE {condicion}", list(clave.values()))
+    elif cambio['operacion'] == "delete":
+        columnas = list(cambio['antes'])
+        cursor.execute(
+            f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' for _ in columnas)})",
+            [cambio['antes'][columna] for columna in columnas]
+        )
+    else:
+        columnas = cambio['columnas']
+        cursor.execute(
+            f"UPDATE {tabla} SET {', '.join(f'{columna} = ?' for columna in columnas)} WHERE {condicion}",
+            [cambio['antes'][columna] for columna in columnas] + list(clave.values())
+        )
+
+
+class JournalModel:
+    """
+    Modelo del diario de cambios.
+
+    Las filas las escriben los triggers creados en schema.py, en la misma
+    transacción que cada cambio de las tablas de TABLAS_DIARIO, así que los
+    modelos no tienen que hacer nada para que sus cambios queden anotados.
+    Aquí solo se leen, se purgan y se revierten.
+    """
+
+    @staticmethod
+    def ultima_secuencia() -> int:
+        """
+        Obtiene el número de secuencia del último cambio anotado.
+
+        Returns:
+            Último seq (0 si el diario está vacío)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            # sqlite_sequence conserva el último valor aunque se purgue el diario
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+            fila = cursor.fetchone()
+            return fila[0] if fila else 0
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer el diario de cambios: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def cambios_desde(seq: int, tablas: Optional[list[str]] = None,
+                      limite: int = LIMITE_POR_DEFECTO) -> list[dict]:
+        """
+        Obtiene los cambios posteriores a un número de secuencia, en orden.
+
+        Para leer todo lo pendiente se repite la llamada con el seq del último
+        cambio recibido hasta que devuelva una lista vacía.
+
+        Args:
+            seq: Último seq ya procesado (0 = desde el principio)
+            tablas: Solo cambios de estas tablas (opcional)
+            limite: Número máximo de cambios
+
+        Returns:
+            Lista de diccionarios con seq, tabla, fila_id, clave (dict de la
+            clave primaria), operacion ("insert", "update" o "delete"),
+            columnas (lista de columnas modificadas, solo en update), antes y
+            despues (fila completa como dict, o None) y fecha
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            query = "SELECT * FROM cambios WHERE seq > ?"
+            params: list = [seq]
+            if tablas:
+                query += f" AND tabla IN ({', '.join('?' for _ in tablas)})"
+                params.extend(tablas)
+            query += " ORDER BY seq LIMIT ?"
+            params.append(limite)
+
+            cursor.execute(query, params)
+            return [_decodificar(fila) for fila in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer el diario de cambios: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def filas_cambiadas_desde(seq: int) -> dict[str, set]:
+        """
+        Resume qué filas han cambiado después de un número de secuencia.
+
+        Útil para cachés que solo necesitan saber qué invalidar.
+
+        Args:
+            seq: Último seq ya procesado
+
+        Returns:
+            Diccionario {tabla: conjunto de fila_id (o de claves JSON en las
+            tablas con clave compuesta)}
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT DISTINCT tabla, COALESCE(fila_id, clave) AS fila
+                FROM cambios
+                WHERE seq > ?
+            """, (seq,))
+
+            cambiadas: dict[str, set] = {}
+            for fila in cursor.fetchall():
+                cambiadas.setdefault(fila['tabla'], set()).add(fila['fila'])
+            return cambiadas
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer el diario de cambios: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def purgar_hasta(seq: int) -> int:
+        """
+        Borra los cambios con número de secuencia menor o igual que seq.
+
+        Solo deben purgarse los cambios que ya han procesado todos los
+        consumidores. Los números de secuencia nuevos siguen creciendo.
+
+        Args:
+            seq: Último seq que se puede borrar
+
+        Returns:
+            Número de cambios borrados
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("DELETE FROM cambios WHERE seq <= ?", (seq,))
+            conn.commit()
+            return cursor.rowcount
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al purgar el diario de cambios: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def revertir(desde: int, hasta: int) -> list[dict]:
+        """
+        Deshace los cambios de un rango de secuencias en una sola transacción.
+
+        Se aplican las operaciones inversas del último cambio al primero
+        (borrar lo insertado, volver a insertar lo borrado y devolver las
+        columnas modificadas a su valor anterior), así que el coste depende
+        de las filas del rango y no del tamaño de la base de datos. Las
+        claves foráneas se comprueban al final, porque el orden inverso puede
+        insertar filas hijas antes que su padre. La reversión queda anotada
+        en el diario como cualquier otro cambio.
+
+        Args:
+            desde: Primer seq del rango
+            hasta: Último seq del rango
+
+        Returns:
+            Cambios revertidos, del último al primero
+
+        Raises:
+            ValueError: Si el rango ya se ha purgado del diario o alguna fila
+                se ha modificado después (no se revierte nada)
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "SELECT * FROM cambios WHERE seq BETWEEN ? AND ? ORDER BY seq DESC", (desde, hasta)
+            )
+            cambios = [_decodificar(fila) for fila in cursor.fetchall()]
+            if not cambios or cambios[-1]['seq'] != desde:
+                raise ValueError("Los cambios ya no están en el diario")
+
+            cursor.execute("SAVEPOINT revertir")
+            try:
+                cursor.execute("PRAGMA defer_foreign_keys = ON")
+                for cambio in cambios:
+                    _revertir_cambio(cursor, cambio)
+                cursor.execute("RELEASE revertir")
+            except (ValueError, sqlite3.Error):
+                cursor.execute("ROLLBACK TO revertir")
+                cursor.execute("RELEASE revertir")
+                raise
+            return cambios
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al revertir cambios del diario: {e}")
+        finally:
+            if conn:
+                conn.close()
@@ -3,7 +3,9 @@ Modelo para la gestión de partidos.
 """
 import sqlite3
 from typing import Optional
-from app.models.db import get_connection
+from app.models.db import get_connection, DbError, ConflictoVersionError
+from app.models.schema import TORNEO_ACTIVO
+from app.constants import FASE_GRUPOS
 
 
 class MatchModel:
@@ -35,14 +37,14 @@ class MatchModel:
         conn = get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
+        cursor.execute(f"""
             INSERT INTO partidos (
-                eliminatoria, slot, fecha_hora,
+                torneo_id, eliminatoria, slot, fecha_hora,
                 equipo_local_id, equipo_visitante_id,
                 arbitro_id, goles_local, goles_visitante,
                 penaltis_local, penaltis_visitante,
                 ganador_equipo_id, estado
-            ) VALUES (?, ?, ?, ?, ?, NULL, NULL, NULL, NULL, NULL, NULL, ?)
+            ) VALUES ({TORNEO_ACTIVO}, ?, ?, ?, ?, ?, NULL, NULL, NULL, NULL, NULL, NULL, ?)
         """, (eliminatoria, slot, fecha_hora, local_id, visitante_id, estado))
         
         conn.commit()
@@ -53,11 +55,13 @@ class MatchModel:
 
     @staticmethod
     def borrar_todos_los_partidos() -> None:
-        """Elimina todos los partidos de la base de datos."""
+        """Elimina todos los partidos del torneo activo."""
         conn = get_connection()
         cursor = conn.cursor()
         
-        cursor.execute("DELETE FROM partidos")
+        cursor.execute(f"DELETE FROM partidos WHERE torneo_id = {TORNEO_ACTIVO}")
+        # Sin sus partidos, los grupos (y su clasificación) no tienen sentido
+        cursor.execute("DELETE FROM grupos")
         
         conn.commit()
         conn.close()
@@ -93,7 +97,7 @@ class MatchModel:
                 END as arbitro_nombre,
                 p.goles_local, p.goles_visitante,
                 p.penaltis_local, p.penaltis_visitante,
-                p.ganador_equipo_id, p.estado
+                p.ganador_equipo_id, p.estado, p.version
             FROM partidos p
             LEFT JOIN equipos el ON p.equipo_local_id = el.id
             LEFT JOIN equipos ev ON p.equipo_visitante_id = ev.id
@@ -113,15 +117,8 @@ class MatchModel:
         
         consulta += " ORDER BY p.fecha_hora DESC, p.eliminatoria, p.slot"
         
-        print(f"[APP-QUERY] SQL: {consulta}")
-        print(f"[APP-QUERY] Params: {parametros}")
         cursor.execute(consulta, parametros)
         filas = cursor.fetchall()
-        print(f"[APP-QUERY] Resultado: {len(filas)} partidos")
-        if len(filas) > 0:
-            print(f"[APP-QUERY] Primeros 3 partidos:")
-            for i, fila in enumerate(filas[:3]):
-                print(f"  [{i+1}] ID:{fila[0]} Fecha:{fila[3]} Local:{fila[5]} vs Visitante:{fila[7]} Estado:{fila[15]}")
         conn.close()
         
         partidos = []
@@ -144,7 +141,8 @@ class MatchModel:
                 "penaltis_local": fila[12],
                 "penaltis_visitante": fila[13],
                 "ganador_equipo_id": fila[14],
-                "estado": fila[15]
+                "estado": fila[15],
+                "version": fila[16]
             })
         
         return partidos
@@ -175,7 +173,7 @@ class MatchModel:
                 END as arbitro_nombre,
                 p.goles_local, p.goles_visitante,
                 p.penaltis_local, p.penaltis_visitante,
-                p.ganador_equipo_id, p.estado
+                p.ganador_equipo_id, p.estado, p.version
             FROM partidos p
             LEFT JOIN equipos el ON p.equipo_local_id = el.id
             LEFT JOIN equipos ev ON p.equipo_visitante_id = ev.id
@@ -205,7 +203,8 @@ class MatchModel:
                 "penaltis_local": fila[12],
                 "penaltis_visitante": fila[13],
                 "ganador_equipo_id": fila[14],
-                "estado": fila[15]
+                "estado": fila[15],
+                "version": fila[16]
             }
         return None
 
@@ -275,7 +274,7 @@ class MatchModel:
                 END as arbitro_nombre,
                 p.goles_local, p.goles_visitante,
                 p.penaltis_local, p.penaltis_visitante,
-                p.ganador_equipo_id, p.estado
+                p.ganador_equipo_id, p.estado, p.version
             FROM partidos p
             LEFT JOIN equipos el ON p.equipo_local_id = el.id
             LEFT JOIN equipos ev ON p.equipo_visitante_id = ev.id
@@ -306,7 +305,8 @@ class MatchModel:
                 "penaltis_local": fila[12],
                 "penaltis_visitante": fila[13],
                 "ganador_equipo_id": fila[14],
-                "estado": fila[15]
+                "estado": fila[15],
+                "version": fila[16]
             })
         return partidos
     
@@ -333,7 +333,7 @@ class MatchModel:
                 END as arbitro_nombre,
                 p.goles_local, p.goles_visitante,
                 p.penaltis_local, p.penaltis_visitante,
-                p.ganador_equipo_id, p.estado
+                p.ganador_equipo_id, p.estado, p.version
             FROM partidos p
             LEFT JOIN equipos el ON p.equipo_local_id = el.id
             LEFT JOIN equipos ev ON p.equipo_visitante_id = ev.id
@@ -364,7 +364,8 @@ class MatchModel:
                 "penaltis_local": fila[12],
                 "penaltis_visitante": fila[13],
                 "ganador_equipo_id": fila[14],
-                "estado": fila[15]
+                "estado": fila[15],
+                "version": fila[16]
             })
         return partidos
 
@@ -394,7 +395,7 @@ class MatchModel:
                 END as arbitro_nombre,
                 p.goles_local, p.goles_visitante,
                 p.penaltis_local, p.penaltis_visitante,
-                p.ganador_equipo_id, p.estado
+                p.ganador_equipo_id, p.estado, p.version
             FROM partidos p
             LEFT JOIN equipos el ON p.equipo_local_id = el.id
             LEFT JOIN equipos ev ON p.equipo_visitante_id = ev.id
@@ -425,7 +426,8 @@ class MatchModel:
                 "penaltis_local": fila[12],
                 "penaltis_visitante": fila[13],
                 "ganador_equipo_id": fila[14],
-                "estado": fila[15]
+                "estado": fila[15],
+                "version": fila[16]
             })
         return partidos
 
@@ -454,7 +456,8 @@ class MatchModel:
         goles_local: int,
         goles_visitante: int,
         penaltis_local: Optional[int] = None,
-        penaltis_visitante: Optional[int] = None
+        penaltis_visitante: Optional[int] = None,
+        version: Optional[int] = None
     ) -> dict:
         """
         Guarda el resultado de un partido y determina el ganador.
@@ -465,9 +468,15 @@ class MatchModel:
             goles_visitante: Goles del equipo visitante
             penaltis_local: Goles en penaltis del equipo local (opcional)
             penaltis_visitante: Goles en penaltis del equipo visitante (opcional)
+            version: Versión del partido que se leyó antes de editarlo; si se
+                indica y el partido ha cambiado desde entonces no se guarda
             
         Returns:
             Diccionario con ganador_equipo_id, estado actualizado y estado_previo
+            
+        Raises:
+            ValueError: Si el partido no existe
+            ConflictoVersionError: Si el partido ha cambiado desde que se leyó
         """
         conn = get_connection()
         cursor = conn.cursor()
@@ -485,23 +494,12 @@ class MatchModel:
         
         local_id, visitante_id, estado_previo = fila
         
-        # Determinar ganador
-        ganador_equipo_id = None
+        ganador_equipo_id = MatchModel._determinar_ganador(
+            local_id, visitante_id, goles_local, goles_visitante,
+            penaltis_local, penaltis_visitante
+        )
         
-        if goles_local > goles_visitante:
-            ganador_equipo_id = local_id
-        elif goles_visitante > goles_local:
-            ganador_equipo_id = visitante_id
-        else:
-            # Empate en tiempo regular, verificar penaltis
-            if penaltis_local is not None and penaltis_visitante is not None:
-                if penaltis_local > penaltis_visitante:
-                    ganador_equipo_id = local_id
-                elif penaltis_visitante > penaltis_local:
-                    ganador_equipo_id = visitante_id
-                # Si también empatan en penaltis, ganador_equipo_id queda None
-        
-        # Actualizar partido
+        # Actualizar partido (solo si sigue en la versión leída, cuando se indica)
         cursor.execute("""
             UPDATE partidos 
             SET goles_local = ?,
@@ -510,9 +508,16 @@ class MatchModel:
                 penaltis_visitante = ?,
                 ganador_equipo_id = ?,
                 estado = 'Jugado'
-            WHERE id = ?
+            WHERE id = ? AND (? IS NULL OR version = ?)
         """, (goles_local, goles_visitante, penaltis_local, penaltis_visitante, 
-              ganador_equipo_id, partido_id))
+              ganador_equipo_id, partido_id, version, version))
+        
+        if cursor.rowcount == 0:
+            conn.rollback()
+            conn.close()
+            raise ConflictoVersionError(
+                f"El partido {partido_id} ha sido modificado por otro usuario desde que se abrió"
+            )
         
         conn.commit()
         conn.close()
@@ -523,6 +528,128 @@ class MatchModel:
             "estado_previo": estado_previo
         }
 
+    @staticmethod
+    def _determinar_ganador(
+        local_id: Optional[int],
+        visitante_id: Optional[int],
+        goles_local: int,
+        goles_visitante: int,
+        penaltis_local: Optional[int] = None,
+        penaltis_visitante: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Determina el ganador por goles y, si hay empate, por penaltis.
+        
+        Returns:
+            ID del equipo ganador o None si el partido queda empatado
+        """
+        if goles_local > goles_visitante:
+            return local_id
+        if goles_visitante > goles_local:
+            return visitante_id
+        # Empate en tiempo regular, verificar penaltis
+        if penaltis_local is not None and penaltis_visitante is not None:
+            if penaltis_local > penaltis_visitante:
+                return local_id
+            if penaltis_visitante > penaltis_local:
+                return visitante_id
+        # Si también empatan en penaltis, no hay ganador
+        return None
+
+    @staticmethod
+    def guardar_resultados(resultados: list[dict]) -> list[dict]:
+        """
+        Guarda el resultado de varios partidos en una única transacción.
+        
+        Si algún partido no existe no se guarda ninguno. En la fase de grupos
+        los penaltis se ignoran, igual que en el diálogo del partido.
+        
+        Args:
+            resultados: Lista de diccionarios con partido_id, goles_local,
+                goles_visitante y, opcionalmente, penaltis_local, penaltis_visitante
+                y version (la versión leída del partido)
+            
+        Returns:
+            Lista de diccionarios con partido_id, eliminatoria, ganador_equipo_id
+            y estado_previo, en el mismo orden
+            
+        Raises:
+            ValueError: Si algún partido no existe
+            ConflictoVersionError: Si algún partido ha cambiado desde la versión
+                indicada (no se guarda ninguno)
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            # Bloqueo de escritura desde la lectura: las versiones comprobadas
+            # no pueden cambiar antes de guardar
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            guardados = []
+            filas_update = []
+            for resultado in resultados:
+                cursor.execute(
+                    "SELECT equipo_local_id, equipo_visitante_id, eliminatoria, estado, version "
+                    "FROM partidos WHERE id = ?",
+                    (resultado['partido_id'],)
+                )
+                fila = cursor.fetchone()
+                if not fila:
+                    raise ValueError(f"Partido con ID {resultado['partido_id']} no encontrado")
+                
+                local_id, visitante_id, eliminatoria, estado_previo, version = fila
+                if resultado.get('version') is not None and resultado['version'] != version:
+                    raise ConflictoVersionError(
+                        f"El partido {resultado['partido_id']} ha sido modificado por otro usuario"
+                    )
+                penaltis_local = resultado.get('penaltis_local')
+                penaltis_visitante = resultado.get('penaltis_visitante')
+                if eliminatoria == FASE_GRUPOS:
+                    penaltis_local = penaltis_visitante = None
+                ganador_equipo_id = MatchModel._determinar_ganador(
+                    local_id, visitante_id, resultado['goles_local'], resultado['goles_visitante'],
+                    penaltis_local, penaltis_visitante
+                )
+                filas_update.append((
+                    resultado['goles_local'], resultado['goles_visitante'],
+                    penaltis_local, penaltis_visitante,
+                    ganador_equipo_id, resultado['partido_id']
+                ))
+                guardados.append({
+                    "partido_id": resultado['partido_id'],
+                    "eliminatoria": eliminatoria,
+                    "ganador_equipo_id": ganador_equipo_id,
+                    "estado_previo": estado_previo
+                })
+            
+            cursor.executemany("""
+                UPDATE partidos 
+                SET goles_local = ?,
+                    goles_visitante = ?,
+                    penaltis_local = ?,
+                    penaltis_visitante = ?,
+                    ganador_equipo_id = ?,
+                    estado = 'Jugado'
+                WHERE id = ?
+            """, filas_update)
+            
+            conn.commit()
+            return guardados
+            
+        except (ValueError, ConflictoVersionError):
+            if conn:
+                conn.rollback()
+            raise
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al guardar los resultados: {e}")
+        finally:
+            if conn:
+                conn.close()
+
     @staticmethod
     def insertar_partido(
         eliminatoria: str,
@@ -556,12 +683,12 @@ class MatchModel:
         )
         slot = cursor.fetchone()[0]
         
-        cursor.execute("""
+        cursor.execute(f"""
             INSERT INTO partidos (
-                eliminatoria, slot, fecha_hora,
+                torneo_id, eliminatoria, slot, fecha_hora,
                 equipo_local_id, equipo_visitante_id,
                 arbitro_id, estado
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ) VALUES ({TORNEO_ACTIVO}, ?, ?, ?, ?, ?, ?, ?)
         """, (eliminatoria, slot, fecha_hora, local_id, visitante_id, arbitro_id, estado))
         
         conn.commit()
@@ -699,3 +826,92 @@ class MatchModel:
             })
         
         return partidos
+
+    @staticmethod
+    def obtener_goles_por_equipo() -> dict[int, dict]:
+        """
+        Obtiene los goles a favor y en contra de cada equipo en partidos jugados.
+        
+        Returns:
+            Diccionario {equipo_id: {"jugados", "goles_favor", "goles_contra"}}
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        # Cada partido jugado aporta una fila por equipo (local y visitante)
+        cursor.execute("""
+            SELECT equipo_id, COUNT(*), SUM(favor), SUM(contra)
+            FROM (
+                SELECT equipo_local_id AS equipo_id,
+                       COALESCE(goles_local, 0) AS favor,
+                       COALESCE(goles_visitante, 0) AS contra
+                FROM partidos
+                WHERE estado = 'Jugado' AND equipo_local_id IS NOT NULL
+                UNION ALL
+                SELECT equipo_visitante_id,
+                       COALESCE(goles_visitante, 0),
+                       COALESCE(goles_local, 0)
+                FROM partidos
+                WHERE estado = 'Jugado' AND equipo_visitante_id IS NOT NULL
+            )
+            GROUP BY equipo_id
+        """)
+        
+        filas = cursor.fetchall()
+        conn.close()
+        
+        return {
+            fila[0]: {"jugados": fila[1], "goles_favor": fila[2], "goles_contra": fila[3]}
+            for fila in filas
+        }
+
+    @staticmethod
+    def programar_partidos(asignaciones: list[dict]) -> int:
+        """
+        Guarda fecha, campo y árbitro de varios partidos en una única transacción.
+        
+        Los partidos en estado "Pendiente" pasan a "Programado".
+        
+        Args:
+            asignaciones: Lista de diccionarios con partido_id, fecha_hora,
+                campo y arbitro_id (None para dejar el partido sin árbitro)
+            
+        Returns:
+            Número de partidos actualizados
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.executemany("""
+                UPDATE partidos
+                SET fecha_hora = :fecha_hora,
+                    campo = :campo,
+                    arbitro_id = :arbitro_id,
+                    estado = CASE WHEN estado = 'Pendiente' THEN 'Programado' ELSE estado END
+                WHERE id = :partido_id
+            """, asignaciones)
+            conn.commit()
+            return len(asignaciones)
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def obtener_campos_asignados() -> dict[int, int]:
+        """
+        Obtiene el campo asignado a cada partido que ya tiene uno.
+        
+        Returns:
+            Diccionario {partido_id: campo}
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT id, campo FROM partidos WHERE campo IS NOT NULL")
+        filas = cursor.fetchall()
+        conn.close()
+        
+        return {fila[0]: fila[1] for fila in filas}
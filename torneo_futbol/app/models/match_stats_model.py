@@ -365,3 +365,89 @@ class MatchStatsModel:
         
         conn.commit()
         conn.close()
+
+    @staticmethod
+    def obtener_tarjetas(partido_id: int = None) -> list[dict]:
+        """
+        Obtiene las tarjetas de los partidos jugados, con el equipo de cada jugador.
+        
+        Args:
+            partido_id: Si se indica, solo las de ese partido
+            
+        Returns:
+            Lista de diccionarios con partido_id, participante_id, equipo_id,
+            amarillas y rojas (solo filas con alguna tarjeta)
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        consulta = """
+            SELECT sp.partido_id, sp.participante_id, c.equipo_id, sp.amarillas, sp.rojas
+            FROM stats_partido sp
+            INNER JOIN convocados c
+                ON c.partido_id = sp.partido_id AND c.participante_id = sp.participante_id
+            INNER JOIN partidos pt ON pt.id = sp.partido_id
+            WHERE pt.estado = 'Jugado' AND (sp.amarillas > 0 OR sp.rojas > 0)
+        """
+        parametros = []
+        if partido_id is not None:
+            consulta += " AND sp.partido_id = ?"
+            parametros.append(partido_id)
+        
+        cursor.execute(consulta, parametros)
+        filas = cursor.fetchall()
+        conn.close()
+        
+        return [
+            {
+                "partido_id": fila[0],
+                "participante_id": fila[1],
+                "equipo_id": fila[2],
+                "amarillas": fila[3],
+                "rojas": fila[4]
+            }
+            for fila in filas
+        ]
+
+    @staticmethod
+    def obtener_stats_jugados(partido_id: int = None) -> list[dict]:
+        """
+        Obtiene las estadísticas de los partidos jugados con la ronda de cada partido.
+        
+        Args:
+            partido_id: Si se indica, solo las de ese partido (vacío si no está jugado)
+            
+        Returns:
+            Lista de diccionarios con partido_id, eliminatoria, participante_id,
+            goles, amarillas y rojas
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        consulta = """
+            SELECT sp.partido_id, pt.eliminatoria, sp.participante_id,
+                   sp.goles, sp.amarillas, sp.rojas
+            FROM stats_partido sp
+            INNER JOIN partidos pt ON pt.id = sp.partido_id
+            WHERE pt.estado = 'Jugado'
+        """
+        parametros = []
+        if partido_id is not None:
+            consulta += " AND sp.partido_id = ?"
+            parametros.append(partido_id)
+        
+        cursor.execute(consulta, parametros)
+        filas = cursor.fetchall()
+        conn.close()
+        
+        return [
+            {
+                "partido_id": fila[0],
+                "eliminatoria": fila[1],
+                "participante_id": fila[2],
+                "goles": fila[3] or 0,
+                "amarillas": fila[4] or 0,
+                "rojas": fila[5] or 0
+            }
+            for fila in filas
+        ]
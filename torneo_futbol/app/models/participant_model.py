@@ -224,12 +224,6 @@ class ParticipantModel:
         
         cursor.execute(consulta, parametros)
         filas = cursor.fetchall()
-        
-        if len(filas) == 0:
-            print(f"⚠️ 0 participantes encontrados")
-            print(f"Query: {consulta}")
-            print(f"Parámetros: {parametros}")
-        
         conn.close()
         
         participantes = []
@@ -431,3 +425,39 @@ class ParticipantModel:
             raise e
         finally:
             conn.close()
+
+    @staticmethod
+    def recalcular_acumulados() -> int:
+        """
+        Recalcula desde cero los goles y tarjetas acumulados de todos los participantes.
+        
+        Suma las estadísticas de los partidos en estado "Jugado", en una única
+        transacción. Corrige los acumulados que hayan quedado desfasados al
+        editar o borrar partidos ya jugados.
+        
+        Returns:
+            Número de participantes actualizados
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            jugados = """
+                FROM stats_partido s
+                JOIN partidos p ON p.id = s.partido_id
+                WHERE s.participante_id = participantes.id AND p.estado = 'Jugado'
+            """
+            cursor.execute(f"""
+                UPDATE participantes
+                SET goles = (SELECT COALESCE(SUM(s.goles), 0) {jugados}),
+                    t_amarillas = (SELECT COALESCE(SUM(s.amarillas), 0) {jugados}),
+                    t_rojas = (SELECT COALESCE(SUM(s.rojas), 0) {jugados})
+            """)
+            conn.commit()
+            return cursor.rowcount
+            
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
@@ -0,0 +1,199 @@
+"""Modelo de datos para los ratings de los equipos."""
+import sqlite3
+from typing import Optional
+from app.models.db import get_connection, DbError
+
+
+class RatingModel:
+    """Modelo para las tablas ratings_equipos y ratings_historial."""
+
+    @staticmethod
+    def obtener_ratings() -> dict[int, dict]:
+        """
+        Obtiene el rating actual de cada equipo que ya ha jugado.
+
+        Returns:
+            Diccionario {equipo_id: {"rating", "partidos"}}
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT equipo_id, rating, partidos FROM ratings_equipos")
+
+            return {
+                row['equipo_id']: {"rating": row['rating'], "partidos": row['partidos']}
+                for row in cursor.fetchall()
+            }
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al obtener ratings: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_entrada_historial(partido_id: int) -> Optional[dict]:
+        """
+        Obtiene el registro del historial de un partido.
+
+        Args:
+            partido_id: ID del partido
+
+        Returns:
+            Diccionario con los datos del registro o None si el partido no se ha puntuado
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "SELECT * FROM ratings_historial WHERE partido_id = ?",
+                (partido_id,)
+            )
+
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al obtener historial de ratings: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_historial() -> list[dict]:
+        """
+        Obtiene el historial completo en orden de aplicación.
+
+        Returns:
+            Lista de registros (partido_id, equipos, goles, ratings previos, delta, fecha)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM ratings_historial ORDER BY id")
+
+            return [dict(row) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al obtener historial de ratings: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def registrar_partido(entrada: dict, rating_local: float, rating_visitante: float) -> None:
+        """
+        Añade un partido al historial y actualiza el rating de sus dos equipos.
+
+        Todo se hace en una única transacción.
+
+        Args:
+            entrada: Registro del historial (partido_id, equipo_local_id,
+                equipo_visitante_id, goles_local, goles_visitante, rating_local,
+                rating_visitante, delta, fecha)
+            rating_local: Nuevo rating del equipo local
+            rating_visitante: Nuevo rating del equipo visitante
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO ratings_historial (
+                    partido_id, equipo_local_id, equipo_visitante_id,
+                    goles_local, goles_visitante,
+                    rating_local, rating_visitante, delta, fecha
+                ) VALUES (
+                    :partido_id, :equipo_local_id, :equipo_visitante_id,
+                    :goles_local, :goles_visitante,
+                    :rating_local, :rating_visitante, :delta, :fecha
+                )
+            """, entrada)
+
+            for equipo_id, rating in (
+                (entrada['equipo_local_id'], rating_local),
+                (entrada['equipo_visitante_id'], rating_visitante)
+            ):
+                cursor.execute("""
+                    INSERT INTO ratings_equipos (equipo_id, rating, partidos)
+                    VALUES (?, ?, 1)
+                    ON CONFLICT(equipo_id) DO UPDATE SET
+                        rating = excluded.rating,
+                        partidos = partidos + 1
+                """, (equipo_id, rating))
+
+            conn.commit()
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al registrar rating del partido: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def reemplazar_historial(entradas: list[dict], ratings: dict[int, tuple[float, int]]) -> None:
+        """
+        Sustituye el historial y los ratings actuales en una única transacción.
+
+        Args:
+            entradas: Registros del historial en orden de aplicación
+            ratings: Diccionario {equipo_id: (rating, partidos)}; se ignoran
+                los equipos que ya no existen
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("DELETE FROM ratings_historial")
+            cursor.executemany("""
+                INSERT INTO ratings_historial (
+                    partido_id, equipo_local_id, equipo_visitante_id,
+                    goles_local, goles_visitante,
+                    rating_local, rating_visitante, delta, fecha
+                ) VALUES (
+                    :partido_id, :equipo_local_id, :equipo_visitante_id,
+                    :goles_local, :goles_visitante,
+                    :rating_local, :rating_visitante, :delta, :fecha
+                )
+            """, entradas)
+
+            cursor.execute("DELETE FROM ratings_equipos")
+            cursor.executemany("""
+                INSERT INTO ratings_equipos (equipo_id, rating, partidos)
+                SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM equipos WHERE id = ?)
+            """, [(eid, r, n, eid) for eid, (r, n) in ratings.items()])
+
+            conn.commit()
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al reconstruir ratings: {e}")
+        finally:
+            if conn:
+                conn.close()
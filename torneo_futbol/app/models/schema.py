@@ -2,6 +2,123 @@
 import sqlite3
 
 
+def _asegurar_columna(cursor: sqlite3.Cursor, tabla: str, columna: str, definicion: str) -> None:
+    """
+    Añade una columna a una tabla existente si aún no la tiene.
+    
+    CREATE TABLE IF NOT EXISTS no modifica las tablas de bases de datos
+    anteriores, así que las columnas nuevas se añaden con ALTER TABLE.
+    
+    Args:
+        cursor: Cursor de la conexión
+        tabla: Nombre de la tabla
+        columna: Nombre de la columna
+        definicion: Tipo y restricciones de la columna (p. ej. "INTEGER")
+    """
+    cursor.execute(f"PRAGMA table_info({tabla})")
+    if columna not in {fila[1] for fila in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {definicion}")
+        print(f"✓ Columna {tabla}.{columna} añadida")
+
+
+# Tablas cuyos cambios se registran en el diario (tabla cambios). La
+# clasificación de grupos no está porque se recalcula desde los partidos.
+TABLAS_DIARIO = (
+    "equipos", "participantes", "partidos", "convocados", "stats_partido", "goles",
+    "grupos", "grupo_equipos", "grupo_partidos",
+)
+
+# Columnas de control que no cuentan como cambio: el diario no anota las
+# actualizaciones que solo las tocan y deshacer nunca las revierte
+COLUMNAS_FUERA_DEL_DIARIO = ("version",)
+
+# Subconsulta con el id del torneo activo, para las filas nuevas de partidos
+TORNEO_ACTIVO = "(SELECT id FROM torneos WHERE estado = 'activo')"
+
+
+def _crear_triggers_diario(cursor: sqlite3.Cursor, tabla: str) -> None:
+    """
+    (Re)crea los triggers que anotan en cambios cada INSERT, UPDATE y DELETE de una tabla.
+    
+    Se generan a partir de las columnas actuales de la tabla, así que se
+    vuelven a crear en cada arranque por si se ha añadido alguna. Al ser
+    triggers, la anotación va en la misma transacción que el cambio.
+    
+    Args:
+        cursor: Cursor de la conexión
+        tabla: Nombre de la tabla
+    """
+    cursor.execute(f"PRAGMA table_info({tabla})")
+    info = cursor.fetchall()
+    columnas = [fila[1] for fila in info]
+    clave = [fila[1] for fila in sorted(info, key=lambda f: f[5]) if fila[5]]
+    # Las tablas con id entero guardan también el id en fila_id para consultarlo sin JSON
+    fila_id = "{0}.id" if clave == ["id"] else "NULL"
+
+    def objeto(prefijo: str, nombres: list[str]) -> str:
+        return "json_object(" + ", ".join(f"'{c}', {prefijo}.{c}" for c in nombres) + ")"
+
+    datos = [c for c in columnas if c not in COLUMNAS_FUERA_DEL_DIARIO]
+    distintas = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in datos)
+    cambiadas = " UNION ALL ".join(
+        f"SELECT '{c}' AS columna WHERE OLD.{c} IS NOT NEW.{c}" for c in datos
+    )
+
+    for operacion in ("insert", "update", "delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS diario_{tabla}_{operacion}")
+
+    cursor.execute(f"""
+        CREATE TRIGGER diario_{tabla}_insert AFTER INSERT ON {tabla}
+        BEGIN
+            INSERT INTO cambios (tabla, fila_id, clave, operacion, despues)
+            VALUES ('{tabla}', {fila_id.format("NEW")}, {objeto("NEW", clave)}, 'insert', {objeto("NEW", columnas)});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER diario_{tabla}_update AFTER UPDATE ON {tabla}
+        WHEN {distintas}
+        BEGIN
+            INSERT INTO cambios (tabla, fila_id, clave, operacion, columnas, antes, despues)
+            VALUES ('{tabla}', {fila_id.format("NEW")}, {objeto("NEW", clave)}, 'update',
+                    (SELECT json_group_array(columna) FROM ({cambiadas})),
+                    {objeto("OLD", columnas)}, {objeto("NEW", columnas)});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER diario_{tabla}_delete AFTER DELETE ON {tabla}
+        BEGIN
+            INSERT INTO cambios (tabla, fila_id, clave, operacion, antes)
+            VALUES ('{tabla}', {fila_id.format("OLD")}, {objeto("OLD", clave)}, 'delete', {objeto("OLD", columnas)});
+        END
+    """)
+
+
+def _crear_trigger_version(cursor: sqlite3.Cursor, tabla: str) -> None:
+    """
+    (Re)crea el trigger que incrementa la columna version en cada UPDATE que cambia datos.
+    
+    La versión permite el bloqueo optimista: quien guarda indica la versión
+    que leyó y el guardado se rechaza si entretanto otra instancia (u otro
+    equipo con la misma base de datos) ha modificado la fila.
+    
+    Args:
+        cursor: Cursor de la conexión
+        tabla: Nombre de la tabla (con columnas id y version)
+    """
+    cursor.execute(f"PRAGMA table_info({tabla})")
+    datos = [fila[1] for fila in cursor.fetchall() if fila[1] not in COLUMNAS_FUERA_DEL_DIARIO]
+    distintas = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in datos)
+    
+    cursor.execute(f"DROP TRIGGER IF EXISTS version_{tabla}")
+    cursor.execute(f"""
+        CREATE TRIGGER version_{tabla} AFTER UPDATE ON {tabla}
+        WHEN NEW.version = OLD.version AND ({distintas})
+        BEGIN
+            UPDATE {tabla} SET version = OLD.version + 1 WHERE id = NEW.id;
+        END
+    """)
+
+
 def create_schema(conn: sqlite3.Connection) -> None:
     """
     Crea el esquema completo de la base de datos.
@@ -43,6 +160,31 @@ def create_schema(conn: sqlite3.Connection) -> None:
         )
     """)
     
+    # Torneos (ediciones). Solo hay uno activo: sus partidos son los de las
+    # tablas de siempre. Los archivados se guardan aparte, cada uno en su
+    # propio archivo de solo lectura (app.services.archive_service), y aquí
+    # queda su ficha con la ruta del archivo
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS torneos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'activo' CHECK (estado IN ('activo', 'archivado')),
+            inicio TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+            fin TEXT,
+            archivo TEXT,
+            campeon TEXT,
+            partidos INTEGER
+        )
+    """)
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_torneos_activo ON torneos(estado) WHERE estado = 'activo'"
+    )
+    cursor.execute("""
+        INSERT INTO torneos (nombre)
+        SELECT 'Torneo ' || strftime('%Y', 'now', 'localtime')
+        WHERE NOT EXISTS (SELECT 1 FROM torneos WHERE estado = 'activo')
+    """)
+    
     # Tabla de partidos
     # NOTA: equipo_local_id y equipo_visitante_id permiten NULL para soportar 
     # partidos con equipos por definir (cuando solo un ganador ha avanzado)
@@ -61,6 +203,9 @@ def create_schema(conn: sqlite3.Connection) -> None:
             penaltis_visitante INTEGER,
             ganador_equipo_id INTEGER,
             estado TEXT NOT NULL DEFAULT 'Pendiente',
+            campo INTEGER,
+            version INTEGER NOT NULL DEFAULT 0,
+            torneo_id INTEGER REFERENCES torneos(id),
             FOREIGN KEY (equipo_local_id) REFERENCES equipos(id) ON DELETE RESTRICT,
             FOREIGN KEY (equipo_visitante_id) REFERENCES equipos(id) ON DELETE RESTRICT,
             FOREIGN KEY (arbitro_id) REFERENCES participantes(id) ON DELETE SET NULL,
@@ -69,6 +214,16 @@ def create_schema(conn: sqlite3.Connection) -> None:
         )
     """)
     
+    # Campo (pista) asignado por el programador de partidos
+    _asegurar_columna(cursor, "partidos", "campo", "INTEGER")
+    
+    # Versión de cada partido para rechazar guardados que pisarían cambios ajenos
+    _asegurar_columna(cursor, "partidos", "version", "INTEGER NOT NULL DEFAULT 0")
+    
+    # Torneo al que pertenece cada partido (los de antes, al activo)
+    _asegurar_columna(cursor, "partidos", "torneo_id", "INTEGER REFERENCES torneos(id)")
+    cursor.execute(f"UPDATE partidos SET torneo_id = {TORNEO_ACTIVO} WHERE torneo_id IS NULL")
+    
     # Tabla de convocados
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS convocados (
@@ -111,11 +266,151 @@ def create_schema(conn: sqlite3.Connection) -> None:
         )
     """)
     
+    # Rating actual de cada equipo (Elo con diferencia de goles)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ratings_equipos (
+            equipo_id INTEGER PRIMARY KEY,
+            rating REAL NOT NULL,
+            partidos INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (equipo_id) REFERENCES equipos(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Historial de ratings: un registro por partido puntuado, en orden de aplicación
+    # NOTA: sin clave foránea a partidos para conservar el historial de torneos
+    # anteriores (reiniciar el torneo borra los partidos, no los ratings)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ratings_historial (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            partido_id INTEGER NOT NULL UNIQUE,
+            equipo_local_id INTEGER NOT NULL,
+            equipo_visitante_id INTEGER NOT NULL,
+            goles_local INTEGER NOT NULL,
+            goles_visitante INTEGER NOT NULL,
+            rating_local REAL NOT NULL,
+            rating_visitante REAL NOT NULL,
+            delta REAL NOT NULL,
+            fecha TEXT NOT NULL
+        )
+    """)
+
+    # Fase de grupos: grupos, equipos de cada grupo y partidos de liga
+    # (los partidos son filas de partidos con eliminatoria = 'grupos')
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS grupos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL UNIQUE,
+            clasificados INTEGER NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS grupo_equipos (
+            grupo_id INTEGER NOT NULL,
+            equipo_id INTEGER NOT NULL UNIQUE,
+            PRIMARY KEY (grupo_id, equipo_id),
+            FOREIGN KEY (grupo_id) REFERENCES grupos(id) ON DELETE CASCADE,
+            FOREIGN KEY (equipo_id) REFERENCES equipos(id) ON DELETE CASCADE
+        )
+    """)
+
+    # goles_*_aplicado: resultado ya sumado a la clasificación (NULL = ninguno),
+    # para poder restarlo si el resultado se corrige
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS grupo_partidos (
+            partido_id INTEGER PRIMARY KEY,
+            grupo_id INTEGER NOT NULL,
+            jornada INTEGER NOT NULL,
+            goles_local_aplicado INTEGER,
+            goles_visitante_aplicado INTEGER,
+            FOREIGN KEY (partido_id) REFERENCES partidos(id) ON DELETE CASCADE,
+            FOREIGN KEY (grupo_id) REFERENCES grupos(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Clasificación acumulada de cada grupo (se actualiza con cada resultado)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS clasificacion (
+            grupo_id INTEGER NOT NULL,
+            equipo_id INTEGER NOT NULL,
+            jugados INTEGER NOT NULL DEFAULT 0,
+            ganados INTEGER NOT NULL DEFAULT 0,
+            empatados INTEGER NOT NULL DEFAULT 0,
+            perdidos INTEGER NOT NULL DEFAULT 0,
+            goles_favor INTEGER NOT NULL DEFAULT 0,
+            goles_contra INTEGER NOT NULL DEFAULT 0,
+            puntos INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (grupo_id, equipo_id),
+            FOREIGN KEY (grupo_id) REFERENCES grupos(id) ON DELETE CASCADE,
+            FOREIGN KEY (equipo_id) REFERENCES equipos(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Diario de cambios: una fila por cada INSERT, UPDATE o DELETE de las
+    # tablas de TABLAS_DIARIO, escrita por triggers en la misma transacción.
+    # seq crece siempre (AUTOINCREMENT), así que sirve para pedir "lo nuevo
+    # desde seq". clave es el JSON de la clave primaria; antes y despues, la
+    # fila completa en JSON; columnas, las columnas modificadas (solo update)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cambios (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabla TEXT NOT NULL,
+            fila_id INTEGER,
+            clave TEXT NOT NULL,
+            operacion TEXT NOT NULL CHECK (operacion IN ('insert', 'update', 'delete')),
+            columnas TEXT,
+            antes TEXT,
+            despues TEXT,
+            fecha TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+        )
+    """)
+    for tabla in TABLAS_DIARIO:
+        _crear_triggers_diario(cursor, tabla)
+    _crear_trigger_version(cursor, "partidos")
+
+    # Sincronización entre equipos con su propia copia de la base de datos
+    # (app.services.sync_service). dispositivo tiene una sola fila con la
+    # identidad de esta copia y el seq del diario en el que se separó de la
+    # original (0 si no es una copia); sync_pares, hasta dónde se ha
+    # intercambiado el diario con cada otro dispositivo; sync_base, la huella
+    # del último estado de cada partido en el que coincidían los dos
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dispositivo (
+            id TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            origen_seq INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_pares (
+            dispositivo_id TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            enviado_hasta INTEGER NOT NULL DEFAULT 0,
+            recibido_hasta INTEGER NOT NULL DEFAULT 0,
+            fecha TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sync_base (
+            dispositivo_id TEXT NOT NULL,
+            eliminatoria TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            huella TEXT NOT NULL,
+            PRIMARY KEY (dispositivo_id, eliminatoria, slot),
+            FOREIGN KEY (dispositivo_id) REFERENCES sync_pares(dispositivo_id) ON DELETE CASCADE
+        )
+    """)
+
     # Crear índices
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_participantes_equipo ON participantes(equipo_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_partidos_eliminatoria ON partidos(eliminatoria)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_partidos_torneo ON partidos(torneo_id, eliminatoria, slot)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_convocados_partido ON convocados(partido_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_goles_partido ON goles(partido_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_goles_participante ON goles(participante_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_grupo_partidos_grupo ON grupo_partidos(grupo_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cambios_tabla ON cambios(tabla, seq)")
     
     print("✓ Esquema de base de datos creado correctamente")
@@ -0,0 +1,306 @@
+"""
+Instrumentación opcional de las consultas SQL.
+
+Cuando está activa, las conexiones devueltas por ``get_connection`` se crean
+con ``TracedConnection``: cada sentencia se registra con el método del modelo
+que la lanzó, su duración, las filas devueltas, los pasos de la máquina
+virtual de SQLite (vía ``set_progress_handler``) y la conexión de origen.
+La SQL final con los parámetros ya sustituidos se captura con
+``set_trace_callback``.
+
+Las mediciones se agregan por sentencia (texto normalizado) con recuento y
+percentiles p50/p95/p99 de latencia.
+"""
+import re
+import sys
+import threading
+import time
+from collections import deque
+from itertools import count
+from typing import Optional
+import sqlite3
+
+
+# Número máximo de ejecuciones individuales que se conservan
+MAX_REGISTROS = 2000
+
+# Número máximo de muestras de latencia por sentencia
+MAX_MUESTRAS_POR_SENTENCIA = 1000
+
+# Cada cuántas instrucciones de la VM se invoca el progress handler
+PASOS_PROGRESS_HANDLER = 100
+
+_PATRON_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql: str) -> str:
+    """
+    Normaliza el texto de una sentencia para agruparla.
+
+    Args:
+        sql: Sentencia SQL tal como se ejecutó
+
+    Returns:
+        Sentencia con los espacios colapsados
+    """
+    return _PATRON_ESPACIOS.sub(" ", sql).strip()
+
+
+def percentil(valores_ordenados: list[float], p: float) -> float:
+    """
+    Calcula un percentil por el método del rango más cercano.
+
+    Args:
+        valores_ordenados: Lista ordenada de valores
+        p: Percentil entre 0 y 100
+
+    Returns:
+        Valor del percentil o 0.0 si la lista está vacía
+    """
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, int(round(p / 100.0 * len(valores_ordenados) + 0.5)) - 1)
+    return valores_ordenados[min(indice, len(valores_ordenados) - 1)]
+
+
+def _detectar_llamador() -> str:
+    """
+    Busca en la pila el primer método de la aplicación fuera de la capa de BD.
+
+    Returns:
+        Cadena "Clase.metodo" o "modulo.funcion" del llamador
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("app.") and modulo not in ("app.models.db", __name__):
+            funcion = frame.f_code.co_name
+            propietario = frame.f_locals.get("self") or frame.f_locals.get("cls")
+            if propietario is not None:
+                nombre_clase = propietario.__name__ if isinstance(propietario, type) else type(propietario).__name__
+                return f"{nombre_clase}.{funcion}"
+            qualname = getattr(frame.f_code, "co_qualname", funcion)
+            if "." in qualname:
+                return qualname
+            return f"{modulo.rsplit('.', 1)[-1]}.{qualname}"
+        frame = frame.f_back
+    return "desconocido"
+
+
+class SqlTracer:
+    """Almacén de mediciones SQL compartido por todas las conexiones."""
+
+    def __init__(self):
+        """Inicializa el trazador vacío."""
+        self._lock = threading.Lock()
+        self._registros: deque = deque(maxlen=MAX_REGISTROS)
+        self._agregados: dict[str, dict] = {}
+        self._ids_conexion = count(1)
+        self.activo: bool = False
+
+    def siguiente_id_conexion(self) -> int:
+        """Devuelve un identificador correlativo para una nueva conexión."""
+        return next(self._ids_conexion)
+
+    def registrar(self, registro: dict) -> None:
+        """
+        Guarda una ejecución y actualiza los agregados de su sentencia.
+
+        Args:
+            registro: Diccionario con sql, llamador, duracion_ms, filas, pasos_vm y conexion
+        """
+        with self._lock:
+            self._registros.append(registro)
+            agregado = self._agregados.get(registro["sql"])
+            if agregado is None:
+                agregado = {
+                    "sql": registro["sql"],
+                    "llamadores": set(),
+                    "ejecuciones": 0,
+                    "filas": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "muestras": deque(maxlen=MAX_MUESTRAS_POR_SENTENCIA),
+                }
+                self._agregados[registro["sql"]] = agregado
+            agregado["llamadores"].add(registro["llamador"])
+            agregado["ejecuciones"] += 1
+            agregado["total_ms"] += registro["duracion_ms"]
+            agregado["max_ms"] = max(agregado["max_ms"], registro["duracion_ms"])
+            agregado["muestras"].append(registro["duracion_ms"])
+
+    def sumar_filas(self, registro: dict, filas: int) -> None:
+        """
+        Suma filas leídas a una ejecución ya registrada.
+
+        Args:
+            registro: Registro devuelto al ejecutar la sentencia
+            filas: Número de filas leídas en el fetch
+        """
+        if filas <= 0:
+            return
+        with self._lock:
+            registro["filas"] += filas
+            agregado = self._agregados.get(registro["sql"])
+            if agregado is not None:
+                agregado["filas"] += filas
+
+    def obtener_registros(self, limite: Optional[int] = None) -> list[dict]:
+        """
+        Obtiene las últimas ejecuciones registradas.
+
+        Args:
+            limite: Número máximo de registros (los más recientes)
+
+        Returns:
+            Lista de registros, del más antiguo al más reciente
+        """
+        with self._lock:
+            registros = [dict(r) for r in self._registros]
+        return registros[-limite:] if limite else registros
+
+    def obtener_estadisticas(self) -> list[dict]:
+        """
+        Calcula las estadísticas por sentencia.
+
+        Returns:
+            Lista ordenada por tiempo total descendente con ejecuciones, filas,
+            media, p50, p95, p99 y máximo en milisegundos
+        """
+        with self._lock:
+            agregados = [
+                (dict(a, llamadores=set(a["llamadores"])), sorted(a["muestras"]))
+                for a in self._agregados.values()
+            ]
+
+        estadisticas = []
+        for agregado, muestras in agregados:
+            ejecuciones = agregado["ejecuciones"]
+            estadisticas.append({
+                "sql": agregado["sql"],
+                "llamadores": sorted(agregado["llamadores"]),
+                "ejecuciones": ejecuciones,
+                "filas": agregado["filas"],
+                "total_ms": agregado["total_ms"],
+                "media_ms": agregado["total_ms"] / ejecuciones if ejecuciones else 0.0,
+                "p50_ms": percentil(muestras, 50),
+                "p95_ms": percentil(muestras, 95),
+                "p99_ms": percentil(muestras, 99),
+                "max_ms": agregado["max_ms"],
+            })
+        estadisticas.sort(key=lambda e: e["total_ms"], reverse=True)
+        return estadisticas
+
+    def reiniciar(self) -> None:
+        """Descarta todas las mediciones acumuladas."""
+        with self._lock:
+            self._registros.clear()
+            self._agregados.clear()
+
+    def volcar(self, limite: int = 20, salida=None) -> None:
+        """
+        Imprime un resumen de las sentencias más costosas.
+
+        Args:
+            limite: Número de sentencias a mostrar
+            salida: Flujo de salida (por defecto sys.stdout)
+        """
+        salida = salida or sys.stdout
+        estadisticas = self.obtener_estadisticas()
+        print(f"[APP-SQL] {len(estadisticas)} sentencias distintas registradas", file=salida)
+        for e in estadisticas[:limite]:
+            print(
+                f"[APP-SQL] n={e['ejecuciones']:<5} filas={e['filas']:<6} "
+                f"total={e['total_ms']:.1f}ms p50={e['p50_ms']:.2f} "
+                f"p95={e['p95_ms']:.2f} p99={e['p99_ms']:.2f} max={e['max_ms']:.2f} "
+                f"<- {', '.join(e['llamadores'])}",
+                file=salida
+            )
+            print(f"          {e['sql'][:160]}", file=salida)
+
+
+# Instancia global
+sql_tracer = SqlTracer()
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor que mide cada ejecución y cuenta las filas que se leen."""
+
+    _registro: Optional[dict] = None
+
+    def _medir(self, metodo, sql: str, *args):
+        conexion = self.connection
+        conexion._pasos_vm = 0
+        conexion._sql_expandido = None
+        llamador = _detectar_llamador()
+        inicio = time.perf_counter()
+        try:
+            return metodo(sql, *args)
+        finally:
+            duracion_ms = (time.perf_counter() - inicio) * 1000.0
+            self._registro = {
+                "sql": normalizar_sql(sql),
+                "sql_expandido": conexion._sql_expandido,
+                "llamador": llamador,
+                "conexion": conexion.id_traza,
+                "inicio": inicio,
+                "duracion_ms": duracion_ms,
+                "filas": 0,
+                "filas_afectadas": self.rowcount if self.rowcount > 0 else 0,
+                "pasos_vm": conexion._pasos_vm * PASOS_PROGRESS_HANDLER,
+            }
+            sql_tracer.registrar(self._registro)
+
+    def execute(self, sql, parameters=()):
+        return self._medir(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._medir(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        fila = super().fetchone()
+        if fila is not None and self._registro is not None:
+            sql_tracer.sumar_filas(self._registro, 1)
+        return fila
+
+    def fetchmany(self, size=None):
+        filas = super().fetchmany(size) if size is not None else super().fetchmany()
+        if self._registro is not None:
+            sql_tracer.sumar_filas(self._registro, len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = super().fetchall()
+        if self._registro is not None:
+            sql_tracer.sumar_filas(self._registro, len(filas))
+        return filas
+
+
+class TracedConnection(sqlite3.Connection):
+    """Conexión que entrega cursores instrumentados."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.id_traza = sql_tracer.siguiente_id_conexion()
+        self._pasos_vm = 0
+        self._sql_expandido = None
+        self.set_trace_callback(self._on_trace)
+        self.set_progress_handler(self._on_progress, PASOS_PROGRESS_HANDLER)
+
+    def _on_trace(self, sql_expandido: str) -> None:
+        # Solo la primera sentencia: las siguientes son de triggers o PRAGMAs internos
+        if self._sql_expandido is None:
+            self._sql_expandido = sql_expandido
+
+    def _on_progress(self) -> int:
+        self._pasos_vm += 1
+        return 0
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,523 @@
+"""Modelo de datos de la sincronización entre dispositivos."""
+import platform
+import sqlite3
+import uuid
+from typing import Optional
+from app.models.db import get_connection, DbError, ConflictoVersionError
+from app.models.schema import TORNEO_ACTIVO
+from app.constants import FASE_GRUPOS
+
+
+# Tablas del diario que forman los datos de un partido que se sincronizan
+TABLAS_PARTIDO = ("partidos", "convocados", "stats_partido", "goles")
+
+# Columnas del resultado que viajan en cada partido (el ganador va por nombre)
+COLUMNAS_RESULTADO = ("goles_local", "goles_visitante", "penaltis_local", "penaltis_visitante", "estado")
+
+
+def _jugador(fila: sqlite3.Row) -> list:
+    """Clave natural de un participante: [nombre, apellidos, fecha_nacimiento]."""
+    return [fila['nombre'], fila['apellidos'], fila['fecha_nacimiento']]
+
+
+class SyncModel:
+    """
+    Modelo para las tablas dispositivo, sync_pares y sync_base.
+
+    Los partidos se leen y se escriben con claves naturales, que son las
+    mismas en todas las copias aunque los IDs no coincidan: el partido por
+    (eliminatoria, slot), el equipo por su nombre y el participante por
+    nombre, apellidos y fecha de nacimiento.
+    """
+
+    @staticmethod
+    def obtener_dispositivo(nuevo: bool = False, nombre: Optional[str] = None) -> dict:
+        """
+        Obtiene la identidad de esta copia de la base de datos (la crea si no existe).
+
+        Args:
+            nuevo: Si True, se genera un identificador nuevo (para una copia
+                recién duplicada de otro dispositivo) y se anota el seq
+                actual del diario como punto en el que se separaron
+            nombre: Nombre que se muestra a los demás dispositivos (opcional)
+
+        Returns:
+            Diccionario con id, nombre y origen_seq
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT id, nombre, origen_seq FROM dispositivo")
+            fila = cursor.fetchone()
+            if fila is None or nuevo or nombre:
+                if nuevo:
+                    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+                    ultima = cursor.fetchone()
+                    origen_seq = ultima[0] if ultima else 0
+                else:
+                    origen_seq = fila['origen_seq'] if fila else 0
+                dispositivo = {
+                    "id": uuid.uuid4().hex if fila is None or nuevo else fila['id'],
+                    "nombre": nombre or (fila['nombre'] if fila else platform.node() or "torneo"),
+                    "origen_seq": origen_seq,
+                }
+                cursor.execute("DELETE FROM dispositivo")
+                cursor.execute(
+                    "INSERT INTO dispositivo (id, nombre, origen_seq) VALUES (?, ?, ?)",
+                    (dispositivo['id'], dispositivo['nombre'], dispositivo['origen_seq'])
+                )
+                conn.commit()
+                return dispositivo
+            return dict(fila)
+
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al leer el dispositivo: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_par(dispositivo_id: str) -> Optional[dict]:
+        """
+        Obtiene el estado de la sincronización con otro dispositivo.
+
+        Args:
+            dispositivo_id: ID del otro dispositivo
+
+        Returns:
+            Diccionario con dispositivo_id, nombre, enviado_hasta,
+            recibido_hasta y fecha, o None si nunca se ha sincronizado
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM sync_pares WHERE dispositivo_id = ?", (dispositivo_id,))
+            fila = cursor.fetchone()
+            return dict(fila) if fila else None
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer la sincronización: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def listar_pares() -> list[dict]:
+        """
+        Lista los dispositivos con los que se ha sincronizado.
+
+        Returns:
+            Lista de diccionarios como los de obtener_par, del más reciente al más antiguo
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM sync_pares ORDER BY fecha DESC")
+            return [dict(fila) for fila in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer la sincronización: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def obtener_bases(dispositivo_id: str) -> dict[tuple[str, int], str]:
+        """
+        Obtiene la huella del último estado común de cada partido con otro dispositivo.
+
+        Args:
+            dispositivo_id: ID del otro dispositivo
+
+        Returns:
+            Diccionario {(eliminatoria, slot): huella}
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "SELECT eliminatoria, slot, huella FROM sync_base WHERE dispositivo_id = ?",
+                (dispositivo_id,)
+            )
+            return {(fila['eliminatoria'], fila['slot']): fila['huella'] for fila in cursor.fetchall()}
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer la sincronización: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def partidos_cambiados_desde(seq: int) -> tuple[int, Optional[set[int]]]:
+        """
+        Obtiene los partidos cuyos datos han cambiado después de un número de secuencia del diario.
+
+        Args:
+            seq: Último seq ya enviado
+
+        Returns:
+            Tupla (último seq del diario, IDs de los partidos con cambios).
+            El conjunto es None si el diario ya no llega hasta seq (se ha
+            purgado o es anterior al diario) y hay que revisar todos
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+            fila = cursor.fetchone()
+            ultima = fila[0] if fila else 0
+            if seq >= ultima:
+                return ultima, set()
+
+            cursor.execute("SELECT MIN(seq) FROM cambios")
+            primera = cursor.fetchone()[0]
+            if seq == 0 or primera is None or primera > seq + 1:
+                return ultima, None
+
+            cursor.execute(f"""
+                SELECT DISTINCT CASE
+                    WHEN tabla = 'partidos' THEN fila_id
+                    ELSE json_extract(COALESCE(despues, antes), '$.partido_id')
+                END
+                FROM cambios
+                WHERE seq > ? AND tabla IN ({', '.join('?' for _ in TABLAS_PARTIDO)})
+            """, (seq, *TABLAS_PARTIDO))
+            return ultima, {fila[0] for fila in cursor.fetchall() if fila[0] is not None}
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer el diario de cambios: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def ultimos_cambios() -> tuple[int, dict[int, int]]:
+        """
+        Obtiene el último cambio del diario de cada partido.
+
+        Returns:
+            Tupla (primer seq que conserva el diario, {partido_id: último seq
+            que tocó sus datos}). Los partidos sin cambios en el diario no
+            aparecen
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT MIN(seq) FROM cambios")
+            primera = cursor.fetchone()[0]
+            if primera is None:
+                cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+                fila = cursor.fetchone()
+                primera = (fila[0] if fila else 0) + 1
+
+            cursor.execute(f"""
+                SELECT CASE
+                    WHEN tabla = 'partidos' THEN fila_id
+                    ELSE json_extract(COALESCE(despues, antes), '$.partido_id')
+                END AS partido_id, MAX(seq)
+                FROM cambios
+                WHERE tabla IN ({', '.join('?' for _ in TABLAS_PARTIDO)})
+                GROUP BY 1
+            """, TABLAS_PARTIDO)
+            return primera, {fila[0]: fila[1] for fila in cursor.fetchall() if fila[0] is not None}
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer el diario de cambios: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def leer_partidos(ids: Optional[set[int]] = None,
+                      claves: Optional[list[tuple[str, int]]] = None) -> list[dict]:
+        """
+        Lee los datos sincronizables de partidos con claves naturales.
+
+        Args:
+            ids: Solo estos partidos (opcional)
+            claves: Solo los partidos con estas (eliminatoria, slot) (opcional)
+
+        Returns:
+            Lista de diccionarios con id y version (locales), eliminatoria,
+            slot, local y visitante (nombres), resultado (columnas de
+            COLUMNAS_RESULTADO y ganador por nombre), convocados
+            ([jugador, equipo]), estadisticas ([jugador, goles, amarillas,
+            rojas]) y goles ([jugador, equipo, minuto]), con las listas
+            ordenadas. jugador es [nombre, apellidos, fecha_nacimiento]
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        if (ids is not None and not ids) or (claves is not None and not claves):
+            return []
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            consulta = f"""
+                SELECT p.id, p.version, p.eliminatoria, p.slot,
+                       el.nombre AS local, ev.nombre AS visitante, eg.nombre AS ganador,
+                       {', '.join(f'p.{columna}' for columna in COLUMNAS_RESULTADO)}
+                FROM partidos p
+                LEFT JOIN equipos el ON p.equipo_local_id = el.id
+                LEFT JOIN equipos ev ON p.equipo_visitante_id = ev.id
+                LEFT JOIN equipos eg ON p.ganador_equipo_id = eg.id
+            """
+            parametros: list = []
+            if ids is not None:
+                consulta += f" WHERE p.id IN ({', '.join('?' for _ in ids)})"
+                parametros.extend(ids)
+            elif claves is not None:
+                consulta += f" WHERE (p.eliminatoria, p.slot) IN (VALUES {', '.join('(?, ?)' for _ in claves)})"
+                for clave in claves:
+                    parametros.extend(clave)
+            cursor.execute(consulta, parametros)
+
+            partidos = {}
+            for fila in cursor.fetchall():
+                partidos[fila['id']] = {
+                    "id": fila['id'],
+                    "version": fila['version'],
+                    "eliminatoria": fila['eliminatoria'],
+                    "slot": fila['slot'],
+                    "local": fila['local'],
+                    "visitante": fila['visitante'],
+                    "resultado": {
+                        **{columna: fila[columna] for columna in COLUMNAS_RESULTADO},
+                        "ganador": fila['ganador'],
+                    },
+                    "convocados": [],
+                    "estadisticas": [],
+                    "goles": [],
+                }
+            if not partidos:
+                return []
+            filtro = f"IN ({', '.join('?' for _ in partidos)})"
+
+            cursor.execute(f"""
+                SELECT c.partido_id, pa.nombre, pa.apellidos, pa.fecha_nacimiento, e.nombre AS equipo
+                FROM convocados c
+                JOIN participantes pa ON c.participante_id = pa.id
+                JOIN equipos e ON c.equipo_id = e.id
+                WHERE c.partido_id {filtro}
+            """, list(partidos))
+            for fila in cursor.fetchall():
+                partidos[fila['partido_id']]["convocados"].append([_jugador(fila), fila['equipo']])
+
+            cursor.execute(f"""
+                SELECT s.partido_id, pa.nombre, pa.apellidos, pa.fecha_nacimiento,
+                       s.goles, s.amarillas, s.rojas
+                FROM stats_partido s
+                JOIN participantes pa ON s.participante_id = pa.id
+                WHERE s.partido_id {filtro}
+            """, list(partidos))
+            for fila in cursor.fetchall():
+                partidos[fila['partido_id']]["estadisticas"].append(
+                    [_jugador(fila), fila['goles'], fila['amarillas'], fila['rojas']]
+                )
+
+            cursor.execute(f"""
+                SELECT g.partido_id, pa.nombre, pa.apellidos, pa.fecha_nacimiento,
+                       e.nombre AS equipo, g.minuto
+                FROM goles g
+                JOIN participantes pa ON g.participante_id = pa.id
+                JOIN equipos e ON g.equipo_id = e.id
+                WHERE g.partido_id {filtro}
+            """, list(partidos))
+            for fila in cursor.fetchall():
+                partidos[fila['partido_id']]["goles"].append([_jugador(fila), fila['equipo'], fila['minuto']])
+
+            # Orden estable para que la misma información dé siempre la misma huella
+            for partido in partidos.values():
+                for lista in ("convocados", "estadisticas", "goles"):
+                    partido[lista].sort(key=lambda elemento: repr(elemento))
+            return sorted(partidos.values(), key=lambda p: (p['eliminatoria'], p['slot']))
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer los partidos: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def aplicar(par: dict, partidos: list[dict], bases: dict[tuple[str, int], str]) -> list[dict]:
+        """
+        Aplica los partidos recibidos de otro dispositivo en una única transacción.
+
+        Cada partido sustituye al local: equipos, resultado, convocatoria,
+        estadísticas y goles. Los partidos de eliminatoria que aún no existen
+        aquí (los de una ronda a la que este dispositivo no ha llegado) se
+        crean; los de la fase de grupos se omiten. Si algún partido ha
+        cambiado desde que se leyó (por su versión), no se aplica nada.
+
+        Args:
+            par: Otro dispositivo (id, nombre, recibido_hasta y confirmado,
+                el último seq propio que ya tiene)
+            partidos: Partidos recibidos (como los de leer_partidos), cada uno
+                con la version local leída al decidir aplicarlo
+            bases: Huellas que pasan a ser el estado común {(eliminatoria, slot): huella}
+
+        Returns:
+            Lista de diccionarios con eliminatoria, slot, id (None si no se
+            aplicó) y motivo (por qué se omitió, o None)
+
+        Raises:
+            ConflictoVersionError: Si algún partido ha cambiado mientras tanto
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+
+            cursor.execute("SELECT nombre, id FROM equipos")
+            equipos = {fila['nombre']: fila['id'] for fila in cursor.fetchall()}
+            cursor.execute("SELECT id, nombre, apellidos, fecha_nacimiento FROM participantes")
+            jugadores: dict[tuple, Optional[int]] = {}
+            for fila in cursor.fetchall():
+                clave = tuple(_jugador(fila))
+                # Dos participantes con la misma clave natural no se pueden distinguir
+                jugadores[clave] = None if clave in jugadores else fila['id']
+
+            def equipo(nombre: Optional[str]) -> Optional[int]:
+                if nombre is None:
+                    return None
+                if equipos.get(nombre) is None:
+                    raise LookupError(f"no existe el equipo {nombre}")
+                return equipos[nombre]
+
+            def jugador(clave: list) -> int:
+                if jugadores.get(tuple(clave)) is None:
+                    raise LookupError(f"no se encuentra el participante {' '.join(filter(None, clave[:2]))}")
+                return jugadores[tuple(clave)]
+
+            aplicados = []
+            for partido in partidos:
+                aplicado = {"eliminatoria": partido['eliminatoria'], "slot": partido['slot'],
+                            "id": None, "motivo": None}
+                aplicados.append(aplicado)
+                cursor.execute(
+                    "SELECT id, version FROM partidos WHERE eliminatoria = ? AND slot = ?",
+                    (partido['eliminatoria'], partido['slot'])
+                )
+                fila = cursor.fetchone()
+                if fila is None and partido['eliminatoria'] == FASE_GRUPOS:
+                    aplicado['motivo'] = "el partido no existe en esta base de datos"
+                    continue
+                if partido.get('version') is not None and fila is None:
+                    raise ConflictoVersionError(
+                        f"El partido {partido['eliminatoria']} {partido['slot']} ha cambiado durante la sincronización"
+                    )
+                if fila is not None and partido.get('version') is not None and fila['version'] != partido['version']:
+                    raise ConflictoVersionError(
+                        f"El partido {partido['eliminatoria']} {partido['slot']} ha cambiado durante la sincronización"
+                    )
+                try:
+                    resultado = partido['resultado']
+                    valores = (
+                        equipo(partido['local']), equipo(partido['visitante']),
+                        *(resultado[columna] for columna in COLUMNAS_RESULTADO),
+                        equipo(resultado['ganador']),
+                    )
+                    convocados = [(jugador(j), equipo(e)) for j, e in partido['convocados']]
+                    estadisticas = [(jugador(j), g, a, r) for j, g, a, r in partido['estadisticas']]
+                    goles = [(jugador(j), equipo(e), minuto) for j, e, minuto in partido['goles']]
+                except LookupError as e:
+                    aplicado['motivo'] = str(e)
+                    bases.pop((partido['eliminatoria'], partido['slot']), None)
+                    continue
+
+                if fila is None:
+                    cursor.execute(
+                        f"INSERT INTO partidos (torneo_id, eliminatoria, slot) VALUES ({TORNEO_ACTIVO}, ?, ?)",
+                        (partido['eliminatoria'], partido['slot'])
+                    )
+                    partido_id = cursor.lastrowid
+                else:
+                    partido_id = fila['id']
+                cursor.execute(f"""
+                    UPDATE partidos
+                    SET equipo_local_id = ?, equipo_visitante_id = ?,
+                        {', '.join(f'{columna} = ?' for columna in COLUMNAS_RESULTADO)},
+                        ganador_equipo_id = ?
+                    WHERE id = ?
+                """, (*valores, partido_id))
+                cursor.execute("DELETE FROM stats_partido WHERE partido_id = ?", (partido_id,))
+                cursor.execute("DELETE FROM goles WHERE partido_id = ?", (partido_id,))
+                cursor.execute("DELETE FROM convocados WHERE partido_id = ?", (partido_id,))
+                cursor.executemany(
+                    "INSERT INTO convocados (partido_id, participante_id, equipo_id) VALUES (?, ?, ?)",
+                    [(partido_id, *convocado) for convocado in convocados]
+                )
+                cursor.executemany("""
+                    INSERT INTO stats_partido (partido_id, participante_id, goles, amarillas, rojas)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(partido_id, *estadistica) for estadistica in estadisticas])
+                cursor.executemany(
+                    "INSERT INTO goles (partido_id, participante_id, equipo_id, minuto) VALUES (?, ?, ?, ?)",
+                    [(partido_id, *gol) for gol in goles]
+                )
+                aplicado['id'] = partido_id
+
+            cursor.execute("""
+                INSERT INTO sync_pares (dispositivo_id, nombre, enviado_hasta, recibido_hasta, fecha)
+                VALUES (?, ?, ?, ?, datetime('now', 'localtime'))
+                ON CONFLICT (dispositivo_id) DO UPDATE SET
+                    nombre = excluded.nombre,
+                    enviado_hasta = MAX(enviado_hasta, excluded.enviado_hasta),
+                    recibido_hasta = MAX(recibido_hasta, excluded.recibido_hasta),
+                    fecha = excluded.fecha
+            """, (par['id'], par['nombre'], par['confirmado'], par['recibido_hasta']))
+            cursor.executemany("""
+                INSERT INTO sync_base (dispositivo_id, eliminatoria, slot, huella) VALUES (?, ?, ?, ?)
+                ON CONFLICT (dispositivo_id, eliminatoria, slot) DO UPDATE SET huella = excluded.huella
+            """, [(par['id'], *clave, huella) for clave, huella in bases.items()])
+
+            conn.commit()
+            return aplicados
+
+        except ConflictoVersionError:
+            if conn:
+                conn.rollback()
+            raise
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al aplicar los cambios recibidos: {e}")
+        finally:
+            if conn:
+                conn.close()
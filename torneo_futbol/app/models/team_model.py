@@ -270,3 +270,72 @@ class TeamModel:
         finally:
             if conn:
                 conn.close()
+    
+    @staticmethod
+    def contar_referencias_escudos() -> dict[str, int]:
+        """
+        Cuenta cuántos equipos usan cada archivo de escudo.
+        
+        Returns:
+            Diccionario con {escudo_path: num_equipos} tal como están guardadas las rutas
+            
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT escudo_path, COUNT(*) as count
+                FROM equipos
+                WHERE escudo_path IS NOT NULL AND escudo_path != ''
+                GROUP BY escudo_path
+            """)
+            
+            rows = cursor.fetchall()
+            return {row['escudo_path']: row['count'] for row in rows}
+            
+        except sqlite3.Error as e:
+            raise DbError(f"Error al contar referencias de escudos: {e}")
+        finally:
+            if conn:
+                conn.close()
+    
+    @staticmethod
+    def reemplazar_rutas_escudo(cambios: dict[str, str]) -> int:
+        """
+        Sustituye rutas de escudo en todos los equipos en una única transacción.
+        
+        Args:
+            cambios: Diccionario con {ruta_antigua: ruta_nueva}
+            
+        Returns:
+            Número de equipos actualizados
+            
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            
+            actualizados = 0
+            for antigua, nueva in cambios.items():
+                cursor.execute(
+                    "UPDATE equipos SET escudo_path = ? WHERE escudo_path = ?",
+                    (nueva, antigua)
+                )
+                actualizados += cursor.rowcount
+            conn.commit()
+            return actualizados
+            
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al reemplazar rutas de escudo: {e}")
+        finally:
+            if conn:
+                conn.close()
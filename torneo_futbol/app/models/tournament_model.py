@@ -0,0 +1,177 @@
+"""Modelo de datos de los torneos (tabla torneos)."""
+import sqlite3
+from typing import Optional
+from app.models.db import get_connection, DbError, ConflictoVersionError
+from app.constants import FASE_FINAL
+
+
+class TournamentModel:
+    """
+    Modelo para la tabla torneos.
+
+    En la base de datos de trabajo solo hay un torneo activo, y todos los
+    partidos (con sus convocatorias, estadísticas y goles) y los grupos son
+    suyos. Los torneos archivados solo conservan aquí su ficha: sus datos
+    están en el archivo de la columna archivo.
+    """
+
+    @staticmethod
+    def obtener_activo() -> Optional[dict]:
+        """
+        Obtiene el torneo activo.
+
+        Returns:
+            Diccionario con los datos del torneo, o None en un torneo archivado
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM torneos WHERE estado = 'activo'")
+            fila = cursor.fetchone()
+            return dict(fila) if fila else None
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al leer el torneo activo: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def listar_torneos() -> list[dict]:
+        """
+        Lista todos los torneos, el activo incluido.
+
+        Returns:
+            Lista de diccionarios con id, nombre, estado, inicio, fin,
+            archivo, campeon y partidos, del más antiguo al más reciente
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT * FROM torneos ORDER BY id")
+            return [dict(fila) for fila in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al listar los torneos: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def resumen(torneo_id: int, cursor: Optional[sqlite3.Cursor] = None) -> dict:
+        """
+        Calcula el número de partidos y el campeón de un torneo.
+
+        Args:
+            torneo_id: ID del torneo
+            cursor: Cursor de una conexión ya abierta (por ejemplo, la del
+                archivo del torneo); sin él se usa la base de datos de trabajo
+
+        Returns:
+            Diccionario con partidos (número) y campeon (nombre del ganador
+            de la final, o None si no se ha jugado)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            if cursor is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+
+            cursor.execute("SELECT COUNT(*) FROM partidos WHERE torneo_id = ?", (torneo_id,))
+            partidos = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT e.nombre
+                FROM partidos p
+                JOIN equipos e ON e.id = p.ganador_equipo_id
+                WHERE p.torneo_id = ? AND p.eliminatoria = ?
+                ORDER BY p.slot
+                LIMIT 1
+            """, (torneo_id, FASE_FINAL))
+            campeon = cursor.fetchone()
+            return {"partidos": partidos, "campeon": campeon[0] if campeon else None}
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al resumir el torneo: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def archivar(torneo_id: int, archivo: str, resumen: dict, hasta_seq: int, nombre_nuevo: str) -> int:
+        """
+        Saca un torneo de la base de datos de trabajo y empieza otro.
+
+        En una sola transacción borra los partidos del torneo (sus
+        convocatorias, estadísticas y goles van en cascada) y los grupos,
+        marca el torneo como archivado con la ruta de su archivo y crea el
+        torneo activo nuevo. Equipos y participantes se conservan. También
+        se olvida el estado de la sincronización, que era de este torneo.
+
+        Args:
+            torneo_id: ID del torneo activo
+            archivo: Ruta del archivo con los datos del torneo
+            resumen: Número de partidos y campeón (como los devuelve resumen)
+            hasta_seq: Último seq del diario incluido en el archivo; si la
+                base de datos ha cambiado después no se archiva nada
+            nombre_nuevo: Nombre del torneo que empieza
+
+        Returns:
+            ID del torneo nuevo
+
+        Raises:
+            ConflictoVersionError: Si ha habido cambios desde que se copió el
+                torneo, o el torneo ya no es el activo
+            DbError: Si hay error en la base de datos
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+            ultima = cursor.fetchone()
+            if (ultima[0] if ultima else 0) != hasta_seq:
+                raise ConflictoVersionError("El torneo ha cambiado mientras se archivaba")
+
+            cursor.execute("""
+                UPDATE torneos
+                SET estado = 'archivado', fin = datetime('now', 'localtime'),
+                    archivo = ?, campeon = ?, partidos = ?
+                WHERE id = ? AND estado = 'activo'
+            """, (archivo, resumen['campeon'], resumen['partidos'], torneo_id))
+            if cursor.rowcount == 0:
+                raise ConflictoVersionError("El torneo ya no es el activo")
+
+            cursor.execute("DELETE FROM partidos WHERE torneo_id = ?", (torneo_id,))
+            cursor.execute("DELETE FROM grupos")
+            cursor.execute("DELETE FROM sync_pares")
+            cursor.execute("INSERT INTO torneos (nombre) VALUES (?)", (nombre_nuevo,))
+            nuevo_id = cursor.lastrowid
+
+            conn.commit()
+            return nuevo_id
+
+        except ConflictoVersionError:
+            conn.rollback()
+            raise
+        except sqlite3.Error as e:
+            if conn:
+                conn.rollback()
+            raise DbError(f"Error al archivar el torneo: {e}")
+        finally:
+            if conn:
+                conn.close()
@@ -0,0 +1,206 @@
+"""
+Archivo de torneos terminados.
+
+La base de datos de trabajo solo contiene el torneo activo: sus partidos,
+convocatorias, estadísticas, goles y grupos. Así las consultas del día a día
+(cuadro, clasificaciones, goleadores, sincronización) nunca recorren datos
+de ediciones anteriores, por muchas que se acumulen.
+
+Al archivar un torneo:
+
+- Se guarda una copia de seguridad (motivo "archivar").
+- Se escribe su archivo en ``TORNEOS_DIR`` con ``VACUUM INTO``, que crea una
+  copia compacta en un solo paso. En ella se dejan solo la ficha de ese
+  torneo, sus partidos y los equipos y participantes, sin el diario ni el
+  estado de la sincronización, y se marca como de solo lectura.
+- En una sola transacción se borran sus datos de la base de datos de
+  trabajo, su ficha queda en la tabla torneos con la ruta del archivo y el
+  campeón, y empieza un torneo nuevo con los mismos equipos y participantes.
+
+Un archivo se puede abrir como cualquier base de datos (``--db`` en la línea
+de órdenes o ``TORNEO_DB``) para consultarlo o sacar informes: al no tener
+torneo activo, la aplicación lo abre en solo lectura.
+"""
+import os
+import re
+import sqlite3
+import stat
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.config import TORNEOS_DIR
+from app.core.event_bus import get_event_bus
+from app.models.db import get_db_path, DbError
+from app.models.tournament_model import TournamentModel
+from app.services.backup_service import get_backup_service
+from app.services.undo_service import get_undo_service
+
+
+def _nombre_archivo(torneo: dict) -> str:
+    """Nombre del archivo de un torneo: 001_Torneo-2025.db."""
+    nombre = re.sub(r"[^\w-]+", "-", torneo['nombre']).strip("-") or "torneo"
+    return f"{torneo['id']:03d}_{nombre}.db"
+
+
+class ArchiveService:
+    """Archiva el torneo activo y consulta el catálogo de torneos."""
+
+    def __init__(self, directorio: Optional[Path] = None):
+        """
+        Inicializa el servicio.
+
+        Args:
+            directorio: Directorio de los torneos archivados (por defecto, TORNEOS_DIR)
+        """
+        self.directorio = Path(directorio) if directorio else TORNEOS_DIR
+
+    def listar(self) -> list[dict]:
+        """
+        Lista todos los torneos, el activo incluido.
+
+        Returns:
+            Lista de diccionarios como los de TournamentModel.listar_torneos,
+            con disponible (True si su archivo existe; el activo siempre)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        torneos = TournamentModel.listar_torneos()
+        for torneo in torneos:
+            torneo['disponible'] = torneo['estado'] == "activo" or bool(
+                torneo['archivo'] and Path(torneo['archivo']).exists()
+            )
+        return torneos
+
+    def archivar(self, nombre_nuevo: Optional[str] = None) -> dict:
+        """
+        Archiva el torneo activo y empieza otro.
+
+        Args:
+            nombre_nuevo: Nombre del torneo que empieza (por defecto,
+                "Torneo <año>", numerado si ya existe)
+
+        Returns:
+            Diccionario con archivado (ficha del torneo archivado, con su
+            archivo y campeón) y activo (ficha del torneo nuevo)
+
+        Raises:
+            ValueError: Si no hay torneo activo (la base de datos es un archivo)
+                o ya existe su archivo
+            ConflictoVersionError: Si la base de datos ha cambiado mientras se
+                archivaba (no se archiva nada; se puede repetir)
+            DbError: Si hay error en la base de datos
+        """
+        torneo = TournamentModel.obtener_activo()
+        if torneo is None:
+            raise ValueError("Esta base de datos es un torneo archivado")
+        ruta = self.directorio / _nombre_archivo(torneo)
+        if ruta.exists():
+            raise ValueError(f"Ya existe el archivo {ruta}")
+        nombre_nuevo = nombre_nuevo or self._nombre_libre()
+
+        get_backup_service().crear_copia("archivar")
+        resumen, hasta_seq = self._escribir_archivo(torneo, ruta)
+        try:
+            nuevo_id = TournamentModel.archivar(torneo['id'], str(ruta), resumen, hasta_seq, nombre_nuevo)
+        except DbError:
+            self._borrar_archivo(ruta)
+            raise
+
+        # Los rangos del diario de la sesión eran de partidos que ya no están
+        get_undo_service().limpiar()
+        get_event_bus().emit_match_deleted(0)
+        print(f"[TORNEOS] {torneo['nombre']} archivado en {ruta} "
+              f"({resumen['partidos']} partidos, campeón: {resumen['campeon'] or '-'})")
+        torneos = {t['id']: t for t in TournamentModel.listar_torneos()}
+        return {"archivado": torneos[torneo['id']], "activo": torneos[nuevo_id]}
+
+    def _nombre_libre(self) -> str:
+        nombres = {torneo['nombre'] for torneo in TournamentModel.listar_torneos()}
+        base = nombre = f"Torneo {datetime.now().year}"
+        numero = 2
+        while nombre in nombres:
+            nombre = f"{base} ({numero})"
+            numero += 1
+        return nombre
+
+    def _escribir_archivo(self, torneo: dict, ruta: Path) -> tuple[dict, int]:
+        """
+        Escribe el archivo de solo lectura de un torneo.
+
+        Returns:
+            Resumen del torneo (partidos y campeón) y último seq del diario
+            que contiene
+
+        Raises:
+            DbError: Si no se puede escribir
+        """
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        temporal = ruta.with_suffix(".tmp")
+        temporal.unlink(missing_ok=True)
+        origen = destino = None
+        try:
+            # Instantánea compacta de la base de datos de trabajo
+            origen = sqlite3.connect(str(get_db_path()))
+            origen.execute("VACUUM INTO ?", (str(temporal),))
+            origen.close()
+            origen = None
+
+            destino = sqlite3.connect(str(temporal))
+            destino.execute("PRAGMA foreign_keys = ON")
+            fila = destino.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'").fetchone()
+            hasta_seq = fila[0] if fila else 0
+            resumen = TournamentModel.resumen(torneo['id'], destino.cursor())
+            with destino:
+                destino.execute("DELETE FROM partidos WHERE torneo_id IS NOT ?", (torneo['id'],))
+                destino.execute("DELETE FROM torneos WHERE id != ?", (torneo['id'],))
+                destino.execute("""
+                    UPDATE torneos
+                    SET estado = 'archivado', fin = datetime('now', 'localtime'),
+                        archivo = ?, campeon = ?, partidos = ?
+                """, (str(ruta), resumen['campeon'], resumen['partidos']))
+                destino.execute("DELETE FROM sync_pares")
+                destino.execute("DELETE FROM dispositivo")
+                # Al final: los borrados de arriba también pasan por el diario
+                destino.execute("DELETE FROM cambios")
+            destino.execute("VACUUM")
+            destino.close()
+            destino = None
+
+            os.replace(temporal, ruta)
+            os.chmod(ruta, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        except (sqlite3.Error, OSError, DbError) as e:
+            if destino:
+                destino.close()
+            temporal.unlink(missing_ok=True)
+            raise DbError(f"No se pudo escribir el archivo del torneo: {e}")
+        finally:
+            if origen:
+                origen.close()
+        return resumen, hasta_seq
+
+    @staticmethod
+    def _borrar_archivo(ruta: Path) -> None:
+        try:
+            os.chmod(ruta, stat.S_IRUSR | stat.S_IWUSR)
+            ruta.unlink()
+        except OSError as e:
+            print(f"[TORNEOS] No se pudo borrar {ruta}: {e}")
+
+
+# Instancia global del servicio
+_archive_service: Optional[ArchiveService] = None
+
+
+def get_archive_service() -> ArchiveService:
+    """
+    Obtiene la instancia única del servicio de torneos archivados.
+
+    Returns:
+        Instancia global de ArchiveService
+    """
+    global _archive_service
+    if _archive_service is None:
+        _archive_service = ArchiveService()
+    return _archive_service
@@ -0,0 +1,378 @@
+"""
+Copias de seguridad de la base de datos con la API de copia de SQLite.
+
+Las copias se hacen en caliente, página a página (``Connection.backup``) en
+pasos de ``PAGINAS_POR_PASO``: entre un paso y el siguiente la base de datos
+queda libre, así que la aplicación puede seguir leyendo y escribiendo. Si
+alguien escribe a mitad de copia, SQLite la reinicia para que el resultado
+sea siempre una instantánea coherente de un momento dado. Cada copia se
+escribe primero en un archivo temporal y se renombra al terminar.
+
+Las copias se guardan en ``COPIAS_DIR`` con la fecha y el motivo en el
+nombre y se conservan las ``MAX_COPIAS`` más recientes. Cada una incluye el
+diario de cambios, así que su último número de secuencia dice exactamente a
+qué punto del historial corresponde.
+
+Se crean copias automáticas antes de las operaciones destructivas
+(reiniciar el torneo, borrar el cuadro, restaurar otra copia) y, desde la
+interfaz, periódicamente si ha habido cambios.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.config import COPIAS_DIR
+from app.core.event_bus import get_event_bus
+from app.models.db import get_connection, get_db_path, DbError
+from app.models.schema import TABLAS_DIARIO
+
+
+# Copias que se conservan (las más antiguas se borran)
+MAX_COPIAS = 20
+
+# Páginas que se copian en cada paso (con páginas de 4 KB, 256 KB por paso)
+PAGINAS_POR_PASO = 64
+
+# Nombre de los archivos de copia: torneo_20250101_120000_motivo.db
+FORMATO_FECHA = "%Y%m%d_%H%M%S"
+PATRON_COPIA = re.compile(r"^torneo_(\d{8}_\d{6})_([\w-]+)\.db$")
+
+
+def _secuencia_diario(conn: sqlite3.Connection) -> int:
+    """Último seq del diario de cambios de una base de datos (0 si no tiene)."""
+    try:
+        fila = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return fila[0] if fila else 0
+
+
+class BackupService:
+    """Crea, rota, compara y restaura copias de seguridad de la base de datos."""
+
+    def __init__(self, directorio: Optional[Path] = None):
+        """
+        Inicializa el servicio.
+
+        Args:
+            directorio: Directorio de las copias (por defecto, COPIAS_DIR)
+        """
+        self.directorio = Path(directorio) if directorio else COPIAS_DIR
+        self._lock = threading.Lock()
+        self._ultima_secuencia: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Crear
+    # ------------------------------------------------------------------
+
+    def crear_copia(self, motivo: str = "manual",
+                    progreso: Optional[Callable[[int, int], None]] = None) -> Path:
+        """
+        Crea una copia de la base de datos en caliente.
+
+        Args:
+            motivo: Palabra que se añade al nombre del archivo (p. ej. "reiniciar")
+            progreso: Función progreso(copiadas, total) llamada tras cada paso (opcional)
+
+        Returns:
+            Ruta de la copia creada
+
+        Raises:
+            DbError: Si no se puede crear la copia
+        """
+        motivo = re.sub(r"[^\w-]+", "-", motivo).strip("-") or "manual"
+        with self._lock:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            ruta = self._ruta_libre(motivo)
+            temporal = ruta.with_suffix(".tmp")
+            origen = destino = None
+            try:
+                origen = sqlite3.connect(str(get_db_path()))
+                destino = sqlite3.connect(str(temporal))
+                origen.backup(
+                    destino, pages=PAGINAS_POR_PASO,
+                    progress=(lambda estado, restantes, total: progreso(total - restantes, total))
+                    if progreso else None
+                )
+                secuencia = _secuencia_diario(destino)
+                destino.close()
+                destino = None
+                os.replace(temporal, ruta)
+            except (sqlite3.Error, OSError) as e:
+                if destino:
+                    destino.close()
+                temporal.unlink(missing_ok=True)
+                raise DbError(f"No se pudo crear la copia de seguridad: {e}")
+            finally:
+                if origen:
+                    origen.close()
+
+            self._ultima_secuencia = secuencia
+            self._rotar()
+        print(f"[COPIAS] Copia creada: {ruta.name}")
+        return ruta
+
+    def crear_copia_en_segundo_plano(self, motivo: str = "manual") -> threading.Thread:
+        """
+        Crea una copia en un hilo aparte para no bloquear la interfaz.
+
+        Los errores se anotan en el registro.
+
+        Args:
+            motivo: Palabra que se añade al nombre del archivo
+
+        Returns:
+            Hilo de la copia (ya iniciado)
+        """
+        def copiar():
+            try:
+                self.crear_copia(motivo)
+            except DbError as e:
+                print(f"[COPIAS] {e}")
+
+        hilo = threading.Thread(target=copiar, name="copia-seguridad", daemon=True)
+        hilo.start()
+        return hilo
+
+    def crear_copia_programada(self) -> Optional[threading.Thread]:
+        """
+        Crea una copia en segundo plano solo si la base de datos ha cambiado desde la última.
+
+        Returns:
+            Hilo de la copia, o None si no hacía falta
+        """
+        try:
+            conn = get_connection()
+            try:
+                secuencia = _secuencia_diario(conn)
+            finally:
+                conn.close()
+        except DbError as e:
+            print(f"[COPIAS] {e}")
+            return None
+
+        if self._ultima_secuencia is None:
+            copias = self.listar_copias()
+            self._ultima_secuencia = copias[0]['secuencia'] if copias else -1
+        if secuencia == self._ultima_secuencia:
+            return None
+        return self.crear_copia_en_segundo_plano("automatica")
+
+    def _ruta_libre(self, motivo: str) -> Path:
+        fecha = datetime.now()
+        ruta = self.directorio / f"torneo_{fecha.strftime(FORMATO_FECHA)}_{motivo}.db"
+        numero = 2
+        while ruta.exists():
+            # Dos copias en el mismo segundo con el mismo motivo
+            ruta = self.directorio / f"torneo_{fecha.strftime(FORMATO_FECHA)}_{motivo}-{numero}.db"
+            numero += 1
+        return ruta
+
+    def _rotar(self) -> None:
+        for copia in self.listar_copias()[MAX_COPIAS:]:
+            try:
+                copia['ruta'].unlink()
+                print(f"[COPIAS] Copia antigua borrada: {copia['ruta'].name}")
+            except OSError as e:
+                print(f"[COPIAS] No se pudo borrar {copia['ruta'].name}: {e}")
+
+    # ------------------------------------------------------------------
+    # Consultar
+    # ------------------------------------------------------------------
+
+    def listar_copias(self) -> list[dict]:
+        """
+        Lista las copias disponibles, de la más reciente a la más antigua.
+
+        Returns:
+            Lista de diccionarios con ruta, fecha (datetime), motivo, tamano
+            (bytes) y secuencia (último seq del diario incluido en la copia)
+        """
+        if not self.directorio.exists():
+            return []
+        copias = []
+        for ruta in self.directorio.glob("torneo_*.db"):
+            coincidencia = PATRON_COPIA.match(ruta.name)
+            if not coincidencia:
+                continue
+            conn = None
+            try:
+                conn = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)
+                secuencia = _secuencia_diario(conn)
+            except sqlite3.Error:
+                secuencia = 0
+            finally:
+                if conn:
+                    conn.close()
+            copias.append({
+                'ruta': ruta,
+                'fecha': datetime.strptime(coincidencia.group(1), FORMATO_FECHA),
+                'motivo': coincidencia.group(2),
+                'tamano': ruta.stat().st_size,
+                'secuencia': secuencia,
+            })
+        copias.sort(key=lambda c: (c['fecha'], c['ruta'].stat().st_mtime), reverse=True)
+        return copias
+
+    def diferencias(self, copia: Path) -> dict[str, dict[str, int]]:
+        """
+        Compara una copia con la base de datos actual, tabla a tabla.
+
+        Las filas se emparejan por clave primaria y se comparan las columnas
+        que existen en las dos (la copia puede ser de una versión anterior).
+
+        Args:
+            copia: Ruta de la copia
+
+        Returns:
+            Diccionario {tabla: {"añadidas", "borradas", "modificadas"}} con
+            las tablas que tienen alguna diferencia; "añadidas" son filas que
+            hay ahora y no en la copia
+
+        Raises:
+            DbError: Si la copia no existe o no se puede leer
+        """
+        copia = Path(copia)
+        if not copia.exists():
+            raise DbError(f"No existe la copia {copia}")
+        conn = None
+        try:
+            conn = get_connection()
+            cursor = conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS copia", (str(copia),))
+
+            diferencias = {}
+            for tabla in TABLAS_DIARIO:
+                cursor.execute(f"PRAGMA main.table_info({tabla})")
+                info = cursor.fetchall()
+                cursor.execute(f"PRAGMA copia.table_info({tabla})")
+                en_copia = {fila[1] for fila in cursor.fetchall()}
+                if not en_copia:
+                    cursor.execute(f"SELECT COUNT(*) FROM main.{tabla}")
+                    total = cursor.fetchone()[0]
+                    if total:
+                        diferencias[tabla] = {"añadidas": total, "borradas": 0, "modificadas": 0}
+                    continue
+
+                clave = [fila[1] for fila in sorted(info, key=lambda f: f[5]) if fila[5]]
+                comunes = [fila[1] for fila in info if fila[1] in en_copia and fila[1] not in clave]
+                union = " AND ".join(f"a.{c} = b.{c}" for c in clave)
+                cursor.execute(f"""
+                    SELECT
+                        (SELECT COUNT(*) FROM main.{tabla} a
+                         WHERE NOT EXISTS (SELECT 1 FROM copia.{tabla} b WHERE {union})),
+                        (SELECT COUNT(*) FROM copia.{tabla} a
+                         WHERE NOT EXISTS (SELECT 1 FROM main.{tabla} b WHERE {union})),
+                        (SELECT COUNT(*) FROM main.{tabla} a JOIN copia.{tabla} b ON {union}
+                         WHERE {" OR ".join(f"a.{c} IS NOT b.{c}" for c in comunes) or "0"})
+                """)
+                anadidas, borradas, modificadas = cursor.fetchone()
+                if anadidas or borradas or modificadas:
+                    diferencias[tabla] = {"añadidas": anadidas, "borradas": borradas, "modificadas": modificadas}
+            return diferencias
+
+        except sqlite3.Error as e:
+            raise DbError(f"Error al comparar con la copia {copia.name}: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # Restaurar
+    # ------------------------------------------------------------------
+
+    def restaurar(self, copia: Path) -> Path:
+        """
+        Sustituye la base de datos actual por una copia.
+
+        Antes se comprueba la copia y se guarda una copia del estado actual
+        (motivo "antes-de-restaurar"), así que una restauración también se
+        puede deshacer restaurando esa. La sustitución se hace en un único
+        paso de la API de copia, de modo que nadie ve la base de datos a
+        medias, y el número de secuencia del diario nunca retrocede. Al
+        terminar se actualiza el esquema y se avisa por el bus
+        para que los servicios y las vistas vuelvan a cargar los datos.
+
+        Args:
+            copia: Ruta de la copia a restaurar
+
+        Returns:
+            Ruta de la copia del estado anterior
+
+        Raises:
+            DbError: Si la copia no existe, está dañada o no se puede restaurar
+        """
+        from app.models.db import init_db
+        from app.services.undo_service import get_undo_service
+
+        copia = Path(copia)
+        if not copia.exists():
+            raise DbError(f"No existe la copia {copia}")
+        origen = None
+        try:
+            origen = sqlite3.connect(f"file:{copia}?mode=ro", uri=True)
+            estado = origen.execute("PRAGMA quick_check").fetchone()[0]
+            if estado != "ok":
+                raise DbError(f"La copia {copia.name} está dañada: {estado}")
+        except sqlite3.Error as e:
+            if origen:
+                origen.close()
+            raise DbError(f"No se puede leer la copia {copia.name}: {e}")
+
+        try:
+            anterior = self.crear_copia("antes-de-restaurar")
+            with self._lock:
+                destino = get_connection()
+                try:
+                    secuencia = _secuencia_diario(destino)
+                    origen.backup(destino)
+                    # El diario no puede volver atrás: los números que ya han
+                    # visto /api/cambios, otras instancias y otros dispositivos
+                    # no se reutilizan. El salto deja un hueco que las demás
+                    # instancias abiertas interpretan como recarga completa.
+                    destino.execute(
+                        "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'cambios'",
+                        (secuencia + 1,)
+                    )
+                    if destino.execute("SELECT changes()").fetchone()[0] == 0:
+                        destino.execute(
+                            "INSERT INTO sqlite_sequence (name, seq) VALUES ('cambios', ?)", (secuencia + 1,)
+                        )
+                    destino.commit()
+                finally:
+                    destino.close()
+        except sqlite3.Error as e:
+            raise DbError(f"No se pudo restaurar la copia {copia.name}: {e}")
+        finally:
+            origen.close()
+
+        init_db()
+        # Los rangos del diario de la sesión ya no corresponden a la base de datos
+        get_undo_service().limpiar()
+        self._ultima_secuencia = None
+        get_event_bus().emit_match_deleted(0)
+        get_event_bus().emit_team_updated(0)
+        get_event_bus().emit_participant_updated(0)
+        print(f"[COPIAS] Restaurada la copia {copia.name}")
+        return anterior
+
+
+# Instancia global del servicio
+_backup_service: Optional[BackupService] = None
+
+
+def get_backup_service() -> BackupService:
+    """
+    Obtiene la instancia única del servicio de copias de seguridad.
+
+    Returns:
+        Instancia global de BackupService
+    """
+    global _backup_service
+    if _backup_service is None:
+        _backup_service = BackupService()
+    return _backup_service
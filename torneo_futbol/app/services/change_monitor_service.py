@@ -0,0 +1,276 @@
+"""
+Cambios hechos por otras instancias sobre la misma base de datos.
+
+Varias copias de la aplicación (o scripts de la línea de órdenes) pueden
+trabajar a la vez sobre el mismo torneo.db. ``comprobar()`` se llama
+periódicamente desde la interfaz:
+
+- Consulta ``PRAGMA data_version`` en una conexión propia que se mantiene
+  abierta. Es una lectura de memoria: mientras nadie escriba, no se toca el
+  diario ni se recarga nada.
+- Cuando la versión cambia, lee el diario de cambios desde el último número
+  de secuencia procesado y convierte cada fila en el evento del bus que
+  corresponde (``result_saved``, ``match_created``, ``team_updated``...), así
+  que solo se recargan las vistas y los servicios afectados.
+- Lo que ya anunció esta misma instancia no se repite: el servicio escucha el
+  bus y anota, para cada entidad (partido, equipo, participante), hasta qué
+  número de secuencia ya se ha avisado.
+
+Si el diario se ha purgado o se ha restaurado una copia y no se puede saber
+qué cambió, se emiten los eventos de "todo" (id 0).
+"""
+import sqlite3
+import threading
+from typing import Optional
+
+from app.core.event_bus import get_event_bus
+from app.models.db import DbError, get_db_path
+from app.models.journal_model import JournalModel
+from app.services.rating_service import get_rating_service
+
+
+# Columnas de partidos que forman el resultado
+COLUMNAS_RESULTADO = {
+    "goles_local", "goles_visitante", "penaltis_local", "penaltis_visitante",
+    "ganador_equipo_id", "estado",
+}
+
+# Cambios pendientes a partir de los cuales se recarga todo en lugar de avisar uno a uno
+MAX_CAMBIOS_DETALLADOS = 5000
+
+# Entidad a la que afecta cada evento del bus (los que no están no anuncian nada)
+ENTIDAD_EVENTO = {
+    'match_created': "partido", 'match_updated': "partido", 'match_deleted': "partido",
+    'match_changed': "partido", 'result_saved': "partido", 'result_changed': "partido",
+    'callup_changed': "partido",
+    'team_created': "equipo", 'team_updated': "equipo", 'team_deleted': "equipo", 'team_changed': "equipo",
+    'participant_created': "participante", 'participant_updated': "participante",
+    'participant_deleted': "participante", 'participant_changed': "participante",
+}
+
+
+def _entidad(cambio: dict) -> tuple[str, int]:
+    """Entidad (tipo, id) a la que pertenece una fila del diario; id 0 = todas las de su tipo."""
+    tabla = cambio['tabla']
+    fila = cambio['despues'] or cambio['antes']
+    if tabla == "equipos":
+        return "equipo", fila['id']
+    if tabla == "participantes":
+        return "participante", fila['id']
+    if tabla == "partidos":
+        return "partido", fila['id']
+    # Convocatorias, estadísticas, goles y partidos de grupo van con su partido;
+    # los grupos en sí cambian con todo el sorteo
+    return "partido", fila.get('partido_id') or 0
+
+
+def emitir_eventos(cambios: list[dict], invertidos: bool = False) -> None:
+    """
+    Avisa en el bus de las filas del diario que han cambiado.
+
+    Args:
+        cambios: Cambios del diario (como los devuelve JournalModel)
+        invertidos: Si True, los cambios se acaban de revertir (deshacer): una
+            inserción revertida es un borrado y al revés
+    """
+    creados, borrados, actualizados, resultados, convocatorias = set(), set(), set(), set(), set()
+    equipos, participantes = {}, {}
+    grupos = False
+    if invertidos:
+        eventos_fila = {"insert": "deleted", "delete": "created"}
+    else:
+        eventos_fila = {"insert": "created", "delete": "deleted"}
+
+    for cambio in cambios:
+        tabla = cambio['tabla']
+        operacion = eventos_fila.get(cambio['operacion'], "updated")
+        fila = cambio['despues'] or cambio['antes']
+        if tabla == "partidos":
+            if operacion == "deleted":
+                borrados.add(fila['id'])
+            elif operacion == "created":
+                creados.add(fila['id'])
+            elif COLUMNAS_RESULTADO & set(cambio['columnas']):
+                resultados.add(fila['id'])
+            else:
+                actualizados.add(fila['id'])
+        elif tabla in ("stats_partido", "goles"):
+            resultados.add(fila['partido_id'])
+        elif tabla == "convocados":
+            convocatorias.add(fila['partido_id'])
+        elif tabla in ("equipos", "participantes"):
+            destino = equipos if tabla == "equipos" else participantes
+            destino[fila['id']] = operacion
+        else:
+            grupos = True
+
+    event_bus = get_event_bus()
+    # Varios resultados a la vez: los ratings repiten el historial una sola vez
+    with get_rating_service().en_lote():
+        for equipo_id, evento in equipos.items():
+            getattr(event_bus, f"emit_team_{evento}")(equipo_id)
+        for participante_id, evento in participantes.items():
+            getattr(event_bus, f"emit_participant_{evento}")(participante_id)
+        for partido_id in sorted(borrados):
+            event_bus.emit_match_deleted(partido_id)
+        for partido_id in sorted(creados):
+            event_bus.emit_match_created(partido_id)
+        for partido_id in sorted(actualizados - resultados - borrados - creados):
+            event_bus.emit_match_updated(partido_id)
+        for partido_id in sorted((resultados | creados) - borrados):
+            event_bus.emit_result_saved(partido_id)
+        for partido_id in sorted(convocatorias - borrados):
+            event_bus.emit_callup_changed(partido_id)
+        if creados or grupos:
+            # Partidos nuevos o grupos cambiados: las clasificaciones se recalculan enteras
+            event_bus.emit_match_deleted(0)
+
+
+def emitir_recarga_completa() -> None:
+    """Avisa de que puede haber cambiado cualquier dato (eventos con id 0)."""
+    event_bus = get_event_bus()
+    event_bus.emit_team_updated(0)
+    event_bus.emit_participant_updated(0)
+    event_bus.emit_match_deleted(0)
+
+
+class ChangeMonitorService:
+    """Detecta los cambios de otras instancias y los reenvía al bus de eventos."""
+
+    def __init__(self):
+        """Inicializa el servicio sin conectar al bus de eventos."""
+        self._conexion: Optional[sqlite3.Connection] = None
+        # La conexión propia se usa también desde el hilo que emite los eventos
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._ultimo_seq = 0
+        # (tipo, id) -> último seq del diario ya anunciado por esta instancia
+        self._anunciados: dict[tuple[str, int], int] = {}
+        self._conectado = False
+
+    def conectar(self, event_bus) -> None:
+        """
+        Escucha el bus para saber qué ha anunciado ya esta instancia.
+
+        Los cambios anteriores a la conexión no se reenvían.
+
+        Args:
+            event_bus: Bus de eventos del núcleo
+        """
+        if self._conectado:
+            return
+        event_bus.suscribir_todos(self._on_evento_local)
+        self._conectado = True
+        try:
+            self._ultimo_seq = JournalModel.ultima_secuencia()
+            self._version = self._leer_version()
+        except (DbError, sqlite3.Error) as e:
+            print(f"[CAMBIOS EXTERNOS] No se pudo leer el estado inicial: {e}")
+
+    def _consultar(self, sql: str) -> Optional[tuple]:
+        """Ejecuta una consulta de una fila en la conexión propia (que se abre una vez)."""
+        with self._lock:
+            if self._conexion is None:
+                self._conexion = sqlite3.connect(str(get_db_path()), check_same_thread=False)
+            return self._conexion.execute(sql).fetchone()
+
+    def _leer_version(self) -> int:
+        """Valor actual de PRAGMA data_version en la conexión propia."""
+        return self._consultar("PRAGMA data_version")[0]
+
+    def _on_evento_local(self, nombre: str, *args) -> None:
+        """Anota la entidad de un evento emitido en esta instancia (ya está al día)."""
+        tipo = ENTIDAD_EVENTO.get(nombre)
+        if tipo is None or not args:
+            return
+        # Con la conexión propia: un lote de resultados no abre una conexión por evento
+        try:
+            fila = self._consultar("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'")
+        except sqlite3.Error:
+            return
+        self._anunciados[(tipo, args[0] or 0)] = fila[0] if fila else 0
+
+    def _ya_anunciado(self, cambio: dict) -> bool:
+        tipo, entidad_id = _entidad(cambio)
+        anunciado = max(self._anunciados.get((tipo, entidad_id), 0), self._anunciados.get((tipo, 0), 0))
+        return anunciado >= cambio['seq']
+
+    def comprobar(self) -> int:
+        """
+        Reenvía al bus los cambios que otras instancias han hecho desde la última llamada.
+
+        Returns:
+            Número de cambios externos avisados
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        try:
+            version = self._leer_version()
+        except sqlite3.Error as e:
+            raise DbError(f"Error al consultar la versión de la base de datos: {e}")
+        if version == self._version:
+            return 0
+        self._version = version
+
+        ultima = JournalModel.ultima_secuencia()
+        if ultima == self._ultimo_seq:
+            return 0
+        if ultima < self._ultimo_seq or ultima - self._ultimo_seq > MAX_CAMBIOS_DETALLADOS:
+            # Base de datos restaurada o demasiados cambios: se recarga todo
+            return self._recargar_todo(ultima, "el diario ha cambiado por completo")
+
+        cambios = []
+        while True:
+            lote = JournalModel.cambios_desde(cambios[-1]['seq'] if cambios else self._ultimo_seq)
+            if not lote:
+                break
+            cambios.extend(lote)
+        if not cambios or cambios[0]['seq'] != self._ultimo_seq + 1:
+            return self._recargar_todo(ultima, "faltan cambios en el diario")
+
+        self._ultimo_seq = cambios[-1]['seq']
+        externos = [cambio for cambio in cambios if not self._ya_anunciado(cambio)]
+        self._olvidar_anuncios()
+        if externos:
+            print(f"[CAMBIOS EXTERNOS] {len(externos)} cambios de otra instancia "
+                  f"({externos[0]['seq']}-{externos[-1]['seq']})")
+            emitir_eventos(externos)
+        return len(externos)
+
+    def _recargar_todo(self, ultima: int, motivo: str) -> int:
+        print(f"[CAMBIOS EXTERNOS] Recarga completa: {motivo}")
+        self._ultimo_seq = ultima
+        self._olvidar_anuncios()
+        emitir_recarga_completa()
+        return 1
+
+    def _olvidar_anuncios(self) -> None:
+        """Descarta los anuncios que ya no pueden tapar cambios pendientes."""
+        self._anunciados = {
+            entidad: seq for entidad, seq in self._anunciados.items() if seq > self._ultimo_seq
+        }
+
+    def cerrar(self) -> None:
+        """Cierra la conexión propia."""
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+
+# Instancia global del servicio
+_change_monitor_service: Optional[ChangeMonitorService] = None
+
+
+def get_change_monitor_service() -> ChangeMonitorService:
+    """
+    Obtiene la instancia única del servicio de cambios externos.
+
+    Returns:
+        Instancia global de ChangeMonitorService
+    """
+    global _change_monitor_service
+    if _change_monitor_service is None:
+        _change_monitor_service = ChangeMonitorService()
+    return _change_monitor_service
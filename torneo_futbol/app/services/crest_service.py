@@ -0,0 +1,410 @@
+"""
+Almacén de escudos direccionado por contenido.
+
+Cada escudo se guarda en ``data/escudos`` con el nombre ``<hash>.<ext>``,
+donde el hash son los primeros 16 caracteres del SHA-256 de su contenido.
+Importar dos veces la misma imagen devuelve la misma ruta, sin copias.
+
+El número de referencias de cada archivo se obtiene de ``equipos.escudo_path``
+(la base de datos es la única fuente de verdad): cuando ningún equipo usa un
+escudo, ``liberar`` lo borra, y ``recolectar_basura`` elimina de una vez todos
+los archivos huérfanos.
+
+Las miniaturas se rasterizan a PNG (también los SVG) en los tamaños que usan
+las vistas y se guardan en ``data/escudos/.thumbs``; por encima hay una caché
+LRU en memoria (``ImageCache``), de modo que un SVG se renderiza una sola vez
+por tamaño.
+"""
+import hashlib
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import Qt, QRectF, QSize
+from PySide6.QtGui import QImage, QPainter, QPixmap
+from PySide6.QtSvg import QSvgRenderer
+
+from app.config import DATA_DIR
+from app.models.team_model import TeamModel
+from app.services.image_cache import get_image_cache
+
+
+# Directorio de escudos y de sus miniaturas
+DIR_ESCUDOS = DATA_DIR / "escudos"
+DIR_MINIATURAS = DIR_ESCUDOS / ".thumbs"
+
+# Tamaños (px) de miniatura que usan las vistas y los informes
+TAMANO_TABLA = 32
+TAMANO_CUADRO = 48
+TAMANO_INFORME = 96
+TAMANO_DETALLE = 144
+TAMANOS_MINIATURA = (TAMANO_TABLA, TAMANO_CUADRO, TAMANO_INFORME, TAMANO_DETALLE)
+
+# Longitud del hash usado como nombre de archivo
+LONGITUD_HASH = 16
+
+_PATRON_HASH = re.compile(rf"^[0-9a-f]{{{LONGITUD_HASH}}}$")
+
+
+def _hash_archivo(ruta: Path) -> str:
+    """Hash de contenido (prefijo del SHA-256) de un archivo."""
+    resumen = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            resumen.update(bloque)
+    return resumen.hexdigest()[:LONGITUD_HASH]
+
+
+class CrestService:
+    """Servicio de almacenamiento, miniaturas y limpieza de escudos."""
+
+    def __init__(self):
+        """Inicializa el servicio."""
+        self._cache = get_image_cache()
+        self._hashes: dict[Path, str] = {}
+
+    # ==================== RUTAS ====================
+
+    @staticmethod
+    def resolver(ruta_escudo: Optional[str]) -> Optional[Path]:
+        """
+        Convierte la ruta guardada en equipos.escudo_path en una ruta absoluta.
+
+        Acepta rutas absolutas y relativas a la carpeta del proyecto, con
+        separadores de Windows o POSIX.
+
+        Args:
+            ruta_escudo: Ruta tal como está en la base de datos
+
+        Returns:
+            Ruta absoluta o None si no hay escudo
+        """
+        if not ruta_escudo or ruta_escudo == 'Sin escudo':
+            return None
+        ruta = Path(ruta_escudo.replace("\\", "/"))
+        if not ruta.is_absolute():
+            ruta = DATA_DIR.parent / ruta
+        return ruta
+
+    @staticmethod
+    def _ruta_relativa(archivo: Path) -> str:
+        """Ruta que se guarda en la base de datos (relativa y con '/')."""
+        return archivo.relative_to(DATA_DIR.parent).as_posix()
+
+    def _clave(self, archivo: Path) -> str:
+        """Hash de contenido del escudo (el nombre si ya está direccionado)."""
+        if _PATRON_HASH.match(archivo.stem):
+            return archivo.stem
+        clave = self._hashes.get(archivo)
+        if clave is None:
+            clave = _hash_archivo(archivo)
+            self._hashes[archivo] = clave
+        return clave
+
+    # ==================== IMPORTACIÓN ====================
+
+    def importar(self, archivo_origen: str) -> str:
+        """
+        Incorpora una imagen al almacén (sin duplicar si ya existe).
+
+        Args:
+            archivo_origen: Ruta de la imagen elegida por el usuario
+
+        Returns:
+            Ruta relativa a guardar en equipos.escudo_path
+
+        Raises:
+            OSError: Si no se puede leer o copiar el archivo
+        """
+        origen = Path(archivo_origen)
+        clave = _hash_archivo(origen)
+        destino = DIR_ESCUDOS / f"{clave}{origen.suffix.lower()}"
+
+        if not destino.exists():
+            DIR_ESCUDOS.mkdir(parents=True, exist_ok=True)
+            temporal = destino.with_name(destino.name + ".tmp")
+            shutil.copy2(origen, temporal)
+            os.replace(temporal, destino)
+            print(f"[ESCUDOS] Escudo importado: {destino.name}")
+        else:
+            print(f"[ESCUDOS] Escudo ya existente, se reutiliza: {destino.name}")
+
+        self.pre_rasterizar(destino)
+        return self._ruta_relativa(destino)
+
+    # ==================== MINIATURAS ====================
+
+    @staticmethod
+    def _rasterizar(archivo: Path, tamano: int) -> QImage:
+        """
+        Renderiza un escudo centrado en un cuadrado transparente.
+
+        Args:
+            archivo: Imagen o SVG de origen
+            tamano: Lado del cuadrado en píxeles
+
+        Returns:
+            Imagen rasterizada (nula si el archivo no es válido)
+        """
+        if archivo.suffix.lower() == ".svg":
+            renderer = QSvgRenderer(str(archivo))
+            if not renderer.isValid():
+                return QImage()
+            dimensiones = renderer.defaultSize()
+            if dimensiones.isEmpty():
+                dimensiones = QSize(tamano, tamano)
+            origen = None
+        else:
+            origen = QImage(str(archivo))
+            if origen.isNull():
+                return QImage()
+            dimensiones = origen.size()
+
+        dimensiones = dimensiones.scaled(tamano, tamano, Qt.AspectRatioMode.KeepAspectRatio)
+        destino = QRectF(
+            (tamano - dimensiones.width()) / 2, (tamano - dimensiones.height()) / 2,
+            dimensiones.width(), dimensiones.height()
+        )
+
+        imagen = QImage(tamano, tamano, QImage.Format.Format_ARGB32_Premultiplied)
+        imagen.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(imagen)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        if origen is None:
+            renderer.render(painter, destino)
+        else:
+            painter.drawImage(destino, origen)
+        painter.end()
+        return imagen
+
+    def ruta_miniatura(self, ruta_escudo: Optional[str], tamano: int) -> Optional[Path]:
+        """
+        Obtiene (generándola si hace falta) la miniatura PNG en disco.
+
+        Útil también para los informes PDF, que no admiten SVG.
+
+        Args:
+            ruta_escudo: Ruta del escudo tal como está en la base de datos
+            tamano: Lado de la miniatura en píxeles
+
+        Returns:
+            Ruta del PNG o None si el escudo no existe o no es válido
+        """
+        archivo = self.resolver(ruta_escudo)
+        if archivo is None or not archivo.exists():
+            return None
+
+        miniatura = DIR_MINIATURAS / f"{self._clave(archivo)}_{tamano}.png"
+        if not miniatura.exists():
+            imagen = self._rasterizar(archivo, tamano)
+            if imagen.isNull():
+                return None
+            DIR_MINIATURAS.mkdir(parents=True, exist_ok=True)
+            temporal = miniatura.with_name(miniatura.stem + ".tmp.png")
+            if not imagen.save(str(temporal), "PNG"):
+                return None
+            os.replace(temporal, miniatura)
+        return miniatura
+
+    def miniatura(self, ruta_escudo: Optional[str], tamano: int) -> QPixmap:
+        """
+        Obtiene la miniatura de un escudo desde memoria, disco o rasterizándola.
+
+        Args:
+            ruta_escudo: Ruta del escudo tal como está en la base de datos
+            tamano: Lado de la miniatura en píxeles
+
+        Returns:
+            Pixmap cuadrado (nulo si no hay escudo válido)
+        """
+        archivo = self.resolver(ruta_escudo)
+        if archivo is None:
+            return QPixmap()
+
+        def fabrica():
+            ruta = self.ruta_miniatura(ruta_escudo, tamano)
+            return QPixmap(str(ruta)) if ruta else QPixmap()
+
+        return self._cache.obtener_o_crear((str(archivo), ("escudo", tamano), None, "miniatura"), fabrica)
+
+    def pre_rasterizar(self, archivo: Path) -> None:
+        """
+        Genera en disco todas las miniaturas de un escudo.
+
+        Args:
+            archivo: Archivo del escudo
+        """
+        ruta = str(archivo)
+        for tamano in TAMANOS_MINIATURA:
+            self.ruta_miniatura(ruta, tamano)
+
+    # ==================== REFERENCIAS Y LIMPIEZA ====================
+
+    def contar_referencias(self) -> dict[Path, int]:
+        """
+        Cuenta los equipos que usan cada archivo de escudo.
+
+        Returns:
+            Diccionario con {ruta absoluta: num_equipos}
+        """
+        referencias: dict[Path, int] = {}
+        for ruta, cantidad in TeamModel.contar_referencias_escudos().items():
+            archivo = self.resolver(ruta)
+            if archivo is not None:
+                archivo = archivo.resolve()
+                referencias[archivo] = referencias.get(archivo, 0) + cantidad
+        return referencias
+
+    def _borrar(self, archivo: Path, claves_en_uso: set[str]) -> int:
+        """Borra un escudo y sus miniaturas si su contenido ya no se usa."""
+        liberados = archivo.stat().st_size
+        clave = self._clave(archivo)
+        archivo.unlink()
+        self._hashes.pop(archivo, None)
+        self._cache.invalidar(str(archivo))
+        if clave not in claves_en_uso:
+            for miniatura in DIR_MINIATURAS.glob(f"{clave}_*.png"):
+                liberados += miniatura.stat().st_size
+                miniatura.unlink()
+        return liberados
+
+    def liberar(self, ruta_escudo: Optional[str]) -> bool:
+        """
+        Borra un escudo si ya no lo usa ningún equipo.
+
+        Solo actúa sobre archivos del almacén (data/escudos).
+
+        Args:
+            ruta_escudo: Ruta que ha dejado de usar un equipo
+
+        Returns:
+            True si el archivo se ha borrado
+        """
+        archivo = self.resolver(ruta_escudo)
+        if archivo is None or not archivo.exists():
+            return False
+        archivo = archivo.resolve()
+        if archivo.parent != DIR_ESCUDOS.resolve():
+            return False
+
+        referencias = self.contar_referencias()
+        if referencias.get(archivo, 0) > 0:
+            return False
+
+        claves_en_uso = {self._clave(r) for r in referencias if r.exists()}
+        self._borrar(archivo, claves_en_uso)
+        print(f"[ESCUDOS] Escudo sin referencias eliminado: {archivo.name}")
+        return True
+
+    def recolectar_basura(self, simular: bool = False) -> dict:
+        """
+        Elimina los escudos y miniaturas que no usa ningún equipo.
+
+        Args:
+            simular: Si True, solo informa de lo que se borraría
+
+        Returns:
+            Diccionario con eliminados (nombres), miniaturas_eliminadas y bytes_liberados
+        """
+        informe = {"eliminados": [], "miniaturas_eliminadas": 0, "bytes_liberados": 0}
+        if not DIR_ESCUDOS.exists():
+            return informe
+
+        referencias = self.contar_referencias()
+        claves_en_uso = {self._clave(r) for r in referencias if r.exists()}
+
+        for archivo in sorted(DIR_ESCUDOS.iterdir()):
+            archivo = archivo.resolve()
+            if not archivo.is_file() or archivo in referencias:
+                continue
+            informe["eliminados"].append(archivo.name)
+            if simular:
+                informe["bytes_liberados"] += archivo.stat().st_size
+            else:
+                informe["bytes_liberados"] += self._borrar(archivo, claves_en_uso)
+
+        if DIR_MINIATURAS.exists():
+            for miniatura in sorted(DIR_MINIATURAS.glob("*.png")):
+                clave = miniatura.stem.rsplit("_", 1)[0]
+                if clave in claves_en_uso:
+                    continue
+                informe["miniaturas_eliminadas"] += 1
+                informe["bytes_liberados"] += miniatura.stat().st_size
+                if not simular:
+                    miniatura.unlink()
+
+        return informe
+
+    def deduplicar(self, simular: bool = False) -> dict:
+        """
+        Migra los escudos existentes al almacén direccionado por contenido.
+
+        Renombra cada archivo a ``<hash>.<ext>``, actualiza las rutas de los
+        equipos en una transacción y borra las copias duplicadas.
+
+        Args:
+            simular: Si True, solo informa de lo que se haría
+
+        Returns:
+            Diccionario con renombrados, duplicados, equipos_actualizados y bytes_liberados
+        """
+        informe = {"renombrados": 0, "duplicados": [], "equipos_actualizados": 0, "bytes_liberados": 0}
+        if not DIR_ESCUDOS.exists():
+            return informe
+
+        # Archivo actual -> archivo direccionado por contenido
+        destinos: dict[Path, Path] = {}
+        for archivo in sorted(DIR_ESCUDOS.iterdir()):
+            if not archivo.is_file() or archivo.name.endswith(".tmp"):
+                continue
+            archivo = archivo.resolve()
+            destino = archivo.with_name(f"{_hash_archivo(archivo)}{archivo.suffix.lower()}")
+            # Comparación sin mayúsculas: en Windows ambos nombres son el mismo archivo
+            if destino.name.lower() != archivo.name.lower():
+                destinos[archivo] = destino
+
+        # Copiar primero: los originales se borran cuando la BD ya apunta al destino
+        vistos = set()
+        for archivo, destino in destinos.items():
+            if destino.exists() or destino in vistos:
+                informe["duplicados"].append(archivo.name)
+                informe["bytes_liberados"] += archivo.stat().st_size
+            else:
+                informe["renombrados"] += 1
+                if not simular:
+                    shutil.copy2(archivo, destino)
+            vistos.add(destino)
+
+        cambios = {}
+        for ruta, cantidad in TeamModel.contar_referencias_escudos().items():
+            archivo = self.resolver(ruta)
+            if archivo is None:
+                continue
+            destino = destinos.get(archivo.resolve())
+            if destino is not None:
+                cambios[ruta] = self._ruta_relativa(destino)
+                informe["equipos_actualizados"] += cantidad
+
+        if simular:
+            return informe
+
+        if cambios:
+            TeamModel.reemplazar_rutas_escudo(cambios)
+        for archivo, destino in destinos.items():
+            archivo.unlink()
+            self._cache.invalidar(str(archivo))
+        for destino in set(destinos.values()):
+            self.pre_rasterizar(destino)
+        print(
+            f"[ESCUDOS] Deduplicación: {informe['renombrados']} renombrados, "
+            f"{len(informe['duplicados'])} duplicados eliminados, "
+            f"{informe['equipos_actualizados']} equipos actualizados"
+        )
+        return informe
+
+
+# Instancia global
+crest_service = CrestService()
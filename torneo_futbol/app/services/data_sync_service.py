@@ -0,0 +1,317 @@
+"""
+Copia de los datos empaquetados junto al ejecutable.
+
+En el ejecutable de PyInstaller los datos semilla (base de datos y escudos)
+viajan en ``sys._MEIPASS/data`` y deben copiarse a ``DATA_DIR`` (junto al
+.exe) para que los cambios persistan. La copia se hace desde ``main.py`` como
+una fase medida del arranque.
+
+Al empaquetar, ``scripts/generar_manifiesto_datos.py`` escribe un manifiesto
+con el SHA-256 y el tamaño de cada archivo de ``data/``. En cada arranque:
+
+- Si el manifiesto es el mismo que en la última sincronización, no se recorre
+  ningún directorio (camino rápido para memorias USB lentas).
+- Si ha cambiado, solo se copian los archivos cuyo hash difiere del que se
+  copió la última vez. Para saber si el usuario modificó su copia se compara
+  el tamaño y la fecha de modificación guardados en el estado local, sin
+  volver a calcular hashes del destino.
+- Una base de datos que el usuario ya ha modificado nunca se sobrescribe.
+- Los archivos de la raíz (torneo.db) se copian antes de abrir la base de
+  datos; las carpetas de recursos (escudos) se copian en un hilo en segundo
+  plano.
+
+El resultado de cada sincronización se guarda en el archivo de estado.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from app.config import BUNDLED_DATA_DIR, DATA_DIR, DB_NAME, CLASIFICACIONES_NAME
+
+
+# Manifiesto generado al empaquetar (dentro de data/)
+NOMBRE_MANIFIESTO = "datos_empaquetados.json"
+
+# Estado de la última sincronización (en DATA_DIR, junto al .exe)
+NOMBRE_ESTADO = ".sincronizacion_datos.json"
+
+# Archivos de data/ que nunca se incluyen en el manifiesto
+EXCLUIDOS = {NOMBRE_MANIFIESTO, NOMBRE_ESTADO, CLASIFICACIONES_NAME}
+
+_TAMANO_BLOQUE = 1024 * 1024
+
+_hilo_fondo: Optional[threading.Thread] = None
+
+
+def calcular_sha256(ruta: Path) -> str:
+    """
+    Calcula el SHA-256 de un archivo leyendo por bloques.
+
+    Args:
+        ruta: Archivo a resumir
+
+    Returns:
+        Hash en hexadecimal
+    """
+    resumen = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(_TAMANO_BLOQUE), b""):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+def generar_manifiesto(directorio: Path) -> dict:
+    """
+    Genera el manifiesto de un directorio de datos.
+
+    Args:
+        directorio: Directorio data/ del proyecto
+
+    Returns:
+        Diccionario con la fecha de generación y, por cada archivo (ruta
+        relativa con "/"), su sha256 y tamaño
+    """
+    archivos = {}
+    for ruta in sorted(directorio.rglob("*")):
+        if not ruta.is_file() or ruta.name in EXCLUIDOS:
+            continue
+        relativa = ruta.relative_to(directorio).as_posix()
+        if relativa.endswith("-journal") or relativa.endswith("-wal") or relativa.endswith("-shm"):
+            continue
+        # Las miniaturas de los escudos se regeneran en cada ordenador
+        if "/.thumbs/" in f"/{relativa}":
+            continue
+        archivos[relativa] = {
+            "sha256": calcular_sha256(ruta),
+            "tamano": ruta.stat().st_size,
+        }
+    return {
+        "generado": datetime.now().isoformat(timespec="seconds"),
+        "archivos": archivos,
+    }
+
+
+def escribir_manifiesto(directorio: Path) -> Path:
+    """
+    Genera y guarda el manifiesto dentro del directorio de datos.
+
+    Args:
+        directorio: Directorio data/ del proyecto
+
+    Returns:
+        Ruta del manifiesto escrito
+    """
+    manifiesto = generar_manifiesto(directorio)
+    ruta = directorio / NOMBRE_MANIFIESTO
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    return ruta
+
+
+def _leer_json(ruta: Path) -> Optional[dict]:
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _guardar_estado(estado: dict) -> None:
+    ruta = DATA_DIR / NOMBRE_ESTADO
+    temporal = ruta.with_suffix(".tmp")
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, ruta)
+    except OSError as e:
+        print(f"[APP-DATA] No se pudo guardar el estado de sincronización: {e}")
+
+
+def _firma_destino(ruta: Path) -> dict:
+    info = ruta.stat()
+    return {"tamano": info.st_size, "mtime_ns": info.st_mtime_ns}
+
+
+def _copiar_atomico(origen: Path, destino: Path) -> None:
+    """Copia a un temporal y lo renombra para no dejar archivos a medias."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_name(destino.name + ".tmp")
+    shutil.copy2(origen, temporal)
+    os.replace(temporal, destino)
+
+
+def _decidir(relativa: str, entrada: dict, previo: Optional[dict]) -> str:
+    """
+    Decide qué hacer con un archivo del manifiesto.
+
+    Returns:
+        "copiar", "omitir" (ya está al día), "adoptar" (igual que el
+        empaquetado pero sin estado previo) o "conservar" (modificado por el usuario)
+    """
+    destino = DATA_DIR / relativa
+    if not destino.exists():
+        return "copiar"
+
+    firma = _firma_destino(destino)
+    if previo is not None:
+        if previo.get("sha256") == entrada["sha256"]:
+            return "omitir"
+        # El empaquetado cambió: solo se actualiza si el usuario no tocó su copia
+        sin_tocar = (previo.get("tamano") == firma["tamano"]
+                     and previo.get("mtime_ns") == firma["mtime_ns"])
+        return "copiar" if sin_tocar else "conservar"
+
+    # Sin estado previo (primera ejecución de esta versión sobre datos existentes)
+    if firma["tamano"] == 0:
+        return "copiar"
+    if relativa == DB_NAME:
+        return "conservar"
+    return "adoptar" if firma["tamano"] == entrada["tamano"] else "conservar"
+
+
+def _aplicar(pendientes: list[tuple[str, dict, str]], estado: dict, informe: dict) -> None:
+    for relativa, entrada, accion in pendientes:
+        destino = DATA_DIR / relativa
+        try:
+            if accion == "copiar":
+                _copiar_atomico(BUNDLED_DATA_DIR / relativa, destino)
+                informe["copiados"].append(relativa)
+            elif accion == "adoptar":
+                informe["adoptados"].append(relativa)
+            else:
+                informe["conservados"].append(relativa)
+                continue
+            estado["archivos"][relativa] = {"sha256": entrada["sha256"], **_firma_destino(destino)}
+        except OSError as e:
+            informe["errores"].append(f"{relativa}: {e}")
+
+
+def _sincronizar_fondo(pendientes: list, estado: dict, informe: dict, inicio: float) -> None:
+    _aplicar(pendientes, estado, informe)
+    _finalizar(estado, informe, inicio)
+
+
+def _finalizar(estado: dict, informe: dict, inicio: float) -> None:
+    informe["duracion_ms"] = round((time.perf_counter() - inicio) * 1000.0, 1)
+    if not informe["errores"]:
+        estado["manifiesto"] = informe["manifiesto"]
+    estado["ultimo_informe"] = informe
+    _guardar_estado(estado)
+    print(
+        f"[APP-DATA] Sincronización: {len(informe['copiados'])} copiados, "
+        f"{len(informe['adoptados'])} adoptados, {len(informe['conservados'])} conservados, "
+        f"{informe['omitidos']} al día, {len(informe['errores'])} errores "
+        f"({informe['duracion_ms']:.0f} ms)"
+    )
+    for error in informe["errores"]:
+        print(f"[APP-DATA] Error: {error}")
+
+
+def _sincronizar_sin_manifiesto() -> int:
+    """Comportamiento anterior: copiar lo que falte o esté vacío."""
+    copiados = 0
+    for origen in BUNDLED_DATA_DIR.iterdir():
+        destino = DATA_DIR / origen.name
+        if origen.is_file():
+            if not destino.exists() or destino.stat().st_size == 0:
+                shutil.copy2(origen, destino)
+                copiados += 1
+        elif origen.is_dir() and not destino.exists():
+            shutil.copytree(origen, destino)
+            copiados += 1
+    return copiados
+
+
+def sincronizar_datos_empaquetados(en_segundo_plano: bool = True) -> int:
+    """
+    Copia los datos empaquetados que hayan cambiado en DATA_DIR.
+
+    Solo actúa en el ejecutable empaquetado; en desarrollo ambas rutas
+    coinciden y no hay nada que copiar.
+
+    Args:
+        en_segundo_plano: Si True, los archivos de subcarpetas (escudos) se
+            copian en un hilo y la función vuelve tras copiar la base de datos
+
+    Returns:
+        Número de archivos copiados de forma síncrona
+    """
+    global _hilo_fondo
+
+    if not getattr(sys, 'frozen', False) or not BUNDLED_DATA_DIR.exists():
+        return 0
+
+    inicio = time.perf_counter()
+    DATA_DIR.mkdir(exist_ok=True)
+
+    ruta_manifiesto = BUNDLED_DATA_DIR / NOMBRE_MANIFIESTO
+    if not ruta_manifiesto.exists():
+        copiados = _sincronizar_sin_manifiesto()
+        print(f"[APP-DATA] Sin manifiesto: {copiados} elementos copiados")
+        return copiados
+
+    id_manifiesto = calcular_sha256(ruta_manifiesto)
+    estado = _leer_json(DATA_DIR / NOMBRE_ESTADO) or {}
+    estado.setdefault("archivos", {})
+
+    # Camino rápido: el empaquetado no ha cambiado desde la última vez
+    if estado.get("manifiesto") == id_manifiesto and (DATA_DIR / DB_NAME).exists():
+        return 0
+
+    manifiesto = _leer_json(ruta_manifiesto)
+    if manifiesto is None:
+        print("[APP-DATA] Manifiesto ilegible; se usa la copia sin manifiesto")
+        return _sincronizar_sin_manifiesto()
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "manifiesto": id_manifiesto,
+        "copiados": [], "adoptados": [], "conservados": [], "errores": [],
+        "omitidos": 0,
+    }
+    inmediatos, diferidos = [], []
+    for relativa, entrada in manifiesto.get("archivos", {}).items():
+        accion = _decidir(relativa, entrada, estado["archivos"].get(relativa))
+        if accion == "omitir":
+            informe["omitidos"] += 1
+            continue
+        (diferidos if "/" in relativa else inmediatos).append((relativa, entrada, accion))
+
+    _aplicar(inmediatos, estado, informe)
+    copiados = len(informe["copiados"])
+
+    if diferidos and en_segundo_plano:
+        _hilo_fondo = threading.Thread(
+            target=_sincronizar_fondo,
+            args=(diferidos, estado, informe, inicio),
+            name="sincronizacion-datos",
+            daemon=True,
+        )
+        _hilo_fondo.start()
+    else:
+        _aplicar(diferidos, estado, informe)
+        _finalizar(estado, informe, inicio)
+    return copiados
+
+
+def esperar_sincronizacion(timeout: Optional[float] = None) -> bool:
+    """
+    Espera a que termine la copia en segundo plano, si la hay.
+
+    Args:
+        timeout: Segundos máximos de espera (None = sin límite)
+
+    Returns:
+        True si no queda ninguna copia en curso
+    """
+    if _hilo_fondo is not None and _hilo_fondo.is_alive():
+        _hilo_fondo.join(timeout)
+        return not _hilo_fondo.is_alive()
+    return True
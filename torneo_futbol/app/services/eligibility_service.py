@@ -0,0 +1,227 @@
+"""
+Sanciones y elegibilidad de los jugadores.
+
+Recorre los partidos jugados en orden (fecha, ronda y slot) y lleva, para
+cada jugador, las amarillas acumuladas y los partidos de sanción pendientes:
+
+- Cada ``AMARILLAS_POR_SANCION`` amarillas acumuladas suponen un partido de
+  sanción (el contador vuelve a empezar).
+- Una roja supone ``PARTIDOS_SANCION_ROJA`` partidos de sanción.
+- Cada partido jugado por el equipo cumple un partido de sanción de sus
+  jugadores sancionados antes de ese partido.
+
+El estado se guarda en memoria con un índice {equipo_id: sancionados}, así que
+comprobar un jugador o filtrar una plantilla no consulta la base de datos.
+Un resultado nuevo (evento ``result_saved``) se aplica sobre el estado actual
+leyendo solo las tarjetas de ese partido; si se edita un partido ya aplicado
+o llega fuera de orden, el estado se marca como obsoleto y se recalcula
+entero en la siguiente consulta (dos consultas a la base de datos).
+
+Las sanciones solo impiden convocar para partidos no jugados: las
+convocatorias de partidos ya jugados se pueden seguir corrigiendo.
+"""
+from datetime import datetime
+from typing import Optional
+
+from app.constants import AMARILLAS_POR_SANCION, PARTIDOS_SANCION_ROJA
+from app.models.match_model import MatchModel
+from app.models.match_stats_model import MatchStatsModel
+from app.services.scheduler_service import parsear_fecha_hora
+from app.services.tournament_service import TournamentService
+
+
+def _clave_orden(partido: dict) -> tuple:
+    """Clave de orden cronológico de un partido jugado."""
+    rondas = TournamentService.RONDAS
+    ronda = rondas.index(partido['eliminatoria']) if partido['eliminatoria'] in rondas else len(rondas)
+    return (parsear_fecha_hora(partido['fecha_hora']) or datetime.min, ronda, partido['slot'], partido['id'])
+
+
+class EligibilityService:
+    """Estado de sanciones de los jugadores, actualizado con el bus de eventos."""
+
+    def __init__(self):
+        """Inicializa el servicio; el estado se calcula en la primera consulta."""
+        self._conectado = False
+        self._cargado = False
+        self._jugadores: dict[int, dict] = {}         # {participante_id: {amarillas, pendientes, equipo_id}}
+        self._sancionados: dict[int, set[int]] = {}   # {equipo_id: {participante_id}}
+        self._aplicados: set[int] = set()
+        self._ultima_clave: Optional[tuple] = None
+
+    def conectar(self, event_bus) -> None:
+        """
+        Escucha los resultados guardados y los cambios de partidos.
+
+        Args:
+            event_bus: Bus de eventos de la aplicación
+        """
+        if self._conectado:
+            return
+        event_bus.result_saved.connect(self.registrar_resultado)
+        event_bus.match_updated.connect(self._on_partido_modificado)
+        event_bus.match_deleted.connect(self._on_partido_modificado)
+        self._conectado = True
+
+    # ------------------------------------------------------------------
+    # Cálculo
+    # ------------------------------------------------------------------
+
+    def reconstruir(self) -> None:
+        """Recalcula las sanciones desde todos los partidos jugados."""
+        self._jugadores = {}
+        self._sancionados = {}
+        self._aplicados = set()
+        self._ultima_clave = None
+
+        tarjetas: dict[int, list[dict]] = {}
+        for fila in MatchStatsModel.obtener_tarjetas():
+            tarjetas.setdefault(fila['partido_id'], []).append(fila)
+
+        for partido in sorted(MatchModel.listar_partidos(estado='Jugado'), key=_clave_orden):
+            self._aplicar(partido, tarjetas.get(partido['id'], []))
+
+        self._cargado = True
+        sancionados = sum(len(ids) for ids in self._sancionados.values())
+        print(f"[SANCIONES] Estado recalculado: {len(self._aplicados)} partidos, {sancionados} jugadores sancionados")
+
+    def _asegurar_cargado(self) -> None:
+        if not self._cargado:
+            self.reconstruir()
+
+    def _aplicar(self, partido: dict, tarjetas: list[dict]) -> None:
+        """Cumple las sanciones de los dos equipos y añade las tarjetas del partido."""
+        for equipo_id in (partido['local_id'], partido['visitante_id']):
+            for participante_id in list(self._sancionados.get(equipo_id, ())):
+                jugador = self._jugadores[participante_id]
+                jugador['pendientes'] -= 1
+                if jugador['pendientes'] == 0:
+                    self._sancionados[equipo_id].discard(participante_id)
+
+        for tarjeta in tarjetas:
+            jugador = self._jugadores.setdefault(
+                tarjeta['participante_id'], {'amarillas': 0, 'pendientes': 0, 'equipo_id': None}
+            )
+            if jugador['pendientes'] and jugador['equipo_id'] != tarjeta['equipo_id']:
+                # Cambio de equipo: la sanción se cumple con el equipo nuevo
+                self._sancionados.get(jugador['equipo_id'], set()).discard(tarjeta['participante_id'])
+            jugador['equipo_id'] = tarjeta['equipo_id']
+            jugador['amarillas'] += tarjeta['amarillas'] or 0
+            nuevas, jugador['amarillas'] = divmod(jugador['amarillas'], AMARILLAS_POR_SANCION)
+            if tarjeta['rojas']:
+                nuevas += PARTIDOS_SANCION_ROJA
+            jugador['pendientes'] += nuevas
+            if jugador['pendientes']:
+                self._sancionados.setdefault(tarjeta['equipo_id'], set()).add(tarjeta['participante_id'])
+
+        self._aplicados.add(partido['id'])
+        self._ultima_clave = _clave_orden(partido)
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+
+    def registrar_resultado(self, partido_id: int) -> None:
+        """
+        Aplica el resultado de un partido sobre el estado actual.
+
+        Si el partido ya estaba aplicado (resultado editado) o es anterior al
+        último aplicado, el estado se recalculará entero en la siguiente consulta.
+
+        Args:
+            partido_id: ID del partido cuyo resultado se ha guardado
+        """
+        if not self._cargado:
+            return
+        try:
+            partido = MatchModel.obtener_partido_por_id(partido_id)
+            if (not partido or partido['estado'] != 'Jugado' or partido_id in self._aplicados
+                    or (self._ultima_clave is not None and _clave_orden(partido) < self._ultima_clave)):
+                self._cargado = False
+                return
+            self._aplicar(partido, MatchStatsModel.obtener_tarjetas(partido_id))
+        except Exception as e:
+            print(f"[SANCIONES] Error aplicando el partido {partido_id}: {e}")
+            self._cargado = False
+
+    def _on_partido_modificado(self, partido_id: int) -> None:
+        """Invalida el estado si cambia o se borra un partido ya aplicado (0 = todos)."""
+        if not partido_id or partido_id in self._aplicados:
+            self._cargado = False
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def partidos_sancion(self, participante_id: int) -> int:
+        """
+        Partidos de sanción que le quedan por cumplir a un jugador.
+
+        Args:
+            participante_id: ID del jugador
+
+        Returns:
+            Número de partidos (0 si puede jugar)
+        """
+        self._asegurar_cargado()
+        jugador = self._jugadores.get(participante_id)
+        return jugador['pendientes'] if jugador else 0
+
+    def sancionados(self, equipo_id: int) -> set[int]:
+        """
+        Jugadores sancionados de un equipo.
+
+        Args:
+            equipo_id: ID del equipo
+
+        Returns:
+            Conjunto de IDs de participantes
+        """
+        self._asegurar_cargado()
+        return set(self._sancionados.get(equipo_id, ()))
+
+    def filtrar_elegibles(self, jugadores: list[dict], equipo_id: int) -> list[dict]:
+        """
+        Quita de una lista de jugadores los sancionados del equipo.
+
+        Args:
+            jugadores: Jugadores con la clave "id"
+            equipo_id: ID del equipo
+
+        Returns:
+            Jugadores que pueden ser convocados
+        """
+        sancionados = self.sancionados(equipo_id)
+        return [j for j in jugadores if j['id'] not in sancionados]
+
+    def motivo_no_elegible(self, participante_id: int) -> Optional[str]:
+        """
+        Explica por qué un jugador no puede ser convocado.
+
+        Args:
+            participante_id: ID del jugador
+
+        Returns:
+            None si puede ser convocado o el motivo
+        """
+        pendientes = self.partidos_sancion(participante_id)
+        if not pendientes:
+            return None
+        return (f"El jugador está sancionado: le queda{'n' if pendientes > 1 else ''} "
+                f"{pendientes} partido{'s' if pendientes > 1 else ''} por cumplir.")
+
+
+_eligibility_service: Optional[EligibilityService] = None
+
+
+def get_eligibility_service() -> EligibilityService:
+    """
+    Obtiene la instancia única del servicio de sanciones.
+
+    Returns:
+        Instancia global de EligibilityService
+    """
+    global _eligibility_service
+    if _eligibility_service is None:
+        _eligibility_service = EligibilityService()
+    return _eligibility_service
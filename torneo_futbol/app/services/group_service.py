@@ -0,0 +1,460 @@
+"""
+Fase de grupos (liga) previa al cuadro de eliminatorias.
+
+Los equipos se reparten en grupos (por bombos según el rating o al azar) y
+cada grupo juega una liga a una vuelta generada con el método del círculo.
+Los partidos son filas normales de la tabla partidos (eliminatoria
+``FASE_GRUPOS``), así que se convocan, arbitran, programan y puntúan igual
+que los del cuadro; la única diferencia es que admiten empate.
+
+La clasificación se guarda acumulada en la tabla clasificacion. Con cada
+resultado guardado (eventos ``result_saved`` y ``match_updated``) se resta lo
+que el partido había sumado antes y se suma lo nuevo: se actualizan dos filas
+sin recorrer el resto de partidos. Si se borran partidos se recalcula entera.
+
+Orden de la clasificación: puntos y, a igualdad de puntos, enfrentamientos
+directos entre los empatados (puntos, diferencia de goles y goles a favor),
+diferencia de goles general, goles a favor y nombre.
+
+Cuando todos los grupos han terminado, los clasificados pasan al cuadro con
+TournamentService.crear_primera_ronda: los primeros de grupo son cabezas de
+serie y, en lo posible, no se cruzan equipos del mismo grupo. Los
+clasificados entran en octavos (16), cuartos (8) o semifinales (4), según se
+elija al crear los grupos; así también se puede jugar una fase de grupos
+con 16 equipos o menos.
+"""
+import random
+from itertools import groupby
+from typing import Optional
+
+from app.constants import EQUIPOS_RONDA, FASE_OCTAVOS, PUNTOS_EMPATE, PUNTOS_VICTORIA
+from app.models.group_model import COLUMNAS_CLASIFICACION, GroupModel
+from app.core.event_bus import get_event_bus
+from app.services.tournament_service import TournamentService
+from app.services.undo_service import deshacible
+
+
+_PUNTOS = COLUMNAS_CLASIFICACION.index("puntos")
+
+
+def _aportacion(goles_propios: Optional[int], goles_rival: Optional[int]) -> tuple:
+    """Lo que suma un resultado a la clasificación de un equipo (orden de COLUMNAS_CLASIFICACION)."""
+    if goles_propios is None or goles_rival is None:
+        return (0,) * len(COLUMNAS_CLASIFICACION)
+    gana, empata = goles_propios > goles_rival, goles_propios == goles_rival
+    puntos = PUNTOS_VICTORIA if gana else PUNTOS_EMPATE if empata else 0
+    return (1, int(gana), int(empata), int(goles_propios < goles_rival),
+            goles_propios, goles_rival, puntos)
+
+
+def _resultado(partido: dict) -> tuple[Optional[int], Optional[int]]:
+    """Resultado que cuenta para la clasificación ((None, None) si no está jugado)."""
+    if partido['estado'] != 'Jugado' or partido['goles_local'] is None or partido['goles_visitante'] is None:
+        return (None, None)
+    return (partido['goles_local'], partido['goles_visitante'])
+
+
+def calendario_liga(equipos: list[int]) -> list[list[tuple[int, int]]]:
+    """
+    Genera las jornadas de una liga a una vuelta (método del círculo).
+
+    Con un número impar de equipos, cada jornada descansa uno.
+
+    Args:
+        equipos: IDs de los equipos
+
+    Returns:
+        Lista de jornadas, cada una con tuplas (local_id, visitante_id)
+    """
+    rueda = list(equipos) + ([None] if len(equipos) % 2 else [])
+    n = len(rueda)
+    jornadas = []
+    for jornada in range(n - 1):
+        partidos = []
+        for i in range(n // 2):
+            local, visitante = rueda[i], rueda[n - 1 - i]
+            if local is None or visitante is None:
+                continue
+            # El equipo fijo alterna campo cada jornada; el resto, según su posición
+            if (i == 0 and jornada % 2) or (i > 0 and i % 2):
+                local, visitante = visitante, local
+            partidos.append((local, visitante))
+        jornadas.append(partidos)
+        rueda = [rueda[0], rueda[-1]] + rueda[1:-1]
+    return jornadas
+
+
+class GroupService:
+    """Servicio de la fase de grupos, actualizado con el bus de eventos."""
+
+    def __init__(self):
+        """Inicializa el servicio."""
+        self._conectado = False
+
+    def conectar(self, event_bus) -> None:
+        """
+        Escucha los resultados guardados y los cambios de partidos.
+
+        Args:
+            event_bus: Bus de eventos de la aplicación
+        """
+        if self._conectado:
+            return
+        event_bus.result_saved.connect(self.registrar_resultado)
+        event_bus.match_updated.connect(self.registrar_resultado)
+        event_bus.match_deleted.connect(self._on_partido_borrado)
+        self._conectado = True
+
+    # ------------------------------------------------------------------
+    # Generación
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def repartos_posibles(num_equipos: int) -> list[tuple[str, int, int]]:
+        """
+        Fases de grupos que se pueden jugar con un número de equipos.
+
+        El número de grupos debe dividir a los clasificados de la ronda en la
+        que entran, y cada grupo debe tener más equipos de los que pasan.
+
+        Args:
+            num_equipos: Número de equipos participantes
+
+        Returns:
+            Lista de tuplas (ronda, número de grupos, clasificados por grupo),
+            de octavos a semifinales y de menos a más grupos
+        """
+        return [
+            (ronda, num_grupos, total // num_grupos)
+            for ronda, total in EQUIPOS_RONDA.items()
+            for num_grupos in range(1, total + 1)
+            if total % num_grupos == 0 and num_equipos >= num_grupos * (total // num_grupos + 1)
+        ]
+
+    @deshacible("Generar fase de grupos")
+    def generar_grupos(self, equipos_ids: list[int], num_grupos: int, sembrado: bool = True,
+                       ronda: str = FASE_OCTAVOS) -> list[dict]:
+        """
+        Reparte los equipos en grupos y crea el calendario de cada grupo.
+
+        Pasan al cuadro los EQUIPOS_RONDA[ronda] / num_grupos primeros de cada grupo.
+
+        Args:
+            equipos_ids: IDs de los equipos participantes
+            num_grupos: Número de grupos (debe dividir a EQUIPOS_RONDA[ronda])
+            sembrado: Si True, reparte por bombos según el rating (cada
+                grupo recibe un equipo de cada nivel); si False, al azar
+            ronda: Ronda del cuadro en la que entran los clasificados
+                (octavos, cuartos o semifinal)
+
+        Returns:
+            Lista de grupos creados (nombre, clasificados, equipos, partidos)
+
+        Raises:
+            ValueError: Si ya hay grupos o cuadro, o el reparto no es posible
+        """
+        if GroupModel.listar_grupos():
+            raise ValueError("Ya existe una fase de grupos. Reinicie el torneo para generar otra.")
+        if TournamentService.obtener_partidos_cuadro():
+            raise ValueError("Ya hay partidos de eliminatoria. Reinicie el torneo para empezar por la fase de grupos.")
+        if ronda not in EQUIPOS_RONDA:
+            raise ValueError(f"Los clasificados no pueden entrar en la ronda {ronda}.")
+        total = EQUIPOS_RONDA[ronda]
+        if num_grupos < 1 or total % num_grupos:
+            raise ValueError(f"Para pasar a {ronda}, el número de grupos debe ser divisor de {total}.")
+
+        clasificados = total // num_grupos
+        minimo = num_grupos * (clasificados + 1)
+        if len(equipos_ids) < minimo:
+            raise ValueError(
+                f"Con {num_grupos} grupos se necesitan al menos {minimo} equipos "
+                f"(pasan {clasificados} de cada grupo). Hay {len(equipos_ids)}."
+            )
+
+        if sembrado:
+            from app.services.rating_service import get_rating_service, RATING_INICIAL
+            ratings = get_rating_service().obtener_ratings()
+            desempate = {equipo_id: random.random() for equipo_id in equipos_ids}
+            orden = sorted(
+                equipos_ids,
+                key=lambda e: (ratings.get(e, RATING_INICIAL), desempate[e]),
+                reverse=True
+            )
+        else:
+            orden = list(equipos_ids)
+            random.shuffle(orden)
+
+        # Reparto en serpiente: el bombo k va en orden directo o inverso según k
+        equipos_por_grupo: list[list[int]] = [[] for _ in range(num_grupos)]
+        for i, equipo_id in enumerate(orden):
+            bombo, posicion = divmod(i, num_grupos)
+            grupo = posicion if bombo % 2 == 0 else num_grupos - 1 - posicion
+            equipos_por_grupo[grupo].append(equipo_id)
+
+        grupos = []
+        for indice, equipos in enumerate(equipos_por_grupo):
+            partidos = [
+                (jornada, local_id, visitante_id)
+                for jornada, emparejamientos in enumerate(calendario_liga(equipos), start=1)
+                for local_id, visitante_id in emparejamientos
+            ]
+            grupos.append({
+                'nombre': chr(ord('A') + indice),
+                'clasificados': clasificados,
+                'equipos': equipos,
+                'partidos': partidos,
+            })
+
+        partidos_ids = GroupModel.crear_grupos(grupos)
+        print(f"[GRUPOS] {num_grupos} grupos creados con {len(partidos_ids)} partidos")
+        get_event_bus().emit_match_created(0)
+        return grupos
+
+    # ------------------------------------------------------------------
+    # Clasificación
+    # ------------------------------------------------------------------
+
+    def registrar_resultado(self, partido_id: int) -> None:
+        """
+        Actualiza la clasificación con el resultado actual de un partido de grupos.
+
+        Resta lo que el partido había sumado (si ya estaba aplicado) y suma el
+        resultado nuevo. Los partidos que no son de grupos se ignoran.
+
+        Args:
+            partido_id: ID del partido
+        """
+        if not partido_id:
+            return
+        try:
+            partido = GroupModel.obtener_partido_grupo(partido_id)
+            if partido is None:
+                return
+            previo = (partido['goles_local_aplicado'], partido['goles_visitante_aplicado'])
+            nuevo = _resultado(partido)
+            if nuevo == previo:
+                return
+
+            cambios = {}
+            for equipo_id, propios, rival in ((partido['local_id'], 0, 1), (partido['visitante_id'], 1, 0)):
+                antes = _aportacion(previo[propios], previo[rival])
+                despues = _aportacion(nuevo[propios], nuevo[rival])
+                cambios[equipo_id] = tuple(d - a for a, d in zip(antes, despues))
+
+            GroupModel.aplicar_cambios(partido_id, partido['grupo_id'], cambios, nuevo)
+            print(f"[GRUPOS] Clasificación actualizada con el partido {partido_id}")
+        except Exception as e:
+            print(f"[GRUPOS] Error actualizando la clasificación con el partido {partido_id}: {e}")
+
+    def _on_partido_borrado(self, partido_id: int) -> None:
+        """Un partido borrado ya no está en grupo_partidos: se recalcula todo."""
+        try:
+            if GroupModel.listar_grupos():
+                self.recalcular()
+        except Exception as e:
+            print(f"[GRUPOS] Error recalculando la clasificación: {e}")
+
+    def recalcular(self) -> None:
+        """Recalcula la clasificación de todos los grupos desde sus partidos."""
+        totales = {
+            (grupo_id, equipo_id): [0] * len(COLUMNAS_CLASIFICACION)
+            for equipo_id, grupo_id in GroupModel.obtener_equipos_grupos().items()
+        }
+        aplicados = {}
+        for partido in GroupModel.listar_partidos_grupo():
+            resultado = _resultado(partido)
+            aplicados[partido['partido_id']] = resultado
+            for equipo_id, propios, rival in ((partido['local_id'], 0, 1), (partido['visitante_id'], 1, 0)):
+                fila = totales.get((partido['grupo_id'], equipo_id))
+                if fila is not None:
+                    for i, valor in enumerate(_aportacion(resultado[propios], resultado[rival])):
+                        fila[i] += valor
+
+        GroupModel.reemplazar_clasificacion(totales, aplicados)
+        print(f"[GRUPOS] Clasificación recalculada: {len(aplicados)} partidos")
+
+    def clasificacion(self, grupo_id: int) -> list[dict]:
+        """
+        Clasificación ordenada de un grupo.
+
+        Args:
+            grupo_id: ID del grupo
+
+        Returns:
+            Lista de filas de GroupModel.obtener_clasificacion con las claves
+            "diferencia" y "posicion" (1 = primero)
+        """
+        filas = GroupModel.obtener_clasificacion(grupo_id)
+        for fila in filas:
+            fila['diferencia'] = fila['goles_favor'] - fila['goles_contra']
+
+        # Los enfrentamientos directos solo se consultan si hay empates a puntos
+        hay_empates = any(a['puntos'] == b['puntos'] for a, b in zip(filas, filas[1:]))
+        partidos = GroupModel.listar_partidos_grupo(grupo_id) if hay_empates else []
+
+        ordenadas = []
+        for _, bloque in groupby(filas, key=lambda f: f['puntos']):
+            bloque = list(bloque)
+            if len(bloque) > 1:
+                directos = _enfrentamientos_directos({f['equipo_id'] for f in bloque}, partidos)
+                bloque.sort(key=lambda f: (
+                    *(-valor for valor in directos[f['equipo_id']]),
+                    -f['diferencia'], -f['goles_favor'], f['equipo_nombre']
+                ))
+            ordenadas.extend(bloque)
+
+        for posicion, fila in enumerate(ordenadas, start=1):
+            fila['posicion'] = posicion
+        return ordenadas
+
+    def clasificaciones(self) -> list[dict]:
+        """
+        Todos los grupos con su clasificación.
+
+        Returns:
+            Lista de grupos de GroupModel.listar_grupos con la clave "clasificacion"
+        """
+        return [dict(grupo, clasificacion=self.clasificacion(grupo['id']))
+                for grupo in GroupModel.listar_grupos()]
+
+    def fase_completa(self) -> bool:
+        """
+        Indica si existe una fase de grupos con todos sus partidos jugados.
+
+        Returns:
+            True si hay grupos y no les queda ningún partido por jugar
+        """
+        grupos = GroupModel.listar_grupos()
+        return bool(grupos) and all(g['partidos'] and g['jugados'] == g['partidos'] for g in grupos)
+
+    # ------------------------------------------------------------------
+    # Paso al cuadro
+    # ------------------------------------------------------------------
+
+    def clasificados(self) -> list[dict]:
+        """
+        Equipos que pasan al cuadro, del mejor al peor.
+
+        Primero todos los primeros de grupo, después los segundos, etc.; dentro
+        de cada puesto, por puntos, diferencia de goles y goles a favor.
+
+        Returns:
+            Filas de clasificación con las claves "grupo_id" y "grupo"
+
+        Raises:
+            ValueError: Si no hay fase de grupos o no ha terminado
+        """
+        if not GroupModel.listar_grupos():
+            raise ValueError("No hay fase de grupos.")
+        if not self.fase_completa():
+            raise ValueError("Todavía quedan partidos de la fase de grupos por jugar.")
+
+        clasificados = []
+        for grupo in self.clasificaciones():
+            for fila in grupo['clasificacion'][:grupo['clasificados']]:
+                clasificados.append(dict(fila, grupo=grupo['nombre']))
+        clasificados.sort(key=lambda f: (f['posicion'], -f['puntos'], -f['diferencia'],
+                                         -f['goles_favor'], f['equipo_nombre']))
+        return clasificados
+
+    def ronda_clasificados(self) -> Optional[str]:
+        """
+        Ronda del cuadro en la que entran los clasificados de la fase de grupos.
+
+        Returns:
+            octavos, cuartos o semifinal (según cuántos equipos pasan en
+            total), o None si no hay fase de grupos o no da una ronda completa
+        """
+        total = sum(grupo['clasificados'] for grupo in GroupModel.listar_grupos())
+        return next((ronda for ronda, equipos in EQUIPOS_RONDA.items() if equipos == total), None)
+
+    def emparejamientos_cuadro(self) -> tuple[str, list[dict]]:
+        """
+        Emparejamientos de la primera ronda del cuadro con los clasificados de los grupos.
+
+        Los clasificados se siembran con TournamentService.SEMILLAS_RONDA
+        (el mejor contra el peor). Si dos equipos del mismo grupo se cruzan,
+        se intercambia el visitante con el de otro partido.
+
+        Returns:
+            Tupla (ronda, emparejamientos [{local_id, visitante_id}, ...] en orden de slot)
+
+        Raises:
+            ValueError: Si la fase de grupos no ha terminado o sus clasificados
+                no llenan una ronda
+        """
+        clasificados = self.clasificados()
+        ronda = self.ronda_clasificados()
+        if ronda is None:
+            raise ValueError(
+                f"La fase de grupos da {len(clasificados)} clasificados y el cuadro necesita "
+                f"{', '.join(str(total) for total in EQUIPOS_RONDA.values())}."
+            )
+
+        cruces = []
+        semillas = TournamentService.SEMILLAS_RONDA[ronda]
+        for slot in sorted(semillas):
+            semilla_local, semilla_visitante = semillas[slot]
+            cruces.append([clasificados[semilla_local - 1], clasificados[semilla_visitante - 1]])
+
+        for i, (local, visitante) in enumerate(cruces):
+            if local['grupo_id'] != visitante['grupo_id']:
+                continue
+            for otro in cruces:
+                if (otro[1]['grupo_id'] != local['grupo_id']
+                        and otro[0]['grupo_id'] != visitante['grupo_id']):
+                    cruces[i][1], otro[1] = otro[1], visitante
+                    break
+
+        return ronda, [{'local_id': local['equipo_id'], 'visitante_id': visitante['equipo_id']}
+                       for local, visitante in cruces]
+
+    @deshacible("Pasar al cuadro")
+    def promocionar(self) -> list[dict]:
+        """
+        Crea la primera ronda del cuadro con los clasificados de la fase de grupos.
+
+        Returns:
+            Emparejamientos creados
+
+        Raises:
+            ValueError: Si la fase de grupos no ha terminado o sus clasificados
+                no llenan una ronda
+        """
+        ronda, emparejamientos = self.emparejamientos_cuadro()
+        TournamentService.crear_primera_ronda(ronda, emparejamientos)
+        print(f"[GRUPOS] {len(emparejamientos) * 2} equipos pasan a {ronda}")
+        return emparejamientos
+
+
+def _enfrentamientos_directos(equipos: set[int], partidos: list[dict]) -> dict[int, tuple[int, int, int]]:
+    """Puntos, diferencia de goles y goles a favor en los partidos entre ``equipos``."""
+    totales = {equipo_id: [0, 0, 0] for equipo_id in equipos}
+    for partido in partidos:
+        if partido['local_id'] not in equipos or partido['visitante_id'] not in equipos:
+            continue
+        resultado = _resultado(partido)
+        if resultado[0] is None:
+            continue
+        for equipo_id, propios, rival in ((partido['local_id'], 0, 1), (partido['visitante_id'], 1, 0)):
+            aportacion = _aportacion(resultado[propios], resultado[rival])
+            totales[equipo_id][0] += aportacion[_PUNTOS]
+            totales[equipo_id][1] += resultado[propios] - resultado[rival]
+            totales[equipo_id][2] += resultado[propios]
+    return {equipo_id: tuple(valores) for equipo_id, valores in totales.items()}
+
+
+_group_service: Optional[GroupService] = None
+
+
+def get_group_service() -> GroupService:
+    """
+    Obtiene la instancia única del servicio de la fase de grupos.
+
+    Returns:
+        Instancia global de GroupService
+    """
+    global _group_service
+    if _group_service is None:
+        _group_service = GroupService()
+    return _group_service
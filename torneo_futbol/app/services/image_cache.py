@@ -0,0 +1,190 @@
+"""
+Caché compartida de imágenes pre-escaladas.
+
+Los widgets que pintan imágenes o fondos (BackgroundWidget, CardWidget)
+piden aquí el pixmap ya escalado y compuesto para su tamaño, tema y estado.
+Cada combinación se genera una sola vez y los siguientes pintados solo copian
+el pixmap en pantalla. La caché es LRU con un límite de memoria: al superarlo
+se descartan las entradas usadas hace más tiempo.
+"""
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+
+
+# Memoria máxima ocupada por los pixmaps de la caché (bytes)
+LIMITE_MEMORIA_BYTES = 64 * 1024 * 1024
+
+# Clave de las imágenes originales (sin escalar)
+ORIGEN = "origen"
+
+
+def _tamano_pixmap(pixmap: QPixmap) -> int:
+    """Memoria aproximada que ocupa un pixmap."""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class ImageCache:
+    """Caché LRU de pixmaps indexada por (origen, tamaño, tema, estado)."""
+
+    def __init__(self, limite_bytes: int = LIMITE_MEMORIA_BYTES):
+        """
+        Inicializa la caché vacía.
+
+        Args:
+            limite_bytes: Memoria máxima ocupada por los pixmaps
+        """
+        self.limite_bytes = limite_bytes
+        self._entradas: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self._bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: tuple) -> Optional[QPixmap]:
+        """
+        Busca un pixmap y lo marca como usado recientemente.
+
+        Args:
+            clave: Tupla (origen, tamaño, tema, estado)
+
+        Returns:
+            Pixmap en caché o None
+        """
+        pixmap = self._entradas.get(clave)
+        if pixmap is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return pixmap
+
+    def guardar(self, clave: tuple, pixmap: QPixmap) -> None:
+        """
+        Guarda un pixmap y descarta los menos usados si se supera el límite.
+
+        Args:
+            clave: Tupla (origen, tamaño, tema, estado)
+            pixmap: Pixmap a guardar
+        """
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self._bytes -= _tamano_pixmap(anterior)
+        self._entradas[clave] = pixmap
+        self._bytes += _tamano_pixmap(pixmap)
+        while self._bytes > self.limite_bytes and len(self._entradas) > 1:
+            _, descartado = self._entradas.popitem(last=False)
+            self._bytes -= _tamano_pixmap(descartado)
+
+    def obtener_o_crear(self, clave: tuple, fabrica: Callable[[], QPixmap]) -> QPixmap:
+        """
+        Devuelve el pixmap de la clave, generándolo con la fábrica si no existe.
+
+        Args:
+            clave: Tupla (origen, tamaño, tema, estado)
+            fabrica: Función que genera el pixmap
+
+        Returns:
+            Pixmap en caché (puede ser nulo si la fábrica falló)
+        """
+        pixmap = self.obtener(clave)
+        if pixmap is None:
+            pixmap = fabrica()
+            if not pixmap.isNull():
+                self.guardar(clave, pixmap)
+        return pixmap
+
+    def cargar(self, ruta: str) -> QPixmap:
+        """
+        Carga una imagen original desde disco (una sola vez).
+
+        Args:
+            ruta: Ruta de la imagen
+
+        Returns:
+            Pixmap original (nulo si no se pudo cargar)
+        """
+        def fabrica():
+            try:
+                return QPixmap(ruta)
+            except KeyboardInterrupt:
+                # Bug conocido en PySide6/Windows: QPixmap puede lanzar KeyboardInterrupt espurio
+                return QPixmap(ruta)
+        return self.obtener_o_crear((ruta, ORIGEN, None, None), fabrica)
+
+    def cover(self, ruta: str, ancho: int, alto: int, ratio: float = 1.0) -> QPixmap:
+        """
+        Obtiene una imagen escalada tipo "cover" y recortada al tamaño pedido.
+
+        Args:
+            ruta: Ruta de la imagen original
+            ancho: Ancho lógico del área a cubrir
+            alto: Alto lógico del área a cubrir
+            ratio: devicePixelRatio de la pantalla
+
+        Returns:
+            Pixmap del tamaño exacto del área (nulo si la imagen no existe)
+        """
+        def fabrica():
+            original = self.cargar(ruta)
+            if original.isNull() or ancho <= 0 or alto <= 0:
+                return QPixmap()
+            ancho_px, alto_px = int(ancho * ratio), int(alto * ratio)
+            escalado = original.scaled(
+                ancho_px, alto_px,
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            # Centrar y recortar al área
+            x = (escalado.width() - ancho_px) // 2
+            y = (escalado.height() - alto_px) // 2
+            recortado = escalado.copy(x, y, ancho_px, alto_px)
+            recortado.setDevicePixelRatio(ratio)
+            return recortado
+        return self.obtener_o_crear((ruta, (ancho, alto, ratio), None, "cover"), fabrica)
+
+    def invalidar(self, origen: Optional[str] = None) -> None:
+        """
+        Descarta entradas de la caché.
+
+        Args:
+            origen: Si se indica, solo las generadas a partir de ese origen
+        """
+        if origen is None:
+            self._entradas.clear()
+            self._bytes = 0
+            return
+        for clave in [c for c in self._entradas if c[0] == origen]:
+            self._bytes -= _tamano_pixmap(self._entradas.pop(clave))
+
+    def obtener_estadisticas(self) -> dict:
+        """
+        Obtiene el estado de la caché.
+
+        Returns:
+            Diccionario con entradas, bytes, limite_bytes, aciertos y fallos
+        """
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self._bytes,
+            "limite_bytes": self.limite_bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+        }
+
+
+_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """
+    Obtiene la instancia única de la caché de imágenes.
+
+    Returns:
+        Instancia global de ImageCache
+    """
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
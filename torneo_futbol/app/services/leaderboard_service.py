@@ -0,0 +1,310 @@
+"""
+Clasificaciones individuales (goleadores y tarjetas) mantenidas en memoria.
+
+Se calculan una vez desde stats_partido (partidos jugados) y después se
+actualizan con cada resultado guardado: se restan las estadísticas que el
+partido aportaba antes, se suman las nuevas y solo se reordenan los
+jugadores afectados. Cada clasificación es una lista ordenada por clave que
+se actualiza por búsqueda binaria, así que un top N es un corte de la lista.
+
+Clasificaciones disponibles (``CLASIFICACIONES``):
+
+- ``goles``: más goles (a igualdad, menos partidos).
+- ``tarjetas``: más rojas y después más amarillas.
+- ``goles_por_partido``: media de goles por partido jugado.
+
+``goles`` también se puede pedir por ronda o por curso.
+
+Tras cada cambio se escribe una instantánea compacta en
+``CLASIFICACIONES_PATH`` (JSON) para la página de inicio y para pantallas
+públicas, que así no necesitan consultar la base de datos.
+"""
+import json
+import os
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Optional
+
+from app.config import CLASIFICACIONES_PATH
+from app.models.match_stats_model import MatchStatsModel
+from app.models.participant_model import ParticipantModel
+
+
+# Clasificaciones generales
+CLASIFICACIONES = ("goles", "tarjetas", "goles_por_partido")
+
+# Jugadores de cada clasificación que se guardan en la instantánea
+TAMANO_SNAPSHOT = 20
+
+
+class _Clasificacion:
+    """Jugadores ordenados por clave (menor = mejor puesto)."""
+
+    def __init__(self):
+        self._orden: list[tuple[tuple, int]] = []
+        self._claves: dict[int, tuple] = {}
+
+    def actualizar(self, participante_id: int, clave: Optional[tuple]) -> None:
+        """Coloca al jugador según su clave nueva (None = fuera de la clasificación)."""
+        previa = self._claves.pop(participante_id, None)
+        if previa is not None:
+            del self._orden[bisect_left(self._orden, (previa, participante_id))]
+        if clave is not None:
+            self._claves[participante_id] = clave
+            insort(self._orden, (clave, participante_id))
+
+    def top(self, n: int) -> list[int]:
+        return [participante_id for _, participante_id in self._orden[:n]]
+
+
+class LeaderboardService:
+    """Servicio de clasificaciones individuales, actualizado con el bus de eventos."""
+
+    def __init__(self):
+        """Inicializa el servicio; las clasificaciones se calculan en la primera consulta."""
+        self._conectado = False
+        self._cargado = False
+        self._jugadores: dict[int, dict] = {}
+        self._info: dict[int, dict] = {}
+        self._aportes: dict[int, list[dict]] = {}  # {partido_id: filas de stats aplicadas}
+        self._generales: dict[str, _Clasificacion] = {}
+        self._por_ronda: dict[str, _Clasificacion] = {}
+        self._por_curso: dict[str, _Clasificacion] = {}
+
+    def conectar(self, event_bus) -> None:
+        """
+        Escucha los resultados guardados y los cambios de partidos y participantes.
+
+        Args:
+            event_bus: Bus de eventos de la aplicación
+        """
+        if self._conectado:
+            return
+        event_bus.result_saved.connect(self.actualizar_partido)
+        event_bus.match_updated.connect(self._on_partido_modificado)
+        event_bus.match_deleted.connect(self._on_partido_modificado)
+        event_bus.participant_changed.connect(self._on_participante_modificado)
+        self._conectado = True
+
+    # ------------------------------------------------------------------
+    # Cálculo
+    # ------------------------------------------------------------------
+
+    def reconstruir(self) -> None:
+        """Recalcula todas las clasificaciones desde la base de datos."""
+        self._info = {p['id']: p for p in ParticipantModel.listar_participantes()}
+        self._jugadores = {}
+        self._aportes = {}
+        self._generales = {nombre: _Clasificacion() for nombre in CLASIFICACIONES}
+        self._por_ronda = {}
+        self._por_curso = {}
+
+        for fila in MatchStatsModel.obtener_stats_jugados():
+            self._aportes.setdefault(fila['partido_id'], []).append(fila)
+        afectados = set()
+        for filas in self._aportes.values():
+            afectados |= self._sumar(filas, 1)
+        self._reordenar(afectados)
+        self._cargado = True
+        print(f"[CLASIFICACIONES] Calculadas: {len(self._jugadores)} jugadores, {len(self._aportes)} partidos")
+
+    def _asegurar_cargado(self) -> None:
+        if not self._cargado:
+            self.reconstruir()
+
+    def _sumar(self, filas: list[dict], signo: int) -> set[int]:
+        """Suma (o resta, con signo -1) las filas de stats a los totales de cada jugador."""
+        afectados = set()
+        for fila in filas:
+            jugador = self._jugadores.setdefault(fila['participante_id'], {
+                'goles': 0, 'amarillas': 0, 'rojas': 0, 'partidos': 0, 'rondas': {}
+            })
+            jugador['goles'] += signo * fila['goles']
+            jugador['amarillas'] += signo * fila['amarillas']
+            jugador['rojas'] += signo * fila['rojas']
+            jugador['partidos'] += signo
+            rondas = jugador['rondas']
+            rondas[fila['eliminatoria']] = rondas.get(fila['eliminatoria'], 0) + signo * fila['goles']
+            afectados.add(fila['participante_id'])
+        return afectados
+
+    def _reordenar(self, afectados: set[int]) -> None:
+        """Recoloca a los jugadores afectados en todas las clasificaciones."""
+        for participante_id in afectados:
+            jugador = self._jugadores[participante_id]
+            goles, partidos = jugador['goles'], jugador['partidos']
+            clave_goles = (-goles, partidos) if goles > 0 else None
+
+            self._generales['goles'].actualizar(participante_id, clave_goles)
+            self._generales['tarjetas'].actualizar(
+                participante_id,
+                (-jugador['rojas'], -jugador['amarillas']) if jugador['rojas'] or jugador['amarillas'] else None
+            )
+            self._generales['goles_por_partido'].actualizar(
+                participante_id, (-goles / partidos, -goles) if goles > 0 and partidos else None
+            )
+
+            for ronda, goles_ronda in jugador['rondas'].items():
+                self._por_ronda.setdefault(ronda, _Clasificacion()).actualizar(
+                    participante_id, (-goles_ronda,) if goles_ronda > 0 else None
+                )
+
+            curso = self._info.get(participante_id, {}).get('curso')
+            if curso:
+                self._por_curso.setdefault(curso, _Clasificacion()).actualizar(participante_id, clave_goles)
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+
+    def actualizar_partido(self, partido_id: int) -> None:
+        """
+        Sustituye lo que aporta un partido por sus estadísticas actuales.
+
+        Si el partido ya no está jugado, simplemente se retira. Guarda la
+        instantánea al terminar.
+
+        Args:
+            partido_id: ID del partido
+        """
+        try:
+            if not self._cargado:
+                self.reconstruir()
+            else:
+                afectados = self._sumar(self._aportes.pop(partido_id, []), -1)
+                filas = MatchStatsModel.obtener_stats_jugados(partido_id)
+                if filas:
+                    self._aportes[partido_id] = filas
+                    afectados |= self._sumar(filas, 1)
+                self._reordenar(afectados)
+            self.guardar_snapshot()
+        except Exception as e:
+            print(f"[CLASIFICACIONES] Error actualizando el partido {partido_id}: {e}")
+            self._cargado = False
+
+    def _on_partido_modificado(self, partido_id: int) -> None:
+        """Un partido aplicado puede haber dejado de estar jugado o haberse borrado (0 = todos)."""
+        if not partido_id:
+            self._invalidar()
+        elif self._cargado and partido_id in self._aportes:
+            self.actualizar_partido(partido_id)
+
+    def _on_participante_modificado(self, participante_id: int) -> None:
+        """Nombre, equipo o curso cambiados: hay que recalcular."""
+        self._invalidar()
+
+    def _invalidar(self) -> None:
+        """
+        Descarta las clasificaciones en memoria.
+
+        Si ya se habían calculado, se recalculan en el acto para que la
+        instantánea no se quede con los datos anteriores.
+        """
+        if not self._cargado:
+            return
+        self._cargado = False
+        try:
+            self.guardar_snapshot()
+        except Exception as e:
+            print(f"[CLASIFICACIONES] Error recalculando las clasificaciones: {e}")
+            self._cargado = False
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def top(self, clasificacion: str = "goles", n: int = 10,
+            ronda: Optional[str] = None, curso: Optional[str] = None) -> list[dict]:
+        """
+        Primeros puestos de una clasificación.
+
+        Args:
+            clasificacion: Una de CLASIFICACIONES
+            n: Número de jugadores
+            ronda: Solo goles de esa ronda (solo con la clasificación "goles")
+            curso: Solo jugadores de ese curso (solo con la clasificación "goles")
+
+        Returns:
+            Lista de diccionarios con participante_id, nombre, equipo, curso,
+            goles, amarillas, rojas, partidos y media (goles por partido)
+
+        Raises:
+            ValueError: Si la clasificación no existe o se pide por ronda o
+                curso una clasificación que no es "goles"
+        """
+        if clasificacion not in CLASIFICACIONES:
+            raise ValueError(f"Clasificación desconocida: {clasificacion}")
+        if (ronda or curso) and clasificacion != "goles":
+            raise ValueError(f"La clasificación {clasificacion} no se puede filtrar por ronda ni por curso")
+        self._asegurar_cargado()
+
+        if ronda:
+            ranking = self._por_ronda.get(ronda)
+        elif curso:
+            ranking = self._por_curso.get(curso)
+        else:
+            ranking = self._generales[clasificacion]
+        if ranking is None:
+            return []
+
+        resultado = []
+        for participante_id in ranking.top(n):
+            jugador = self._jugadores[participante_id]
+            info = self._info.get(participante_id, {})
+            goles = jugador['rondas'].get(ronda, 0) if ronda else jugador['goles']
+            resultado.append({
+                'participante_id': participante_id,
+                'nombre': f"{info.get('nombre', '')} {info.get('apellidos') or ''}".strip(),
+                'equipo': info.get('equipo_nombre'),
+                'curso': info.get('curso'),
+                'goles': goles,
+                'amarillas': jugador['amarillas'],
+                'rojas': jugador['rojas'],
+                'partidos': jugador['partidos'],
+                'media': round(jugador['goles'] / jugador['partidos'], 2) if jugador['partidos'] else 0.0,
+            })
+        return resultado
+
+    def guardar_snapshot(self) -> None:
+        """Escribe la instantánea JSON de las clasificaciones (escritura atómica)."""
+        self._asegurar_cargado()
+        datos = {
+            'generado': datetime.now().isoformat(timespec="seconds"),
+            **{nombre: self.top(nombre, TAMANO_SNAPSHOT) for nombre in CLASIFICACIONES},
+            'por_ronda': {ronda: self.top("goles", TAMANO_SNAPSHOT, ronda=ronda) for ronda in self._por_ronda},
+            'por_curso': {curso: self.top("goles", TAMANO_SNAPSHOT, curso=curso) for curso in self._por_curso},
+        }
+        temporal = CLASIFICACIONES_PATH.with_suffix(".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporal, CLASIFICACIONES_PATH)
+
+    @staticmethod
+    def leer_snapshot() -> Optional[dict]:
+        """
+        Lee la última instantánea guardada sin consultar la base de datos.
+
+        Returns:
+            Diccionario con las clasificaciones o None si no existe o está dañada
+        """
+        try:
+            with open(CLASIFICACIONES_PATH, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+_leaderboard_service: Optional[LeaderboardService] = None
+
+
+def get_leaderboard_service() -> LeaderboardService:
+    """
+    Obtiene la instancia única del servicio de clasificaciones.
+
+    Returns:
+        Instancia global de LeaderboardService
+    """
+    global _leaderboard_service
+    if _leaderboard_service is None:
+        _leaderboard_service = LeaderboardService()
+    return _leaderboard_service
@@ -5,7 +5,8 @@ from app.models.match_model import MatchModel
 from app.models.callup_model import CallupModel
 from app.models.match_stats_model import MatchStatsModel
 from app.models.goal_model import GoalModel
-from app.services.event_bus import get_event_bus
+from app.core.event_bus import get_event_bus
+from app.services.undo_service import deshacible
 
 
 @dataclass
@@ -24,6 +25,7 @@ class MatchData:
     penaltis_visitante: Optional[int] = None
     ganador_equipo_id: Optional[int] = None
     estado: str = "Pendiente"
+    version: Optional[int] = None
     
     def esta_programado(self) -> bool:
         """Verifica si el partido tiene los datos mínimos para ser programado."""
@@ -57,7 +59,8 @@ class MatchData:
             penaltis_local=data.get('penaltis_local'),
             penaltis_visitante=data.get('penaltis_visitante'),
             ganador_equipo_id=data.get('ganador_equipo_id'),
-            estado=data.get('estado', 'Pendiente')
+            estado=data.get('estado', 'Pendiente'),
+            version=data.get('version')
         )
 
 
@@ -111,6 +114,7 @@ class MatchService:
         return True, ""
     
     @staticmethod
+    @deshacible("Editar partido")
     def save_match_data(
         partido_id: int,
         fase: str,
@@ -143,6 +147,36 @@ class MatchService:
         event_bus.emit_match_updated(partido_id)
     
     @staticmethod
+    def convocar_jugador(partido_id: int, participante_id: int, equipo_id: int,
+                         estado: Optional[str] = None) -> None:
+        """
+        Convoca un jugador para un partido si no está sancionado.
+        
+        Args:
+            partido_id: ID del partido
+            participante_id: ID del participante (jugador)
+            equipo_id: ID del equipo al que pertenece
+            estado: Estado del partido si ya se conoce (si no, se consulta)
+            
+        Raises:
+            ValueError: Si el jugador está sancionado y el partido no se ha jugado
+            sqlite3.IntegrityError: Si el jugador ya está convocado para este partido
+        """
+        # Importación diferida: el servicio de sanciones depende del de torneo, que usa este
+        from app.services.eligibility_service import get_eligibility_service
+        
+        if estado is None:
+            partido = MatchModel.obtener_partido_por_id(partido_id)
+            estado = partido['estado'] if partido else 'Jugado'
+        if estado != 'Jugado':
+            motivo = get_eligibility_service().motivo_no_elegible(participante_id)
+            if motivo:
+                raise ValueError(motivo)
+        
+        CallupModel.convocar_jugador(partido_id, participante_id, equipo_id)
+    
+    @staticmethod
+    @deshacible("Cambiar convocatoria")
     def save_convocatoria(partido_id: int, local_ids: list[int], visitante_ids: list[int]) -> None:
         """
         Guarda la convocatoria completa de un partido.
@@ -158,19 +192,20 @@ class MatchService:
             raise ValueError("No se pueden guardar convocados sin equipos asignados")
         
         # Limpiar convocatoria actual
-        CallupModel.limpiar_convocados_partido(partido_id)
+        CallupModel.limpiar_convocados(partido_id)
         
         # Añadir convocados locales
         for participante_id in local_ids:
-            CallupModel.convocar_jugador(partido_id, participante_id, match.equipo_local_id)
+            MatchService.convocar_jugador(partido_id, participante_id, match.equipo_local_id, match.estado)
             MatchStatsModel.inicializar_stats(partido_id, [participante_id])
         
         # Añadir convocados visitantes
         for participante_id in visitante_ids:
-            CallupModel.convocar_jugador(partido_id, participante_id, match.equipo_visitante_id)
+            MatchService.convocar_jugador(partido_id, participante_id, match.equipo_visitante_id, match.estado)
             MatchStatsModel.inicializar_stats(partido_id, [participante_id])
     
     @staticmethod
+    @deshacible("Guardar resultado")
     def save_result_with_goals(
         partido_id: int,
         goles_local: int,
@@ -178,7 +213,8 @@ class MatchService:
         penaltis_local: Optional[int],
         penaltis_visitante: Optional[int],
         goles_detalle: list[dict],
-        stats: list[dict]
+        stats: list[dict],
+        version: Optional[int] = None
     ) -> dict:
         """
         Guarda el resultado con goles detallados y estadísticas.
@@ -191,9 +227,15 @@ class MatchService:
             penaltis_visitante: Penaltis del equipo visitante (si aplica)
             goles_detalle: Lista de dicts con {participante_id, equipo_id, minuto}
             stats: Lista de dicts con estadísticas de jugadores
+            version: Versión del partido cuando se abrió para editar; si otra
+                instancia lo ha modificado después, no se guarda nada
             
         Returns:
             Diccionario con resultado guardado
+            
+        Raises:
+            ValueError: Si el partido no existe o no es válido
+            ConflictoVersionError: Si el partido ha cambiado desde la versión indicada
         """
         # Validar partido
         match = MatchService.load_match(partido_id)
@@ -214,7 +256,7 @@ class MatchService:
         # Guardar resultado en tabla partidos
         resultado = MatchModel.guardar_resultado(
             partido_id, goles_local, goles_visitante,
-            penaltis_local, penaltis_visitante
+            penaltis_local, penaltis_visitante, version
         )
         
         print(f"[MATCH_SERVICE] Resultado guardado. Ganador: {resultado.get('ganador_equipo_id')}")
@@ -1,12 +1,97 @@
-"""Servicio de gestión de estilos QSS (temas)."""
+"""
+Servicio de gestión de estilos QSS (temas).
+
+Los dos temas se compilan una sola vez en una hoja de estilo combinada en la
+que cada regla queda condicionada a la propiedad dinámica ``tema`` de la
+ventana (``*[tema="dark"] QPushButton``). La hoja se instala en la aplicación
+al arrancar y cambiar de tema solo requiere cambiar esa propiedad y
+re-pulir los widgets visibles: Qt no vuelve a analizar el QSS. Los widgets
+ocultos (páginas no activas, menús...) se re-pulen la próxima vez que se
+muestran.
+"""
+import re
 from pathlib import Path
 from typing import Optional
 from PySide6.QtWidgets import QApplication, QWidget
 from PySide6.QtGui import QFontDatabase
+from PySide6.QtCore import QObject, QEvent, Qt
 from app.config import STYLES_DIR
 from app.constants import THEME_LIGHT, THEME_DARK
 
 
+# Propiedad dinámica de las ventanas que selecciona el tema
+PROPIEDAD_TEMA = "tema"
+
+_PATRON_COMENTARIO = re.compile(r"/\*.*?\*/", re.DOTALL)
+_PATRON_REGLA = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+def _condicionar_selector(selector: str, theme: str) -> list[str]:
+    """
+    Condiciona un selector a un tema.
+
+    Devuelve dos variantes: la que exige un ancestro con la propiedad del tema
+    y la que la exige al propio widget (para las ventanas de nivel superior).
+
+    Args:
+        selector: Selector QSS simple o compuesto
+        theme: Nombre del tema
+
+    Returns:
+        Lista con los dos selectores condicionados
+    """
+    atributo = f'[{PROPIEDAD_TEMA}="{theme}"]'
+    # La propiedad se inserta al final del primer selector simple,
+    # antes de cualquier pseudo-estado o subcontrol
+    partes = selector.split(None, 1)
+    primero = partes[0]
+    posicion = primero.find(":")
+    if posicion == -1:
+        primero = primero + atributo
+    else:
+        primero = primero[:posicion] + atributo + primero[posicion:]
+    propio = " ".join([primero] + partes[1:])
+    return [f"*{atributo} {selector}", propio]
+
+
+def compilar_qss(contenido: str, theme: str) -> str:
+    """
+    Reescribe una hoja QSS para que solo se aplique con el tema indicado.
+
+    Args:
+        contenido: Contenido QSS del tema
+        theme: Nombre del tema
+
+    Returns:
+        Hoja QSS con todas las reglas condicionadas a la propiedad del tema
+    """
+    contenido = _PATRON_COMENTARIO.sub("", contenido)
+    reglas = []
+    for selectores, cuerpo in _PATRON_REGLA.findall(contenido):
+        condicionados = []
+        for selector in selectores.split(","):
+            selector = " ".join(selector.split())
+            if selector:
+                condicionados.extend(_condicionar_selector(selector, theme))
+        if condicionados:
+            reglas.append(f"{', '.join(condicionados)} {{{cuerpo}}}")
+    return "\n".join(reglas)
+
+
+class _FiltroMostrar(QObject):
+    """Re-pule los widgets pendientes cuando se muestran."""
+    
+    def __init__(self, servicio: "QSSService"):
+        super().__init__()
+        self._servicio = servicio
+    
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Show:
+            obj.removeEventFilter(self)
+            self._servicio._repolish_visible(obj)
+        return False
+
+
 class QSSService:
     """Servicio para cargar y aplicar estilos QSS."""
     
@@ -14,6 +99,9 @@ class QSSService:
         """Inicializa el servicio de estilos."""
         self.current_theme: str = THEME_LIGHT
         self._fonts_loaded: bool = False
+        self._hoja_compilada: Optional[str] = None
+        self._hoja_instalada: bool = False
+        self._filtro_mostrar: Optional[_FiltroMostrar] = None
     
     def _load_custom_fonts(self):
         """Carga las fuentes personalizadas desde la carpeta resources/fonts."""
@@ -78,13 +166,48 @@ class QSSService:
             print(f"✗ Error al cargar el estilo: {e}")
             return None
     
+    def compilar_temas(self) -> Optional[str]:
+        """
+        Compila los dos temas en una única hoja condicionada por tema.
+        
+        El resultado se guarda en memoria, así que los archivos QSS solo se
+        leen una vez por ejecución.
+        
+        Returns:
+            Hoja combinada o None si no se pudo cargar algún tema
+        """
+        if self._hoja_compilada is None:
+            partes = []
+            for theme in (THEME_LIGHT, THEME_DARK):
+                contenido = self.load_qss(theme)
+                if contenido is None:
+                    return None
+                partes.append(compilar_qss(contenido, theme))
+            self._hoja_compilada = "\n".join(partes)
+        return self._hoja_compilada
+    
+    def registrar_ventana(self, widget: QWidget) -> None:
+        """
+        Marca una ventana de nivel superior con el tema actual.
+        
+        Las ventanas con padre (diálogos, menús) heredan el tema de su
+        ancestro; solo hace falta registrar las ventanas sin padre.
+        
+        Args:
+            widget: Ventana a la que aplicar los estilos del tema
+        """
+        widget.setProperty(PROPIEDAD_TEMA, self.current_theme)
+        if widget.isVisible():
+            self._repolish_visible(widget)
+    
     def apply_theme(self, theme: str, force_refresh: bool = True) -> bool:
         """
         Aplica un tema a la aplicación.
         
         Args:
             theme: Nombre del tema ('light' o 'dark')
-            force_refresh: Si True, fuerza el refresco de estilos en todos los widgets
+            force_refresh: Si True, re-pule los widgets visibles de las
+                ventanas cuyo tema ha cambiado (los ocultos se re-pulen al mostrarse)
             
         Returns:
             True si se aplicó correctamente, False en caso contrario
@@ -92,70 +215,59 @@ class QSSService:
         # Cargar fuentes personalizadas si aún no se han cargado
         self._load_custom_fonts()
         
-        qss_content = self.load_qss(theme)
-        
-        if qss_content is None:
+        app = QApplication.instance()
+        if not app:
             return False
         
-        app = QApplication.instance()
-        if app:
-            app.setStyleSheet(qss_content)
-            self.current_theme = theme
-            
-            # Forzar refresco de estilos en todos los widgets
+        if not self._hoja_instalada:
+            hoja = self.compilar_temas()
+            if hoja is None:
+                return False
+            app.setStyleSheet(hoja)
+            self._hoja_instalada = True
+        
+        self.current_theme = theme
+        
+        # Solo las ventanas registradas llevan la propiedad; el resto la hereda
+        for ventana in app.topLevelWidgets():
+            tema_ventana = ventana.property(PROPIEDAD_TEMA)
+            if tema_ventana is None or tema_ventana == theme:
+                continue
+            ventana.setProperty(PROPIEDAD_TEMA, theme)
             if force_refresh:
-                self._refresh_all_widgets()
-            
-            print(f"✓ Tema '{theme}' aplicado correctamente")
-            return True
+                self._repolish_visible(ventana)
         
-        return False
+        print(f"✓ Tema '{theme}' aplicado correctamente")
+        return True
     
-    def _refresh_all_widgets(self):
+    def _repolish_visible(self, raiz: QWidget):
         """
-        Fuerza el refresco de estilos en todos los widgets de la aplicación.
-        Esto asegura que los estilos QSS se apliquen correctamente a widgets
-        ya creados, especialmente útil al iniciar o cambiar de tema.
-        """
-        app = QApplication.instance()
-        if not app:
-            return
+        Re-pule un widget y sus descendientes visibles.
         
-        # Obtener todos los top-level widgets
-        for widget in app.topLevelWidgets():
-            # Forzar repolish del widget y todos sus hijos
-            self._repolish_widget(widget)
-    
-    def _repolish_widget(self, widget):
-        """
-        Fuerza el repolish de un widget y todos sus hijos recursivamente.
+        Los subárboles ocultos no se recorren: se les instala un filtro que
+        los re-pule cuando vuelvan a mostrarse.
         
         Args:
-            widget: Widget a repolish
+            raiz: Widget desde el que empezar
         """
-        if widget is None:
-            return
+        if self._filtro_mostrar is None:
+            self._filtro_mostrar = _FiltroMostrar(self)
         
-        try:
-            # Forzar que el estilo se vuelva a aplicar al widget principal
-            style = widget.style()
-            style.unpolish(widget)
-            style.polish(widget)
-            widget.update()
-            
-            # Aplicar recursivamente a todos los widgets hijos
-            for child in widget.findChildren(QWidget):
-                try:
-                    child_style = child.style()
-                    child_style.unpolish(child)
-                    child_style.polish(child)
-                    child.update()
-                except:
-                    # Algunos widgets pueden no soportar unpolish/polish
-                    continue
-        except Exception:
-            # Silenciar errores de repolish
-            pass
+        pendientes = [raiz]
+        while pendientes:
+            widget = pendientes.pop()
+            if widget is not raiz and not widget.isVisible():
+                widget.installEventFilter(self._filtro_mostrar)
+                continue
+            try:
+                style = widget.style()
+                style.unpolish(widget)
+                style.polish(widget)
+                widget.update()
+            except RuntimeError:
+                # Widget destruido en C++ mientras se recorría el árbol
+                continue
+            pendientes.extend(widget.findChildren(QWidget, options=Qt.FindChildOption.FindDirectChildrenOnly))
     
     def toggle_theme(self) -> str:
         """
@@ -0,0 +1,365 @@
+"""
+Ratings de los equipos (Elo con diferencia de goles).
+
+Cada equipo empieza con ``RATING_INICIAL``. Al guardar un resultado
+(evento ``result_saved``) se leen los ratings de los dos equipos, se aplica
+la fórmula de Elo ponderada por la diferencia de goles y se guardan los
+nuevos valores junto con un registro en ``ratings_historial``: dos lecturas
+y una transacción, sin recorrer el resto de partidos.
+
+Si se edita un resultado ya puntuado, todo lo posterior depende de él, así
+que se repite el historial completo. La repetición agrupa los partidos en
+capas en las que ningún equipo aparece dos veces (en un cuadro de
+eliminatorias, una capa por ronda) y resuelve cada capa con operaciones de
+NumPy sobre todos sus partidos a la vez; el resultado es idéntico a
+aplicarlos uno a uno en orden.
+
+Cuando llegan muchos resultados seguidos (deshacer o rehacer un lote), los
+avisos se agrupan con ``en_lote()`` y el historial se repite una sola vez
+al final.
+
+El historial no depende de la tabla partidos: reiniciar el torneo borra los
+partidos pero los ratings se conservan para el siguiente.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from app.models.match_model import MatchModel
+from app.models.rating_model import RatingModel
+
+
+# Rating de un equipo sin partidos puntuados
+RATING_INICIAL = 1500.0
+
+# Puntos máximos que cambia un partido con un gol de diferencia
+FACTOR_K = 30.0
+
+# Diferencia de rating con la que el favorito gana el 91 % de las veces
+ESCALA = 400.0
+
+
+def probabilidad_esperada(rating: float, rating_rival: float) -> float:
+    """
+    Probabilidad esperada de victoria según los ratings (empate = media victoria).
+
+    Args:
+        rating: Rating del equipo
+        rating_rival: Rating del rival
+
+    Returns:
+        Valor entre 0 y 1
+    """
+    return 1.0 / (1.0 + 10.0 ** ((rating_rival - rating) / ESCALA))
+
+
+def multiplicador_goles(diferencia: int) -> float:
+    """
+    Peso del partido según la diferencia de goles (1, 1.5 y (11 + N) / 8 desde 3).
+
+    Args:
+        diferencia: Diferencia de goles en valor absoluto
+
+    Returns:
+        Multiplicador del factor K
+    """
+    if diferencia <= 1:
+        return 1.0
+    if diferencia == 2:
+        return 1.5
+    return (11.0 + diferencia) / 8.0
+
+
+def calcular_delta(rating_local: float, rating_visitante: float,
+                   goles_local: int, goles_visitante: int) -> float:
+    """
+    Puntos que gana el local (y pierde el visitante) con un resultado.
+
+    Los penaltis no cuentan: un empate en el tiempo reglamentario puntúa como empate.
+
+    Args:
+        rating_local: Rating previo del local
+        rating_visitante: Rating previo del visitante
+        goles_local: Goles del local
+        goles_visitante: Goles del visitante
+
+    Returns:
+        Variación del rating del local
+    """
+    resultado = 1.0 if goles_local > goles_visitante else 0.0 if goles_local < goles_visitante else 0.5
+    esperado = probabilidad_esperada(rating_local, rating_visitante)
+    return FACTOR_K * multiplicador_goles(abs(goles_local - goles_visitante)) * (resultado - esperado)
+
+
+def _repetir_historial(entradas: list[dict]) -> dict[int, tuple[float, int]]:
+    """
+    Recalcula el historial en orden, rellenando ratings previos y delta de cada entrada.
+
+    Args:
+        entradas: Registros con partido_id, equipos y goles (se modifican)
+
+    Returns:
+        Diccionario {equipo_id: (rating final, partidos puntuados)}
+    """
+    import numpy as np
+
+    if not entradas:
+        return {}
+
+    equipos = sorted({e['equipo_local_id'] for e in entradas} | {e['equipo_visitante_id'] for e in entradas})
+    indices = {equipo_id: i for i, equipo_id in enumerate(equipos)}
+    local = np.array([indices[e['equipo_local_id']] for e in entradas], dtype=np.intp)
+    visitante = np.array([indices[e['equipo_visitante_id']] for e in entradas], dtype=np.intp)
+    goles_local = np.array([e['goles_local'] for e in entradas], dtype=float)
+    goles_visitante = np.array([e['goles_visitante'] for e in entradas], dtype=float)
+
+    # Capa de cada partido: una después de la última capa de cualquiera de sus equipos
+    capas = np.empty(len(entradas), dtype=np.intp)
+    ultima = [-1] * len(equipos)
+    for i, (l, v) in enumerate(zip(local.tolist(), visitante.tolist())):
+        capa = max(ultima[l], ultima[v]) + 1
+        capas[i] = ultima[l] = ultima[v] = capa
+
+    # Multiplicador y resultado no dependen de los ratings: se calculan de una vez
+    diferencia = np.abs(goles_local - goles_visitante)
+    peso = np.where(diferencia <= 1, 1.0, np.where(diferencia == 2, 1.5, (11.0 + diferencia) / 8.0))
+    resultado = np.sign(goles_local - goles_visitante) * 0.5 + 0.5
+
+    ratings = np.full(len(equipos), RATING_INICIAL)
+    rating_local = np.empty(len(entradas))
+    rating_visitante = np.empty(len(entradas))
+    delta = np.empty(len(entradas))
+
+    orden = np.argsort(capas, kind="stable")
+    limites = np.searchsorted(capas[orden], np.arange(capas.max() + 2))
+    for inicio, fin in zip(limites[:-1], limites[1:]):
+        sel = orden[inicio:fin]
+        rl = ratings[local[sel]]
+        rv = ratings[visitante[sel]]
+        esperado = 1.0 / (1.0 + 10.0 ** ((rv - rl) / ESCALA))
+        d = FACTOR_K * peso[sel] * (resultado[sel] - esperado)
+        rating_local[sel], rating_visitante[sel], delta[sel] = rl, rv, d
+        # Ningún equipo se repite dentro de una capa: las asignaciones no chocan
+        ratings[local[sel]] = rl + d
+        ratings[visitante[sel]] = rv - d
+
+    for i, entrada in enumerate(entradas):
+        entrada['rating_local'] = float(rating_local[i])
+        entrada['rating_visitante'] = float(rating_visitante[i])
+        entrada['delta'] = float(delta[i])
+
+    partidos = np.bincount(np.concatenate([local, visitante]), minlength=len(equipos))
+    return {equipo_id: (float(ratings[i]), int(partidos[i])) for i, equipo_id in enumerate(equipos)}
+
+
+class RatingService:
+    """Servicio que mantiene el rating de cada equipo al día."""
+
+    def __init__(self):
+        """Inicializa el servicio sin conectar al bus de eventos."""
+        self._conectado = False
+        self._lotes = 0
+        self._repetir_al_terminar = False
+        # Partidos borrados cuya entrada del historial se quita al repetirlo
+        self._descartados: set[int] = set()
+
+    def conectar(self, event_bus) -> None:
+        """
+        Escucha los resultados guardados y los partidos borrados para actualizar los ratings.
+
+        Si la base de datos tiene partidos jugados pero aún no hay historial
+        (primera ejecución con ratings), lo genera a partir de ellos.
+
+        Args:
+            event_bus: Bus de eventos de la aplicación
+        """
+        if self._conectado:
+            return
+        event_bus.result_saved.connect(self.registrar_resultado)
+        event_bus.match_deleted.connect(self.descartar_partido)
+        self._conectado = True
+        try:
+            if not RatingModel.obtener_historial() and MatchModel.obtener_goles_por_equipo():
+                self.reconstruir()
+        except Exception as e:
+            print(f"[RATINGS] No se pudo generar el historial inicial: {e}")
+
+    def obtener_ratings(self) -> dict[int, float]:
+        """
+        Obtiene el rating actual de los equipos con partidos puntuados.
+
+        Returns:
+            Diccionario {equipo_id: rating}; los equipos ausentes tienen RATING_INICIAL
+        """
+        return {equipo_id: datos["rating"] for equipo_id, datos in RatingModel.obtener_ratings().items()}
+
+    def registrar_resultado(self, partido_id: int) -> None:
+        """
+        Actualiza los ratings con el resultado de un partido.
+
+        Un partido nuevo se aplica directamente sobre los dos equipos. Si ya
+        estaba puntuado y el resultado ha cambiado, se repite el historial.
+
+        Args:
+            partido_id: ID del partido cuyo resultado se ha guardado
+        """
+        try:
+            partido = MatchModel.obtener_partido_por_id(partido_id)
+            if (not partido or partido['estado'] != 'Jugado'
+                    or not partido['local_id'] or not partido['visitante_id']):
+                # Un partido puntuado que ya no está jugado (resultado deshecho) sale del historial
+                if RatingModel.obtener_entrada_historial(partido_id) is not None:
+                    print(f"[RATINGS] El partido {partido_id} ya no está jugado, repitiendo historial")
+                    self._repetir_historial()
+                return
+            goles_local = partido['goles_local'] or 0
+            goles_visitante = partido['goles_visitante'] or 0
+
+            previa = RatingModel.obtener_entrada_historial(partido_id)
+            if previa is not None:
+                sin_cambios = (
+                    (previa['equipo_local_id'], previa['equipo_visitante_id'],
+                     previa['goles_local'], previa['goles_visitante'])
+                    == (partido['local_id'], partido['visitante_id'], goles_local, goles_visitante)
+                )
+                if not sin_cambios:
+                    print(f"[RATINGS] Resultado del partido {partido_id} editado, repitiendo historial")
+                    self._repetir_historial()
+                return
+
+            ratings = RatingModel.obtener_ratings()
+            rating_local = ratings.get(partido['local_id'], {}).get("rating", RATING_INICIAL)
+            rating_visitante = ratings.get(partido['visitante_id'], {}).get("rating", RATING_INICIAL)
+            delta = calcular_delta(rating_local, rating_visitante, goles_local, goles_visitante)
+
+            RatingModel.registrar_partido(
+                {
+                    'partido_id': partido_id,
+                    'equipo_local_id': partido['local_id'],
+                    'equipo_visitante_id': partido['visitante_id'],
+                    'goles_local': goles_local,
+                    'goles_visitante': goles_visitante,
+                    'rating_local': rating_local,
+                    'rating_visitante': rating_visitante,
+                    'delta': delta,
+                    'fecha': datetime.now().isoformat(timespec="seconds"),
+                },
+                rating_local + delta,
+                rating_visitante - delta
+            )
+            print(f"[RATINGS] Partido {partido_id}: {delta:+.1f} puntos para el local")
+        except Exception as e:
+            print(f"[RATINGS] Error actualizando ratings del partido {partido_id}: {e}")
+
+    def descartar_partido(self, partido_id: int) -> None:
+        """
+        Quita del historial un partido puntuado que se ha borrado.
+
+        Con id 0 (reinicio del torneo) no se hace nada: los ratings se
+        conservan para el siguiente torneo.
+
+        Args:
+            partido_id: ID del partido borrado
+        """
+        if not partido_id:
+            return
+        try:
+            if RatingModel.obtener_entrada_historial(partido_id) is None:
+                return
+            print(f"[RATINGS] El partido {partido_id} se ha borrado, repitiendo historial")
+            self._descartados.add(partido_id)
+            self._repetir_historial()
+        except Exception as e:
+            print(f"[RATINGS] Error quitando el partido {partido_id} del historial: {e}")
+
+    @contextmanager
+    def en_lote(self):
+        """
+        Agrupa los resultados que llegan dentro del bloque.
+
+        Los partidos nuevos se puntúan en el momento, pero si alguno obliga a
+        repetir el historial se hace una sola vez al salir del bloque.
+        """
+        self._lotes += 1
+        try:
+            yield
+        finally:
+            self._lotes -= 1
+            if not self._lotes and self._repetir_al_terminar:
+                self._repetir_al_terminar = False
+                try:
+                    self.reconstruir()
+                except Exception as e:
+                    print(f"[RATINGS] Error repitiendo el historial: {e}")
+
+    def _repetir_historial(self) -> None:
+        """Repite el historial ahora o, dentro de en_lote(), al terminar el lote."""
+        if self._lotes:
+            self._repetir_al_terminar = True
+        else:
+            self.reconstruir()
+
+    def reconstruir(self) -> int:
+        """
+        Repite el historial completo con los resultados actuales.
+
+        Los partidos jugados toman su resultado actual, los que faltan en el
+        historial se añaden al final (en orden de fecha) y los que ya no están
+        en la base de datos (de torneos anteriores) se conservan tal cual. Los
+        que siguen en la base de datos pero ya no están jugados (resultado
+        deshecho o partido reabierto) y los borrados con descartar_partido
+        salen del historial.
+
+        Returns:
+            Número de partidos del historial
+        """
+        partidos = MatchModel.listar_partidos()
+        descartados, self._descartados = self._descartados, set()
+        existentes = {p['id'] for p in partidos} | descartados
+        jugados = {p['id']: p for p in partidos
+                   if p['estado'] == 'Jugado' and p['local_id'] and p['visitante_id']}
+        entradas = []
+        for entrada in RatingModel.obtener_historial():
+            partido = jugados.pop(entrada['partido_id'], None)
+            if partido is None and entrada['partido_id'] in existentes:
+                continue
+            if partido is not None:
+                entrada.update({
+                    'equipo_local_id': partido['local_id'],
+                    'equipo_visitante_id': partido['visitante_id'],
+                    'goles_local': partido['goles_local'] or 0,
+                    'goles_visitante': partido['goles_visitante'] or 0,
+                })
+            entradas.append(entrada)
+
+        ahora = datetime.now().isoformat(timespec="seconds")
+        for partido in sorted(jugados.values(), key=lambda p: (p['fecha_hora'] or "", p['id'])):
+            entradas.append({
+                'partido_id': partido['id'],
+                'equipo_local_id': partido['local_id'],
+                'equipo_visitante_id': partido['visitante_id'],
+                'goles_local': partido['goles_local'] or 0,
+                'goles_visitante': partido['goles_visitante'] or 0,
+                'fecha': ahora,
+            })
+
+        ratings = _repetir_historial(entradas)
+        RatingModel.reemplazar_historial(entradas, ratings)
+        print(f"[RATINGS] Historial repetido: {len(entradas)} partidos, {len(ratings)} equipos")
+        return len(entradas)
+
+
+_rating_service: Optional[RatingService] = None
+
+
+def get_rating_service() -> RatingService:
+    """
+    Obtiene la instancia única del servicio de ratings.
+
+    Returns:
+        Instancia global de RatingService
+    """
+    global _rating_service
+    if _rating_service is None:
+        _rating_service = RatingService()
+    return _rating_service
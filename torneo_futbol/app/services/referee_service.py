@@ -0,0 +1,249 @@
+"""
+Índice en memoria de la disponibilidad de los árbitros.
+
+Se construye una vez desde la base de datos (árbitros y partidos) y después
+se mantiene al día con los eventos ``match_changed`` (un partido: se lee solo
+ese partido) y ``participant_changed`` (se recarga la lista de árbitros).
+``match_changed(0)`` indica un cambio general y reconstruye el índice.
+
+Para cada árbitro guarda su equipo, el número de partidos asignados y los
+inicios de sus partidos ordenados; para cada equipo, los inicios de sus
+partidos. Todas las comprobaciones son búsquedas binarias sobre esas listas:
+
+- ``validar_asignacion``: si un árbitro puede pitar un partido a una hora
+  (no es de uno de los equipos, su equipo no juega a esa hora y no tiene otro
+  partido que se solape).
+- ``arbitros_disponibles``: árbitros libres para una franja, a partir de los
+  partidos que se solapan con ella (búsqueda binaria en la lista global).
+
+Un partido ocupa ``DURACION_PARTIDO_MIN`` minutos desde su fecha_hora.
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.constants import DURACION_PARTIDO_MIN
+from app.models.match_model import MatchModel
+from app.models.participant_model import ParticipantModel
+from app.services.scheduler_service import parsear_fecha_hora
+
+
+class RefereeService:
+    """Índice de disponibilidad de árbitros, actualizado con el bus de eventos."""
+
+    def __init__(self):
+        """Inicializa el índice vacío; se carga en el primer uso."""
+        self.duracion = timedelta(minutes=DURACION_PARTIDO_MIN)
+        self._conectado = False
+        self._cargado = False
+        self._arbitros: dict[int, dict] = {}
+        self._por_equipo: dict[int, set[int]] = {}
+        self._partidos: dict[int, tuple[Optional[datetime], frozenset, Optional[int]]] = {}
+        self._reservas: dict[int, list[tuple[datetime, int]]] = {}  # Por árbitro
+        self._equipos: dict[int, list[tuple[datetime, int]]] = {}   # Por equipo
+        self._inicios: list[tuple[datetime, int]] = []              # Todos los partidos con fecha
+        self._carga: dict[int, int] = {}
+
+    def conectar(self, event_bus) -> None:
+        """
+        Escucha los cambios de partidos y participantes.
+
+        Args:
+            event_bus: Bus de eventos de la aplicación
+        """
+        if self._conectado:
+            return
+        event_bus.match_changed.connect(self.actualizar_partido)
+        event_bus.participant_changed.connect(self._on_participant_changed)
+        self._conectado = True
+
+    # ------------------------------------------------------------------
+    # Carga y actualización
+    # ------------------------------------------------------------------
+
+    def reconstruir(self) -> None:
+        """Carga árbitros y partidos desde la base de datos."""
+        self._cargar_arbitros()
+        self._partidos.clear()
+        self._reservas.clear()
+        self._equipos.clear()
+        self._inicios.clear()
+        self._carga = {}
+        for partido in MatchModel.listar_partidos():
+            self._anadir(partido)
+        self._cargado = True
+        print(f"[ARBITROS] Índice construido: {len(self._arbitros)} árbitros, {len(self._partidos)} partidos")
+
+    def _asegurar_cargado(self) -> None:
+        if not self._cargado:
+            self.reconstruir()
+
+    def _cargar_arbitros(self) -> None:
+        self._arbitros = {a['id']: a for a in ParticipantModel.listar_arbitros()}
+        self._por_equipo = {}
+        for arbitro in self._arbitros.values():
+            if arbitro['equipo_id']:
+                self._por_equipo.setdefault(arbitro['equipo_id'], set()).add(arbitro['id'])
+
+    def _on_participant_changed(self, participant_id: int) -> None:
+        """Recarga la lista de árbitros (altas, bajas o cambio de equipo)."""
+        if self._cargado:
+            self._cargar_arbitros()
+
+    def actualizar_partido(self, partido_id: int) -> None:
+        """
+        Actualiza el índice con el estado actual de un partido.
+
+        Args:
+            partido_id: ID del partido (0 = cambio general, se reconstruye el índice)
+        """
+        if not self._cargado:
+            return
+        if not partido_id:
+            self.reconstruir()
+            return
+        self._quitar(partido_id)
+        partido = MatchModel.obtener_partido_por_id(partido_id)
+        if partido:
+            self._anadir(partido)
+
+    def _anadir(self, partido: dict) -> None:
+        if partido['estado'] == 'Cancelado':
+            return
+        partido_id = partido['id']
+        inicio = parsear_fecha_hora(partido['fecha_hora'])
+        equipos = frozenset({partido['local_id'], partido['visitante_id']} - {None})
+        arbitro_id = partido['arbitro_id']
+        self._partidos[partido_id] = (inicio, equipos, arbitro_id)
+
+        if arbitro_id is not None:
+            self._carga[arbitro_id] = self._carga.get(arbitro_id, 0) + 1
+        if inicio is None:
+            return
+        insort(self._inicios, (inicio, partido_id))
+        for equipo_id in equipos:
+            insort(self._equipos.setdefault(equipo_id, []), (inicio, partido_id))
+        if arbitro_id is not None:
+            insort(self._reservas.setdefault(arbitro_id, []), (inicio, partido_id))
+
+    def _quitar(self, partido_id: int) -> None:
+        datos = self._partidos.pop(partido_id, None)
+        if datos is None:
+            return
+        inicio, equipos, arbitro_id = datos
+        if arbitro_id is not None:
+            self._carga[arbitro_id] -= 1
+        if inicio is None:
+            return
+        clave = (inicio, partido_id)
+        _eliminar(self._inicios, clave)
+        for equipo_id in equipos:
+            _eliminar(self._equipos[equipo_id], clave)
+        if arbitro_id is not None:
+            _eliminar(self._reservas[arbitro_id], clave)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _solapados(self, lista: list[tuple[datetime, int]], inicio: datetime,
+                   ignorar: Optional[int]) -> list[int]:
+        """Partidos de la lista que se solapan con uno que empieza en ``inicio``."""
+        i = bisect_right(lista, (inicio - self.duracion, float("inf")))
+        fin = bisect_left(lista, (inicio + self.duracion, -1), lo=i)
+        return [partido_id for _, partido_id in lista[i:fin] if partido_id != ignorar]
+
+    def listar_arbitros(self) -> list[dict]:
+        """
+        Lista los árbitros con su número de partidos asignados.
+
+        Returns:
+            Lista de diccionarios de ParticipantModel.listar_arbitros con la clave "partidos"
+        """
+        self._asegurar_cargado()
+        return [dict(arbitro, partidos=self._carga.get(arbitro_id, 0))
+                for arbitro_id, arbitro in self._arbitros.items()]
+
+    def validar_asignacion(self, arbitro_id: int, fecha_hora: Optional[str],
+                           equipos: set, partido_id: Optional[int] = None) -> Optional[str]:
+        """
+        Comprueba si un árbitro puede pitar un partido.
+
+        Args:
+            arbitro_id: ID del árbitro
+            fecha_hora: Fecha y hora del partido (sin fecha solo se comprueba el equipo)
+            equipos: IDs de los equipos del partido
+            partido_id: ID del partido si ya existe (no cuenta como conflicto consigo mismo)
+
+        Returns:
+            None si la asignación es válida o el motivo del conflicto
+        """
+        self._asegurar_cargado()
+        arbitro = self._arbitros.get(arbitro_id)
+        if arbitro is None:
+            return None
+        equipo_id = arbitro['equipo_id']
+        if equipo_id and equipo_id in equipos:
+            return f"El árbitro pertenece a {arbitro['equipo_nombre']}, que juega este partido."
+
+        inicio = parsear_fecha_hora(fecha_hora)
+        if inicio is None:
+            return None
+        if equipo_id and self._solapados(self._equipos.get(equipo_id, []), inicio, partido_id):
+            return f"{arbitro['equipo_nombre']}, el equipo del árbitro, juega a esa hora."
+        if self._solapados(self._reservas.get(arbitro_id, []), inicio, partido_id):
+            return "El árbitro ya tiene otro partido a esa hora."
+        return None
+
+    def arbitros_disponibles(self, fecha_hora: Optional[str], equipos: set,
+                             partido_id: Optional[int] = None) -> list[dict]:
+        """
+        Árbitros que pueden pitar un partido, de menos a más partidos asignados.
+
+        Args:
+            fecha_hora: Fecha y hora del partido (sin fecha solo se excluyen los de sus equipos)
+            equipos: IDs de los equipos del partido
+            partido_id: ID del partido si ya existe (su árbitro actual sigue disponible)
+
+        Returns:
+            Lista de árbitros como en listar_arbitros
+        """
+        self._asegurar_cargado()
+        ocupados = set()
+        equipos_en_juego = set(equipos)
+        inicio = parsear_fecha_hora(fecha_hora)
+        if inicio is not None:
+            for otro_id in self._solapados(self._inicios, inicio, partido_id):
+                _, equipos_otro, arbitro_otro = self._partidos[otro_id]
+                equipos_en_juego |= equipos_otro
+                if arbitro_otro is not None:
+                    ocupados.add(arbitro_otro)
+        for equipo_id in equipos_en_juego:
+            ocupados |= self._por_equipo.get(equipo_id, set())
+
+        disponibles = [arbitro for arbitro in self.listar_arbitros() if arbitro['id'] not in ocupados]
+        disponibles.sort(key=lambda a: a['partidos'])
+        return disponibles
+
+
+def _eliminar(lista: list, clave) -> None:
+    """Elimina un elemento de una lista ordenada por búsqueda binaria."""
+    i = bisect_left(lista, clave)
+    if i < len(lista) and lista[i] == clave:
+        del lista[i]
+
+
+_referee_service: Optional[RefereeService] = None
+
+
+def get_referee_service() -> RefereeService:
+    """
+    Obtiene la instancia única del índice de árbitros.
+
+    Returns:
+        Instancia global de RefereeService
+    """
+    global _referee_service
+    if _referee_service is None:
+        _referee_service = RefereeService()
+    return _referee_service
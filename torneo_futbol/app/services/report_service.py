@@ -8,6 +8,7 @@ from fpdf import FPDF
 
 from app.config import RESOURCES_DIR, REPORTS_GENERATED_DIR
 from app.models.db import get_connection
+from app.services.leaderboard_service import get_leaderboard_service
 
 
 # ──────────────────────────────────────────────
@@ -498,18 +499,12 @@ class ReportService:
 
             pdf.ln(4)
 
-            # Goleadores individuales
-            goleadores_query = """
-                SELECT p.nombre || ' ' || p.apellidos AS jugador,
-                       e.nombre AS equipo,
-                       COALESCE(p.goles, 0) AS goles
-                FROM participantes p
-                LEFT JOIN equipos e ON p.equipo_id = e.id
-                WHERE p.goles > 0
-                ORDER BY p.goles DESC
-                LIMIT 10
-            """
-            goleadores = conn.execute(goleadores_query).fetchall()
+            # Goleadores individuales (de la fase filtrada, si la hay)
+            clasificaciones = get_leaderboard_service()
+            goleadores = [
+                (g['nombre'], g['equipo'], g['goles'])
+                for g in clasificaciones.top("goles", 10, ronda=eliminatoria)
+            ]
 
             if goleadores:
                 if pdf.get_y() > pdf.h - 50:
@@ -527,18 +522,10 @@ class ReportService:
                     )
 
             # Tarjetas
-            tarjetas_query = """
-                SELECT p.nombre || ' ' || p.apellidos AS jugador,
-                       e.nombre AS equipo,
-                       COALESCE(p.t_amarillas, 0) AS amarillas,
-                       COALESCE(p.t_rojas, 0) AS rojas
-                FROM participantes p
-                LEFT JOIN equipos e ON p.equipo_id = e.id
-                WHERE p.t_amarillas > 0 OR p.t_rojas > 0
-                ORDER BY p.t_rojas DESC, p.t_amarillas DESC
-                LIMIT 10
-            """
-            tarjetas = conn.execute(tarjetas_query).fetchall()
+            tarjetas = [
+                (t['nombre'], t['equipo'], t['amarillas'], t['rojas'])
+                for t in clasificaciones.top("tarjetas", 10)
+            ]
 
             if tarjetas:
                 if pdf.get_y() > pdf.h - 50:
@@ -0,0 +1,450 @@
+"""
+Programación automática de partidos.
+
+Asigna fecha, hora, campo y árbitro a todos los partidos pendientes de una
+vez, respetando:
+
+- Un partido por campo y franja horaria.
+- El descanso mínimo de cada equipo entre dos partidos. En las rondas con
+  equipos por definir se aplica a partir de los partidos de los que salen
+  (el de cuartos empieza, como pronto, ``DESCANSO_MINIMO_HORAS`` después de
+  que terminen sus dos octavos).
+- Los árbitros no pitan partidos en los que puede jugar su equipo, ni a la
+  misma hora que juega su equipo, ni dos partidos que se solapen.
+
+Los partidos pendientes que ya tienen fecha la conservan (salvo con
+``reprogramar``); si no tienen árbitro, se les busca uno para esa misma
+franja antes de colocar los demás.
+
+Los partidos se recorren por ronda y slot y cada uno ocupa la primera franja
+libre (búsqueda binaria sobre las franjas ordenadas). Los árbitros de los
+partidos que empiezan a la misma hora se reparten con un emparejamiento
+bipartito por caminos de aumento: si el único árbitro válido para un partido
+ya está en otro de la misma franja, se reasigna ese otro en lugar de retrasar
+el partido. Dentro de lo posible se elige el árbitro con menos partidos.
+
+Todas las comprobaciones de choque son búsquedas binarias sobre las reservas
+ordenadas de cada equipo, campo y árbitro, y el resultado se guarda en una
+única transacción (MatchModel.programar_partidos).
+"""
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from app.constants import FASE_GRUPOS, DURACION_PARTIDO_MIN, HORARIOS_PARTIDO, DESCANSO_MINIMO_HORAS
+from app.models.match_model import MatchModel
+from app.models.participant_model import ParticipantModel
+from app.core.event_bus import get_event_bus
+from app.services.tournament_service import TournamentService
+
+
+# Formato de fecha_hora en la tabla partidos
+FORMATO_FECHA_HORA = "%Y-%m-%d %H:%M:%S"
+
+# Días como máximo que se buscan franjas libres desde la fecha de inicio
+HORIZONTE_DIAS = 120
+
+
+@dataclass
+class OpcionesProgramacion:
+    """Parámetros de una programación automática."""
+
+    fecha_inicio: date = field(default_factory=lambda: date.today() + timedelta(days=1))
+    horarios: list[str] = field(default_factory=lambda: list(HORARIOS_PARTIDO))
+    campos: int = 1
+    dias_semana: tuple[int, ...] = (0, 1, 2, 3, 4)  # Lunes a viernes
+    descanso_horas: float = DESCANSO_MINIMO_HORAS
+    reprogramar: bool = False  # Si True, también mueve los pendientes con fecha (si no, solo reciben árbitro)
+    asignar_arbitros: bool = True
+
+
+def parsear_fecha_hora(texto: Optional[str]) -> Optional[datetime]:
+    """Convierte fecha_hora de la base de datos (con o sin segundos) a datetime."""
+    if not texto:
+        return None
+    for formato in (FORMATO_FECHA_HORA, "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+    return None
+
+
+class _Reservas:
+    """Inicios de partido reservados por recurso (equipo, campo o árbitro), ordenados."""
+
+    def __init__(self):
+        self._reservas: dict[object, list[tuple[datetime, int]]] = {}
+
+    def reservar(self, clave, inicio: datetime, partido_id: int) -> None:
+        insort(self._reservas.setdefault(clave, []), (inicio, partido_id))
+
+    def liberar(self, clave, inicio: datetime, partido_id: int) -> None:
+        lista = self._reservas[clave]
+        del lista[bisect_left(lista, (inicio, partido_id))]
+
+    def hay_conflicto(self, clave, inicio: datetime, ventana: timedelta, ignorar=()) -> bool:
+        """Indica si hay una reserva a menos de ``ventana`` de ``inicio`` (sin contar ``ignorar``)."""
+        lista = self._reservas.get(clave)
+        if not lista:
+            return False
+        i = bisect_right(lista, (inicio - ventana, float("inf")))
+        while i < len(lista) and lista[i][0] < inicio + ventana:
+            if lista[i][1] not in ignorar:
+                return True
+            i += 1
+        return False
+
+
+class _Programacion:
+    """Estado de una programación en curso."""
+
+    def __init__(self, opciones: OpcionesProgramacion, partidos: list[dict],
+                 arbitros: list[dict], campos_asignados: dict[int, int]):
+        self.opciones = opciones
+        self.duracion = timedelta(minutes=DURACION_PARTIDO_MIN)
+        self.descanso = timedelta(hours=opciones.descanso_horas)
+
+        self.partidos = {p['id']: p for p in partidos if p['estado'] != 'Cancelado'}
+        self.por_clave = {(p['eliminatoria'], p['slot']): p for p in self.partidos.values()}
+        self.alimentadores = self._calcular_alimentadores()
+        self._posibles: dict[tuple[str, int], frozenset] = {}
+
+        self.equipo_arbitro = {a['id']: a['equipo_id'] for a in arbitros}
+        self.arbitros_por_equipo: dict[int, list[int]] = {}
+        for arbitro in arbitros:
+            if arbitro['equipo_id']:
+                self.arbitros_por_equipo.setdefault(arbitro['equipo_id'], []).append(arbitro['id'])
+
+        self.equipos = _Reservas()   # Equipos conocidos (descanso)
+        self.posibles = _Reservas()  # Equipos que pueden jugar (árbitros de ese equipo)
+        self.campos = _Reservas()
+        self.arbitros = _Reservas()
+        self.carga: dict[int, int] = {a['id']: 0 for a in arbitros}
+
+        self.inicios: dict[int, datetime] = {}
+        self.campo: dict[int, int] = {}
+        self.arbitro: dict[int, Optional[int]] = {}
+        self.bloques: dict[datetime, dict[int, int]] = {}  # {inicio: {arbitro_id: partido_id}}
+        self.elegibles: dict[int, list[int]] = {}
+
+        self.pendientes = []
+        self.sin_arbitro = []  # Pendientes con fecha fija que necesitan árbitro
+        for partido in self.partidos.values():
+            inicio = parsear_fecha_hora(partido['fecha_hora'])
+            fijo = partido['estado'] == 'Jugado' or (inicio is not None and not opciones.reprogramar)
+            if fijo:
+                if inicio is not None:
+                    # Sin campo registrado se supone el primero
+                    self._reservar(partido, inicio, campos_asignados.get(partido['id'], 1),
+                                   partido['arbitro_id'])
+                    if (partido['estado'] != 'Jugado' and partido['arbitro_id'] is None
+                            and opciones.asignar_arbitros):
+                        self.sin_arbitro.append(partido)
+            else:
+                self.pendientes.append(partido)
+
+        # La fase de grupos va antes que las eliminatorias
+        orden_rondas = {ronda: i for i, ronda in enumerate([FASE_GRUPOS, *TournamentService.RONDAS])}
+        self.pendientes.sort(key=lambda p: (orden_rondas.get(p['eliminatoria'], len(orden_rondas)), p['slot']))
+        self.sin_arbitro.sort(key=lambda p: (orden_rondas.get(p['eliminatoria'], len(orden_rondas)), p['slot']))
+        self.huecos = self._generar_huecos()
+
+    def _calcular_alimentadores(self) -> dict[tuple[str, int], list[tuple[str, int]]]:
+        """Partidos de los que salen los equipos de cada partido de la ronda siguiente."""
+        alimentadores: dict[tuple[str, int], list[tuple[str, int]]] = {}
+        rondas = TournamentService.RONDAS
+        for ronda, siguiente in zip(rondas, rondas[1:]):
+            for slot in range(1, TournamentService.PARTIDOS_POR_RONDA[ronda] + 1):
+                siguiente_slot, _ = TournamentService._calcular_siguiente_partido(ronda, slot)
+                alimentadores.setdefault((siguiente, siguiente_slot), []).append((ronda, slot))
+        return alimentadores
+
+    def _generar_huecos(self) -> list[datetime]:
+        """Franjas de inicio disponibles, ordenadas."""
+        horas = sorted(datetime.strptime(h, "%H:%M").time() for h in self.opciones.horarios)
+        huecos = []
+        for dia in range(HORIZONTE_DIAS):
+            fecha = self.opciones.fecha_inicio + timedelta(days=dia)
+            if fecha.weekday() in self.opciones.dias_semana:
+                huecos.extend(datetime.combine(fecha, hora) for hora in horas)
+        return huecos
+
+    def equipos_posibles(self, clave: tuple[str, int]) -> frozenset:
+        """Equipos que pueden jugar un partido (los conocidos o los que pueden llegar a él)."""
+        if clave in self._posibles:
+            return self._posibles[clave]
+        partido = self.por_clave.get(clave)
+        conocidos = set()
+        if partido:
+            conocidos = {partido['local_id'], partido['visitante_id']} - {None}
+        posibles = set(conocidos)
+        if len(conocidos) < 2:
+            for alimentador in self.alimentadores.get(clave, []):
+                anterior = self.por_clave.get(alimentador)
+                if anterior and anterior['ganador_equipo_id']:
+                    posibles.add(anterior['ganador_equipo_id'])
+                else:
+                    posibles |= self.equipos_posibles(alimentador)
+        self._posibles[clave] = frozenset(posibles)
+        return self._posibles[clave]
+
+    def _reservar(self, partido: dict, inicio: datetime, campo: int, arbitro_id: Optional[int]) -> None:
+        partido_id = partido['id']
+        self.inicios[partido_id] = inicio
+        self.campo[partido_id] = campo
+        self.arbitro[partido_id] = arbitro_id
+        self.campos.reservar(campo, inicio, partido_id)
+        for equipo_id in {partido['local_id'], partido['visitante_id']} - {None}:
+            self.equipos.reservar(equipo_id, inicio, partido_id)
+        for equipo_id in self.equipos_posibles((partido['eliminatoria'], partido['slot'])):
+            self.posibles.reservar(equipo_id, inicio, partido_id)
+        if arbitro_id is not None:
+            self.arbitros.reservar(arbitro_id, inicio, partido_id)
+            self.carga[arbitro_id] = self.carga.get(arbitro_id, 0) + 1
+
+    def inicio_minimo(self, partido: dict) -> Optional[datetime]:
+        """Primer inicio posible según los partidos de los que sale, o None si alguno no tiene fecha."""
+        inicio = datetime.combine(self.opciones.fecha_inicio, datetime.min.time())
+        for alimentador in self.alimentadores.get((partido['eliminatoria'], partido['slot']), []):
+            anterior = self.por_clave.get(alimentador)
+            if anterior is None:
+                continue
+            if anterior['id'] in self.inicios:
+                inicio = max(inicio, self.inicios[anterior['id']] + self.duracion + self.descanso)
+            elif anterior['estado'] != 'Jugado':
+                return None
+        return inicio
+
+    def _arbitros_validos(self, partido_id: int, inicio: datetime, en_juego: frozenset) -> list[int]:
+        """
+        Árbitros que pueden pitar el partido a esa hora (los de la misma franja cuentan como libres).
+
+        ``en_juego`` son los equipos del partido que se está colocando, que aún
+        no figuran en las reservas.
+        """
+        bloque = self.bloques.get(inicio, {})
+        movibles = set(bloque.values())
+        validos = [
+            arbitro_id for arbitro_id in self.elegibles[partido_id]
+            if self.equipo_arbitro[arbitro_id] not in en_juego
+            and not self.arbitros.hay_conflicto(arbitro_id, inicio, self.duracion, movibles)
+            and not (self.equipo_arbitro[arbitro_id]
+                     and self.posibles.hay_conflicto(self.equipo_arbitro[arbitro_id], inicio,
+                                                     self.duracion, {partido_id}))
+        ]
+        validos.sort(key=lambda a: (self.carga.get(a, 0), a))
+        return validos
+
+    def _aumentar(self, partido_id: int, inicio: datetime, asignacion: dict[int, int],
+                  visitados: set[int], en_juego: frozenset) -> bool:
+        """Busca un camino de aumento que dé árbitro al partido dentro de la franja."""
+        for arbitro_id in self._arbitros_validos(partido_id, inicio, en_juego):
+            if arbitro_id in visitados:
+                continue
+            visitados.add(arbitro_id)
+            otro = asignacion.get(arbitro_id)
+            if otro is None or self._aumentar(otro, inicio, asignacion, visitados, en_juego):
+                asignacion[arbitro_id] = partido_id
+                return True
+        return False
+
+    def _asignar_arbitro(self, partido_id: int, inicio: datetime, en_juego: frozenset) -> bool:
+        """Intenta dar árbitro al partido en la franja, reasignando los de la franja si hace falta."""
+        anterior = self.bloques.get(inicio, {})
+        asignacion = dict(anterior)
+        if not self._aumentar(partido_id, inicio, asignacion, set(), en_juego):
+            return False
+
+        # Aplicar solo los cambios del camino de aumento
+        nuevos = {p: a for a, p in asignacion.items()}
+        for arbitro_id, otro in anterior.items():
+            if nuevos.get(otro) != arbitro_id:
+                self.arbitros.liberar(arbitro_id, inicio, otro)
+                self.carga[arbitro_id] -= 1
+        for arbitro_id, otro in asignacion.items():
+            if anterior.get(arbitro_id) != otro:
+                self.arbitros.reservar(arbitro_id, inicio, otro)
+                self.carga[arbitro_id] = self.carga.get(arbitro_id, 0) + 1
+            self.arbitro[otro] = arbitro_id
+        self.bloques[inicio] = asignacion
+        return True
+
+    def _calcular_elegibles(self, partido: dict) -> frozenset:
+        """Anota los árbitros que pueden pitar el partido y devuelve los equipos que pueden jugarlo."""
+        posibles = self.equipos_posibles((partido['eliminatoria'], partido['slot']))
+        self.elegibles[partido['id']] = [
+            arbitro_id for arbitro_id, equipo_id in self.equipo_arbitro.items()
+            if equipo_id not in posibles
+        ] if self.opciones.asignar_arbitros else []
+        return posibles
+
+    def arbitrar(self, partido: dict) -> bool:
+        """
+        Da árbitro a un partido que ya tiene fecha, sin moverlo de su franja.
+
+        Returns:
+            True si se ha encontrado árbitro
+        """
+        partido_id = partido['id']
+        posibles = self._calcular_elegibles(partido)
+        return bool(self.elegibles[partido_id]) and self._asignar_arbitro(
+            partido_id, self.inicios[partido_id], posibles
+        )
+
+    def colocar(self, partido: dict) -> Optional[datetime]:
+        """
+        Coloca un partido en la primera franja válida.
+
+        Returns:
+            Inicio asignado o None si no cabe en el horizonte
+        """
+        partido_id = partido['id']
+        inicio_minimo = self.inicio_minimo(partido)
+        if inicio_minimo is None:
+            return None
+
+        equipos = {partido['local_id'], partido['visitante_id']} - {None}
+        posibles = self._calcular_elegibles(partido)
+        con_arbitro = bool(self.elegibles[partido_id])
+        ventana_equipo = self.duracion + self.descanso
+
+        for i in range(bisect_left(self.huecos, inicio_minimo), len(self.huecos)):
+            inicio = self.huecos[i]
+            if any(self.equipos.hay_conflicto(e, inicio, ventana_equipo) for e in equipos):
+                continue
+            # Un árbitro no puede estar pitando mientras juega su equipo
+            if any(self.arbitros.hay_conflicto(a, inicio, self.duracion)
+                   for e in posibles for a in self.arbitros_por_equipo.get(e, ())):
+                continue
+            campo = next((c for c in range(1, self.opciones.campos + 1)
+                          if not self.campos.hay_conflicto(c, inicio, self.duracion)), None)
+            if campo is None:
+                continue
+            if con_arbitro and not self._asignar_arbitro(partido_id, inicio, posibles):
+                continue
+
+            if con_arbitro:
+                # El árbitro ya está reservado por _asignar_arbitro
+                arbitro_id = self.arbitro[partido_id]
+                self._reservar(partido, inicio, campo, None)
+                self.arbitro[partido_id] = arbitro_id
+            else:
+                # Sin asignación automática se conserva el árbitro que tuviera
+                conservar = None if self.opciones.asignar_arbitros else partido['arbitro_id']
+                self._reservar(partido, inicio, campo, conservar)
+            return inicio
+        return None
+
+
+class SchedulerService:
+    """Servicio de programación automática de partidos."""
+
+    @staticmethod
+    def planificar(opciones: Optional[OpcionesProgramacion] = None,
+                   partidos: Optional[list[dict]] = None,
+                   arbitros: Optional[list[dict]] = None,
+                   campos_asignados: Optional[dict[int, int]] = None) -> dict:
+        """
+        Calcula la programación de los partidos pendientes sin guardarla.
+
+        Args:
+            opciones: Parámetros de la programación (por defecto OpcionesProgramacion())
+            partidos: Partidos del torneo (por defecto, los de la base de datos)
+            arbitros: Árbitros disponibles (por defecto ParticipantModel.listar_arbitros)
+            campos_asignados: Campo de los partidos ya programados {partido_id: campo}
+
+        Returns:
+            Diccionario con:
+                - asignaciones: lista de {partido_id, fecha_hora, campo, arbitro_id}
+                - sin_arbitro: IDs de partidos programados sin árbitro posible
+                  (también los que ya tenían fecha y no tienen árbitro libre a esa hora)
+                - no_programados: IDs de partidos que no caben en el horizonte
+                - duracion_ms: tiempo de cálculo
+
+        Raises:
+            ValueError: Si las opciones no dejan ninguna franja disponible
+        """
+        inicio_calculo = time.perf_counter()
+        opciones = opciones or OpcionesProgramacion()
+        if opciones.campos < 1 or not opciones.horarios or not opciones.dias_semana:
+            raise ValueError("Se necesita al menos un campo, un horario y un día de la semana")
+
+        if partidos is None:
+            partidos = MatchModel.listar_partidos()
+        if arbitros is None:
+            arbitros = ParticipantModel.listar_arbitros() if opciones.asignar_arbitros else []
+        if campos_asignados is None:
+            campos_asignados = MatchModel.obtener_campos_asignados()
+
+        programacion = _Programacion(opciones, partidos, arbitros, campos_asignados)
+
+        asignaciones = []
+        sin_arbitro = []
+        no_programados = []
+        # Primero los que ya tienen fecha: su franja no se puede mover
+        arbitrados = []
+        for partido in programacion.sin_arbitro:
+            if programacion.arbitrar(partido):
+                arbitrados.append(partido)
+            else:
+                sin_arbitro.append(partido['id'])
+        for partido in programacion.pendientes:
+            if programacion.colocar(partido) is None:
+                no_programados.append(partido['id'])
+            elif opciones.asignar_arbitros and not programacion.elegibles[partido['id']]:
+                sin_arbitro.append(partido['id'])
+
+        # Los árbitros pueden haberse reasignado dentro de cada franja: se leen al final
+        for partido in arbitrados:
+            partido_id = partido['id']
+            asignaciones.append({
+                'partido_id': partido_id,
+                'fecha_hora': partido['fecha_hora'],
+                'campo': campos_asignados.get(partido_id),
+                'arbitro_id': programacion.arbitro[partido_id],
+            })
+        for partido in programacion.pendientes:
+            partido_id = partido['id']
+            if partido_id in no_programados:
+                continue
+            asignaciones.append({
+                'partido_id': partido_id,
+                'fecha_hora': programacion.inicios[partido_id].strftime(FORMATO_FECHA_HORA),
+                'campo': programacion.campo[partido_id],
+                'arbitro_id': programacion.arbitro[partido_id],
+            })
+
+        return {
+            'asignaciones': asignaciones,
+            'sin_arbitro': sin_arbitro,
+            'no_programados': no_programados,
+            'duracion_ms': (time.perf_counter() - inicio_calculo) * 1000,
+        }
+
+    @staticmethod
+    def programar(opciones: Optional[OpcionesProgramacion] = None) -> dict:
+        """
+        Programa los partidos pendientes y guarda el resultado en una transacción.
+
+        Args:
+            opciones: Parámetros de la programación
+
+        Returns:
+            Resultado de planificar() con la clave adicional "guardados"
+
+        Raises:
+            ValueError: Si las opciones no dejan ninguna franja disponible
+        """
+        resultado = SchedulerService.planificar(opciones)
+        resultado['guardados'] = 0
+        if resultado['asignaciones']:
+            resultado['guardados'] = MatchModel.programar_partidos(resultado['asignaciones'])
+            # match_id 0 = cambio general: las vistas recargan todos los partidos
+            get_event_bus().emit_match_updated(0)
+        print(f"[SCHEDULER] {resultado['guardados']} partidos programados en "
+              f"{resultado['duracion_ms']:.1f} ms ({len(resultado['sin_arbitro'])} sin árbitro, "
+              f"{len(resultado['no_programados'])} sin hueco)")
+        return resultado
@@ -0,0 +1,278 @@
+"""
+Simulación Monte Carlo del cuadro de eliminatorias.
+
+Parte del estado actual del cuadro (``TournamentService.get_bracket_state``),
+desde su primera ronda (octavos, o cuartos o semifinal si los clasificados de
+la fase de grupos entran más tarde), y de un modelo de fuerza por equipo calculado con los goles a favor y en
+contra de los partidos jugados. Cada partido pendiente se decide con dos
+variables de Poisson (goles de cada equipo) y, si hay empate, con una
+tanda de penaltis al 50 %. Los partidos ya jugados conservan su ganador.
+
+Todas las simulaciones de un bloque avanzan a la vez: cada ronda es una
+matriz (simulaciones x partidos) de índices de equipo y se resuelve con
+operaciones de NumPy, sin bucles de Python por simulación.
+
+NumPy se importa al simular, no al importar el módulo, para no añadir su
+coste al arranque de la aplicación.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.constants import FASES_CONFIG, EQUIPOS_RONDA, FASE_OCTAVOS, FASE_FINAL
+from app.models.match_model import MatchModel
+from app.services.tournament_service import TournamentService
+
+
+# Simulaciones por defecto y tamaño de bloque (limita la memoria usada)
+SIMULACIONES_POR_DEFECTO = 200_000
+TAMANO_BLOQUE = 50_000
+
+# Media de goles por equipo y partido cuando aún no hay partidos jugados
+GOLES_MEDIOS_POR_DEFECTO = 1.5
+
+# Partidos ficticios con la media del torneo que se suman a cada equipo:
+# con pocos partidos jugados la fuerza se acerca a la media en lugar de
+# depender de un único resultado
+PARTIDOS_PREVIOS = 3
+
+# Clave de las probabilidades de ganar el torneo
+CAMPEON = "campeon"
+
+
+@dataclass
+class ModeloFuerza:
+    """Fuerza ofensiva y defensiva de cada equipo (1.0 = media del torneo)."""
+    goles_medios: float
+    ataque: dict[int, float]
+    defensa: dict[int, float]
+
+    def obtener(self, equipo_id: int) -> tuple[float, float]:
+        """Devuelve (ataque, defensa) de un equipo; la media si no tiene datos."""
+        return self.ataque.get(equipo_id, 1.0), self.defensa.get(equipo_id, 1.0)
+
+
+class SimulationService:
+    """Servicio de simulación de probabilidades del torneo."""
+
+    @staticmethod
+    def calcular_modelo_fuerza(totales: Optional[dict[int, dict]] = None) -> ModeloFuerza:
+        """
+        Calcula el modelo de fuerza a partir de los goles de los partidos jugados.
+
+        El ataque es la media de goles marcados del equipo dividida entre la
+        media del torneo y la defensa, la media de goles encajados dividida
+        entre la misma media (mayor = peor defensa). Los goles esperados de
+        un equipo contra otro son ``media * ataque_propio * defensa_rival``.
+
+        Args:
+            totales: Goles por equipo como los devuelve
+                MatchModel.obtener_goles_por_equipo (se consultan si es None)
+
+        Returns:
+            Modelo de fuerza de los equipos con partidos jugados
+        """
+        if totales is None:
+            totales = MatchModel.obtener_goles_por_equipo()
+
+        jugados = sum(t["jugados"] for t in totales.values())
+        goles = sum(t["goles_favor"] for t in totales.values())
+        media = goles / jugados if jugados and goles else GOLES_MEDIOS_POR_DEFECTO
+
+        ataque, defensa = {}, {}
+        for equipo_id, t in totales.items():
+            partidos = t["jugados"] + PARTIDOS_PREVIOS
+            ataque[equipo_id] = (t["goles_favor"] + PARTIDOS_PREVIOS * media) / partidos / media
+            defensa[equipo_id] = (t["goles_contra"] + PARTIDOS_PREVIOS * media) / partidos / media
+        return ModeloFuerza(media, ataque, defensa)
+
+    @staticmethod
+    def _preparar_cuadro(cuadro: dict[str, list[dict]]) -> dict:
+        """
+        Convierte el estado del cuadro en las tablas que usa la simulación.
+
+        Args:
+            cuadro: Partidos por ronda (formato de get_bracket_state)
+
+        Returns:
+            Diccionario con rondas (las que se simulan, desde la primera del
+            cuadro), equipos (ids en orden de índice), nombres, primera (pares
+            de índices por slot de la primera ronda), cruces (por ronda
+            siguiente, slots de origen del local y del visitante) y fijos (por
+            ronda, {slot - 1: índice del ganador ya decidido})
+
+        Raises:
+            ValueError: Si la primera ronda del cuadro no tiene todos sus equipos
+        """
+        # Primera ronda con partidos; sin ninguno, se piden los octavos
+        primera = next((r for r in EQUIPOS_RONDA if cuadro.get(r)), FASE_OCTAVOS)
+        rondas = TournamentService.RONDAS[TournamentService.RONDAS.index(primera):]
+        partidos = {p["slot"]: p for p in cuadro.get(primera, [])}
+
+        equipos, nombres, indices, pares = [], {}, {}, []
+        for slot in range(1, TournamentService.PARTIDOS_POR_RONDA[primera] + 1):
+            partido = partidos.get(slot)
+            if not partido or not partido.get("local_id") or not partido.get("visitante_id"):
+                raise ValueError(
+                    f"El cuadro de {FASES_CONFIG[primera]['label'].lower()} no está completo: "
+                    "faltan equipos por asignar"
+                )
+            par = []
+            for clave in ("local", "visitante"):
+                equipo_id = partido[f"{clave}_id"]
+                if equipo_id not in indices:
+                    indices[equipo_id] = len(equipos)
+                    equipos.append(equipo_id)
+                    nombres[equipo_id] = partido.get(f"{clave}_nombre") or f"Equipo {equipo_id}"
+                par.append(indices[equipo_id])
+            pares.append(par)
+
+        # Cruces: qué partidos de la ronda anterior alimentan cada partido
+        cruces = {}
+        for anterior, ronda in zip(rondas, rondas[1:]):
+            num = TournamentService.PARTIDOS_POR_RONDA[ronda]
+            local, visitante = [0] * num, [0] * num
+            for slot in range(1, TournamentService.PARTIDOS_POR_RONDA[anterior] + 1):
+                siguiente, es_local = TournamentService._calcular_siguiente_partido(anterior, slot)
+                (local if es_local else visitante)[siguiente - 1] = slot - 1
+            cruces[ronda] = (local, visitante)
+
+        # Resultados ya jugados
+        fijos = {}
+        for ronda in rondas:
+            fijos[ronda] = {
+                p["slot"] - 1: indices[p["ganador_equipo_id"]]
+                for p in cuadro.get(ronda, [])
+                if p.get("ganador_equipo_id") in indices
+            }
+
+        return {
+            "rondas": rondas,
+            "equipos": equipos,
+            "nombres": nombres,
+            "primera": pares,
+            "cruces": cruces,
+            "fijos": fijos,
+        }
+
+    @staticmethod
+    def _simular_bloque(np, rng, tablas: dict, ataque, defensa, media: float, n: int) -> dict:
+        """
+        Simula ``n`` torneos completos y cuenta cuántas veces llega cada equipo a cada ronda.
+
+        Returns:
+            Diccionario {ronda o CAMPEON: array de llegadas por índice de equipo}
+        """
+        num_equipos = len(tablas["equipos"])
+        pares = np.asarray(tablas["primera"], dtype=np.intp)
+        local = np.broadcast_to(pares[:, 0], (n, len(pares)))
+        visitante = np.broadcast_to(pares[:, 1], (n, len(pares)))
+
+        llegadas = {}
+        rondas = tablas["rondas"]
+        for numero, ronda in enumerate(rondas):
+            llegadas[ronda] = (
+                np.bincount(local.ravel(), minlength=num_equipos)
+                + np.bincount(visitante.ravel(), minlength=num_equipos)
+            )
+
+            # Poisson para cada equipo y penaltis al 50 % en caso de empate
+            goles_local = rng.poisson(media * ataque[local] * defensa[visitante])
+            goles_visitante = rng.poisson(media * ataque[visitante] * defensa[local])
+            penaltis_local = rng.random(goles_local.shape) < 0.5
+            gana_local = (goles_local > goles_visitante) | (
+                (goles_local == goles_visitante) & penaltis_local
+            )
+            ganadores = np.where(gana_local, local, visitante)
+
+            for indice, ganador in tablas["fijos"][ronda].items():
+                ganadores[:, indice] = ganador
+
+            # Los ganadores forman los partidos de la ronda siguiente
+            if numero + 1 < len(rondas):
+                origen_local, origen_visitante = tablas["cruces"][rondas[numero + 1]]
+                local = ganadores[:, origen_local]
+                visitante = ganadores[:, origen_visitante]
+
+        llegadas[CAMPEON] = np.bincount(ganadores[:, 0], minlength=num_equipos)
+        return llegadas
+
+    @staticmethod
+    def simular(
+        simulaciones: int = SIMULACIONES_POR_DEFECTO,
+        semilla: Optional[int] = None,
+        cuadro: Optional[dict[str, list[dict]]] = None,
+        modelo: Optional[ModeloFuerza] = None
+    ) -> dict[str, Any]:
+        """
+        Estima la probabilidad de cada equipo de alcanzar cada ronda.
+
+        Args:
+            simulaciones: Número de torneos simulados
+            semilla: Semilla del generador (para resultados reproducibles)
+            cuadro: Estado del cuadro (por defecto, get_bracket_state)
+            modelo: Modelo de fuerza (por defecto, calculado de la BD)
+
+        Returns:
+            Diccionario con simulaciones, duracion_s, simulaciones_por_segundo,
+            goles_medios, rondas (las simuladas, desde la primera del cuadro)
+            y equipos: lista ordenada por probabilidad de ser
+            campeón con equipo_id, nombre, ataque, defensa y probabilidades
+            ({ronda: p, "campeon": p})
+
+        Raises:
+            ValueError: Si la primera ronda del cuadro no está completa o simulaciones < 1
+        """
+        import numpy as np
+
+        if simulaciones < 1:
+            raise ValueError("El número de simulaciones debe ser positivo")
+        if cuadro is None:
+            cuadro = TournamentService.get_bracket_state()
+        if modelo is None:
+            modelo = SimulationService.calcular_modelo_fuerza()
+
+        tablas = SimulationService._preparar_cuadro(cuadro)
+        fuerzas = [modelo.obtener(equipo_id) for equipo_id in tablas["equipos"]]
+        ataque = np.array([f[0] for f in fuerzas])
+        defensa = np.array([f[1] for f in fuerzas])
+        rng = np.random.default_rng(semilla)
+
+        inicio = time.perf_counter()
+        totales = {}
+        restantes = simulaciones
+        while restantes > 0:
+            n = min(restantes, TAMANO_BLOQUE)
+            llegadas = SimulationService._simular_bloque(
+                np, rng, tablas, ataque, defensa, modelo.goles_medios, n
+            )
+            for clave, valores in llegadas.items():
+                totales[clave] = totales.get(clave, 0) + valores
+            restantes -= n
+        duracion = time.perf_counter() - inicio
+
+        equipos = []
+        for indice, equipo_id in enumerate(tablas["equipos"]):
+            equipos.append({
+                "equipo_id": equipo_id,
+                "nombre": tablas["nombres"][equipo_id],
+                "ataque": float(ataque[indice]),
+                "defensa": float(defensa[indice]),
+                "probabilidades": {
+                    clave: float(valores[indice]) / simulaciones
+                    for clave, valores in totales.items()
+                },
+            })
+        equipos.sort(
+            key=lambda e: (e["probabilidades"][CAMPEON], e["probabilidades"][FASE_FINAL]),
+            reverse=True
+        )
+
+        return {
+            "simulaciones": simulaciones,
+            "duracion_s": duracion,
+            "simulaciones_por_segundo": simulaciones / duracion if duracion else float("inf"),
+            "goles_medios": modelo.goles_medios,
+            "rondas": tablas["rondas"],
+            "equipos": equipos,
+        }
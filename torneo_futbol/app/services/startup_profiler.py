@@ -0,0 +1,225 @@
+"""
+Medición del arranque de la aplicación.
+
+``main.py`` marca cada fase del arranque (traducciones, base de datos, tema,
+construcción de la ventana...) y la ventana principal registra el primer
+frame pintado. Con esas marcas se obtiene el tiempo hasta el primer frame y
+el coste de cada fase, que se imprimen al terminar el calentamiento de las
+páginas diferidas.
+
+Si la variable de entorno ``TORNEO_ARRANQUE_LOG`` apunta a un archivo, cada
+arranque añade una línea JSON con las mediciones para poder seguir su
+evolución entre versiones.
+
+Con ``TORNEO_PERFIL_IMPORTS=1`` se instala además un buscador en
+``sys.meta_path`` que mide cuánto tarda en ejecutarse cada módulo importado
+(tiempo propio, sin contar sus importaciones anidadas).
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+from typing import Optional
+
+from app.config import STARTUP_LOG_PATH, IMPORT_PROFILE_ENABLED, VERSION
+
+
+# Número de módulos más costosos que se muestran en el resumen
+MAX_MODULOS_RESUMEN = 25
+
+
+class _LoaderCronometrado:
+    """Envoltorio de un loader que mide la ejecución del módulo."""
+
+    def __init__(self, loader, cronometro: "CronometroImportaciones"):
+        self._loader = loader
+        self._cronometro = cronometro
+
+    def __getattr__(self, nombre):
+        # Delegar el resto (get_resource_reader, is_package...) en el loader real
+        return getattr(self._loader, nombre)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, modulo):
+        with self._cronometro.medir(modulo.__name__):
+            self._loader.exec_module(modulo)
+
+
+class CronometroImportaciones(MetaPathFinder):
+    """Buscador que cronometra la ejecución de cada módulo importado."""
+
+    def __init__(self):
+        """Inicializa el cronómetro sin mediciones."""
+        self._tiempos: dict[str, tuple[float, float]] = {}
+        self._pila: list[list] = []
+        self._buscando: set[str] = set()
+
+    def instalar(self) -> None:
+        """Coloca el cronómetro al principio de ``sys.meta_path``."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def desinstalar(self) -> None:
+        """Retira el cronómetro de ``sys.meta_path``."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._buscando:
+            return None
+        self._buscando.add(fullname)
+        try:
+            for buscador in sys.meta_path:
+                if buscador is self or not hasattr(buscador, "find_spec"):
+                    continue
+                spec = buscador.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _LoaderCronometrado(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._buscando.discard(fullname)
+
+    @contextmanager
+    def medir(self, modulo: str):
+        """
+        Mide la ejecución de un módulo descontando sus importaciones anidadas.
+
+        Args:
+            modulo: Nombre completo del módulo
+        """
+        entrada = [modulo, 0.0]  # nombre, tiempo de los hijos
+        self._pila.append(entrada)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = (time.perf_counter() - inicio) * 1000.0
+            self._pila.pop()
+            if self._pila:
+                self._pila[-1][1] += total
+            self._tiempos[modulo] = (total, total - entrada[1])
+
+    def obtener_tiempos(self) -> list[dict]:
+        """
+        Obtiene los módulos importados ordenados por tiempo propio.
+
+        Returns:
+            Lista de diccionarios con modulo, total_ms y propio_ms
+        """
+        tiempos = [
+            {"modulo": modulo, "total_ms": total, "propio_ms": propio}
+            for modulo, (total, propio) in self._tiempos.items()
+        ]
+        tiempos.sort(key=lambda t: t["propio_ms"], reverse=True)
+        return tiempos
+
+
+class StartupProfiler:
+    """Registra las fases del arranque con su instante relativo al inicio."""
+
+    def __init__(self):
+        """Inicializa el perfilador tomando el instante actual como origen."""
+        self._origen = time.perf_counter()
+        self._fases: list[tuple[str, float, float]] = []
+        self.primer_frame_ms: Optional[float] = None
+        self._volcado = False
+        self.importaciones: Optional[CronometroImportaciones] = None
+        if IMPORT_PROFILE_ENABLED:
+            self.importaciones = CronometroImportaciones()
+            self.importaciones.instalar()
+
+    def _ms_desde_origen(self, instante: float) -> float:
+        return (instante - self._origen) * 1000.0
+
+    def marcar(self, fase: str) -> None:
+        """
+        Registra un hito instantáneo del arranque.
+
+        Args:
+            fase: Nombre del hito
+        """
+        ahora = self._ms_desde_origen(time.perf_counter())
+        self._fases.append((fase, ahora, 0.0))
+
+    @contextmanager
+    def medir(self, fase: str):
+        """
+        Mide la duración de un bloque del arranque.
+
+        Args:
+            fase: Nombre de la fase
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fin = time.perf_counter()
+            self._fases.append((fase, self._ms_desde_origen(inicio), (fin - inicio) * 1000.0))
+
+    def registrar_primer_frame(self) -> None:
+        """Registra el instante en que se pintó la primera ventana (solo la primera vez)."""
+        if self.primer_frame_ms is None:
+            self.primer_frame_ms = self._ms_desde_origen(time.perf_counter())
+            self.marcar("primer frame")
+
+    def obtener_fases(self) -> list[dict]:
+        """
+        Obtiene las fases registradas.
+
+        Returns:
+            Lista de diccionarios con fase, inicio_ms y duracion_ms
+        """
+        return [
+            {"fase": fase, "inicio_ms": inicio, "duracion_ms": duracion}
+            for fase, inicio, duracion in self._fases
+        ]
+
+    def volcar(self) -> None:
+        """Imprime el resumen del arranque y lo guarda en el log si está configurado."""
+        if self._volcado:
+            return
+        self._volcado = True
+
+        if self.primer_frame_ms is not None:
+            print(f"[ARRANQUE] Tiempo hasta el primer frame: {self.primer_frame_ms:.0f} ms")
+        for fase, inicio, duracion in self._fases:
+            if duracion:
+                print(f"[ARRANQUE] {inicio:8.1f} ms  {fase:<32} {duracion:7.1f} ms")
+            else:
+                print(f"[ARRANQUE] {inicio:8.1f} ms  {fase}")
+
+        if self.importaciones is not None:
+            tiempos = self.importaciones.obtener_tiempos()
+            print(f"[ARRANQUE] {len(tiempos)} módulos importados; los más costosos (tiempo propio):")
+            for t in tiempos[:MAX_MODULOS_RESUMEN]:
+                print(f"[ARRANQUE]   {t['propio_ms']:7.1f} ms  (total {t['total_ms']:7.1f} ms)  {t['modulo']}")
+
+        if STARTUP_LOG_PATH:
+            self._guardar_log(Path(STARTUP_LOG_PATH))
+
+    def _guardar_log(self, ruta: Path) -> None:
+        registro = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "version": VERSION,
+            "primer_frame_ms": self.primer_frame_ms,
+            "fases": self.obtener_fases(),
+        }
+        if self.importaciones is not None:
+            registro["importaciones"] = self.importaciones.obtener_tiempos()[:MAX_MODULOS_RESUMEN]
+        try:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            with open(ruta, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"[ARRANQUE] No se pudo escribir el log de arranque: {e}")
+
+
+# Instancia global (el origen es la primera importación, al inicio de main.py)
+startup_profiler = StartupProfiler()
@@ -0,0 +1,394 @@
+"""
+Sincronización sin conexión entre dispositivos con su propia copia del torneo.
+
+En los torneos grandes cada campo lleva un portátil con su torneo.db. En vez
+de copiar archivos enteros, cada dispositivo exporta un conjunto de cambios
+(JSON, comprimido si el archivo termina en .gz) que el otro importa:
+
+- Qué se envía: solo los partidos cuyos datos (equipos, resultado,
+  convocatoria, estadísticas y goles) han cambiado en el diario desde el
+  último seq que el otro dispositivo ha confirmado haber recibido, y que no
+  coinciden ya con el último estado común. El tamaño depende de los cambios,
+  no de la base de datos. La primera vez (o si el diario se ha purgado) se
+  revisan todos los partidos con datos.
+- Identidad: cada copia tiene un identificador propio (tabla dispositivo).
+  Los datos viajan con claves naturales (partido por eliminatoria y slot,
+  equipo por nombre, participante por nombre, apellidos y fecha de
+  nacimiento), así que los IDs locales no tienen por qué coincidir.
+- Fusión a tres bandas: cada partido lleva la huella de sus datos y la del
+  último estado común que conoce quien lo envía. Al importar se compara con
+  la huella local y la base propia: si solo ha cambiado un lado se queda ese
+  cambio, si los dos coinciden no se hace nada y si han cambiado los dos de
+  forma distinta es un conflicto, que se informa y no se aplica (salvo que
+  se indique qué lado prefiere).
+- Primera sincronización: aún no hay estado común, pero una copia del
+  archivo conserva el diario y sus números de secuencia. La copia anota con
+  ``dispositivo --nuevo`` el seq en el que se separó, y cada lado ha cambiado
+  un partido si su diario lo toca después de ese seq.
+
+Los partidos de eliminatoria que el otro dispositivo ya tiene y este no (los
+de una ronda a la que aún no ha llegado) se crean al importar. Después se
+propagan los ganadores de los partidos aplicados, como al guardar un
+resultado: el equipo de la ronda siguiente se sustituye si el ganador ha
+cambiado.
+
+Los cambios aplicados se escriben en una única transacción y quedan en el
+diario, así que llegan también a las demás instancias abiertas y se pueden
+reenviar a un tercer dispositivo. Antes de aplicarlos se crea una copia de
+seguridad.
+"""
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from app.core.event_bus import get_event_bus
+from app.models.sync_model import SyncModel
+from app.models.tournament_model import TournamentModel
+from app.services.backup_service import get_backup_service
+from app.services.rating_service import get_rating_service
+from app.services.tournament_service import TournamentService
+
+
+# Versión del formato de los conjuntos de cambios
+FORMATO = 1
+
+# Datos de cada partido que forman su huella
+CAMPOS_PARTIDO = ("eliminatoria", "slot", "local", "visitante", "resultado",
+                  "convocados", "estadisticas", "goles")
+
+# Valores de --preferir para resolver conflictos
+PREFERENCIAS = ("local", "remoto")
+
+
+def huella(partido: dict) -> str:
+    """
+    Calcula la huella de los datos sincronizables de un partido.
+
+    Args:
+        partido: Partido como los de SyncModel.leer_partidos
+
+    Returns:
+        Resumen hexadecimal (igual en todas las copias para los mismos datos)
+    """
+    datos = json.dumps({campo: partido[campo] for campo in CAMPOS_PARTIDO},
+                       sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()[:32]
+
+
+def _sin_datos(partido: dict) -> bool:
+    """Indica si un partido aún no tiene nada apuntado (ni equipos, ni resultado, ni convocatoria, ni goles)."""
+    resultado = partido['resultado']
+    return (resultado['estado'] == "Pendiente" and resultado['goles_local'] is None
+            and resultado['goles_visitante'] is None
+            and partido['local'] is None and partido['visitante'] is None
+            and not (partido['convocados'] or partido['estadisticas'] or partido['goles']))
+
+
+def _cambiado(ultimo_cambio: Optional[int], diario_desde: int, separacion: int) -> bool:
+    """Indica si un partido ha cambiado después del seq de separación según su último cambio en el diario."""
+    if ultimo_cambio is not None:
+        return ultimo_cambio > separacion
+    # Sin cambios anotados: solo es seguro si el diario llega hasta la separación
+    return diario_desde > separacion + 1
+
+
+def _resumen(partido: dict) -> str:
+    """Descripción corta de los datos de un partido para el informe de conflictos."""
+    resultado = partido['resultado']
+    marcador = "-".join("?" if resultado[c] is None else str(resultado[c])
+                        for c in ("goles_local", "goles_visitante"))
+    return (f"{partido['local'] or '?'} {marcador} {partido['visitante'] or '?'} ({resultado['estado']}), "
+            f"{len(partido['convocados'])} convocados, {len(partido['goles'])} goles")
+
+
+class SyncService:
+    """Exporta e importa conjuntos de cambios entre dispositivos."""
+
+    def dispositivo(self, nombre: Optional[str] = None, nuevo: bool = False) -> dict:
+        """
+        Obtiene (o cambia) la identidad de esta copia de la base de datos.
+
+        Una copia duplicada de otro dispositivo debe pedir un identificador
+        nuevo antes de sincronizar con él.
+
+        Args:
+            nombre: Nombre nuevo del dispositivo (opcional)
+            nuevo: Si True, se genera un identificador nuevo
+
+        Returns:
+            Diccionario con id y nombre
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        return SyncModel.obtener_dispositivo(nuevo=nuevo, nombre=nombre)
+
+    def resolver_par(self, par: str) -> str:
+        """
+        Identificador de un dispositivo conocido a partir de su ID o su nombre.
+
+        Args:
+            par: ID o nombre del otro dispositivo
+
+        Returns:
+            ID del dispositivo (el mismo texto si no se conoce)
+
+        Raises:
+            DbError: Si hay error en la base de datos
+        """
+        for conocido in SyncModel.listar_pares():
+            if par in (conocido['dispositivo_id'], conocido['nombre']):
+                return conocido['dispositivo_id']
+        return par
+
+    def exportar(self, para: Optional[str] = None) -> dict:
+        """
+        Prepara el conjunto de cambios para otro dispositivo.
+
+        Args:
+            para: ID del dispositivo destino (sin él, o si nunca se ha
+                sincronizado con él, se incluyen todos los partidos con datos)
+
+        Returns:
+            Conjunto de cambios: formato, torneo (nombre del torneo activo),
+            origen (id y nombre), destino, hasta
+            (último seq propio incluido), confirmado (último seq del destino
+            ya recibido) y partidos (cada uno con sus datos, huella y base)
+
+        Raises:
+            ValueError: Si no hay torneo activo (la base de datos es un archivo)
+            DbError: Si hay error en la base de datos
+        """
+        torneo = TournamentModel.obtener_activo()
+        if torneo is None:
+            raise ValueError("Esta base de datos es un torneo archivado: no tiene cambios que enviar")
+        origen = SyncModel.obtener_dispositivo()
+        par = SyncModel.obtener_par(para) if para else None
+        bases = SyncModel.obtener_bases(para) if para else {}
+        hasta, cambiados = SyncModel.partidos_cambiados_desde(par['enviado_hasta'] if par else 0)
+        diario_desde, ultimos = SyncModel.ultimos_cambios()
+
+        partidos = []
+        for partido in SyncModel.leer_partidos(ids=cambiados):
+            clave = (partido['eliminatoria'], partido['slot'])
+            actual = huella(partido)
+            # El destino ya tiene estos datos, o no hay nada que contar
+            if bases.get(clave) == actual or (clave not in bases and _sin_datos(partido)):
+                continue
+            partidos.append({
+                **{campo: partido[campo] for campo in CAMPOS_PARTIDO},
+                "huella": actual,
+                "base": bases.get(clave),
+                "ultimo_cambio": ultimos.get(partido['id']),
+            })
+
+        print(f"[SINCRONIZACION] Exportados {len(partidos)} partidos para {para or 'cualquier dispositivo'}")
+        return {
+            "formato": FORMATO,
+            "torneo": torneo['nombre'],
+            "origen": origen,
+            "destino": para,
+            "hasta": hasta,
+            "confirmado": par['recibido_hasta'] if par else 0,
+            "diario_desde": diario_desde,
+            "partidos": partidos,
+        }
+
+    def importar(self, conjunto: dict, preferir: Optional[str] = None) -> dict:
+        """
+        Fusiona un conjunto de cambios de otro dispositivo.
+
+        Args:
+            conjunto: Conjunto de cambios creado con exportar en el otro dispositivo
+            preferir: "local" o "remoto" para resolver los conflictos (sin
+                él, los conflictos no se aplican y se informa de ellos)
+
+        Returns:
+            Informe con aplicados (lista de "eliminatoria slot"), iguales y
+            conservados (número de partidos que no cambian), conflictos
+            (lista de diccionarios con partido, local y remoto) y omitidos
+            (lista de diccionarios con partido y motivo)
+
+        Raises:
+            ValueError: Si el conjunto no es válido, es de otro torneo o lo ha
+                creado este mismo dispositivo
+            ConflictoVersionError: Si un partido ha cambiado durante la
+                importación (no se aplica nada; se puede repetir)
+            DbError: Si hay error en la base de datos
+        """
+        if conjunto.get("formato") != FORMATO:
+            raise ValueError(f"Formato de cambios no admitido: {conjunto.get('formato')}")
+        if preferir not in (None, *PREFERENCIAS):
+            raise ValueError(f"preferir debe ser uno de {PREFERENCIAS}")
+        torneo = TournamentModel.obtener_activo()
+        if torneo is None or conjunto.get("torneo") not in (None, torneo['nombre']):
+            raise ValueError(
+                f"El conjunto de cambios es del torneo {conjunto.get('torneo')}, no del activo en "
+                f"esta base de datos ({torneo['nombre'] if torneo else 'ninguno'})"
+            )
+        origen = conjunto['origen']
+        propio = SyncModel.obtener_dispositivo()
+        if origen['id'] == propio['id']:
+            raise ValueError(
+                "El conjunto de cambios tiene el identificador de este dispositivo: si esta "
+                "base de datos es una copia de la otra, genere un identificador nuevo"
+            )
+
+        bases = SyncModel.obtener_bases(origen['id'])
+        # Seq del diario en el que se separaron las dos copias
+        separacion = max(propio['origen_seq'], origen['origen_seq'])
+        diario_desde, ultimos = SyncModel.ultimos_cambios()
+        remotos = conjunto['partidos']
+        locales = {
+            (partido['eliminatoria'], partido['slot']): partido
+            for partido in SyncModel.leer_partidos(claves=[(p['eliminatoria'], p['slot']) for p in remotos])
+        }
+
+        informe = {"aplicados": [], "iguales": 0, "conservados": 0, "conflictos": [], "omitidos": []}
+        a_aplicar, nuevas_bases = [], {}
+        for remoto in remotos:
+            clave = (remoto['eliminatoria'], remoto['slot'])
+            nombre = f"{clave[0]} {clave[1]}"
+            if huella(remoto) != remoto['huella']:
+                raise ValueError(f"Los datos del partido {nombre} están dañados")
+            local = locales.get(clave)
+            if local is None:
+                # Aquí aún no existe: no hay nada local que conservar
+                a_aplicar.append({**remoto, "version": None})
+                nuevas_bases[clave] = remoto['huella']
+                continue
+
+            actual, base = huella(local), bases.get(clave)
+            if base is None and remoto['base'] is None:
+                cambio_local = _cambiado(ultimos.get(local['id']), diario_desde, separacion)
+                cambio_remoto = _cambiado(remoto['ultimo_cambio'], conjunto['diario_desde'], separacion)
+                if not (cambio_local or cambio_remoto):
+                    # Distintos sin que ninguno los haya cambiado: no se sabe cuál vale
+                    cambio_local = cambio_remoto = True
+            else:
+                cambio_local = actual not in (base, remoto['base'])
+                cambio_remoto = remoto['huella'] != base
+
+            if actual == remoto['huella']:
+                informe['iguales'] += 1
+            elif not cambio_local:
+                # Aquí no ha cambiado desde el estado común: se queda el cambio remoto
+                a_aplicar.append({**remoto, "version": local['version']})
+            elif not cambio_remoto:
+                # El remoto no ha cambiado desde el estado común: se queda el local
+                informe['conservados'] += 1
+                continue
+            elif preferir == "remoto":
+                a_aplicar.append({**remoto, "version": local['version']})
+            elif preferir == "local":
+                informe['conservados'] += 1
+            else:
+                informe['conflictos'].append({"partido": nombre, "local": _resumen(local), "remoto": _resumen(remoto)})
+                continue
+            nuevas_bases[clave] = remoto['huella']
+
+        par = {
+            "id": origen['id'],
+            "nombre": origen['nombre'],
+            "recibido_hasta": conjunto['hasta'],
+            "confirmado": conjunto['confirmado'],
+        }
+        if a_aplicar:
+            # Si la fusión no era la esperada, se puede volver atrás restaurando esta copia
+            get_backup_service().crear_copia("antes-de-sincronizar")
+        event_bus = get_event_bus()
+        aplicados = []
+        with get_rating_service().en_lote():
+            for aplicado in SyncModel.aplicar(par, a_aplicar, nuevas_bases):
+                nombre = f"{aplicado['eliminatoria']} {aplicado['slot']}"
+                if aplicado['id'] is None:
+                    informe['omitidos'].append({"partido": nombre, "motivo": aplicado['motivo']})
+                    continue
+                informe['aplicados'].append(nombre)
+                aplicados.append(aplicado)
+                event_bus.emit_callup_changed(aplicado['id'])
+                event_bus.emit_result_saved(aplicado['id'])
+        self._propagar_ganadores(aplicados)
+
+        print(f"[SINCRONIZACION] Desde {origen['nombre']}: {len(informe['aplicados'])} aplicados, "
+              f"{informe['iguales']} iguales, {informe['conservados']} conservados, "
+              f"{len(informe['conflictos'])} conflictos, {len(informe['omitidos'])} omitidos")
+        return informe
+
+    @staticmethod
+    def _propagar_ganadores(aplicados: list[dict]) -> None:
+        """
+        Avanza a la ronda siguiente los ganadores de los partidos aplicados.
+
+        Se recorren ronda a ronda, para que un ganador que cambia arrastre a
+        los partidos que dependen de él.
+
+        Args:
+            aplicados: Partidos aplicados (eliminatoria, slot e id)
+        """
+        rondas = TournamentService.RONDAS[:-1]
+        for aplicado in sorted(
+            (a for a in aplicados if a['eliminatoria'] in rondas),
+            key=lambda a: (rondas.index(a['eliminatoria']), a['slot'])
+        ):
+            TournamentService.propagate_winner(aplicado['id'])
+
+    @staticmethod
+    def guardar(conjunto: dict, ruta: Path) -> int:
+        """
+        Escribe un conjunto de cambios en un archivo (comprimido si termina en .gz).
+
+        Args:
+            conjunto: Conjunto de cambios
+            ruta: Archivo de destino
+
+        Returns:
+            Bytes escritos
+        """
+        datos = json.dumps(conjunto, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if ruta.suffix == ".gz":
+            datos = gzip.compress(datos)
+        ruta.write_bytes(datos)
+        return len(datos)
+
+    @staticmethod
+    def leer(ruta: Path) -> dict:
+        """
+        Lee un conjunto de cambios de un archivo.
+
+        Args:
+            ruta: Archivo creado con guardar
+
+        Returns:
+            Conjunto de cambios
+
+        Raises:
+            ValueError: Si el archivo no es un conjunto de cambios válido
+            OSError: Si no se puede leer el archivo
+        """
+        datos = ruta.read_bytes()
+        try:
+            if datos[:2] == b"\x1f\x8b":
+                datos = gzip.decompress(datos)
+            return json.loads(datos.decode("utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"{ruta} no es un conjunto de cambios válido: {e}")
+
+
+# Instancia global del servicio
+_sync_service: Optional[SyncService] = None
+
+
+def get_sync_service() -> SyncService:
+    """
+    Obtiene la instancia única del servicio de sincronización.
+
+    Returns:
+        Instancia global de SyncService
+    """
+    global _sync_service
+    if _sync_service is None:
+        _sync_service = SyncService()
+    return _sync_service
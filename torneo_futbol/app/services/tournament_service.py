@@ -5,7 +5,11 @@ import random
 from typing import Optional, Dict, Any
 from app.models.match_model import MatchModel
 from app.models.match_stats_model import MatchStatsModel
-from app.services.event_bus import get_event_bus
+from app.services.match_service import MatchService
+from app.core.event_bus import get_event_bus
+from app.services.undo_service import deshacible
+from app.services.backup_service import get_backup_service
+from app.services.rating_service import get_rating_service
 from app.constants import (
     FASE_OCTAVOS, FASE_CUARTOS, FASE_SEMIFINAL, FASE_FINAL,
     FASES_CONFIG, FASES_ORDEN
@@ -25,8 +29,25 @@ class TournamentService:
         FASE_SEMIFINAL: 2,
         FASE_FINAL: 1
     }
+    
+    # Cabezas de serie de cada slot de octavos (1 = mejor rating).
+    # Sigue los cruces de _calcular_siguiente_partido: 1 y 2 solo pueden
+    # encontrarse en la final, 3 y 4 en semifinales contra 2 y 1, etc.
+    SEMILLAS_OCTAVOS = {
+        1: (1, 16), 3: (8, 9), 5: (4, 13), 7: (5, 12),
+        2: (2, 15), 4: (7, 10), 6: (3, 14), 8: (6, 11),
+    }
+    
+    # Lo mismo cuando el cuadro empieza en cuartos o en semifinales (los
+    # clasificados de una fase de grupos pueden entrar en esas rondas)
+    SEMILLAS_RONDA = {
+        FASE_OCTAVOS: SEMILLAS_OCTAVOS,
+        FASE_CUARTOS: {1: (1, 8), 2: (4, 5), 3: (2, 7), 4: (3, 6)},
+        FASE_SEMIFINAL: {1: (1, 4), 2: (2, 3)},
+    }
 
     @staticmethod
+    @deshacible("Generar octavos")
     def generar_octavos_desde_emparejamientos(emparejamientos: list[dict]) -> None:
         """
         Genera los partidos de octavos desde una lista de emparejamientos.
@@ -81,22 +102,78 @@ class TournamentService:
         return emparejamientos
 
     @staticmethod
+    def sembrar_octavos(equipos: list[int]) -> list[dict]:
+        """
+        Genera emparejamientos de octavos por cabezas de serie según el rating.
+        
+        El mejor equipo se enfrenta al peor, y los favoritos quedan en
+        lados opuestos del cuadro. Los empates de rating (p. ej. equipos
+        sin partidos) se resuelven al azar.
+        
+        Args:
+            equipos: Lista de 16 IDs de equipos
+            
+        Returns:
+            Lista de 8 emparejamientos [{local_id, visitante_id}, ...] en orden de slot
+        """
+        if len(equipos) != 16:
+            raise ValueError("Se requieren exactamente 16 equipos para octavos")
+        
+        from app.services.rating_service import get_rating_service, RATING_INICIAL
+        ratings = get_rating_service().obtener_ratings()
+        
+        # Semilla 1 = mayor rating
+        desempate = {equipo_id: random.random() for equipo_id in equipos}
+        ordenados = sorted(
+            equipos,
+            key=lambda e: (ratings.get(e, RATING_INICIAL), desempate[e]),
+            reverse=True
+        )
+        
+        emparejamientos = []
+        for slot in range(1, 9):
+            semilla_local, semilla_visitante = TournamentService.SEMILLAS_OCTAVOS[slot]
+            emparejamientos.append({
+                'local_id': ordenados[semilla_local - 1],
+                'visitante_id': ordenados[semilla_visitante - 1]
+            })
+        
+        return emparejamientos
+
+    @staticmethod
+    @deshacible("Borrar cuadro")
     def resetear_cuadro() -> None:
-        """Elimina todos los partidos del torneo."""
+        """
+        Elimina todos los partidos del torneo.
+        
+        Antes guarda una copia de seguridad de la base de datos.
+        
+        Raises:
+            DbError: Si no se puede crear la copia (no se borra nada)
+        """
+        get_backup_service().crear_copia("borrar-cuadro")
         MatchModel.borrar_todos_los_partidos()
     
     @staticmethod
+    @deshacible("Reiniciar torneo")
     def reiniciar_torneo() -> None:
         """
         Reinicia completamente el torneo eliminando todos los partidos, 
         resultados, convocatorias y estadísticas.
+        
+        Antes guarda una copia de seguridad de la base de datos.
+        
+        Raises:
+            DbError: Si no se puede crear la copia (no se borra nada)
         """
+        get_backup_service().crear_copia("reiniciar")
+        
         # Usar el método existente que hace exactamente lo mismo
         MatchModel.borrar_todos_los_partidos()
         
-        # Emitir evento para actualizar vistas
+        # Emitir evento para actualizar vistas (match_id 0 = todos los partidos)
         event_bus = get_event_bus()
-        event_bus.emit_bracket_updated()
+        event_bus.emit_match_deleted(0)
 
     @staticmethod
     def avanzar_ronda(partido: dict) -> None:
@@ -436,6 +513,7 @@ class TournamentService:
         return TournamentService.verificar_ronda_completa(eliminatoria)
 
     @staticmethod
+    @deshacible("Editar partido")
     def create_or_update_match(match_data: Dict[str, Any]) -> int:
         """
         Crea o actualiza un partido y emite eventos correspondientes.
@@ -473,6 +551,7 @@ class TournamentService:
             return match_id
 
     @staticmethod
+    @deshacible("Guardar resultado")
     def save_match_result(match_id: int, result_data: Dict[str, Any]) -> bool:
         """
         Guarda el resultado de un partido y propaga el ganador automáticamente.
@@ -539,6 +618,94 @@ class TournamentService:
         
         return True
 
+    @staticmethod
+    def validar_resultado(resultado: dict) -> None:
+        """
+        Comprueba que se puede guardar un resultado, como al guardarlo desde el partido.
+        
+        El partido debe tener los dos equipos, árbitro y al menos un convocado
+        por equipo, y un empate en una eliminatoria necesita un ganador en los
+        penaltis.
+        
+        Args:
+            resultado: Diccionario con partido_id, goles_local, goles_visitante
+                y, opcionalmente, penaltis_local y penaltis_visitante
+        
+        Raises:
+            ValueError: Si no se puede guardar (el mensaje dice por qué)
+        """
+        partido = MatchService.load_match(resultado['partido_id'])
+        if partido is None:
+            raise ValueError(f"Partido con ID {resultado['partido_id']} no encontrado")
+        es_valido, mensaje = MatchService.validate_for_result_save(partido)
+        if not es_valido:
+            raise ValueError(f"Partido {partido.id}: {mensaje.splitlines()[0]}")
+        if (partido.eliminatoria in TournamentService.RONDAS
+                and resultado['goles_local'] == resultado['goles_visitante']):
+            penaltis_local = resultado.get('penaltis_local')
+            penaltis_visitante = resultado.get('penaltis_visitante')
+            if penaltis_local is None or penaltis_visitante is None or penaltis_local == penaltis_visitante:
+                raise ValueError(f"Partido {partido.id}: un empate en eliminatoria necesita un ganador en los penaltis")
+
+    @staticmethod
+    @deshacible("Guardar resultados")
+    def guardar_resultados(resultados: list[dict]) -> list[dict]:
+        """
+        Guarda un lote de resultados en una única transacción y propaga los ganadores.
+        
+        Antes comprueba cada resultado con validar_resultado. Después de
+        confirmar el lote emite result_saved por cada partido (los servicios
+        con estado se actualizan de forma incremental) y avanza los ganadores
+        de las eliminatorias.
+        
+        Args:
+            resultados: Lista de diccionarios con partido_id, goles_local,
+                goles_visitante y, opcionalmente, penaltis_local y penaltis_visitante
+        
+        Returns:
+            Lista como la de MatchModel.guardar_resultados
+        
+        Raises:
+            ValueError: Si algún partido no existe o no está listo para guardar
+                su resultado (no se guarda ninguno)
+            DbError: Si hay error en la base de datos
+        """
+        event_bus = get_event_bus()
+        
+        for resultado in resultados:
+            TournamentService.validar_resultado(resultado)
+        guardados = MatchModel.guardar_resultados(resultados)
+        
+        with get_rating_service().en_lote():
+            for guardado in guardados:
+                event_bus.emit_result_saved(guardado['partido_id'])
+        for guardado in guardados:
+            if guardado['ganador_equipo_id'] and guardado['eliminatoria'] in TournamentService.RONDAS:
+                TournamentService.propagate_winner(guardado['partido_id'])
+        
+        return guardados
+
+    @staticmethod
+    @deshacible("Propagar ganadores")
+    def propagar_ganadores() -> int:
+        """
+        Propaga a la siguiente ronda todos los ganadores del cuadro, ronda a ronda.
+        
+        Sirve para reparar el cuadro cuando hay resultados guardados cuyo
+        ganador no llegó a avanzar. Volver a propagar un ganador ya avanzado
+        no cambia nada.
+        
+        Returns:
+            Número de ganadores propagados
+        """
+        propagados = 0
+        for ronda in TournamentService.RONDAS[:-1]:
+            for partido in TournamentService.obtener_partidos_por_ronda(ronda):
+                if partido.get('ganador_equipo_id'):
+                    TournamentService.propagate_winner(partido['id'])
+                    propagados += 1
+        return propagados
+
     @staticmethod
     def propagate_winner(match_id: int) -> Optional[int]:
         """
@@ -668,18 +835,46 @@ class TournamentService:
         return len(partidos_octavos) > 0
 
     @staticmethod
-    def randomize_and_create_octavos(equipos_ids: list[int]) -> None:
+    def obtener_partidos_cuadro() -> list[dict]:
+        """
+        Obtiene todos los partidos de eliminatoria, de octavos a la final.
+        
+        Returns:
+            Partidos del cuadro (sin los de la fase de grupos)
+        """
+        return [
+            partido
+            for ronda in TournamentService.RONDAS
+            for partido in MatchModel.listar_partidos(eliminatoria=ronda)
+        ]
+
+    @staticmethod
+    def partidos_tras_octavos() -> list[dict]:
+        """
+        Obtiene los partidos de las rondas posteriores a octavos.
+        
+        Returns:
+            Partidos de cuartos, semifinales y final
+        """
+        return [
+            partido
+            for ronda in TournamentService.RONDAS[1:]
+            for partido in MatchModel.listar_partidos(eliminatoria=ronda)
+        ]
+
+    @staticmethod
+    def randomize_and_create_octavos(equipos_ids: list[int], sembrado: bool = False) -> None:
         """
         Genera emparejamientos aleatorios de octavos Y los persiste en BD con fechas automáticas.
         
         Args:
             equipos_ids: Lista de 16 IDs de equipos
+            sembrado: Si True, empareja por cabezas de serie según el rating
+                (sembrar_octavos) en lugar de al azar
             
         Raises:
             ValueError: Si no hay exactamente 16 equipos o si ya existen octavos
         """
-        from datetime import datetime, timedelta
-        
         print("\n" + "="*60)
         print("[TOURNAMENT SERVICE] randomize_and_create_octavos INICIADO")
         print("="*60)
@@ -689,23 +884,75 @@ class TournamentService:
         if len(equipos_ids) != 16:
             raise ValueError("Se requieren exactamente 16 equipos para octavos")
         
-        # Eliminar octavos existentes si los hay (para evitar constraint UNIQUE)
-        print("[DEBUG] Verificando si ya existen octavos...")
-        if TournamentService.octavos_already_exist():
-            print("[DEBUG] ⚠️ Ya existen octavos en BD, eliminándolos...")
-            partidos_octavos = MatchModel.listar_partidos(eliminatoria=FASE_OCTAVOS)
-            for partido in partidos_octavos:
-                MatchModel.eliminar_partido(partido['id'])
-                print(f"[DEBUG]   ✅ Eliminado partido ID {partido['id']}")
-            print("[DEBUG] ✅ Octavos previos eliminados")
-        else:
-            print("[DEBUG] ✅ No existen octavos previos")
-        
         # Generar emparejamientos aleatorios
-        print("[DEBUG] Generando emparejamientos aleatorios...")
-        emparejamientos = TournamentService.randomizar_octavos(equipos_ids)
+        print(f"[DEBUG] Generando emparejamientos {'por ranking' if sembrado else 'aleatorios'}...")
+        if sembrado:
+            emparejamientos = TournamentService.sembrar_octavos(equipos_ids)
+        else:
+            emparejamientos = TournamentService.randomizar_octavos(equipos_ids)
         print(f"[DEBUG] ✅ {len(emparejamientos)} emparejamientos generados")
         
+        TournamentService.crear_octavos(emparejamientos)
+        
+        print("\n" + "="*60)
+        print("[TOURNAMENT SERVICE] randomize_and_create_octavos COMPLETADO")
+        print("="*60 + "\n")
+
+    @staticmethod
+    @deshacible("Generar octavos")
+    def crear_octavos(emparejamientos: list[dict]) -> None:
+        """
+        Persiste los 8 partidos de octavos con fechas automáticas.
+        
+        Es el paso común de todas las formas de generar el cuadro (sorteo,
+        cabezas de serie o clasificados de la fase de grupos).
+        
+        Args:
+            emparejamientos: Lista de 8 diccionarios con 'local_id' y 'visitante_id' en orden de slot
+            
+        Raises:
+            ValueError: Si no hay exactamente 8 emparejamientos
+        """
+        TournamentService.crear_primera_ronda(FASE_OCTAVOS, emparejamientos)
+
+    @staticmethod
+    @deshacible("Generar cuadro")
+    def crear_primera_ronda(ronda: str, emparejamientos: list[dict]) -> None:
+        """
+        Persiste los partidos de la ronda en la que empieza el cuadro, con fechas automáticas.
+        
+        El cuadro empieza en octavos salvo cuando los clasificados de la fase
+        de grupos entran en cuartos o en semifinales. Los partidos de
+        eliminatoria existentes se eliminan antes de crear los nuevos: los de
+        las rondas siguientes tenían los equipos del cuadro anterior.
+        
+        Args:
+            ronda: Ronda inicial (octavos, cuartos o semifinal)
+            emparejamientos: Un diccionario con 'local_id' y 'visitante_id'
+                por partido de la ronda, en orden de slot
+            
+        Raises:
+            ValueError: Si la ronda no es válida o el número de emparejamientos
+                no es el de sus partidos
+        """
+        from datetime import datetime, timedelta
+        
+        if ronda not in TournamentService.SEMILLAS_RONDA:
+            raise ValueError(f"El cuadro no puede empezar en la ronda {ronda}")
+        num_partidos = TournamentService.PARTIDOS_POR_RONDA[ronda]
+        if len(emparejamientos) != num_partidos:
+            raise ValueError(f"Se requieren exactamente {num_partidos} emparejamientos para {ronda}")
+        
+        # Eliminar el cuadro existente si lo hay (para evitar constraint UNIQUE)
+        existentes = TournamentService.obtener_partidos_cuadro()
+        if existentes:
+            print(f"[DEBUG] ⚠️ Ya hay {len(existentes)} partidos de eliminatoria en BD, eliminándolos...")
+            for partido in existentes:
+                MatchModel.eliminar_partido(partido['id'])
+                print(f"[DEBUG]   ✅ Eliminado partido ID {partido['id']} ({partido['eliminatoria']})")
+        else:
+            print("[DEBUG] ✅ No existe un cuadro previo")
+        
         # Fecha base: hoy + 1 día a las 16:00
         fecha_base = datetime.now() + timedelta(days=1)
         fecha_base = fecha_base.replace(hour=16, minute=0, second=0, microsecond=0)
@@ -714,7 +961,7 @@ class TournamentService:
         # Horarios disponibles por día (2 partidos por día)
         horarios = ["16:00", "18:00"]
         
-        # Crear los 8 partidos de octavos con fechas automáticas
+        # Crear los partidos de la ronda con fechas automáticas
         partidos_creados = []
         print("\n[DEBUG] Creando partidos en BD...")
         for i, emparejamiento in enumerate(emparejamientos):
@@ -728,7 +975,7 @@ class TournamentService:
             # Formato: "YYYY-MM-DD HH:MM:SS"
             fecha_hora_str = fecha_partido.strftime(f"%Y-%m-%d {hora_partido}:00")
             
-            print(f"\n  Partido {i+1}/8:")
+            print(f"\n  Partido {i+1}/{num_partidos}:")
             print(f"    Local ID: {emparejamiento['local_id']}")
             print(f"    Visitante ID: {emparejamiento['visitante_id']}")
             print(f"    Fecha/Hora: {fecha_hora_str}")
@@ -736,7 +983,7 @@ class TournamentService:
             
             # Crear partido en BD
             match_id = MatchModel.crear_partido(
-                eliminatoria=FASE_OCTAVOS,
+                eliminatoria=ronda,
                 slot=i + 1,
                 local_id=emparejamiento['local_id'],
                 visitante_id=emparejamiento['visitante_id'],
@@ -751,13 +998,13 @@ class TournamentService:
         
         # Verificar que se crearon en BD
         print("\n[DEBUG] Verificando en BD...")
-        partidos_en_bd = MatchModel.listar_partidos(eliminatoria=FASE_OCTAVOS)
-        print(f"[DEBUG] Partidos 'Octavos' encontrados en BD: {len(partidos_en_bd)}")
+        partidos_en_bd = MatchModel.listar_partidos(eliminatoria=ronda)
+        print(f"[DEBUG] Partidos '{ronda}' encontrados en BD: {len(partidos_en_bd)}")
         
-        if len(partidos_en_bd) != 8:
-            print(f"[ERROR] ❌ Se esperaban 8 partidos pero hay {len(partidos_en_bd)}")
+        if len(partidos_en_bd) != num_partidos:
+            print(f"[ERROR] ❌ Se esperaban {num_partidos} partidos pero hay {len(partidos_en_bd)}")
         else:
-            print("[DEBUG] ✅ Verificación exitosa: 8 partidos en BD")
+            print(f"[DEBUG] ✅ Verificación exitosa: {num_partidos} partidos en BD")
         
         # Emitir eventos para refrescar UI
         print("\n[DEBUG] Emitiendo eventos...")
@@ -766,9 +1013,3 @@ class TournamentService:
         print("[DEBUG] ✅ Evento bracket_updated emitido")
         event_bus.match_changed.emit(0)  # 0 = cambio general, no específico
         print("[DEBUG] ✅ Evento match_changed emitido")
-        
-        print("\n" + "="*60)
-        print("[TOURNAMENT SERVICE] randomize_and_create_octavos COMPLETADO")
-        print("="*60 + "\n")
-
-
@@ -0,0 +1,342 @@
+"""
+Perfilado de la interfaz: tiempo de los slots y bloqueos del bucle de eventos.
+
+Los métodos de controladores y vistas se envuelven a nivel de clase con
+``instrumentar_clase`` (antes de conectar sus señales). Cuando el modo
+diagnóstico está activo, cada invocación se mide y se anota con la señal que
+la disparó. Un temporizador de vigilancia (watchdog) detecta los intervalos en
+los que el bucle de eventos estuvo bloqueado por encima de un umbral y los
+atribuye al slot que se estaba ejecutando.
+
+Los resultados se consultan en vivo desde la página de Herramientas y se
+exportan en formato Chrome Trace (``chrome://tracing`` / Perfetto).
+"""
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, QMetaMethod, QTimer
+
+from app.config import UI_PROFILE_ENABLED
+from app.models.sql_trace import sql_tracer, percentil
+
+
+# Intervalo del temporizador de vigilancia (ms)
+INTERVALO_WATCHDOG_MS = 50
+
+# Retraso a partir del cual se considera que el bucle de eventos se bloqueó (ms)
+UMBRAL_BLOQUEO_MS = 100
+
+# Número máximo de eventos conservados para la exportación
+MAX_EVENTOS = 5000
+
+# Métodos medidos además de los que empiezan por "_on_"
+METODOS_INSTRUMENTADOS = (
+    "cargar_tabla", "cargar_cuadro", "cargar_equipos", "cargar_arbitros",
+    "cargar_jugadores_disponibles", "cargar_convocados", "cargar_stats",
+    "cargar_filtros", "rellenar_detalle",
+)
+
+
+class UIProfiler(QObject):
+    """Recoge tiempos de slots y bloqueos del bucle de eventos."""
+
+    def __init__(self):
+        """Inicializa el perfilador (desactivado)."""
+        super().__init__()
+        self.activo: bool = False
+        self.umbral_bloqueo_ms: float = UMBRAL_BLOQUEO_MS
+        self._lock = threading.Lock()
+        self._eventos: deque = deque(maxlen=MAX_EVENTOS)
+        self._bloqueos: deque = deque(maxlen=MAX_EVENTOS)
+        self._agregados: dict[str, dict] = {}
+        self._pila: list[tuple[str, float]] = []
+        self._ultima_senal: Optional[tuple[str, float]] = None
+        self._origen = time.perf_counter()
+
+        self._watchdog = QTimer(self)
+        self._watchdog.setInterval(INTERVALO_WATCHDOG_MS)
+        self._watchdog.timeout.connect(self._on_watchdog)
+        self._ultimo_tick: Optional[float] = None
+
+    # ==================== ACTIVACIÓN ====================
+
+    def activar(self) -> None:
+        """Activa la medición de slots y el watchdog."""
+        if self.activo:
+            return
+        self.activo = True
+        self._ultimo_tick = time.perf_counter()
+        self._watchdog.start()
+        print(f"[DIAGNÓSTICO] Perfilado de interfaz activado (umbral {self.umbral_bloqueo_ms:.0f} ms)")
+
+    def desactivar(self) -> None:
+        """Detiene la medición (conserva los datos recogidos)."""
+        if not self.activo:
+            return
+        self.activo = False
+        self._watchdog.stop()
+        self._ultimo_tick = None
+        print("[DIAGNÓSTICO] Perfilado de interfaz desactivado")
+
+    def reiniciar(self) -> None:
+        """Descarta todos los datos recogidos."""
+        with self._lock:
+            self._eventos.clear()
+            self._bloqueos.clear()
+            self._agregados.clear()
+
+    # ==================== INSTRUMENTACIÓN ====================
+
+    def instrumentar_clase(self, cls: type, nombres: Optional[tuple] = None) -> None:
+        """
+        Envuelve los slots de una clase para medirlos.
+
+        Debe llamarse antes de crear las instancias que conectan sus señales,
+        ya que Qt guarda el método ligado en el momento de ``connect``.
+
+        Args:
+            cls: Clase a instrumentar
+            nombres: Métodos a envolver; por defecto los que empiezan por "_on_"
+                y los de METODOS_INSTRUMENTADOS definidos en la clase
+        """
+        for nombre, funcion in list(vars(cls).items()):
+            if not inspect.isfunction(funcion) or getattr(funcion, "_perfilado", False):
+                continue
+            if nombres is not None:
+                if nombre not in nombres:
+                    continue
+            elif not (nombre.startswith("_on_") or nombre in METODOS_INSTRUMENTADOS):
+                continue
+            setattr(cls, nombre, self._envolver(funcion, f"{cls.__name__}.{nombre}"))
+
+    def marcar_senales(self, emisor: QObject, prefijo: Optional[str] = None) -> None:
+        """
+        Conecta un marcador a todas las señales de un objeto.
+
+        El marcador se ejecuta antes que los slots conectados después, lo que
+        permite saber qué señal disparó cada slot medido.
+
+        Args:
+            emisor: Objeto Qt cuyas señales se marcan
+            prefijo: Prefijo para el nombre de la señal (por defecto, la clase)
+        """
+        prefijo = prefijo or type(emisor).__name__
+        meta = emisor.metaObject()
+        vistas = set()
+        for i in range(meta.methodOffset(), meta.methodCount()):
+            metodo = meta.method(i)
+            if metodo.methodType() != QMetaMethod.MethodType.Signal:
+                continue
+            nombre = metodo.name().data().decode()
+            if nombre in vistas:
+                continue
+            vistas.add(nombre)
+            senal = getattr(emisor, nombre, None)
+            if senal is None:
+                continue
+            etiqueta = f"{prefijo}.{nombre}"
+            senal.connect(lambda *args, _e=etiqueta: self._marcar(_e))
+
+    def _marcar(self, etiqueta: str) -> None:
+        if self.activo:
+            self._ultima_senal = (etiqueta, time.perf_counter())
+
+    def _envolver(self, funcion, nombre: str):
+        codigo = funcion.__code__
+        acepta_varargs = bool(codigo.co_flags & inspect.CO_VARARGS)
+        max_posicionales = codigo.co_argcount
+        perfilador = self
+
+        @functools.wraps(funcion)
+        def envoltorio(*args, **kwargs):
+            # PySide pasa todos los argumentos de la señal a un callable *args:
+            # se recortan a los que acepta el método original.
+            if not acepta_varargs and len(args) > max_posicionales:
+                args = args[:max_posicionales]
+            if not perfilador.activo:
+                return funcion(*args, **kwargs)
+            return perfilador._medir(funcion, nombre, args, kwargs)
+
+        envoltorio._perfilado = True
+        return envoltorio
+
+    def _medir(self, funcion, nombre: str, args, kwargs):
+        senal = self._ultima_senal[0] if self._ultima_senal else "directa"
+        if self._pila:
+            padre, inicio_padre = self._pila[-1]
+            # Una señal marcada durante el slot padre es la causa directa;
+            # si no, se trata de una llamada normal desde el padre.
+            if self._ultima_senal and self._ultima_senal[1] >= inicio_padre:
+                senal = f"{senal} (desde {padre})"
+            else:
+                senal = f"llamada desde {padre}"
+        inicio = time.perf_counter()
+        self._pila.append((nombre, inicio))
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            fin = time.perf_counter()
+            self._pila.pop()
+            self._registrar_slot(nombre, senal, inicio, fin, len(self._pila))
+
+    def _registrar_slot(self, nombre: str, senal: str, inicio: float, fin: float, nivel: int) -> None:
+        duracion_ms = (fin - inicio) * 1000.0
+        with self._lock:
+            self._eventos.append({
+                "nombre": nombre,
+                "senal": senal,
+                "inicio": inicio,
+                "fin": fin,
+                "duracion_ms": duracion_ms,
+                "nivel": nivel,
+            })
+            agregado = self._agregados.setdefault(nombre, {
+                "nombre": nombre,
+                "llamadas": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "senales": {},
+                "muestras": deque(maxlen=1000),
+            })
+            agregado["llamadas"] += 1
+            agregado["total_ms"] += duracion_ms
+            agregado["max_ms"] = max(agregado["max_ms"], duracion_ms)
+            agregado["senales"][senal] = agregado["senales"].get(senal, 0) + 1
+            agregado["muestras"].append(duracion_ms)
+
+    # ==================== WATCHDOG ====================
+
+    def _on_watchdog(self):
+        ahora = time.perf_counter()
+        if self._ultimo_tick is not None:
+            retraso_ms = (ahora - self._ultimo_tick) * 1000.0 - INTERVALO_WATCHDOG_MS
+            if retraso_ms >= self.umbral_bloqueo_ms:
+                self._registrar_bloqueo(self._ultimo_tick, ahora, retraso_ms)
+        self._ultimo_tick = ahora
+
+    def _registrar_bloqueo(self, desde: float, hasta: float, retraso_ms: float) -> None:
+        with self._lock:
+            # Slot de nivel superior más largo que se solapa con el intervalo
+            culpable = None
+            for evento in reversed(self._eventos):
+                if evento["fin"] < desde:
+                    break
+                if evento["nivel"] == 0 and evento["inicio"] <= hasta:
+                    if culpable is None or evento["duracion_ms"] > culpable["duracion_ms"]:
+                        culpable = evento
+            self._bloqueos.append({
+                "inicio": desde,
+                "fin": hasta,
+                "retraso_ms": retraso_ms,
+                "slot": culpable["nombre"] if culpable else None,
+                "senal": culpable["senal"] if culpable else None,
+            })
+        descripcion = f"{culpable['nombre']} ({culpable['senal']})" if culpable else "sin slot medido"
+        print(f"[DIAGNÓSTICO] Bucle de eventos bloqueado {retraso_ms:.0f} ms: {descripcion}")
+
+    # ==================== CONSULTA Y EXPORTACIÓN ====================
+
+    def obtener_estadisticas(self) -> list[dict]:
+        """
+        Calcula las estadísticas por slot.
+
+        Returns:
+            Lista ordenada por tiempo total con llamadas, total_ms, media_ms,
+            p95_ms, max_ms y la señal que más veces lo disparó
+        """
+        with self._lock:
+            agregados = [
+                (dict(a), dict(a["senales"]), sorted(a["muestras"]))
+                for a in self._agregados.values()
+            ]
+        estadisticas = []
+        for agregado, senales, muestras in agregados:
+            estadisticas.append({
+                "nombre": agregado["nombre"],
+                "llamadas": agregado["llamadas"],
+                "total_ms": agregado["total_ms"],
+                "media_ms": agregado["total_ms"] / agregado["llamadas"],
+                "p95_ms": percentil(muestras, 95),
+                "max_ms": agregado["max_ms"],
+                "senal_principal": max(senales, key=senales.get) if senales else "",
+            })
+        estadisticas.sort(key=lambda e: e["total_ms"], reverse=True)
+        return estadisticas
+
+    def obtener_bloqueos(self) -> list[dict]:
+        """Devuelve los bloqueos detectados, del más antiguo al más reciente."""
+        with self._lock:
+            return [dict(b) for b in self._bloqueos]
+
+    def exportar_traza(self, ruta: Path) -> int:
+        """
+        Exporta slots, bloqueos y consultas SQL en formato Chrome Trace.
+
+        Args:
+            ruta: Archivo JSON de destino
+
+        Returns:
+            Número de eventos escritos
+        """
+        def us(t: float) -> float:
+            return (t - self._origen) * 1_000_000.0
+
+        with self._lock:
+            eventos = list(self._eventos)
+            bloqueos = list(self._bloqueos)
+
+        traza = []
+        for e in eventos:
+            traza.append({
+                "name": e["nombre"], "cat": "slot", "ph": "X",
+                "ts": us(e["inicio"]), "dur": e["duracion_ms"] * 1000.0,
+                "pid": 1, "tid": 1, "args": {"senal": e["senal"]},
+            })
+        for b in bloqueos:
+            traza.append({
+                "name": "Bucle bloqueado", "cat": "bloqueo", "ph": "X",
+                "ts": us(b["inicio"]), "dur": (b["fin"] - b["inicio"]) * 1_000_000.0,
+                "pid": 1, "tid": 2, "args": {"slot": b["slot"], "senal": b["senal"]},
+            })
+        for r in sql_tracer.obtener_registros():
+            if r["inicio"] < self._origen:
+                continue
+            traza.append({
+                "name": r["llamador"], "cat": "sql", "ph": "X",
+                "ts": us(r["inicio"]), "dur": r["duracion_ms"] * 1000.0,
+                "pid": 1, "tid": 3,
+                "args": {"sql": r["sql"], "filas": r["filas"], "conexion": r["conexion"]},
+            })
+
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": traza, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        print(f"[DIAGNÓSTICO] Traza exportada: {ruta} ({len(traza)} eventos)")
+        return len(traza)
+
+
+_ui_profiler: Optional[UIProfiler] = None
+
+
+def get_ui_profiler() -> UIProfiler:
+    """
+    Obtiene la instancia única del perfilador de interfaz.
+
+    Se crea bajo demanda porque necesita una QApplication existente.
+
+    Returns:
+        Instancia del UIProfiler
+    """
+    global _ui_profiler
+    if _ui_profiler is None:
+        _ui_profiler = UIProfiler()
+        if UI_PROFILE_ENABLED:
+            _ui_profiler.activar()
+    return _ui_profiler
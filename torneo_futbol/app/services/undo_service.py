@@ -0,0 +1,198 @@
+"""
+Deshacer y rehacer operaciones del torneo a partir del diario de cambios.
+
+Cada operación de usuario (guardar un resultado con su propagación, cambiar
+una convocatoria, regenerar el cuadro, borrar un partido...) se envuelve en
+``operacion()``: se anota el rango de secuencias del diario que escribió,
+incluidos los cambios de los servicios que reaccionan a sus eventos.
+Deshacer revierte ese rango con ``JournalModel.revertir`` en una sola
+transacción; la reversión escribe a su vez un rango nuevo en el diario, que
+es lo que se revierte al rehacer.
+
+Si alguna fila del rango se ha modificado después (por una operación que no
+se puede deshacer o desde otro proceso), no se revierte nada y se avisa.
+Las pilas viven en memoria durante la sesión.
+"""
+import functools
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from app.models.db import DbError
+from app.models.journal_model import JournalModel
+from app.services.change_monitor_service import emitir_eventos
+
+
+# Operaciones que se recuerdan como máximo
+MAX_OPERACIONES = 50
+
+
+@dataclass
+class Operacion:
+    """Operación que se puede deshacer: su descripción y su rango en el diario."""
+    descripcion: str
+    desde: int
+    hasta: int
+
+
+class UndoService:
+    """Pilas de deshacer y rehacer de las operaciones de usuario."""
+
+    def __init__(self):
+        """Inicializa las pilas vacías."""
+        self._deshacer: list[Operacion] = []
+        self._rehacer: list[Operacion] = []
+        self._profundidad = 0
+
+    @contextmanager
+    def operacion(self, descripcion: str):
+        """
+        Anota como una sola operación todo lo que se escribe en el bloque.
+
+        Las operaciones anidadas forman parte de la exterior. Si el bloque
+        falla a medias, lo que llegó a escribirse también se puede deshacer.
+
+        Args:
+            descripcion: Texto que se muestra en el menú (p. ej. "Guardar resultado")
+        """
+        if self._profundidad:
+            self._profundidad += 1
+            try:
+                yield
+            finally:
+                self._profundidad -= 1
+            return
+
+        self._profundidad = 1
+        try:
+            inicio = JournalModel.ultima_secuencia()
+        except DbError as e:
+            print(f"[DESHACER] No se puede anotar '{descripcion}': {e}")
+            inicio = None
+        try:
+            yield
+        finally:
+            self._profundidad = 0
+            if inicio is not None:
+                self._anotar(descripcion, inicio)
+
+    def _anotar(self, descripcion: str, inicio: int) -> None:
+        try:
+            fin = JournalModel.ultima_secuencia()
+        except DbError as e:
+            print(f"[DESHACER] No se puede anotar '{descripcion}': {e}")
+            return
+        if fin <= inicio:
+            return
+        self._deshacer.append(Operacion(descripcion, inicio + 1, fin))
+        del self._deshacer[:-MAX_OPERACIONES]
+        self._rehacer.clear()
+        print(f"[DESHACER] '{descripcion}': cambios {inicio + 1}-{fin}")
+
+    def puede_deshacer(self) -> bool:
+        """Indica si hay alguna operación que deshacer."""
+        return bool(self._deshacer)
+
+    def puede_rehacer(self) -> bool:
+        """Indica si hay alguna operación que rehacer."""
+        return bool(self._rehacer)
+
+    def descripcion_deshacer(self) -> Optional[str]:
+        """Descripción de la operación que se desharía (None si no hay)."""
+        return self._deshacer[-1].descripcion if self._deshacer else None
+
+    def descripcion_rehacer(self) -> Optional[str]:
+        """Descripción de la operación que se reharía (None si no hay)."""
+        return self._rehacer[-1].descripcion if self._rehacer else None
+
+    def deshacer(self) -> str:
+        """
+        Deshace la última operación.
+
+        Returns:
+            Descripción de la operación deshecha
+
+        Raises:
+            ValueError: Si no hay nada que deshacer o no se puede revertir
+                (la operación se descarta de la pila)
+            DbError: Si hay error en la base de datos
+        """
+        return self._revertir(self._deshacer, self._rehacer, "deshacer")
+
+    def rehacer(self) -> str:
+        """
+        Vuelve a aplicar la última operación deshecha.
+
+        Returns:
+            Descripción de la operación rehecha
+
+        Raises:
+            ValueError: Si no hay nada que rehacer o no se puede revertir
+                (la operación se descarta de la pila)
+            DbError: Si hay error en la base de datos
+        """
+        return self._revertir(self._rehacer, self._deshacer, "rehacer")
+
+    def limpiar(self) -> None:
+        """Vacía las dos pilas."""
+        self._deshacer.clear()
+        self._rehacer.clear()
+
+    def _revertir(self, origen: list[Operacion], destino: list[Operacion], accion: str) -> str:
+        if not origen:
+            raise ValueError(f"No hay nada que {accion}")
+        operacion = origen[-1]
+
+        inicio = JournalModel.ultima_secuencia()
+        try:
+            cambios = JournalModel.revertir(operacion.desde, operacion.hasta)
+        except ValueError:
+            # No se podrá revertir nunca: se descarta para no bloquear las demás
+            origen.pop()
+            raise
+        origen.pop()
+
+        # Los servicios reaccionan dentro del rango nuevo, igual que en la operación original
+        self._profundidad = 1
+        try:
+            emitir_eventos(cambios, invertidos=True)
+        finally:
+            self._profundidad = 0
+        fin = JournalModel.ultima_secuencia()
+        destino.append(Operacion(operacion.descripcion, inicio + 1, fin))
+        del destino[:-MAX_OPERACIONES]
+        print(f"[DESHACER] {accion} '{operacion.descripcion}': {len(cambios)} cambios revertidos")
+        return operacion.descripcion
+
+
+def deshacible(descripcion: str):
+    """
+    Decorador que anota cada llamada a la función como una operación que se puede deshacer.
+
+    Args:
+        descripcion: Texto de la operación en el menú
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with get_undo_service().operacion(descripcion):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+# Instancia global del servicio
+_undo_service: Optional[UndoService] = None
+
+
+def get_undo_service() -> UndoService:
+    """
+    Obtiene la instancia única del servicio de deshacer.
+
+    Returns:
+        Instancia global de UndoService
+    """
+    global _undo_service
+    if _undo_service is None:
+        _undo_service = UndoService()
+    return _undo_service
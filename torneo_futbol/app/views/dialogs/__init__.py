@@ -1,6 +1,28 @@
-"""Módulo de diálogos de la aplicación."""
-from .dialog_goles_detalle import DialogGolesDetalle
-from .dialog_partidos_dia import DialogPartidosDia
-from .dialog_jugadores_equipo import DialogJugadoresEquipo
+"""Módulo de diálogos de la aplicación.
 
-__all__ = ['DialogGolesDetalle', 'DialogPartidosDia', 'DialogJugadoresEquipo']
+Los diálogos se importan bajo demanda (PEP 562) para que importar uno de
+ellos no cargue el resto durante el arranque.
+"""
+from importlib import import_module
+
+_MODULOS = {
+    'DialogGolesDetalle': '.dialog_goles_detalle',
+    'DialogPartidosDia': '.dialog_partidos_dia',
+    'DialogJugadoresEquipo': '.dialog_jugadores_equipo',
+    'DialogProbabilidades': '.dialog_probabilidades',
+    'DialogGrupos': '.dialog_grupos',
+}
+
+__all__ = ['DialogGolesDetalle', 'DialogPartidosDia', 'DialogJugadoresEquipo', 'DialogProbabilidades', 'DialogGrupos']
+
+
+def __getattr__(nombre):
+    if nombre in _MODULOS:
+        clase = getattr(import_module(_MODULOS[nombre], __name__), nombre)
+        globals()[nombre] = clase
+        return clase
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
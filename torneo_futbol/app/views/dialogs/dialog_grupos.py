@@ -0,0 +1,131 @@
+"""Diálogo con la clasificación de la fase de grupos."""
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
+    QTableWidgetItem, QPushButton, QHeaderView, QScrollArea, QWidget
+)
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QFont
+
+
+# Columnas de la tabla: (cabecera, clave de la fila)
+COLUMNAS = [
+    ("Pos", "posicion"), ("Equipo", "equipo_nombre"), ("PJ", "jugados"),
+    ("G", "ganados"), ("E", "empatados"), ("P", "perdidos"),
+    ("GF", "goles_favor"), ("GC", "goles_contra"), ("DG", "diferencia"), ("Pts", "puntos"),
+]
+
+
+class DialogGrupos(QDialog):
+    """Diálogo que muestra la clasificación de cada grupo y permite pasar al cuadro."""
+
+    pasar_a_octavos_signal = Signal()
+
+    def __init__(self, grupos: list[dict], fase_completa: bool, parent=None):
+        """
+        Inicializa el diálogo.
+
+        Args:
+            grupos: Resultado de GroupService.clasificaciones
+            fase_completa: Si todos los partidos de grupos están jugados
+            parent: Widget padre
+        """
+        super().__init__(parent)
+        self.grupos = grupos
+        self.fase_completa = fase_completa
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura la interfaz del diálogo."""
+        self.setWindowTitle("Fase de grupos")
+        self.setMinimumSize(700, 550)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        titulo = QLabel("Clasificación de la fase de grupos")
+        titulo.setObjectName("dialogTitle")
+        titulo.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(titulo)
+
+        # Una tabla por grupo dentro de un área con scroll
+        contenedor = QWidget()
+        layout_grupos = QVBoxLayout(contenedor)
+        layout_grupos.setSpacing(12)
+        for grupo in self.grupos:
+            layout_grupos.addWidget(self._crear_tabla_grupo(grupo))
+        layout_grupos.addStretch()
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(contenedor)
+        layout.addWidget(scroll, 1)
+
+        jugados = sum(g['jugados'] for g in self.grupos)
+        partidos = sum(g['partidos'] for g in self.grupos)
+        self.label_resumen = QLabel(
+            f"Partidos jugados: {jugados}/{partidos}. En negrita, los equipos que pasan al cuadro."
+        )
+        self.label_resumen.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label_resumen.setWordWrap(True)
+        layout.addWidget(self.label_resumen)
+
+        # Botones
+        layout_botones = QHBoxLayout()
+        self.btn_octavos = QPushButton("Pasar al cuadro")
+        self.btn_octavos.setObjectName("successButton")
+        self.btn_octavos.setEnabled(self.fase_completa)
+        if not self.fase_completa:
+            self.btn_octavos.setToolTip("Disponible cuando se hayan jugado todos los partidos de grupos")
+        self.btn_octavos.clicked.connect(self._on_pasar_a_octavos)
+        btn_cerrar = QPushButton("Cerrar")
+        btn_cerrar.clicked.connect(self.reject)
+        layout_botones.addStretch()
+        layout_botones.addWidget(self.btn_octavos)
+        layout_botones.addWidget(btn_cerrar)
+        layout.addLayout(layout_botones)
+
+    def _crear_tabla_grupo(self, grupo: dict) -> QWidget:
+        """Crea el título y la tabla de clasificación de un grupo."""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        label = QLabel(f"Grupo {grupo['nombre']} ({grupo['jugados']}/{grupo['partidos']} jugados)")
+        label.setObjectName("subtitleLabel")
+        layout.addWidget(label)
+
+        filas = grupo['clasificacion']
+        tabla = QTableWidget(len(filas), len(COLUMNAS))
+        tabla.setHorizontalHeaderLabels([cabecera for cabecera, _ in COLUMNAS])
+        tabla.verticalHeader().setVisible(False)
+        tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        tabla.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+
+        header = tabla.horizontalHeader()
+        for columna in range(len(COLUMNAS)):
+            header.setSectionResizeMode(columna, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+
+        negrita = QFont()
+        negrita.setBold(True)
+        for fila, datos in enumerate(filas):
+            clasificado = datos['posicion'] <= grupo['clasificados']
+            for columna, (_, clave) in enumerate(COLUMNAS):
+                item = QTableWidgetItem(str(datos[clave]))
+                if columna != 1:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if clasificado:
+                    item.setFont(negrita)
+                tabla.setItem(fila, columna, item)
+
+        # Altura justa para todas las filas (el scroll es el del diálogo)
+        alto = tabla.horizontalHeader().height() + 2 * tabla.frameWidth()
+        alto += sum(tabla.rowHeight(fila) for fila in range(tabla.rowCount()))
+        tabla.setFixedHeight(alto)
+        layout.addWidget(tabla)
+        return widget
+
+    def _on_pasar_a_octavos(self):
+        """Emite la petición de crear la primera ronda del cuadro y cierra el diálogo."""
+        self.pasar_a_octavos_signal.emit()
+        self.accept()
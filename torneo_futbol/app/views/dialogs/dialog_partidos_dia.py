@@ -10,7 +10,7 @@ from PySide6.QtGui import QColor
 class DialogPartidosDia(QDialog):
     
     abrir_detalle_signal = Signal(int)
-    partido_programado_signal = Signal()  # Nueva señal para refrescar calendario
+    partido_programado_signal = Signal(int)  # ID del partido programado (refresca el calendario)
     
     def __init__(self, fecha: QDate, partidos: list[dict], partidos_pendientes: list[dict], arbitros: list[dict], parent=None):
         super().__init__(parent)
@@ -211,6 +211,26 @@ class DialogPartidosDia(QDialog):
             nueva_fecha = self.fecha_hora_edit.dateTime().toString("yyyy-MM-dd HH:mm")
             arbitro_id = self.combo_arbitro.currentData()
             
+            if arbitro_id:
+                from app.services.referee_service import get_referee_service
+                
+                partido = MatchModel.obtener_partido_por_id(self.partido_seleccionado_id)
+                conflicto = get_referee_service().validar_asignacion(
+                    arbitro_id,
+                    nueva_fecha,
+                    {partido['local_id'], partido['visitante_id']} - {None},
+                    self.partido_seleccionado_id
+                )
+                if conflicto:
+                    msg = QMessageBox(self)
+                    msg.setObjectName("appMessageBox")
+                    msg.setIcon(QMessageBox.Warning)
+                    msg.setWindowTitle("Árbitro no disponible")
+                    msg.setText(conflicto)
+                    msg.setStyleSheet(self.styleSheet() or QApplication.instance().styleSheet())
+                    msg.exec()
+                    return
+            
             # Actualizar partido
             MatchModel.actualizar_fecha_hora(self.partido_seleccionado_id, nueva_fecha)
             
@@ -226,7 +246,7 @@ class DialogPartidosDia(QDialog):
             msg.exec()
             
             # Emitir señal para refrescar calendario
-            self.partido_programado_signal.emit()
+            self.partido_programado_signal.emit(self.partido_seleccionado_id)
             
             # Cerrar diálogo
             self.accept()
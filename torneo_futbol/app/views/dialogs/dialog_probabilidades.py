@@ -0,0 +1,91 @@
+"""Diálogo con las probabilidades del torneo calculadas por simulación."""
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTableWidget,
+    QTableWidgetItem, QPushButton, QHeaderView
+)
+from PySide6.QtCore import Qt
+
+from app.constants import FASES_CONFIG
+from app.services.simulation_service import CAMPEON
+
+
+class DialogProbabilidades(QDialog):
+    """Diálogo que muestra la probabilidad de cada equipo de alcanzar cada ronda."""
+
+    def __init__(self, resultado: dict, rondas: list[str], parent=None):
+        """
+        Inicializa el diálogo.
+
+        Args:
+            resultado: Resultado de SimulationService.simular
+            rondas: Rondas a mostrar (sin la primera del cuadro, que todos alcanzan)
+            parent: Widget padre
+        """
+        super().__init__(parent)
+        self.resultado = resultado
+        self.columnas = list(rondas) + [CAMPEON]
+        self.setup_ui()
+        self.cargar_probabilidades()
+
+    def setup_ui(self):
+        """Configura la interfaz del diálogo."""
+        self.setWindowTitle("Probabilidades del torneo")
+        self.setMinimumSize(700, 500)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        # Título
+        titulo = QLabel("Probabilidad de alcanzar cada ronda")
+        titulo.setObjectName("dialogTitle")
+        titulo.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(titulo)
+
+        # Tabla de probabilidades
+        self.tabla = QTableWidget()
+        self.tabla.setColumnCount(len(self.columnas) + 1)
+        self.tabla.setHorizontalHeaderLabels(
+            ["Equipo"]
+            + [FASES_CONFIG[r]["label"] for r in self.columnas[:-1]]
+            + ["Campeón"]
+        )
+        self.tabla.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        header = self.tabla.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for columna in range(1, len(self.columnas) + 1):
+            header.setSectionResizeMode(columna, QHeaderView.ResizeMode.ResizeToContents)
+
+        layout.addWidget(self.tabla)
+
+        # Etiqueta de resumen
+        self.label_resumen = QLabel()
+        self.label_resumen.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label_resumen.setWordWrap(True)
+        layout.addWidget(self.label_resumen)
+
+        # Botón cerrar
+        btn_cerrar = QPushButton("Cerrar")
+        btn_cerrar.clicked.connect(self.accept)
+        layout.addWidget(btn_cerrar)
+
+    def cargar_probabilidades(self):
+        """Carga las probabilidades en la tabla."""
+        equipos = self.resultado["equipos"]
+        self.tabla.setRowCount(len(equipos))
+
+        for fila, equipo in enumerate(equipos):
+            self.tabla.setItem(fila, 0, QTableWidgetItem(equipo["nombre"]))
+            for columna, clave in enumerate(self.columnas, start=1):
+                probabilidad = equipo["probabilidades"].get(clave, 0.0)
+                item = QTableWidgetItem(f"{probabilidad * 100:.1f} %")
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.tabla.setItem(fila, columna, item)
+
+        self.label_resumen.setText(
+            f"{self.resultado['simulaciones']:,} simulaciones del cuadro actual "
+            f"({self.resultado['duracion_s']:.2f} s). Los partidos jugados conservan "
+            "su resultado; los pendientes se deciden según los goles a favor y en "
+            "contra de cada equipo."
+        )
@@ -1,10 +1,11 @@
 """Ventana principal de la aplicación."""
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QStackedWidget,
-    QMenuBar, QMenu, QApplication
+    QMenuBar, QMenu, QApplication, QMessageBox, QInputDialog, QLineEdit
 )
-from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt, QTranslator, QEvent
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtCore import Qt, QTranslator, QEvent, QTimer, QObject
+from importlib import import_module
 from pathlib import Path
 
 from app.constants import (
@@ -13,41 +14,111 @@ from app.constants import (
     PAGE_HOME, PAGE_TEAMS, PAGE_PARTICIPANTS, PAGE_MATCHES,
     PAGE_BRACKET, PAGE_REPORTS, PAGE_TOOLS, PAGE_HELP, PAGE_CREDITS, THEME_LIGHT
 )
-from app.config import AVAILABLE_LANGUAGES, TRANSLATIONS_DIR
+from app.config import AVAILABLE_LANGUAGES, TRANSLATIONS_DIR, INTERVALO_COPIAS_MIN, INTERVALO_CAMBIOS_EXTERNOS_MS
 from app.controllers.navigation_controller import NavigationController
-from app.controllers.teams_controller import ControladorGestionEquipos
-from app.controllers.participants_controller import ControladorGestionParticipantes
-from app.controllers.matches_controller import ControladorCalendarioPartidos
-from app.controllers.bracket_controller import ControladorCuadroEliminatorias
-from app.controllers.reports_controller import ControladorReportes
 from app.services.qss_service import qss_service
+from app.services.event_bus import get_event_bus
+from app.services.rating_service import get_rating_service
+from app.services.referee_service import get_referee_service
+from app.services.eligibility_service import get_eligibility_service
+from app.services.leaderboard_service import LeaderboardService, get_leaderboard_service
+from app.services.group_service import get_group_service
+from app.services.undo_service import get_undo_service
+from app.services.backup_service import get_backup_service
+from app.services.archive_service import get_archive_service
+from app.services.change_monitor_service import get_change_monitor_service
+from app.models.db import DbError, es_solo_lectura
+from app.services.ui_profiler import get_ui_profiler
+from app.services.startup_profiler import startup_profiler
 from app.views.widgets.background_widget import BackgroundWidget
 from app.views.page_home import PageInicio
-from app.views.page_teams import PageGestionEquipos
-from app.views.page_participants import PageParticipants
-from app.views.page_matches import PageMatches
-from app.views.page_bracket import PageBracket
-from app.views.page_reports import PageReports
-from app.views.page_tools import PageTools
-from app.views.page_help import PageHelp
-from app.views.page_credits import PageCredits
+
+
+class BloqueoSoloLectura(QObject):
+    """
+    Mantiene desactivados los botones que escriben en un torneo archivado.
+    
+    Las páginas activan y desactivan sus botones según el modo en que están,
+    así que no basta con desactivarlos una vez: se vuelven a desactivar cada
+    vez que algo los activa.
+    """
+    
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        """Desactiva el botón en cuanto se activa."""
+        if event.type() == QEvent.Type.EnabledChange and obj.isEnabled():
+            obj.setEnabled(False)
+        return False
 
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación."""
     
+    # Páginas construidas bajo demanda (sus módulos también se importan entonces):
+    # índice -> (atributo de página, clase, atributo de controlador, clase de controlador)
+    PAGINAS_DIFERIDAS = {
+        PAGE_TEAMS: ("page_equipos", "app.views.page_teams:PageGestionEquipos",
+                     "controlador_equipos", "app.controllers.teams_controller:ControladorGestionEquipos"),
+        PAGE_PARTICIPANTS: ("page_participantes", "app.views.page_participants:PageParticipants",
+                            "controlador_participantes", "app.controllers.participants_controller:ControladorGestionParticipantes"),
+        PAGE_MATCHES: ("page_matches", "app.views.page_matches:PageMatches",
+                       "controlador_matches", "app.controllers.matches_controller:ControladorCalendarioPartidos"),
+        PAGE_BRACKET: ("page_bracket", "app.views.page_bracket:PageBracket",
+                       "controlador_bracket", "app.controllers.bracket_controller:ControladorCuadroEliminatorias"),
+        PAGE_REPORTS: ("page_reports", "app.views.page_reports:PageReports",
+                       "controlador_reportes", "app.controllers.reports_controller:ControladorReportes"),
+        PAGE_TOOLS: ("page_tools", "app.views.page_tools:PageTools", None, None),
+        PAGE_HELP: ("page_help", "app.views.page_help:PageHelp", None, None),
+        PAGE_CREDITS: ("page_credits", "app.views.page_credits:PageCredits", None, None),
+    }
+    
+    # Botones de cada página que escriben en la base de datos (desactivados
+    # al abrir un torneo archivado)
+    BOTONES_ESCRITURA = {
+        PAGE_TEAMS: ("nuevo_equipo", "editar_equipo", "eliminar_equipo", "guardar_equipo",
+                     "seleccionar_escudo"),
+        PAGE_PARTICIPANTS: ("nuevo_participante", "editar_participante", "eliminar_participante",
+                            "guardar_participante", "btnGuardarEquipo", "btnQuitarEquipo"),
+        PAGE_MATCHES: ("btnNuevoPartidoTop", "btnProgramarAutomatico", "btnReiniciarTorneo",
+                       "btnGuardar", "btnEliminar", "editar_resultado_btn", "guardar_resultado",
+                       "btn_detalles_goles"),
+        PAGE_BRACKET: ("randomizar_octavos", "sembrar_octavos", "guardar_emparejamientos",
+                       "generar_grupos"),
+    }
+    
+    # Goleadores que se muestran en la página de inicio
+    GOLEADORES_INICIO = 5
+    
+    # El cuadro necesita el controlador de partidos (p. ej. para reiniciar el torneo)
+    DEPENDENCIAS_PAGINA = {PAGE_BRACKET: (PAGE_MATCHES,)}
+    
+    # Orden de construcción en segundo plano tras el primer frame
+    ORDEN_CALENTAMIENTO = (
+        PAGE_MATCHES, PAGE_BRACKET, PAGE_TEAMS, PAGE_PARTICIPANTS,
+        PAGE_REPORTS, PAGE_TOOLS, PAGE_HELP, PAGE_CREDITS
+    )
+    
+    # Espera tras el primer frame antes de empezar el calentamiento (ms)
+    RETRASO_CALENTAMIENTO_MS = 300
+    
     def __init__(self):
         """Inicializa la ventana principal."""
         super().__init__()
         self.translator = None
         self.current_language = "es"
+        self.solo_lectura = es_solo_lectura()
+        self._bloqueo_solo_lectura = BloqueoSoloLectura(self)
         self.setup_ui()
         self.create_menu_bar()
         self.setup_navigation()
+        self.setup_copias_programadas()
+        self.setup_cambios_externos()
     
     def setup_ui(self):
         """Configura la interfaz de usuario básica."""
-        self.setWindowTitle(APP_TITLE)
+        self.setWindowTitle(
+            self.tr("{0} (torneo archivado, solo lectura)").format(APP_TITLE) if self.solo_lectura else APP_TITLE
+        )
+        qss_service.registrar_ventana(self)
         self.setMinimumSize(WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT)
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
         
@@ -72,55 +143,52 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         main_layout.addWidget(self.stacked_widget)
         
-        # Crear páginas (guardar referencias)
+        # Solo la página de inicio se construye ahora; el resto se crea al
+        # navegar a ella por primera vez o en el calentamiento tras el primer frame
         self.page_inicio = PageInicio()
-        self.page_equipos = PageGestionEquipos()
-        self.page_participantes = PageParticipants()
-        self.page_matches = PageMatches()  # ✅ GUARDADA COMO ATRIBUTO
-        self.page_bracket = PageBracket()  # ✅ GUARDADA COMO ATRIBUTO
-        self.page_reports = PageReports()
-        self.page_tools = PageTools()
-        self.page_help = PageHelp()
-        self.page_credits = PageCredits()
-        
-        # Agregar páginas al stacked widget
-        self.stacked_widget.addWidget(self.page_inicio)         # 0 - HOME
-        self.stacked_widget.addWidget(self.page_equipos)        # 1 - TEAMS
-        self.stacked_widget.addWidget(self.page_participantes)  # 2 - PARTICIPANTS
-        self.stacked_widget.addWidget(self.page_matches)        # 3 - MATCHES
-        self.stacked_widget.addWidget(self.page_bracket)        # 4 - BRACKET
-        self.stacked_widget.addWidget(self.page_reports)        # 5 - REPORTS
-        self.stacked_widget.addWidget(self.page_tools)          # 6 - TOOLS
-        self.stacked_widget.addWidget(self.page_help)           # 7 - HELP
-        self.stacked_widget.addWidget(self.page_credits)        # 8 - CREDITS
-        
-        # ✅ Inicializar controladores
-        print("[MAIN WINDOW] Inicializando controladores...")
-        self.controlador_equipos = ControladorGestionEquipos(self.page_equipos)
-        self.controlador_participantes = ControladorGestionParticipantes(self.page_participantes)
-        
-        # 🔴 CRITICAL: Inicializar controlador de partidos
-        print("[MAIN WINDOW] Inicializando ControladorCalendarioPartidos...")
-        self.controlador_matches = ControladorCalendarioPartidos(self.page_matches)
-        print("[MAIN WINDOW] ControladorCalendarioPartidos inicializado correctamente")
-        
-        # 🔴 CRITICAL: Inicializar controlador de bracket (temporalmente comentado por incompatibilidades)
-        print("[MAIN WINDOW] Inicializando ControladorCuadroEliminatorias...")
-        try:
-            self.controlador_bracket = ControladorCuadroEliminatorias(self.page_bracket)
-            print("[MAIN WINDOW] ControladorCuadroEliminatorias inicializado correctamente")
-            
-            # Conectar ambos controladores entre sí
-            self.controlador_matches.set_bracket_controller(self.controlador_bracket)
-            self.controlador_bracket.set_matches_controller(self.controlador_matches)
-        except Exception as e:
-            print(f"[MAIN WINDOW WARNING] No se pudo inicializar controlador bracket: {e}")
-            self.controlador_bracket = None
-        
-        # Inicializar controlador de reportes
-        print("[MAIN WINDOW] Inicializando ControladorReportes...")
-        self.controlador_reportes = ControladorReportes(self.page_reports)
-        print("[MAIN WINDOW] ControladorReportes inicializado correctamente")
+        self.page_equipos = None
+        self.page_participantes = None
+        self.page_matches = None
+        self.page_bracket = None
+        self.page_reports = None
+        self.page_tools = None
+        self.page_help = None
+        self.page_credits = None
+        
+        self.controlador_equipos = None
+        self.controlador_participantes = None
+        self.controlador_matches = None
+        self.controlador_bracket = None
+        self.controlador_reportes = None
+        
+        # Agregar páginas al stacked widget (marcadores para las diferidas)
+        self._marcadores: dict[int, QWidget] = {}
+        for indice in range(PAGE_CREDITS + 1):
+            if indice == PAGE_HOME:
+                self.stacked_widget.addWidget(self.page_inicio)
+            else:
+                marcador = QWidget()
+                marcador.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+                self._marcadores[indice] = marcador
+                self.stacked_widget.addWidget(marcador)
+        
+        # Instrumentar slots para el modo diagnóstico (antes de conectar señales)
+        self._instrumentar_diagnostico()
+        
+        # Ratings al día con cada resultado (antes que las páginas, que los muestran)
+        get_rating_service().conectar(get_event_bus())
+        # Índice de disponibilidad de árbitros (se carga en el primer uso)
+        get_referee_service().conectar(get_event_bus())
+        # Sanciones por tarjetas (se calculan en la primera consulta)
+        get_eligibility_service().conectar(get_event_bus())
+        # Clasificación de la fase de grupos (se actualiza con cada resultado)
+        get_group_service().conectar(get_event_bus())
+        # Clasificaciones individuales; la página de inicio parte de la última instantánea
+        get_leaderboard_service().conectar(get_event_bus())
+        get_event_bus().result_saved.connect(self._actualizar_goleadores_inicio)
+        snapshot = LeaderboardService.leer_snapshot()
+        if snapshot:
+            self.page_inicio.set_goleadores(snapshot.get("goles", [])[:self.GOLEADORES_INICIO])
 
         # Conectar señales de navegación de PageInicio
         self.page_inicio.ir_a_equipos_signal.connect(lambda: self.navigate_to_page(PAGE_TEAMS))
@@ -132,6 +200,144 @@ class MainWindow(QMainWindow):
         
         # Mostrar página de inicio al cargar
         self.stacked_widget.setCurrentIndex(PAGE_HOME)
+        
+        # Detectar el primer frame para medir el arranque y empezar el calentamiento
+        self.background_widget.installEventFilter(self)
+    
+    def _instrumentar_diagnostico(self):
+        """
+        Prepara el perfilador de interfaz.
+        
+        Los slots de cada página y controlador se envuelven al cargar su clase
+        (ver _cargar_clase). Los envoltorios solo miden cuando el modo diagnóstico
+        está activo, así que se instalan siempre y el modo puede activarse en
+        caliente desde Herramientas.
+        """
+        # Marcar las señales para saber qué disparó cada slot
+        # (las de cada página se marcan al construirla)
+        get_ui_profiler().marcar_senales(get_event_bus())
+    
+    # ==================== CONSTRUCCIÓN DIFERIDA ====================
+    
+    def eventFilter(self, obj, event):
+        """Detecta el primer pintado de la ventana."""
+        if obj is self.background_widget and event.type() == QEvent.Type.Paint:
+            self.background_widget.removeEventFilter(self)
+            startup_profiler.registrar_primer_frame()
+            QTimer.singleShot(self.RETRASO_CALENTAMIENTO_MS, self._calentar_siguiente_pagina)
+        return super().eventFilter(obj, event)
+    
+    def _calentar_siguiente_pagina(self):
+        """Construye una página pendiente por turno del bucle de eventos."""
+        for indice in self.ORDEN_CALENTAMIENTO:
+            if indice in self._marcadores:
+                with startup_profiler.medir(f"calentamiento página {indice}"):
+                    self._asegurar_pagina(indice)
+                QTimer.singleShot(0, self._calentar_siguiente_pagina)
+                return
+        print("[MAIN WINDOW] Todas las páginas construidas")
+        startup_profiler.volcar()
+    
+    def _cargar_clase(self, ruta: str) -> type:
+        """
+        Importa una clase a partir de una ruta "modulo:Clase".
+        
+        Las clases se instrumentan para el perfilador antes de crear instancias,
+        ya que Qt guarda el método ligado al conectar las señales.
+        
+        Args:
+            ruta: Ruta de la clase con el formato "paquete.modulo:Clase"
+        
+        Returns:
+            Clase importada
+        """
+        nombre_modulo, nombre_clase = ruta.split(":")
+        with startup_profiler.medir(f"importar {nombre_modulo}"):
+            clase = getattr(import_module(nombre_modulo), nombre_clase)
+        get_ui_profiler().instrumentar_clase(clase)
+        return clase
+    
+    def _asegurar_pagina(self, indice: int):
+        """
+        Construye la página y su controlador si todavía son un marcador.
+        
+        Args:
+            indice: Índice de la página en el stacked widget
+        """
+        if indice not in self._marcadores:
+            return
+        for dependencia in self.DEPENDENCIAS_PAGINA.get(indice, ()):
+            self._asegurar_pagina(dependencia)
+        
+        atributo_pagina, ruta_pagina, atributo_controlador, ruta_controlador = self.PAGINAS_DIFERIDAS[indice]
+        clase_pagina = self._cargar_clase(ruta_pagina)
+        clase_controlador = self._cargar_clase(ruta_controlador) if ruta_controlador else None
+        
+        print(f"[MAIN WINDOW] Construyendo {clase_pagina.__name__}...")
+        pagina = clase_pagina()
+        setattr(self, atributo_pagina, pagina)
+        get_ui_profiler().marcar_senales(pagina)
+        
+        # Sustituir el marcador sin alterar la página visible
+        marcador = self._marcadores.pop(indice)
+        self.stacked_widget.insertWidget(indice, pagina)
+        self.stacked_widget.removeWidget(marcador)
+        marcador.deleteLater()
+        
+        if clase_controlador is not None:
+            print(f"[MAIN WINDOW] Inicializando {clase_controlador.__name__}...")
+            try:
+                setattr(self, atributo_controlador, clase_controlador(pagina))
+                print(f"[MAIN WINDOW] {clase_controlador.__name__} inicializado correctamente")
+            except Exception as e:
+                print(f"[MAIN WINDOW WARNING] No se pudo inicializar {clase_controlador.__name__}: {e}")
+        
+        if self.solo_lectura:
+            self._bloquear_escritura(pagina, self.BOTONES_ESCRITURA.get(indice, ()))
+        
+        # Conectar ambos controladores entre sí en cuanto existan los dos
+        if indice in (PAGE_MATCHES, PAGE_BRACKET) and self.controlador_matches and self.controlador_bracket:
+            self.controlador_matches.set_bracket_controller(self.controlador_bracket)
+            self.controlador_bracket.set_matches_controller(self.controlador_matches)
+    
+    def _bloquear_escritura(self, pagina: QWidget, botones: tuple):
+        """
+        Desactiva para siempre los botones de una página que escriben en la base de datos.
+        
+        Args:
+            pagina: Página recién construida
+            botones: Nombres de los atributos de sus botones de escritura
+        """
+        for nombre in botones:
+            boton = getattr(pagina, nombre, None)
+            if boton is None:
+                continue
+            boton.setEnabled(False)
+            boton.installEventFilter(self._bloqueo_solo_lectura)
+    
+    def setup_copias_programadas(self):
+        """Programa copias de seguridad periódicas en segundo plano (solo si hay cambios)."""
+        if INTERVALO_COPIAS_MIN <= 0 or self.solo_lectura:
+            return
+        self._timer_copias = QTimer(self)
+        self._timer_copias.timeout.connect(get_backup_service().crear_copia_programada)
+        self._timer_copias.start(INTERVALO_COPIAS_MIN * 60 * 1000)
+    
+    def setup_cambios_externos(self):
+        """Vigila los cambios de otras instancias sobre la misma base de datos."""
+        if INTERVALO_CAMBIOS_EXTERNOS_MS <= 0:
+            return
+        get_change_monitor_service().conectar(get_event_bus().nucleo)
+        self._timer_cambios = QTimer(self)
+        self._timer_cambios.timeout.connect(self._comprobar_cambios_externos)
+        self._timer_cambios.start(INTERVALO_CAMBIOS_EXTERNOS_MS)
+    
+    def _comprobar_cambios_externos(self):
+        """Reenvía al bus los cambios de otras instancias (las vistas afectadas se recargan)."""
+        try:
+            get_change_monitor_service().comprobar()
+        except DbError as e:
+            print(f"[MAIN WINDOW WARNING] No se pudieron comprobar los cambios externos: {e}")
     
     def setup_navigation(self):
         """Configura el controlador de navegación."""
@@ -169,6 +375,24 @@ class MainWindow(QMainWindow):
         action_bracket.triggered.connect(lambda: self.navigate_to_page(PAGE_BRACKET))
         torneo_menu.addAction(action_bracket)
 
+        # Menú Editar (deshacer y rehacer operaciones del torneo)
+        edit_menu = menubar.addMenu(self.tr("Editar"))
+        
+        self.action_deshacer = QAction(self.tr("Deshacer"), self)
+        self.action_deshacer.setShortcut(QKeySequence.StandardKey.Undo)
+        self.action_deshacer.triggered.connect(lambda: self._revertir_operacion(rehacer=False))
+        edit_menu.addAction(self.action_deshacer)
+        
+        self.action_rehacer = QAction(self.tr("Rehacer"), self)
+        self.action_rehacer.setShortcuts([QKeySequence.StandardKey.Redo, QKeySequence("Ctrl+Y")])
+        self.action_rehacer.triggered.connect(lambda: self._revertir_operacion(rehacer=True))
+        edit_menu.addAction(self.action_rehacer)
+        
+        edit_menu.aboutToShow.connect(self._actualizar_menu_editar)
+        # Fuera del menú las acciones quedan activas para que funcionen los atajos
+        edit_menu.aboutToHide.connect(lambda: self.action_deshacer.setEnabled(True))
+        edit_menu.aboutToHide.connect(lambda: self.action_rehacer.setEnabled(True))
+
         # Menú Herramientas (independiente)
         tools_menu = menubar.addMenu(self.tr("Herramientas"))
 
@@ -179,6 +403,17 @@ class MainWindow(QMainWindow):
         action_tools = QAction(self.tr("Reloj digital"), self)
         action_tools.triggered.connect(lambda: self.navigate_to_page(PAGE_TOOLS))
         tools_menu.addAction(action_tools)
+
+        tools_menu.addSeparator()
+
+        action_copia = QAction(self.tr("Crear copia de seguridad"), self)
+        action_copia.triggered.connect(self._crear_copia_seguridad)
+        tools_menu.addAction(action_copia)
+
+        action_archivar = QAction(self.tr("Archivar torneo y empezar otro..."), self)
+        action_archivar.triggered.connect(self._archivar_torneo)
+        action_archivar.setEnabled(not self.solo_lectura)
+        tools_menu.addAction(action_archivar)
         
         # Menú Ver
         view_menu = menubar.addMenu(self.tr("Ver"))
@@ -211,13 +446,82 @@ class MainWindow(QMainWindow):
         action_credits.triggered.connect(lambda: self.navigate_to_page(PAGE_CREDITS))
         help_menu.addAction(action_credits)
     
+    def _actualizar_menu_editar(self):
+        """Muestra en el menú Editar qué operación se desharía o reharía."""
+        servicio = get_undo_service()
+        descripcion = servicio.descripcion_deshacer()
+        self.action_deshacer.setText(
+            self.tr("Deshacer: {0}").format(self.tr(descripcion)) if descripcion else self.tr("Deshacer")
+        )
+        self.action_deshacer.setEnabled(servicio.puede_deshacer())
+        descripcion = servicio.descripcion_rehacer()
+        self.action_rehacer.setText(
+            self.tr("Rehacer: {0}").format(self.tr(descripcion)) if descripcion else self.tr("Rehacer")
+        )
+        self.action_rehacer.setEnabled(servicio.puede_rehacer())
+    
+    def _revertir_operacion(self, rehacer: bool):
+        """Deshace o rehace la última operación y recarga la página actual."""
+        servicio = get_undo_service()
+        if not (servicio.puede_rehacer() if rehacer else servicio.puede_deshacer()):
+            return
+        titulo = self.tr("Rehacer") if rehacer else self.tr("Deshacer")
+        try:
+            if rehacer:
+                servicio.rehacer()
+            else:
+                servicio.deshacer()
+        except (ValueError, DbError) as e:
+            QMessageBox.warning(self, titulo, self.tr("No se ha podido completar la operación:\n{0}").format(e))
+        self._on_page_changed(self.stacked_widget.currentIndex())
+    
+    def _crear_copia_seguridad(self):
+        """Crea una copia de seguridad sin bloquear la interfaz."""
+        get_backup_service().crear_copia_en_segundo_plano("manual")
+        QMessageBox.information(
+            self, self.tr("Copia de seguridad"),
+            self.tr("Se está creando una copia de seguridad en:\n{0}").format(get_backup_service().directorio)
+        )
+    
+    def _archivar_torneo(self):
+        """Archiva el torneo activo en un archivo de solo lectura y empieza otro."""
+        titulo = self.tr("Archivar torneo")
+        nombre, aceptado = QInputDialog.getText(
+            self, titulo,
+            self.tr("Los partidos, grupos y resultados del torneo actual pasarán a un archivo de "
+                    "solo lectura. Equipos y participantes se conservan.\n\nNombre del torneo nuevo:"),
+            QLineEdit.Normal, ""
+        )
+        if not aceptado:
+            return
+        try:
+            torneos = get_archive_service().archivar(nombre.strip() or None)
+        except (ValueError, DbError) as e:
+            QMessageBox.warning(self, titulo, self.tr("No se ha podido archivar el torneo:\n{0}").format(e))
+            return
+        QMessageBox.information(
+            self, titulo,
+            self.tr("{0} se ha archivado en:\n{1}").format(
+                torneos['archivado']['nombre'], torneos['archivado']['archivo']
+            )
+        )
+        self._on_page_changed(self.stacked_widget.currentIndex())
+    
+    def _actualizar_goleadores_inicio(self, partido_id: int = 0):
+        """Refresca los goleadores de la página de inicio tras guardar un resultado."""
+        try:
+            self.page_inicio.set_goleadores(get_leaderboard_service().top("goles", self.GOLEADORES_INICIO))
+        except Exception as e:
+            print(f"[APP] No se pudieron actualizar los goleadores: {e}")
+    
     def navigate_to_page(self, page_index: int):
         """
-        Navega a una página específica.
+        Navega a una página específica, construyéndola si aún no existe.
         
         Args:
             page_index: Índice de la página
         """
+        self._asegurar_pagina(page_index)
         self.nav_controller.navigate_to(page_index)
     
     def change_language(self, language_code: str):
@@ -300,7 +604,7 @@ class MainWindow(QMainWindow):
     def _on_page_changed(self, index: int):
         """Maneja el evento de cambio de página para recargar datos."""
         # Recargar datos cuando se navega a la página de equipos
-        if index == PAGE_TEAMS:
+        if index == PAGE_TEAMS and self.controlador_equipos:
             self.controlador_equipos.cargar_tabla()
-        elif index == PAGE_REPORTS:
+        elif index == PAGE_REPORTS and self.controlador_reportes:
             self.controlador_reportes.cargar_filtros()
@@ -142,6 +142,7 @@ class BracketWidget(QWidget):
         combo.addItem("Selecciona equipo...", None)
         combo.setMinimumWidth(160)
         combo.setMaximumHeight(28)
+        combo.currentIndexChanged.connect(lambda _, c=combo: self._actualizar_tooltip(c))
         
         combo_layout.addWidget(combo)
         combo_frame.setLayout(combo_layout)
@@ -177,6 +178,7 @@ class BracketWidget(QWidget):
         combo_a.addItem("Selecciona equipo...", None)
         combo_a.setMinimumWidth(160)
         combo_a.setMaximumHeight(26)
+        combo_a.currentIndexChanged.connect(lambda _, c=combo_a: self._actualizar_tooltip(c))
         
         vs_label = QLabel("vs")
         vs_label.setObjectName("vsLabel")
@@ -190,6 +192,7 @@ class BracketWidget(QWidget):
         combo_b.addItem("Selecciona equipo...", None)
         combo_b.setMinimumWidth(160)
         combo_b.setMaximumHeight(26)
+        combo_b.currentIndexChanged.connect(lambda _, c=combo_b: self._actualizar_tooltip(c))
         
         layout.addWidget(combo_a)
         layout.addWidget(vs_label)
@@ -236,6 +239,12 @@ class BracketWidget(QWidget):
             
             for eq in equipos:
                 combo.addItem(eq['nombre'], eq['id'])
+                if eq.get('rating') is not None:
+                    combo.setItemData(
+                        combo.count() - 1,
+                        f"Rating: {eq['rating']:.0f}",
+                        Qt.ItemDataRole.ToolTipRole
+                    )
             
             # Restaurar selección previa si existe
             if current_data is not None:
@@ -248,6 +257,12 @@ class BracketWidget(QWidget):
                     combo.setCurrentIndex(idx)
             
             combo.blockSignals(False)
+            self._actualizar_tooltip(combo)
+    
+    @staticmethod
+    def _actualizar_tooltip(combo: QComboBox):
+        """Muestra como tooltip del combo el rating del equipo seleccionado."""
+        combo.setToolTip(combo.currentData(Qt.ItemDataRole.ToolTipRole) or "")
     
     def update_crown_visibility(self, ganador_equipo_id=None):
         """Actualiza el texto del label Finalista y el estilo visual. Añade corona solo al ganador."""
@@ -298,9 +313,13 @@ class BracketWidget(QWidget):
 class PageCuadroEliminatorias(QWidget):
     
     randomizar_octavos_signal = Signal()
+    sembrar_octavos_signal = Signal()
     guardar_emparejamientos_signal = Signal(list)
     emparejamientos_cambiados_signal = Signal()
     exportar_csv_signal = Signal()
+    simular_probabilidades_signal = Signal()
+    generar_grupos_signal = Signal()
+    ver_grupos_signal = Signal()
     
     def __init__(self):
         super().__init__()
@@ -350,8 +369,12 @@ class PageCuadroEliminatorias(QWidget):
             return
         
         from app.models.team_model import TeamModel
+        from app.services.rating_service import get_rating_service, RATING_INICIAL
         try:
             equipos_dict = TeamModel.listar_equipos()
+            ratings = get_rating_service().obtener_ratings()
+            for equipo in equipos_dict:
+                equipo['rating'] = ratings.get(equipo['id'], RATING_INICIAL)
             if equipos_dict:
                 self.equipos_disponibles = equipos_dict
                 self.bracket_widget.populate_team_combos(equipos_dict)
@@ -369,6 +392,8 @@ class PageCuadroEliminatorias(QWidget):
         layout_botones.setSpacing(10)
         
         self.randomizar_octavos = QPushButton("Randomizar octavos")
+        self.sembrar_octavos = QPushButton("Sorteo por ranking")
+        self.sembrar_octavos.setToolTip("Empareja los octavos por cabezas de serie según el rating de cada equipo")
         self.guardar_emparejamientos = QPushButton("Guardar emparejamientos")
         self.guardar_emparejamientos.setObjectName("successButton")
         
@@ -376,9 +401,19 @@ class PageCuadroEliminatorias(QWidget):
         self.exportar_csv.setObjectName("primaryButton")
         self.exportar_csv.setEnabled(False)  # Inicialmente deshabilitado
         
+        self.simular_probabilidades = QPushButton("Probabilidades")
+        
+        self.generar_grupos = QPushButton("Fase de grupos")
+        self.generar_grupos.setToolTip("Reparte los equipos en grupos de liga cuyos primeros pasan a octavos")
+        self.ver_grupos = QPushButton("Clasificación de grupos")
+        
+        layout_botones.addWidget(self.generar_grupos)
+        layout_botones.addWidget(self.ver_grupos)
         layout_botones.addWidget(self.randomizar_octavos)
+        layout_botones.addWidget(self.sembrar_octavos)
         layout_botones.addWidget(self.guardar_emparejamientos)
         layout_botones.addWidget(self.exportar_csv)
+        layout_botones.addWidget(self.simular_probabilidades)
         layout_botones.addStretch()
         
         layout_padre.addLayout(layout_botones)
@@ -386,8 +421,12 @@ class PageCuadroEliminatorias(QWidget):
     def conectar_senales(self):
         # Conectar "Randomizar octavos" a la señal que el controlador escucha
         self.randomizar_octavos.clicked.connect(self._on_randomizar_wrapper)
+        self.sembrar_octavos.clicked.connect(self.sembrar_octavos_signal.emit)
         self.guardar_emparejamientos.clicked.connect(self.on_guardar_emparejamientos)
         self.exportar_csv.clicked.connect(self.exportar_csv_signal.emit)
+        self.simular_probabilidades.clicked.connect(self.simular_probabilidades_signal.emit)
+        self.generar_grupos.clicked.connect(self.generar_grupos_signal.emit)
+        self.ver_grupos.clicked.connect(self.ver_grupos_signal.emit)
     
     def changeEvent(self, event: QEvent):
         """Captura el evento de cambio de idioma."""
@@ -401,8 +440,12 @@ class PageCuadroEliminatorias(QWidget):
         """Actualiza todos los textos traducibles de la interfaz."""
         self.titulo.setText(self.tr("Cuadro de eliminatorias"))
         self.randomizar_octavos.setText(self.tr("Randomizar octavos"))
+        self.sembrar_octavos.setText(self.tr("Sorteo por ranking"))
         self.guardar_emparejamientos.setText(self.tr("Guardar emparejamientos"))
         self.exportar_csv.setText(self.tr("Exportar resultados (CSV)"))
+        self.simular_probabilidades.setText(self.tr("Probabilidades"))
+        self.generar_grupos.setText(self.tr("Fase de grupos"))
+        self.ver_grupos.setText(self.tr("Clasificación de grupos"))
     
     def _on_randomizar_wrapper(self):
         """Wrapper que emite la señal para que el controlador maneje la randomización.
@@ -885,6 +928,7 @@ class PageCuadroEliminatorias(QWidget):
                 combo.setEnabled(False)
             
             self.randomizar_octavos.setEnabled(False)
+            self.sembrar_octavos.setEnabled(False)
             self.guardar_emparejamientos.setEnabled(False)
             
         elif modo == "configurable":
@@ -892,6 +936,7 @@ class PageCuadroEliminatorias(QWidget):
                 combo.setEnabled(True)
             
             self.randomizar_octavos.setEnabled(True)
+            self.sembrar_octavos.setEnabled(True)
             self.guardar_emparejamientos.setEnabled(True)
 
 
@@ -1,5 +1,5 @@
 """Página de inicio con selector visual de secciones."""
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QScrollArea, QSizePolicy
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QScrollArea, QSizePolicy, QFrame
 from PySide6.QtCore import Qt, Signal, QEvent
 from PySide6.QtGui import QIcon
 from app.views.widgets import CardWidget
@@ -69,6 +69,9 @@ class PageInicio(QWidget):
         
         content_layout.addWidget(self.panel_central)
         
+        # Máximos goleadores (oculto hasta que haya goles)
+        self.crear_panel_goleadores(content_layout)
+        
         # Pequeño espaciador inferior (reducido)
         content_layout.addSpacing(20)
         
@@ -125,6 +128,39 @@ class PageInicio(QWidget):
         
         layout_padre.addLayout(self.grid_layout)
     
+    def crear_panel_goleadores(self, layout_padre: QVBoxLayout):
+        """Crea el panel con los máximos goleadores del torneo."""
+        self.panel_goleadores = QFrame()
+        self.panel_goleadores.setObjectName("contentCard")
+        layout = QVBoxLayout(self.panel_goleadores)
+        layout.setContentsMargins(20, 12, 20, 12)
+        layout.setSpacing(4)
+        
+        self.titulo_goleadores = QLabel(self.tr("Máximos goleadores"))
+        self.titulo_goleadores.setObjectName("subtitleLabel")
+        layout.addWidget(self.titulo_goleadores)
+        
+        self.lista_goleadores = QLabel()
+        self.lista_goleadores.setTextFormat(Qt.TextFormat.PlainText)
+        layout.addWidget(self.lista_goleadores)
+        
+        self.panel_goleadores.hide()
+        layout_padre.addWidget(self.panel_goleadores)
+    
+    def set_goleadores(self, goleadores: list[dict]):
+        """
+        Muestra los máximos goleadores.
+        
+        Args:
+            goleadores: Entradas de LeaderboardService.top("goles") (nombre, equipo, goles)
+        """
+        lineas = [
+            f"{puesto}. {g['nombre']} ({g['equipo'] or '-'}): {g['goles']}"
+            for puesto, g in enumerate(goleadores, start=1)
+        ]
+        self.lista_goleadores.setText("\n".join(lineas))
+        self.panel_goleadores.setVisible(bool(lineas))
+    
     def actualizar_tema_cards(self, theme: str):
         """
         Actualiza el tema de todas las tarjetas.
@@ -227,52 +263,18 @@ class PageInicio(QWidget):
             if ruta_imagen:
                 self._aplicar_imagen_fondo(boton, ruta_imagen)
     
-    def _aplicar_imagen_fondo(self, boton: QPushButton, ruta_imagen: str):
+    def _aplicar_imagen_fondo(self, boton: CardWidget, ruta_imagen: str):
         """
-        Aplica una imagen de fondo a un botón manteniendo el estilo base.
+        Aplica una imagen de fondo a una tarjeta.
+        
+        La tarjeta la pinta pre-escalada desde la caché de imágenes, así que
+        los redimensionados y el hover solo copian pixmaps ya generados.
         
         Args:
-            boton: Botón al que aplicar la imagen
+            boton: Tarjeta a la que aplicar la imagen
             ruta_imagen: Ruta a la imagen de fondo
         """
-        # Obtener el texto actual para preservarlo
-        texto = boton.text()
-        
-        # Estilo con imagen de fondo y overlay oscuro para legibilidad
-        estilo_con_imagen = f"""
-            QPushButton#cardButton {{
-                font-size: 20px;
-                font-weight: bold;
-                color: white;
-                background-color: rgba(52, 73, 94, 0.85);
-                background-image: 
-                    linear-gradient(rgba(0, 0, 0, 0.5), rgba(0, 0, 0, 0.5)),
-                    url({ruta_imagen});
-                background-position: center;
-                background-repeat: no-repeat;
-                background-size: cover;
-                border: 2px solid #2c3e50;
-                border-radius: 12px;
-                padding: 20px;
-                text-align: center;
-                text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.8);
-            }}
-            QPushButton#cardButton:hover {{
-                background-color: rgba(41, 128, 185, 0.95);
-                background-image: 
-                    linear-gradient(rgba(41, 128, 185, 0.6), rgba(41, 128, 185, 0.6)),
-                    url({ruta_imagen});
-                border: 2px solid #1f618d;
-            }}
-            QPushButton#cardButton:pressed {{
-                background-color: rgba(31, 97, 141, 0.95);
-                background-image: 
-                    linear-gradient(rgba(31, 97, 141, 0.7), rgba(31, 97, 141, 0.7)),
-                    url({ruta_imagen});
-                border: 2px solid #154360;
-            }}
-        """
-        boton.setStyleSheet(estilo_con_imagen)
+        boton.set_imagen_fondo(ruta_imagen)
     
     def set_imagen_boton(self, nombre_boton: str, ruta_imagen: str):
         """
@@ -305,6 +307,7 @@ class PageInicio(QWidget):
     def retranslate_ui(self):
         """Actualiza todos los textos traducibles de la interfaz."""
         self.titulo.setText(self.tr("Gestión de torneos"))
+        self.titulo_goleadores.setText(self.tr("Máximos goleadores"))
         
         # Actualizar textos de las tarjetas
         traducciones = [
@@ -9,7 +9,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QDateTime, QDate, QTimer, QEvent, QObject
 from typing import Optional
 from app.views.widgets.widget_calendario_partidos import CalendarioPartidos
-from app.views.dialogs.dialog_partidos_dia import DialogPartidosDia
+from app.services.qss_service import qss_service
+from app.models.db import es_solo_lectura
 import traceback
 
 
@@ -38,10 +39,12 @@ class PageCalendarioPartidos(QWidget):
     guardar_resultado_signal = Signal()
     cancelar_cambios_signal = Signal()
     abrir_partido_desde_dialogo_signal = Signal(int)
+    partido_programado_signal = Signal(int)  # Partido programado desde el diálogo del día
     
     # Señales de acciones principales
     nuevo_partido_signal = Signal()
     reiniciar_torneo_signal = Signal()
+    programar_automatico_signal = Signal()
     
     # Señales de edición de partido
     guardar_partido_signal = Signal()
@@ -164,7 +167,7 @@ class PageCalendarioPartidos(QWidget):
         self.label_filtro_ronda = QLabel("Ronda:")
         layout_barra.addWidget(self.label_filtro_ronda)
         self.filtro_ronda = QComboBox()
-        self.filtro_ronda.addItems(["Todos", "Octavos", "Cuartos", "Semifinales", "Final"])
+        self.filtro_ronda.addItems(["Todos", "Grupos", "Octavos", "Cuartos", "Semifinales", "Final"])
         self.filtro_ronda.setMinimumWidth(120)
         layout_barra.addWidget(self.filtro_ronda)
         
@@ -185,6 +188,14 @@ class PageCalendarioPartidos(QWidget):
         self.btnNuevoPartidoTop.setObjectName("successButton")
         layout_barra.addWidget(self.btnNuevoPartidoTop)
         
+        # Botón Programar automáticamente (fechas, campos y árbitros de los pendientes)
+        self.btnProgramarAutomatico = QPushButton("Programar automáticamente")
+        self.btnProgramarAutomatico.setToolTip(
+            "Asigna fecha, campo y árbitro a los partidos pendientes sin fecha "
+            "y árbitro a los que ya tienen fecha"
+        )
+        layout_barra.addWidget(self.btnProgramarAutomatico)
+        
         # Botón Reiniciar torneo (destructivo)
         self.btnReiniciarTorneo = QPushButton("Reiniciar torneo")
         self.btnReiniciarTorneo.setObjectName("dangerButton")
@@ -737,6 +748,10 @@ class PageCalendarioPartidos(QWidget):
             self.btnReiniciarTorneo.clicked.disconnect()
         except:
             pass
+        try:
+            self.btnProgramarAutomatico.clicked.disconnect()
+        except:
+            pass
         
         # Botones de la barra superior
         try:
@@ -753,6 +768,8 @@ class PageCalendarioPartidos(QWidget):
             print(f"  - ERROR conectando btnReiniciarTorneo: {e}")
             print(traceback.format_exc())
         
+        self.btnProgramarAutomatico.clicked.connect(self.programar_automatico_signal.emit)
+        
         # Filtros
         self.filtro_ronda.currentTextChanged.connect(self.on_filtros_changed)
         self.filtro_estado.currentTextChanged.connect(self.on_filtros_changed)
@@ -1055,15 +1072,20 @@ class PageCalendarioPartidos(QWidget):
         arbitros = ParticipantModel.listar_arbitros()
         
         # Abrir diálogo editable
+        from app.views.dialogs.dialog_partidos_dia import DialogPartidosDia
         dialog = DialogPartidosDia(fecha, partidos_dia, partidos_pendientes, arbitros, self)
         dialog.abrir_detalle_signal.connect(self.on_abrir_partido_desde_dialogo)
         dialog.partido_programado_signal.connect(self.on_partido_programado)
+        if es_solo_lectura():
+            # Torneo archivado: el diálogo solo sirve para consultar y abrir partidos
+            dialog.btn_programar.setVisible(False)
         dialog.exec()
     
-    def on_partido_programado(self):
+    def on_partido_programado(self, partido_id: int):
         """Refresca el calendario tras programar un partido."""
         # Recargar con filtros actuales (esto actualizará el calendario correctamente)
         self.filtros_changed_signal.emit(self.obtener_filtros_actuales())
+        self.partido_programado_signal.emit(partido_id)
     
     def on_abrir_partido_desde_dialogo(self, partido_id: int):
         """Maneja la señal de abrir partido desde el diálogo."""
@@ -1756,12 +1778,14 @@ class PageCalendarioPartidos(QWidget):
         completer_local.setFilterMode(Qt.MatchFlag.MatchContains)
         completer_local.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
         self.comboLocal.setCompleter(completer_local)
+        qss_service.registrar_ventana(completer_local.popup())  # popup sin padre
         
         completer_visitante = QCompleter([equipo['nombre'] for equipo in equipos], self.comboVisitante)
         completer_visitante.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         completer_visitante.setFilterMode(Qt.MatchFlag.MatchContains)
         completer_visitante.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
         self.comboVisitante.setCompleter(completer_visitante)
+        qss_service.registrar_ventana(completer_visitante.popup())  # popup sin padre
     
     def cargar_arbitros_en_combo(self, arbitros: list[str]):
         """Carga los árbitros en el combo."""
@@ -1780,6 +1804,7 @@ class PageCalendarioPartidos(QWidget):
             completer_arbitro.setFilterMode(Qt.MatchFlag.MatchContains)
             completer_arbitro.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
             self.comboArbitro.setCompleter(completer_arbitro)
+            qss_service.registrar_ventana(completer_arbitro.popup())  # popup sin padre
     
     def actualizar_estado_botones(self):
         """
@@ -2031,7 +2056,7 @@ class PageCalendarioPartidos(QWidget):
         
         # Filtros
         self.filtro_ronda.clear()
-        self.filtro_ronda.addItems([self.tr("Todos"), self.tr("Octavos"), self.tr("Cuartos"), self.tr("Semifinales"), self.tr("Final")])
+        self.filtro_ronda.addItems([self.tr("Todos"), self.tr("Grupos"), self.tr("Octavos"), self.tr("Cuartos"), self.tr("Semifinales"), self.tr("Final")])
         
         self.filtro_estado.clear()
         self.filtro_estado.addItems([self.tr("Todos"), self.tr("Pendientes"), self.tr("Jugados")])
@@ -2039,6 +2064,7 @@ class PageCalendarioPartidos(QWidget):
         # Botones principales
         self.btnNuevoPartidoTop.setText(self.tr("Nuevo partido"))
         self.btnReiniciarTorneo.setText(self.tr("Reiniciar torneo"))
+        self.btnProgramarAutomatico.setText(self.tr("Programar automáticamente"))
         
         # Panel calendario
         self.titulo_calendario.setText(self.tr("Calendario mensual"))
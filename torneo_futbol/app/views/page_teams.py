@@ -5,12 +5,10 @@ from PySide6.QtWidgets import (
     QGroupBox, QHeaderView, QFrame
 )
 from PySide6.QtCore import Qt, Signal, QSize, QEvent
-from PySide6.QtGui import QPixmap, QIcon, QPainter
-from PySide6.QtSvg import QSvgRenderer
-from pathlib import Path
+from PySide6.QtGui import QPixmap, QIcon
 from typing import Optional
 
-from app.config import DATA_DIR
+from app.services.crest_service import crest_service, TAMANO_TABLA, TAMANO_DETALLE
 
 
 class PageGestionEquipos(QWidget):
@@ -157,7 +155,7 @@ class PageGestionEquipos(QWidget):
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         
         # Configurar tamaño de iconos y altura de filas para escudos
-        self.tabla_equipos.setIconSize(QSize(32, 32))
+        self.tabla_equipos.setIconSize(QSize(TAMANO_TABLA, TAMANO_TABLA))
         self.tabla_equipos.verticalHeader().setDefaultSectionSize(40)
         
         layout_tabla.addWidget(self.tabla_equipos)
@@ -336,21 +334,14 @@ class PageGestionEquipos(QWidget):
             # Guardar la ruta en UserRole para recuperarla después
             item_escudo.setData(Qt.ItemDataRole.UserRole, ruta_escudo)
             
+            # Miniatura pre-rasterizada (sin decodificar el original en cada recarga)
+            icono = QPixmap()
             if ruta_escudo and ruta_escudo != 'Sin escudo':
-                # Construir ruta absoluta
-                ruta = Path(ruta_escudo)
-                if not ruta.is_absolute():
-                    ruta_proyecto = Path(__file__).resolve().parent.parent.parent
-                    ruta = ruta_proyecto / ruta_escudo
-                
-                # Cargar icono si el archivo existe
-                if ruta.exists():
-                    item_escudo.setIcon(QIcon(str(ruta)))
-                else:
-                    # Sin icono si no existe el archivo
-                    item_escudo.setText("—")
+                icono = crest_service.miniatura(ruta_escudo, TAMANO_TABLA)
+            if not icono.isNull():
+                item_escudo.setIcon(QIcon(icono))
             else:
-                # Sin escudo
+                # Sin escudo o archivo no encontrado
                 item_escudo.setText("—")
             
             # Centrar el contenido de la celda
@@ -446,14 +437,9 @@ class PageGestionEquipos(QWidget):
             self.preview_escudo.style().polish(self.preview_escudo)
             return
         
-        # Construir ruta absoluta si es relativa
-        ruta = Path(ruta_escudo)
-        if not ruta.is_absolute():
-            # Usar DATA_DIR como base para rutas relativas
-            ruta = DATA_DIR.parent / ruta_escudo
-        
         # Verificar si el archivo existe
-        if not ruta.exists():
+        ruta = crest_service.resolver(ruta_escudo)
+        if ruta is None or not ruta.exists():
             self.pixmap_original = None
             self.preview_escudo.clear()
             self.preview_escudo.setText("No\nencontrado")
@@ -462,33 +448,15 @@ class PageGestionEquipos(QWidget):
             self.preview_escudo.style().polish(self.preview_escudo)
             return
         
-        if ruta.suffix.lower() == '.svg':
-            renderer = QSvgRenderer(str(ruta))
-            if not renderer.isValid():
-                self.pixmap_original = None
-                self.preview_escudo.clear()
-                self.preview_escudo.setText("Error")
-                self.preview_escudo.setProperty("empty", True)
-                self.preview_escudo.style().unpolish(self.preview_escudo)
-                self.preview_escudo.style().polish(self.preview_escudo)
-                return
-            
-            self.pixmap_original = QPixmap(144, 144)
-            self.pixmap_original.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(self.pixmap_original)
-            renderer.render(painter)
-            painter.end()
-        else:
-            self.pixmap_original = QPixmap(str(ruta))
-            
-            if self.pixmap_original.isNull():
-                self.pixmap_original = None
-                self.preview_escudo.clear()
-                self.preview_escudo.setText("Error")
-                self.preview_escudo.setProperty("empty", True)
-                self.preview_escudo.style().unpolish(self.preview_escudo)
-                self.preview_escudo.style().polish(self.preview_escudo)
-                return
+        self.pixmap_original = crest_service.miniatura(ruta_escudo, TAMANO_DETALLE)
+        if self.pixmap_original.isNull():
+            self.pixmap_original = None
+            self.preview_escudo.clear()
+            self.preview_escudo.setText("Error")
+            self.preview_escudo.setProperty("empty", True)
+            self.preview_escudo.style().unpolish(self.preview_escudo)
+            self.preview_escudo.style().polish(self.preview_escudo)
+            return
         
         self._actualizar_escudo_escalado()
     
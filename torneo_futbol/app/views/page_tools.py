@@ -1,10 +1,19 @@
 """Página de Herramientas."""
+from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
     QCheckBox, QTimeEdit, QRadioButton, QGroupBox, 
-    QPushButton, QSpinBox, QLineEdit, QSizePolicy, QMessageBox
+    QPushButton, QSpinBox, QLineEdit, QSizePolicy, QMessageBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
 )
-from PySide6.QtCore import Qt, QTime, QEvent
+from PySide6.QtCore import Qt, QTime, QEvent, QTimer
+from app.config import REPORTS_GENERATED_DIR
+from app.models.db import (
+    activar_trazado_sql, desactivar_trazado_sql, trazado_sql_activo,
+    obtener_estadisticas_sql
+)
+from app.models.sql_trace import sql_tracer
+from app.services.ui_profiler import get_ui_profiler
 from app.views.widgets.digital_clock import DigitalClock, ClockMode
 
 
@@ -227,6 +236,73 @@ class PageTools(QWidget):
         card_layout.addStretch()
         
         layout_principal.addWidget(content_card)
+        
+        # ==================== DIAGNÓSTICO DE RENDIMIENTO ====================
+        self._crear_panel_diagnostico(layout_principal)
+    
+    def _crear_panel_diagnostico(self, layout_padre: QVBoxLayout):
+        """Crea el panel con las mediciones en vivo de slots, bloqueos y SQL."""
+        self.profiler = get_ui_profiler()
+        
+        self.diagnostico_group = QGroupBox(self.tr("Diagnóstico de rendimiento"))
+        self.diagnostico_group.setObjectName("contentCard")
+        diag_layout = QVBoxLayout(self.diagnostico_group)
+        diag_layout.setSpacing(8)
+        
+        # Interruptores
+        checks_layout = QHBoxLayout()
+        self.check_diagnostico = QCheckBox(self.tr("Medir slots y bloqueos"))
+        self.check_diagnostico.setChecked(self.profiler.activo)
+        self.check_diagnostico.toggled.connect(self._on_diagnostico_toggled)
+        self.check_sql = QCheckBox(self.tr("Trazar consultas SQL"))
+        self.check_sql.setChecked(trazado_sql_activo())
+        self.check_sql.toggled.connect(self._on_sql_toggled)
+        checks_layout.addWidget(self.check_diagnostico)
+        checks_layout.addWidget(self.check_sql)
+        checks_layout.addStretch()
+        
+        self.btn_exportar_traza = QPushButton(self.tr("Exportar traza..."))
+        self.btn_exportar_traza.clicked.connect(self._on_exportar_traza)
+        self.btn_reiniciar_diag = QPushButton(self.tr("Reiniciar"))
+        self.btn_reiniciar_diag.clicked.connect(self._on_reiniciar_diagnostico)
+        checks_layout.addWidget(self.btn_exportar_traza)
+        checks_layout.addWidget(self.btn_reiniciar_diag)
+        diag_layout.addLayout(checks_layout)
+        
+        self.label_bloqueos = QLabel("")
+        self.label_bloqueos.setWordWrap(True)
+        diag_layout.addWidget(self.label_bloqueos)
+        
+        # Tabla de slots
+        self.tabla_slots = self._crear_tabla_diagnostico(
+            [self.tr("Slot"), self.tr("Llamadas"), self.tr("Media (ms)"),
+             self.tr("p95 (ms)"), self.tr("Máx (ms)"), self.tr("Señal")]
+        )
+        diag_layout.addWidget(self.tabla_slots)
+        
+        # Tabla de consultas SQL
+        self.tabla_sql = self._crear_tabla_diagnostico(
+            [self.tr("Sentencia"), self.tr("Llamador"), self.tr("Ejecuciones"),
+             self.tr("p50 (ms)"), self.tr("p95 (ms)"), self.tr("p99 (ms)")]
+        )
+        diag_layout.addWidget(self.tabla_sql)
+        
+        layout_padre.addWidget(self.diagnostico_group)
+        
+        # Refresco periódico solo mientras la página está visible
+        self.timer_diagnostico = QTimer(self)
+        self.timer_diagnostico.setInterval(1000)
+        self.timer_diagnostico.timeout.connect(self._refrescar_diagnostico)
+    
+    def _crear_tabla_diagnostico(self, columnas: list[str]) -> QTableWidget:
+        """Crea una tabla de solo lectura para el panel de diagnóstico."""
+        tabla = QTableWidget(0, len(columnas))
+        tabla.setHorizontalHeaderLabels(columnas)
+        tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        tabla.verticalHeader().setVisible(False)
+        tabla.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        tabla.setMinimumHeight(140)
+        return tabla
     
     # ==================== MÉTODOS DE MANEJO DE EVENTOS ====================
     
@@ -454,6 +530,94 @@ class PageTools(QWidget):
                     border-radius: 4px;
                 }
             """)    
+
+    # ==================== DIAGNÓSTICO ====================
+    
+    def showEvent(self, event):
+        """Arranca el refresco del panel de diagnóstico al mostrar la página."""
+        super().showEvent(event)
+        self._refrescar_diagnostico()
+        self.timer_diagnostico.start()
+    
+    def hideEvent(self, event):
+        """Detiene el refresco del panel de diagnóstico al ocultar la página."""
+        self.timer_diagnostico.stop()
+        super().hideEvent(event)
+    
+    def _on_diagnostico_toggled(self, checked: bool):
+        """Activa o desactiva el perfilado de slots y el watchdog."""
+        if checked:
+            self.profiler.activar()
+        else:
+            self.profiler.desactivar()
+        self._refrescar_diagnostico()
+    
+    def _on_sql_toggled(self, checked: bool):
+        """Activa o desactiva el trazado de consultas SQL."""
+        if checked:
+            activar_trazado_sql()
+        else:
+            desactivar_trazado_sql()
+        self._refrescar_diagnostico()
+    
+    def _on_reiniciar_diagnostico(self):
+        """Descarta las mediciones acumuladas."""
+        self.profiler.reiniciar()
+        sql_tracer.reiniciar()
+        self._refrescar_diagnostico()
+    
+    def _on_exportar_traza(self):
+        """Exporta las mediciones a un archivo de traza (formato Chrome Trace)."""
+        nombre = f"traza_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        ruta, _ = QFileDialog.getSaveFileName(
+            self,
+            self.tr("Exportar traza"),
+            str(REPORTS_GENERATED_DIR / nombre),
+            self.tr("Traza JSON (*.json)")
+        )
+        if not ruta:
+            return
+        try:
+            eventos = self.profiler.exportar_traza(ruta)
+            self._update_status(self.tr("Traza exportada ({} eventos)").format(eventos))
+        except OSError as e:
+            QMessageBox.critical(self, self.tr("Error"), self.tr("No se pudo exportar la traza:\n{}").format(e))
+    
+    def _refrescar_diagnostico(self):
+        """Actualiza las tablas del panel de diagnóstico."""
+        bloqueos = self.profiler.obtener_bloqueos()
+        if bloqueos:
+            peor = max(bloqueos, key=lambda b: b["retraso_ms"])
+            self.label_bloqueos.setText(
+                self.tr("Bloqueos del bucle de eventos: {} (peor: {:.0f} ms en {})").format(
+                    len(bloqueos), peor["retraso_ms"], peor["slot"] or self.tr("desconocido")
+                )
+            )
+        else:
+            self.label_bloqueos.setText(self.tr("Bloqueos del bucle de eventos: 0"))
+        
+        filas_slots = [
+            (e["nombre"], e["llamadas"], e["media_ms"], e["p95_ms"], e["max_ms"], e["senal_principal"])
+            for e in self.profiler.obtener_estadisticas()[:15]
+        ]
+        self._rellenar_tabla_diagnostico(self.tabla_slots, filas_slots)
+        
+        filas_sql = [
+            (e["sql"], ", ".join(e["llamadores"]), e["ejecuciones"], e["p50_ms"], e["p95_ms"], e["p99_ms"])
+            for e in obtener_estadisticas_sql()[:15]
+        ]
+        self._rellenar_tabla_diagnostico(self.tabla_sql, filas_sql)
+    
+    def _rellenar_tabla_diagnostico(self, tabla: QTableWidget, filas: list[tuple]):
+        """Vuelca filas en una tabla formateando los valores numéricos."""
+        tabla.setRowCount(len(filas))
+        for i, fila in enumerate(filas):
+            for j, valor in enumerate(fila):
+                texto = f"{valor:.2f}" if isinstance(valor, float) else str(valor)
+                item = QTableWidgetItem(texto)
+                item.setToolTip(texto)
+                tabla.setItem(i, j, item)
+    
     def changeEvent(self, event):
         """Maneja eventos de cambio, incluyendo cambio de idioma."""
         if event.type() == QEvent.Type.LanguageChange:
@@ -493,6 +657,13 @@ class PageTools(QWidget):
         self.btn_pause.setText(self.tr("⏸ Pausar"))
         self.btn_reset.setText(self.tr("⏹ Resetear"))
         
+        # Actualizar panel de diagnóstico
+        self.diagnostico_group.setTitle(self.tr("Diagnóstico de rendimiento"))
+        self.check_diagnostico.setText(self.tr("Medir slots y bloqueos"))
+        self.check_sql.setText(self.tr("Trazar consultas SQL"))
+        self.btn_exportar_traza.setText(self.tr("Exportar traza..."))
+        self.btn_reiniciar_diag.setText(self.tr("Reiniciar"))
+        
         # Actualizar mensaje de alarma predeterminado si no ha sido modificado
         if self.alarm_msg.text() in ["¡Alarma!", "Alarm!"]:
             self.alarm_msg.setText(self.tr("¡Alarma!"))
\ No newline at end of file
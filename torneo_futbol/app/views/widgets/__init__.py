@@ -1,6 +1,27 @@
-"""Widgets personalizados para la aplicación."""
-from app.views.widgets.background_widget import BackgroundWidget
-from app.views.widgets.card_widget import CardWidget
-from app.views.widgets.digital_clock import DigitalClock, ClockMode
+"""Widgets personalizados para la aplicación.
+
+Los widgets se importan bajo demanda (PEP 562) para que la página de inicio
+no cargue durante el arranque los que solo usan otras páginas.
+"""
+from importlib import import_module
+
+_MODULOS = {
+    'BackgroundWidget': '.background_widget',
+    'CardWidget': '.card_widget',
+    'DigitalClock': '.digital_clock',
+    'ClockMode': '.digital_clock',
+}
 
 __all__ = ['BackgroundWidget', 'CardWidget', 'DigitalClock', 'ClockMode']
+
+
+def __getattr__(nombre):
+    if nombre in _MODULOS:
+        valor = getattr(import_module(_MODULOS[nombre], __name__), nombre)
+        globals()[nombre] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
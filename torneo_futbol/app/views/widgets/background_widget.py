@@ -1,10 +1,10 @@
 """Widget de fondo con césped escalado y overlay para tema oscuro."""
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPainter, QPixmap, QPainterPath
-from pathlib import Path
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QPainter, QPixmap
 from app.config import RESOURCES_DIR
 from app.constants import THEME_DARK
+from app.services.image_cache import get_image_cache
 
 
 class BackgroundWidget(QWidget):
@@ -19,17 +19,11 @@ class BackgroundWidget(QWidget):
         """
         super().__init__(parent)
         self.current_theme = None
-        self.pixmap = None
+        self._cache = get_image_cache()
         
-        # Cargar imagen de césped
+        # Imagen de césped (se carga y escala a través de la caché compartida)
         img_path = RESOURCES_DIR / "img" / "cesped.jpg"
-        if img_path.exists():
-            try:
-                self.pixmap = QPixmap(str(img_path))
-            except KeyboardInterrupt:
-                # Bug conocido en PySide6/Windows: QPixmap puede lanzar KeyboardInterrupt espurio
-                # Reintentar la carga
-                self.pixmap = QPixmap(str(img_path))
+        self.img_path = str(img_path) if img_path.exists() else None
         
         # Establecer como fondo (detrás de otros widgets)
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
@@ -45,46 +39,49 @@ class BackgroundWidget(QWidget):
         self.current_theme = theme
         self.update()
     
+    def _componer_fondo(self, ancho: int, alto: int, ratio: float) -> QPixmap:
+        """
+        Genera el fondo escalado tipo "cover" con el overlay del tema ya aplicado.
+        
+        Args:
+            ancho: Ancho lógico del widget
+            alto: Alto lógico del widget
+            ratio: devicePixelRatio de la pantalla
+        
+        Returns:
+            Pixmap listo para copiar en pantalla
+        """
+        fondo = self._cache.cover(self.img_path, ancho, alto, ratio)
+        if fondo.isNull() or self.current_theme != THEME_DARK:
+            return fondo
+        
+        # Overlay oscuro en tema dark (30% de opacidad)
+        compuesto = QPixmap(fondo)
+        painter = QPainter(compuesto)
+        painter.setOpacity(0.30)
+        painter.fillRect(QRect(0, 0, ancho, alto), Qt.GlobalColor.black)
+        painter.end()
+        return compuesto
+    
     def paintEvent(self, event):
         """
-        Pinta el fondo escalado con overlay según el tema.
+        Copia en pantalla el fondo pre-escalado para el tamaño y tema actuales.
         
         Args:
             event: Evento de pintado
         """
-        if not self.pixmap:
+        if not self.img_path:
             return
         
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-        
-        # Obtener dimensiones
-        widget_rect = self.rect()
-        widget_w = widget_rect.width()
-        widget_h = widget_rect.height()
-        
-        pixmap_w = self.pixmap.width()
-        pixmap_h = self.pixmap.height()
-        
-        # Calcular escala tipo "cover" (cubrir toda el área manteniendo aspecto)
-        scale_w = widget_w / pixmap_w
-        scale_h = widget_h / pixmap_h
-        scale = max(scale_w, scale_h)  # Usar el mayor para cubrir todo
-        
-        # Calcular dimensiones escaladas
-        scaled_w = int(pixmap_w * scale)
-        scaled_h = int(pixmap_h * scale)
-        
-        # Centrar la imagen
-        x = (widget_w - scaled_w) // 2
-        y = (widget_h - scaled_h) // 2
-        
-        # Dibujar imagen escalada
-        painter.drawPixmap(x, y, scaled_w, scaled_h, self.pixmap)
-        
-        # Aplicar overlay oscuro en tema dark (30% de opacidad)
-        if self.current_theme == THEME_DARK:
-            painter.setOpacity(0.30)
-            painter.fillRect(widget_rect, Qt.GlobalColor.black)
+        ancho, alto = self.width(), self.height()
+        ratio = self.devicePixelRatioF()
+        fondo = self._cache.obtener_o_crear(
+            (self.img_path, (ancho, alto, ratio), self.current_theme, "fondo"),
+            lambda: self._componer_fondo(ancho, alto, ratio)
+        )
+        if fondo.isNull():
+            return
         
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, fondo)
         painter.end()
@@ -1,7 +1,27 @@
 """Widget de tarjeta con bordes redondeados reales y clipping correcto."""
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QSizePolicy
-from PySide6.QtCore import Qt, Signal, QRect
-from PySide6.QtGui import QPainter, QPainterPath, QColor, QPen, QFontMetrics
+from typing import Optional
+from PySide6.QtCore import Qt, Signal, QRectF
+from PySide6.QtGui import QPainter, QPainterPath, QColor, QPen, QPixmap
+from app.services.image_cache import get_image_cache
+
+
+# Colores (fondo, borde) por tema y estado
+COLORES_TARJETA = {
+    ("light", "pressed"): (QColor(250, 248, 235, int(0.88 * 255)), QColor(19, 141, 117, int(0.7 * 255))),
+    ("light", "hover"): (QColor(255, 253, 240, int(0.95 * 255)), QColor(22, 160, 133, int(0.6 * 255))),
+    ("light", "normal"): (QColor(255, 253, 240, int(0.88 * 255)), QColor(180, 160, 90, int(0.45 * 255))),
+    ("dark", "pressed"): (QColor(30, 45, 35, int(0.88 * 255)), QColor(19, 141, 117, int(0.8 * 255))),
+    ("dark", "hover"): (QColor(40, 55, 45, int(0.92 * 255)), QColor(22, 160, 133, int(0.7 * 255))),
+    ("dark", "normal"): (QColor(35, 50, 40, int(0.88 * 255)), QColor(80, 120, 90, int(0.5 * 255))),
+}
+
+# Capa (overlay, borde) sobre la imagen de fondo por estado, para legibilidad del texto
+COLORES_TARJETA_IMAGEN = {
+    "pressed": (QColor(31, 97, 141, int(0.7 * 255)), QColor("#154360")),
+    "hover": (QColor(41, 128, 185, int(0.6 * 255)), QColor("#1f618d")),
+    "normal": (QColor(0, 0, 0, int(0.5 * 255)), QColor("#2c3e50")),
+}
 
 
 class CardWidget(QWidget):
@@ -36,6 +56,8 @@ class CardWidget(QWidget):
         self.is_hovered = False
         self.is_pressed = False
         self.border_radius = 10
+        self.imagen_fondo: Optional[str] = None
+        self._cache = get_image_cache()
         
         # Configurar widget para transparencia y clipping
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
@@ -101,7 +123,10 @@ class CardWidget(QWidget):
     
     def _update_title_style(self):
         """Actualiza el estilo del título según el tema."""
-        color = "#1f2a2e" if self.theme == "light" else "#f2f2f2"
+        if self.imagen_fondo:
+            color = "#ffffff"
+        else:
+            color = "#1f2a2e" if self.theme == "light" else "#f2f2f2"
         self.title_label.setStyleSheet(
             f"font-family: 'Poppins', 'Segoe UI', Arial, sans-serif; "
             f"font-size: 16pt; "
@@ -115,7 +140,10 @@ class CardWidget(QWidget):
     
     def _update_desc_style(self):
         """Actualiza el estilo de la descripción según el tema."""
-        color = "#5a6c7d" if self.theme == "light" else "#b0b0b0"
+        if self.imagen_fondo:
+            color = "#ecf0f1"
+        else:
+            color = "#5a6c7d" if self.theme == "light" else "#b0b0b0"
         self.desc_label.setStyleSheet(
             f"font-size: 11pt; "
             f"font-weight: 400; "
@@ -151,42 +179,59 @@ class CardWidget(QWidget):
         self.title_label.setText(titulo)
         self.desc_label.setText(descripcion)
     
-    def paintEvent(self, event):
-        """Dibuja la tarjeta con bordes redondeados y clipping real."""
-        painter = QPainter(self)
+    def set_imagen_fondo(self, ruta_imagen: Optional[str]):
+        """
+        Establece una imagen de fondo escalada tipo "cover" bajo el contenido.
+        
+        Args:
+            ruta_imagen: Ruta de la imagen o None para quitarla
+        """
+        self.imagen_fondo = ruta_imagen
+        self._update_title_style()
+        self._update_desc_style()
+        self.update()
+    
+    def _estado(self) -> str:
+        """Estado visual actual de la tarjeta."""
+        if self.is_pressed:
+            return "pressed"
+        if self.is_hovered:
+            return "hover"
+        return "normal"
+    
+    def _componer_fondo(self, ancho: int, alto: int, ratio: float, estado: str) -> QPixmap:
+        """
+        Dibuja el fondo de la tarjeta (imagen, color y borde) en un pixmap.
+        
+        Args:
+            ancho: Ancho lógico de la tarjeta
+            alto: Alto lógico de la tarjeta
+            ratio: devicePixelRatio de la pantalla
+            estado: 'normal', 'hover' o 'pressed'
+        
+        Returns:
+            Pixmap transparente con el fondo de la tarjeta
+        """
+        pixmap = QPixmap(int(ancho * ratio), int(alto * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Crear path con bordes redondeados
+        # Crear path con bordes redondeados y aplicar clipping
         path = QPainterPath()
-        rect = QRect(0, 0, self.width(), self.height())
-        path.addRoundedRect(rect, self.border_radius, self.border_radius)
-        
-        # Aplicar clipping
+        path.addRoundedRect(QRectF(0, 0, ancho, alto), self.border_radius, self.border_radius)
         painter.setClipPath(path)
         
-        # Determinar colores según estado y tema
-        if self.theme == "light":
-            if self.is_pressed:
-                bg_color = QColor(250, 248, 235, int(0.88 * 255))
-                border_color = QColor(19, 141, 117, int(0.7 * 255))
-            elif self.is_hovered:
-                bg_color = QColor(255, 253, 240, int(0.95 * 255))
-                border_color = QColor(22, 160, 133, int(0.6 * 255))
-            else:
-                bg_color = QColor(255, 253, 240, int(0.88 * 255))
-                border_color = QColor(180, 160, 90, int(0.45 * 255))
-        else:  # dark theme
-            if self.is_pressed:
-                bg_color = QColor(30, 45, 35, int(0.88 * 255))
-                border_color = QColor(19, 141, 117, int(0.8 * 255))
-            elif self.is_hovered:
-                bg_color = QColor(40, 55, 45, int(0.92 * 255))
-                border_color = QColor(22, 160, 133, int(0.7 * 255))
-            else:
-                bg_color = QColor(35, 50, 40, int(0.88 * 255))
-                border_color = QColor(80, 120, 90, int(0.5 * 255))
-        
-        # Dibujar fondo
+        imagen = self._cache.cover(self.imagen_fondo, ancho, alto, ratio) if self.imagen_fondo else QPixmap()
+        if not imagen.isNull():
+            bg_color, border_color = COLORES_TARJETA_IMAGEN[estado]
+            painter.drawPixmap(0, 0, imagen)
+        else:
+            bg_color, border_color = COLORES_TARJETA[("dark" if self.theme == "dark" else "light", estado)]
+        
+        # Dibujar fondo (o capa sobre la imagen)
         painter.fillPath(path, bg_color)
         
         # Dibujar borde
@@ -194,6 +239,22 @@ class CardWidget(QWidget):
         pen.setWidth(1)
         painter.setPen(pen)
         painter.drawPath(path)
+        painter.end()
+        return pixmap
+    
+    def paintEvent(self, event):
+        """Copia en pantalla el fondo pre-renderizado para el tamaño, tema y estado."""
+        ancho, alto = self.width(), self.height()
+        ratio = self.devicePixelRatioF()
+        estado = self._estado()
+        fondo = self._cache.obtener_o_crear(
+            (self.imagen_fondo or "card", (ancho, alto, ratio, self.border_radius), self.theme, estado),
+            lambda: self._componer_fondo(ancho, alto, ratio, estado)
+        )
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, fondo)
+        painter.end()
     
     def mousePressEvent(self, event):
         """Maneja el evento de click."""
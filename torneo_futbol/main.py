@@ -1,13 +1,14 @@
 """Punto de entrada de la aplicación."""
 import sys
 from pathlib import Path
+from app.services.startup_profiler import startup_profiler
 from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtCore import QTranslator, QLocale
 
 from app.models.db import init_db, DbError
 from app.services.qss_service import qss_service
+from app.services.data_sync_service import sincronizar_datos_empaquetados
 from app.config import DEFAULT_THEME, DEFAULT_LANGUAGE, TRANSLATIONS_DIR
-from app.views.main_window import MainWindow
 
 
 def load_translations(app: QApplication, language: str = None) -> QTranslator:
@@ -61,18 +62,27 @@ def load_translations(app: QApplication, language: str = None) -> QTranslator:
 
 def main():
     """Función principal de la aplicación."""
+    startup_profiler.marcar("módulos importados")
+    
     # Crear aplicación
-    app = QApplication(sys.argv)
-    app.setApplicationName("Torneo de Fútbol")
-    app.setOrganizationName("DAM")
+    with startup_profiler.medir("QApplication"):
+        app = QApplication(sys.argv)
+        app.setApplicationName("Torneo de Fútbol")
+        app.setOrganizationName("DAM")
     
     # Cargar traducciones
-    translator = load_translations(app, DEFAULT_LANGUAGE)
+    with startup_profiler.medir("traducciones"):
+        translator = load_translations(app, DEFAULT_LANGUAGE)
+    
+    # Copiar los datos semilla junto al ejecutable (solo empaquetado)
+    with startup_profiler.medir("datos empaquetados"):
+        sincronizar_datos_empaquetados()
     
     # Inicializar base de datos
     print("Inicializando base de datos...")
     try:
-        init_db()
+        with startup_profiler.medir("base de datos"):
+            init_db()
     except DbError as e:
         QMessageBox.critical(
             None,
@@ -90,17 +100,23 @@ def main():
         )
         sys.exit(1)
     
-    # Aplicar tema por defecto ANTES de crear widgets (primera pasada)
+    # Instalar la hoja de estilos (ambos temas precompilados) ANTES de crear widgets
     print(f"Aplicando tema inicial: {DEFAULT_THEME}")
-    qss_service.apply_theme(DEFAULT_THEME, force_refresh=False)
+    with startup_profiler.medir("tema inicial"):
+        qss_service.apply_theme(DEFAULT_THEME, force_refresh=False)
+    
+    # Importar la ventana aquí para que el coste de sus módulos se mida aparte
+    with startup_profiler.medir("importar ventana principal"):
+        from app.views.main_window import MainWindow
     
     # Crear y mostrar ventana principal
-    window = MainWindow()
-    window.show()
+    with startup_profiler.medir("construcción de la ventana"):
+        window = MainWindow()
+    with startup_profiler.medir("show"):
+        window.show()
     
-    # RE-APLICAR tema con refresco DESPUÉS de crear la UI para asegurar que se aplique correctamente
-    print(f"Refrescando estilos del tema: {DEFAULT_THEME}")
-    qss_service.apply_theme(DEFAULT_THEME, force_refresh=True)
+    # No hace falta re-aplicar el tema: la ventana se registra en qss_service
+    # antes de mostrarse y se pule directamente con el tema actual
     
     # Ejecutar aplicación
     sys.exit(app.exec())
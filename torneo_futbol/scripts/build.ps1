@@ -42,6 +42,9 @@ Write-Host ""
 Write-Host "Iniciando empaquetado..." -ForegroundColor Yellow
 Write-Host "Esto puede tardar varios minutos...`n" -ForegroundColor Yellow
 
+# Generar manifiesto de los datos empaquetados (sincronización incremental)
+py scripts\generar_manifiesto_datos.py
+
 pyinstaller --clean torneo_futbol.spec
 
 # Verificar resultado
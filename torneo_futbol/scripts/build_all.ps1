@@ -53,6 +53,9 @@ Write-Host "=============================================" -ForegroundColor Yell
 Write-Host "Esto puede tardar varios minutos..." -ForegroundColor Cyan
 Write-Host ""
 
+# Generar manifiesto de los datos empaquetados (sincronización incremental)
+py scripts\generar_manifiesto_datos.py
+
 pyinstaller --clean torneo_futbol.spec
 
 if (-not (Test-Path "dist\TorneoFutbol.exe")) {
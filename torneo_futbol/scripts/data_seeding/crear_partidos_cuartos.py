@@ -10,6 +10,7 @@ import os
 # Agregar la ruta del proyecto al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.core.headless import iniciar
 from app.models.db import get_connection
 from app.models.match_model import MatchModel
 from app.models.team_model import TeamModel
@@ -128,4 +129,6 @@ def crear_partidos_cuartos():
         print(f"  Slot {p['slot']}: {p.get('local_nombre')} vs {p.get('visitante_nombre')}")
 
 if __name__ == '__main__':
+    # Crea o migra el esquema antes de usar los modelos
+    iniciar(conectar_servicios=False)
     crear_partidos_cuartos()
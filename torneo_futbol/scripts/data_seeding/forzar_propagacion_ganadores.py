@@ -10,6 +10,7 @@ import os
 # Agregar la ruta del proyecto al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.core.headless import iniciar
 from app.models.match_model import MatchModel
 from app.services.tournament_service import TournamentService
 from app.constants import FASE_OCTAVOS, FASE_CUARTOS, FASE_SEMIFINAL
@@ -82,4 +83,6 @@ def forzar_propagacion():
             print(f"    Slot {p['slot']}: {p.get('local_nombre')} vs {p.get('visitante_nombre')}{ganador_str}")
 
 if __name__ == '__main__':
+    # Crea o migra el esquema antes de usar los modelos
+    iniciar(conectar_servicios=False)
     forzar_propagacion()
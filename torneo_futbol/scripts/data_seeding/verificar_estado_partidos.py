@@ -9,6 +9,7 @@ import os
 # Agregar la ruta del proyecto al path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.core.headless import iniciar
 from app.models.match_model import MatchModel
 from app.constants import FASE_OCTAVOS, FASE_CUARTOS, FASE_SEMIFINAL
 
@@ -61,4 +62,6 @@ def verificar_estado():
     print("\n" + "="*80)
 
 if __name__ == '__main__':
+    # Crea o migra el esquema antes de usar los modelos
+    iniciar(conectar_servicios=False)
     verificar_estado()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Mantenimiento del almacén de escudos (data/escudos).
+
+Subcomandos:
+    gc           Borra los escudos y miniaturas que no usa ningún equipo
+    deduplicar   Renombra los escudos a <hash>.<ext> y elimina las copias repetidas
+    miniaturas   Genera las miniaturas de todos los escudos en uso
+
+Con --simular solo se muestra lo que se haría.
+"""
+
+import argparse
+import sys
+import os
+
+# Agregar la ruta del proyecto al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtGui import QGuiApplication
+
+from app.services.crest_service import crest_service
+
+
+def _gc(args) -> int:
+    informe = crest_service.recolectar_basura(simular=args.simular)
+    for nombre in informe["eliminados"]:
+        print(f"  - {nombre}")
+    print(f"{len(informe['eliminados'])} escudos y {informe['miniaturas_eliminadas']} miniaturas "
+          f"sin referencias ({informe['bytes_liberados'] / 1024:.0f} KB)")
+    return 0
+
+
+def _deduplicar(args) -> int:
+    informe = crest_service.deduplicar(simular=args.simular)
+    for nombre in informe["duplicados"]:
+        print(f"  = {nombre}")
+    print(f"{informe['renombrados']} renombrados, {len(informe['duplicados'])} duplicados, "
+          f"{informe['equipos_actualizados']} equipos actualizados "
+          f"({informe['bytes_liberados'] / 1024:.0f} KB)")
+    return 0
+
+
+def _miniaturas(args) -> int:
+    referencias = [r for r in crest_service.contar_referencias() if r.exists()]
+    if not args.simular:
+        for archivo in referencias:
+            crest_service.pre_rasterizar(archivo)
+    print(f"Miniaturas de {len(referencias)} escudos en uso")
+    return 0
+
+
+def main():
+    """Ejecuta el subcomando indicado."""
+    parser = argparse.ArgumentParser(description="Mantenimiento de los escudos de los equipos")
+    parser.add_argument("--simular", action="store_true", help="No modificar nada, solo informar")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    subcomandos.add_parser("gc", help="Borrar escudos sin referencias").set_defaults(func=_gc)
+    subcomandos.add_parser("deduplicar", help="Unificar escudos repetidos").set_defaults(func=_deduplicar)
+    subcomandos.add_parser("miniaturas", help="Generar miniaturas").set_defaults(func=_miniaturas)
+    args = parser.parse_args()
+
+    # QImage/QSvgRenderer necesitan una aplicación de Qt para rasterizar
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Genera el manifiesto de los datos empaquetados (data/datos_empaquetados.json).
+
+Se ejecuta desde build.ps1 / build_all.ps1 antes de PyInstaller. El ejecutable
+compara este manifiesto con el estado de su última sincronización para copiar
+junto al .exe únicamente los archivos que han cambiado.
+"""
+
+import json
+import sys
+import os
+
+# Agregar la ruta del proyecto al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import BUNDLED_DATA_DIR
+from app.services.data_sync_service import escribir_manifiesto
+
+
+def main():
+    """Escribe el manifiesto y muestra un resumen."""
+    if not BUNDLED_DATA_DIR.exists():
+        print(f"No existe el directorio de datos: {BUNDLED_DATA_DIR}")
+        return 1
+
+    ruta = escribir_manifiesto(BUNDLED_DATA_DIR)
+    with open(ruta, "r", encoding="utf-8") as f:
+        archivos = json.load(f)["archivos"]
+    total = sum(a["tamano"] for a in archivos.values())
+    print(f"Manifiesto generado: {ruta}")
+    print(f"  {len(archivos)} archivos, {total / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
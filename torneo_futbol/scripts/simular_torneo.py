@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Probabilidades del torneo por simulación Monte Carlo.
+
+Sin argumentos simula el cuadro actual de la base de datos y muestra, para
+cada equipo, la probabilidad de llegar a cada ronda y de ser campeón.
+
+Con --benchmark mide las simulaciones por segundo sobre un cuadro sintético
+de 16 equipos (no necesita datos en la base de datos).
+"""
+
+import argparse
+import random
+import sys
+import os
+
+# Agregar la ruta del proyecto al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.constants import FASE_OCTAVOS
+from app.core.headless import iniciar
+from app.services.simulation_service import (
+    SimulationService, ModeloFuerza, CAMPEON, SIMULACIONES_POR_DEFECTO
+)
+from app.services.tournament_service import TournamentService
+
+
+def _cuadro_sintetico() -> dict:
+    """Cuadro de 16 equipos con solo los octavos definidos."""
+    cuadro = {ronda: [] for ronda in TournamentService.RONDAS}
+    for slot in range(1, 9):
+        local, visitante = 2 * slot - 1, 2 * slot
+        cuadro[FASE_OCTAVOS].append({
+            "slot": slot,
+            "local_id": local, "local_nombre": f"Equipo {local}",
+            "visitante_id": visitante, "visitante_nombre": f"Equipo {visitante}",
+            "ganador_equipo_id": None,
+        })
+    return cuadro
+
+
+def _benchmark(simulaciones: int, repeticiones: int) -> int:
+    generador = random.Random(0)
+    modelo = ModeloFuerza(
+        goles_medios=1.5,
+        ataque={i: generador.uniform(0.6, 1.5) for i in range(1, 17)},
+        defensa={i: generador.uniform(0.6, 1.5) for i in range(1, 17)},
+    )
+    cuadro = _cuadro_sintetico()
+
+    # Calentamiento (importación de NumPy y primeras reservas de memoria)
+    SimulationService.simular(1_000, semilla=0, cuadro=cuadro, modelo=modelo)
+
+    velocidades = []
+    for i in range(repeticiones):
+        resultado = SimulationService.simular(simulaciones, semilla=i, cuadro=cuadro, modelo=modelo)
+        velocidades.append(resultado["simulaciones_por_segundo"])
+        print(f"  {simulaciones:,} simulaciones en {resultado['duracion_s'] * 1000:7.1f} ms "
+              f"({resultado['simulaciones_por_segundo']:,.0f}/s)")
+    velocidades.sort()
+    print(f"Mediana: {velocidades[len(velocidades) // 2]:,.0f} simulaciones/s")
+    return 0
+
+
+def _probabilidades(simulaciones: int, semilla) -> int:
+    try:
+        resultado = SimulationService.simular(simulaciones, semilla=semilla)
+    except ValueError as e:
+        print(f"No se puede simular: {e}")
+        return 1
+
+    rondas = resultado["rondas"][1:] + [CAMPEON]
+    print(f"{resultado['simulaciones']:,} simulaciones en {resultado['duracion_s']:.2f} s "
+          f"(media de {resultado['goles_medios']:.2f} goles por equipo y partido)\n")
+    print(f"{'Equipo':<28}" + "".join(f"{r.capitalize():>11}" for r in rondas))
+    for equipo in resultado["equipos"]:
+        fila = "".join(f"{equipo['probabilidades'][r] * 100:10.1f}%" for r in rondas)
+        print(f"{equipo['nombre'][:27]:<28}{fila}")
+    return 0
+
+
+def main():
+    """Ejecuta la simulación o el benchmark."""
+    parser = argparse.ArgumentParser(description="Probabilidades del torneo (Monte Carlo)")
+    parser.add_argument("-n", "--simulaciones", type=int, default=SIMULACIONES_POR_DEFECTO,
+                        help="Número de torneos simulados")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para repetir resultados")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Medir simulaciones por segundo con un cuadro sintético")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones del benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        return _benchmark(args.simulaciones, args.repeticiones)
+    # Crea o migra el esquema antes de leer el cuadro
+    iniciar(conectar_servicios=False)
+    return _probabilidades(args.simulaciones, args.semilla)
+
+
+if __name__ == "__main__":
+    sys.exit(main())